@@ -22,7 +22,11 @@ __all__ = [
     "BufferedReader",
     "Bus",
     "BusABC",
+    "BusLoad",
+    "BusMultiplexer",
+    "BusPoller",
     "BusState",
+    "BusView",
     "CSVReader",
     "CSVWriter",
     "CanError",
@@ -33,7 +37,9 @@ __all__ = [
     "CanTimeoutError",
     "CanutilsLogReader",
     "CanutilsLogWriter",
+    "ConfigMonitor",
     "CyclicSendTaskABC",
+    "Gateway",
     "LimitedDurationCyclicSendTaskABC",
     "Listener",
     "LogReader",
@@ -44,9 +50,15 @@ __all__ = [
     "MessageSync",
     "ModifiableCyclicTaskABC",
     "Notifier",
+    "PolledBus",
     "Printer",
+    "PriorityQueueBus",
+    "ProcessBus",
+    "RateLimitedBus",
     "RedirectReader",
     "RestartableCyclicTaskABC",
+    "Route",
+    "RouteStatistics",
     "SizedRotatingLogger",
     "SqliteReader",
     "SqliteWriter",
@@ -57,9 +69,14 @@ __all__ = [
     "bit_timing",
     "broadcastmanager",
     "bus",
+    "bus_load",
+    "bus_statistics",
     "ctypesutil",
     "detect_available_configs",
+    "discovery",
     "exceptions",
+    "filters",
+    "gateway",
     "interface",
     "interfaces",
     "io",
@@ -68,8 +85,13 @@ __all__ = [
     "logconvert",
     "logger",
     "message",
+    "multiplexer",
     "notifier",
     "player",
+    "poller",
+    "priority_queue_bus",
+    "process_bus",
+    "rate_limited_bus",
     "set_logging_level",
     "thread_safe_bus",
     "typechecking",
@@ -88,6 +110,8 @@ from .broadcastmanager import (
     RestartableCyclicTaskABC,
 )
 from .bus import BusABC, BusState, CanProtocol
+from .bus_load import BusLoad
+from .discovery import ConfigMonitor
 from .exceptions import (
     CanError,
     CanInitializationError,
@@ -95,6 +119,7 @@ from .exceptions import (
     CanOperationError,
     CanTimeoutError,
 )
+from .gateway import Gateway, Route, RouteStatistics
 from .interface import Bus, detect_available_configs
 from .interfaces import VALID_INTERFACES
 from .io import (
@@ -121,7 +146,12 @@ from .io import (
 )
 from .listener import AsyncBufferedReader, BufferedReader, Listener, RedirectReader
 from .message import Message
+from .multiplexer import BusMultiplexer, BusView
 from .notifier import Notifier
+from .poller import BusPoller, PolledBus
+from .priority_queue_bus import PriorityQueueBus
+from .process_bus import ProcessBus
+from .rate_limited_bus import RateLimitedBus
 from .thread_safe_bus import ThreadSafeBus
 from .util import set_logging_level
 
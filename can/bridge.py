@@ -9,18 +9,34 @@ import argparse
 import errno
 import sys
 import time
+from collections.abc import Mapping, Sequence
+from contextlib import ExitStack
 from datetime import datetime
-from typing import Final
+from typing import TYPE_CHECKING, Final, Optional
 
+from can.bus import BusABC, CanProtocol
 from can.cli import add_bus_arguments, create_bus_from_namespace
-from can.listener import RedirectReader
-from can.notifier import Notifier
+from can.exceptions import CanOperationError
+from can.gateway import Gateway, Route, load_routes
+from can.interface import Bus
+
+if TYPE_CHECKING:
+    from can.interfaces.socketcan.gateway import KernelGateway
+    from can.typechecking import CanFilter
 
 BRIDGE_DESCRIPTION: Final = """\
 Bridge two CAN buses.
 
 Both can buses will be connected so that messages from bus1 will be sent on
-bus2 and messages from bus2 will be sent to bus1.
+bus2 and messages from bus2 will be sent to bus1. The filters of a bus select
+the messages that are forwarded from it.
+
+If both buses use SocketCAN, the messages are forwarded by the CAN gateway of
+the Linux kernel (can-gw) where available, which requires the CAP_NET_ADMIN
+capability.
+
+With --routes, messages are forwarded between any number of buses according
+to the routing rules in a JSON file instead.
 """
 BUS_1_PREFIX: Final = "bus1"
 BUS_2_PREFIX: Final = "bus2"
@@ -30,8 +46,26 @@ def _parse_bridge_args(args: list[str]) -> argparse.Namespace:
     """Parse command line arguments for bridge script."""
 
     parser = argparse.ArgumentParser(description=BRIDGE_DESCRIPTION)
-    add_bus_arguments(parser, prefix=BUS_1_PREFIX, group_title="Bus 1 arguments")
-    add_bus_arguments(parser, prefix=BUS_2_PREFIX, group_title="Bus 2 arguments")
+    add_bus_arguments(
+        parser, filter_arg=True, prefix=BUS_1_PREFIX, group_title="Bus 1 arguments"
+    )
+    add_bus_arguments(
+        parser, filter_arg=True, prefix=BUS_2_PREFIX, group_title="Bus 2 arguments"
+    )
+    parser.add_argument(
+        "--offload",
+        choices=("auto", "kernel", "off"),
+        default="auto",
+        help="Forward in the kernel if both buses use SocketCAN (auto), "
+        "always forward in the kernel (kernel) or always forward in this "
+        "process (off). Default: auto",
+    )
+    parser.add_argument(
+        "--routes",
+        metavar="FILE",
+        help="Forward between the buses and according to the routes in a JSON "
+        "file, see can.gateway.load_routes(), instead of bridging bus1 and bus2.",
+    )
 
     # print help message when no arguments were given
     if not args:
@@ -42,22 +76,138 @@ def _parse_bridge_args(args: list[str]) -> argparse.Namespace:
     return results
 
 
+def _start_kernel_gateway(
+    bus1: BusABC, bus2: BusABC, required: bool
+) -> Optional["KernelGateway"]:
+    """Forward between the buses in the kernel, if possible."""
+    # pylint: disable=import-outside-toplevel
+    from can.interfaces.socketcan import SocketcanBus  # noqa: PLC0415
+    from can.interfaces.socketcan.gateway import (  # noqa: PLC0415
+        GatewayRule,
+        KernelGateway,
+    )
+
+    if not (
+        isinstance(bus1, SocketcanBus)
+        and isinstance(bus2, SocketcanBus)
+        and bus1.channel
+        and bus2.channel
+    ):
+        if required:
+            raise SystemExit("Forwarding in the kernel requires two SocketCAN channels")
+        return None
+
+    # CAN FD frames are forwarded by separate rules
+    fd_options = (
+        (False, True)
+        if bus1.protocol == bus2.protocol == CanProtocol.CAN_FD
+        else (False,)
+    )
+    rules = []
+    for source, destination in ((bus1, bus2), (bus2, bus1)):
+        can_filters: list[Optional[CanFilter]] = [None]
+        if source.filters:
+            can_filters = list(source.filters)
+        for can_filter in can_filters:
+            for fd in fd_options:
+                rules.append(
+                    GatewayRule(source.channel, destination.channel, can_filter, fd=fd)
+                )
+    try:
+        return KernelGateway(rules)
+    except CanOperationError as error:
+        if required:
+            raise
+        print(f"Forwarding in user space, since {error}", file=sys.stderr)
+        return None
+
+
+def _print_gateway_counters(kernel_gateway: "KernelGateway") -> None:
+    try:
+        counters = kernel_gateway.counters()
+    except CanOperationError as error:
+        print(f"Could not read the counters of the CAN gateway: {error}")
+        return
+    for rule, rule_counters in counters:
+        print(
+            f"{rule.source} -> {rule.destination}"
+            f"{' (CAN FD)' if rule.fd else ''}"
+            f"{f' filter {rule.can_filter}' if rule.can_filter else ''}: "
+            f"{rule_counters.handled} forwarded, "
+            f"{rule_counters.dropped} dropped, "
+            f"{rule_counters.deleted} deleted"
+        )
+
+
+def _wait_for_interrupt() -> None:
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+
+
+def _run_gateway(buses: Mapping[str, BusABC], routes: Sequence[Route]) -> None:
+    with Gateway(buses, routes) as gateway:
+        print(f"CAN Bridge (Started on {datetime.now()})")
+        _wait_for_interrupt()
+
+    for route, statistics in gateway.statistics():
+        print(
+            f"{route.source} -> {', '.join(route.targets)}: "
+            f"{statistics.forwarded} forwarded, {statistics.dropped} dropped, "
+            f"latency mean {statistics.latency_mean * 1e6:.0f} µs, "
+            f"max {statistics.latency_max * 1e6:.0f} µs"
+        )
+
+
+def _run_routing_file(path: str) -> None:
+    try:
+        bus_kwargs, routes = load_routes(path)
+    except (OSError, ValueError) as error:
+        raise SystemExit(f"Could not read the routes: {error}") from error
+
+    with ExitStack() as stack:
+        buses = {
+            name: stack.enter_context(Bus(**kwargs))
+            for name, kwargs in bus_kwargs.items()
+        }
+        _run_gateway(buses, routes)
+
+
 def main() -> None:
     results = _parse_bridge_args(sys.argv[1:])
 
+    if results.routes:
+        _run_routing_file(results.routes)
+        print(f"CAN Bridge (Stopped on {datetime.now()})")
+        return
+
     with (
         create_bus_from_namespace(results, prefix=BUS_1_PREFIX) as bus1,
         create_bus_from_namespace(results, prefix=BUS_2_PREFIX) as bus2,
     ):
-        reader1_to_2 = RedirectReader(bus2)
-        reader2_to_1 = RedirectReader(bus1)
-        with Notifier(bus1, [reader1_to_2]), Notifier(bus2, [reader2_to_1]):
-            print(f"CAN Bridge (Started on {datetime.now()})")
-            try:
-                while True:
-                    time.sleep(1)
-            except KeyboardInterrupt:
-                pass
+        kernel_gateway = None
+        if results.offload != "off":
+            kernel_gateway = _start_kernel_gateway(
+                bus1, bus2, required=results.offload == "kernel"
+            )
+
+        if kernel_gateway is not None:
+            with kernel_gateway:
+                print(
+                    f"CAN Bridge (Started on {datetime.now()}, forwarding in the kernel)"
+                )
+                _wait_for_interrupt()
+                _print_gateway_counters(kernel_gateway)
+        else:
+            _run_gateway(
+                {BUS_1_PREFIX: bus1, BUS_2_PREFIX: bus2},
+                [
+                    Route(BUS_1_PREFIX, (BUS_2_PREFIX,)),
+                    Route(BUS_2_PREFIX, (BUS_1_PREFIX,)),
+                ],
+            )
 
     print(f"CAN Bridge (Stopped on {datetime.now()})")
 
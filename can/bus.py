@@ -2,15 +2,21 @@
 Contains the ABC bus implementation and its documentation.
 """
 
+import asyncio
 import contextlib
+import functools
 import logging
+import socket
 import threading
 from abc import ABC, abstractmethod
-from collections.abc import Iterator, Sequence
+from collections import deque
+from collections.abc import AsyncIterator, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum, auto
-from time import time
+from time import perf_counter, time
 from types import TracebackType
 from typing import (
+    Any,
     Callable,
     Optional,
     Union,
@@ -21,6 +27,9 @@ from typing_extensions import Self
 
 import can.typechecking
 from can.broadcastmanager import CyclicSendTaskABC, ThreadBasedCyclicSendTask
+from can.bus_statistics import BusStatistics
+from can.exceptions import BACKPRESSURE_ERROR_CODES, CanOperationError, CanTimeoutError
+from can.filters import FilterPredicate, compile_predicate
 from can.message import Message
 
 LOG = logging.getLogger(__name__)
@@ -63,6 +72,22 @@ class BusABC(ABC):
     #: Assume that no cleanup is needed until something was initialized
     _is_shutdown: bool = True
     _can_protocol: CanProtocol = CanProtocol.CAN_20
+    _statistics: Optional[BusStatistics] = None
+    _async_adapter: Optional["_AsyncAdapter"] = None
+    #: Set by select based interfaces, see :meth:`_wake_up`
+    _wakeup: Optional["_WakeupSocket"] = None
+    _interrupt_pending: bool = False
+    _filter_predicate: Optional[FilterPredicate] = None
+    #: Set by interfaces whose :meth:`fileno` becomes writable when
+    #: :meth:`send` accepts a message, and whose :meth:`send` does not block
+    #: with a timeout of ``0``, see :meth:`send_async`
+    _send_with_fileno: bool = False
+
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        super().__init_subclass__(**kwargs)
+        # count the calls of every send() implementation
+        if "send" in cls.__dict__:
+            cls.send = _count_sends(cls.__dict__["send"])  # type: ignore[method-assign]
 
     @abstractmethod
     def __init__(
@@ -115,29 +140,47 @@ class BusABC(ABC):
         """
         start = time()
         time_left = timeout
+        statistics = self.statistics
 
         while True:
             # try to get a message
-            msg, already_filtered = self._recv_internal(timeout=time_left)
+            t_call = perf_counter()
+            try:
+                msg, already_filtered = self._recv_internal(timeout=time_left)
+            except Exception:
+                statistics.receive_errors += 1
+                raise
+            finally:
+                duration = perf_counter() - t_call
+                statistics.receive_time += duration
+                if statistics.receive_histogram is not None:
+                    statistics.receive_histogram.add(duration)
 
             # return it, if it matches
             if msg and (already_filtered or self._matches_filters(msg)):
+                statistics.messages_received += 1
                 LOG.log(self.RECV_LOGGING_LEVEL, "Received: %s", msg)
                 return msg
 
+            if msg:
+                statistics.messages_filtered += 1
+
+            if self._interrupt_pending:
+                self._interrupt_pending = False
+                return None
+
             # if not, and timeout is None, try indefinitely
-            elif timeout is None:
+            if timeout is None:
                 continue
 
             # try next one only if there still is time, and with
             # reduced timeout
-            else:
-                time_left = timeout - (time() - start)
+            time_left = timeout - (time() - start)
 
-                if time_left > 0:
-                    continue
+            if time_left > 0:
+                continue
 
-                return None
+            return None
 
     def _recv_internal(
         self, timeout: Optional[float]
@@ -203,6 +246,17 @@ class BusABC(ABC):
         """
         raise NotImplementedError("Trying to write to a readonly bus?")
 
+    @property
+    def statistics(self) -> BusStatistics:
+        """Counters of the received and sent messages of this bus.
+
+        They are maintained by :meth:`recv` and :meth:`send` for every
+        interface. See :class:`~can.bus_statistics.BusStatistics`.
+        """
+        if self._statistics is None:
+            self._statistics = BusStatistics()
+        return self._statistics
+
     def send_periodic(
         self,
         msgs: Union[Message, Sequence[Message]],
@@ -377,6 +431,69 @@ class BusABC(ABC):
             if msg is not None:
                 yield msg
 
+    async def recv_async(self, timeout: Optional[float] = None) -> Optional[Message]:
+        """Wait for a message from the bus without blocking the event loop.
+
+        If the bus provides a :meth:`fileno`, the event loop watches it
+        directly and received messages are read in batches. Otherwise,
+        :meth:`recv` is called in a thread pool that is shared by all buses.
+
+        :param timeout:
+            seconds to wait for a message or None to wait indefinitely
+
+        :return:
+            :obj:`None` on timeout or a :class:`~can.Message` object.
+
+        :raises ~can.exceptions.CanOperationError:
+            If an error occurred while reading
+        """
+        return await self._get_async_adapter().recv(timeout)
+
+    async def send_async(self, msg: Message, timeout: Optional[float] = None) -> None:
+        """Transmit a message without blocking the event loop.
+
+        If the interface sends through the file descriptor of
+        :meth:`fileno`, like SocketCAN, the message is sent directly and the
+        event loop waits while the transmit queue is full. Otherwise,
+        :meth:`send` is called in a thread pool that is shared by all buses.
+
+        :param msg: A message object.
+        :param timeout:
+            Wait up to this many seconds for the transmit queue to accept the
+            message. None waits indefinitely.
+
+        :raises ~can.exceptions.CanTimeoutError:
+            If the transmit queue remained full until the timeout
+        :raises ~can.exceptions.CanOperationError:
+            If an error occurred while sending
+        """
+        await self._get_async_adapter().send(msg, timeout)
+
+    async def __aiter__(self) -> AsyncIterator[Message]:
+        """Allow asynchronous iteration on messages as they are received.
+
+        .. code-block:: python
+
+            async for msg in bus:
+                print(msg)
+
+        :yields:
+            :class:`Message` msg objects.
+        """
+        while True:
+            msg = await self.recv_async()
+            if msg is not None:
+                yield msg
+
+    def _get_async_adapter(self) -> "_AsyncAdapter":
+        loop = asyncio.get_running_loop()
+        adapter = self._async_adapter
+        if adapter is None or adapter.loop is not loop:
+            if adapter is not None:
+                adapter.close()
+            adapter = self._async_adapter = _AsyncAdapter(self, loop, adapter)
+        return adapter
+
     @property
     def filters(self) -> Optional[can.typechecking.CanFilters]:
         """
@@ -412,7 +529,32 @@ class BusABC(ABC):
             If ``extended`` is set as well, it only matches messages where
             ``<received_is_extended> == extended``. Else it matches every
             messages based only on the arbitration ID and mask.
+
+            The optional ``data`` key holds terms that the payload must
+            match as well. Each term checks the byte at ``offset``, which
+            must exist, with an optional ``mask`` defaulting to ``0xFF``::
+
+                [{"can_id": 0x7E8, "can_mask": 0x7FF,
+                  "data": [{"offset": 1, "value": 0x62}]}]
+
+            A term matches, when
+            ``<received_data>[offset] & mask == value & mask``.
+
+            Further optional keys restrict the matching messages to
+            arbitration IDs from ``min_id`` to ``max_id``, to a
+            :attr:`~can.Message.dlc` from ``min_dlc`` to ``max_dlc``, and
+            to messages whose :attr:`~can.Message.is_fd`,
+            :attr:`~can.Message.is_remote_frame` and
+            :attr:`~can.Message.is_error_frame` equal ``fd``, ``remote``
+            and ``error``, respectively.
+
+            Interfaces that cannot check all keys, like most hardware, check
+            them in software. The filters are compiled into a single
+            function by :func:`can.filters.compile_predicate` for this.
+
+        :raises ValueError: If a filter is invalid.
         """
+        self._filter_predicate = compile_predicate(filters) if filters else None
         self._filters = filters or None
         with contextlib.suppress(NotImplementedError):
             self._apply_filters(self._filters)
@@ -438,29 +580,64 @@ class BusABC(ABC):
             the message to check if matching
         :return: whether the given message matches at least one filter
         """
-
         # if no filters are set, all messages are matched
-        if self._filters is None:
+        if self._filter_predicate is None:
             return True
+        return self._filter_predicate(msg)  # pylint: disable=not-callable
+
+    def interrupt(self) -> None:
+        """Make :meth:`recv` return ``None`` immediately, even if it waits
+        indefinitely in another thread.
+
+        If no thread is waiting, the next call of :meth:`recv` that would
+        wait returns ``None`` instead. This allows to stop a receiving thread
+        without waiting for its timeout to expire and without shutting down
+        the bus::
+
+            def receive():
+                while not stopped:
+                    if msg := bus.recv():
+                        print(msg)
 
-        for _filter in self._filters:
-            # check if this filter even applies to the message
-            if "extended" in _filter:
-                if _filter["extended"] != msg.is_extended_id:
-                    continue
+            stopped = True
+            bus.interrupt()
 
-            # then check for the mask and id
-            can_id = _filter["can_id"]
-            can_mask = _filter["can_mask"]
+        :raises NotImplementedError:
+            If the interface can not interrupt waiting for messages.
+        """
+        self._interrupt_pending = True
+        try:
+            self._wake_up()
+        except NotImplementedError:
+            self._interrupt_pending = False
+            raise
+
+    def _clear_interrupt(self) -> None:
+        """Discard an interrupt that no call of :meth:`recv` consumed, so that
+        the next call does not return ``None`` because of it.
+
+        Only call this when no other thread is receiving.
+        """
+        self._interrupt_pending = False
+        if self._wakeup is not None:
+            self._wakeup.clear()
 
-            # basically, we compute
-            # `msg.arbitration_id & can_mask == can_id & can_mask`
-            # by using the shorter, but equivalent from below:
-            if (can_id ^ msg.arbitration_id) & can_mask == 0:
-                return True
+    def _wake_up(self) -> None:
+        """Make a running call of :meth:`_recv_internal` return ``(None, False)``.
 
-        # nothing matched
-        return False
+        Interfaces that wait with :func:`select.select` assign a
+        ``_WakeupSocket`` to ``self._wakeup`` and wait for it to become
+        readable, too. They must call its ``clear()`` method afterwards.
+        Other interfaces may override this method instead.
+
+        :raises NotImplementedError:
+            If the interface can not interrupt waiting for messages.
+        """
+        if self._wakeup is None:
+            raise NotImplementedError(
+                f"{self.__class__.__name__} does not support interrupting recv()"
+            )
+        self._wakeup.set()
 
     def flush_tx_buffer(self) -> None:
         """Discard every message that may be queued in the output buffer(s)."""
@@ -478,6 +655,10 @@ class BusABC(ABC):
 
         self._is_shutdown = True
         self.stop_all_periodic_tasks()
+        if self._async_adapter is not None:
+            self._async_adapter.close()
+        if self._wakeup is not None:
+            self._wakeup.close()
 
     def __enter__(self) -> Self:
         return self
@@ -539,6 +720,236 @@ class BusABC(ABC):
         raise NotImplementedError("fileno is not implemented using current CAN bus")
 
 
+def _count_sends(send: Callable[..., None]) -> Callable[..., None]:
+    @functools.wraps(send)
+    def wrapper(self: BusABC, *args: Any, **kwargs: Any) -> None:
+        # forward the arguments unchanged to keep the default timeout of the
+        # implementation, and only count once if an overriding implementation
+        # calls super().send()
+        if type(self).send is not wrapper:
+            return send(self, *args, **kwargs)
+
+        statistics = self.statistics
+        t_call = perf_counter()
+        try:
+            send(self, *args, **kwargs)
+        except Exception:
+            statistics.send_errors += 1
+            raise
+        else:
+            statistics.messages_sent += 1
+        finally:
+            duration = perf_counter() - t_call
+            statistics.send_time += duration
+            if statistics.send_histogram is not None:
+                statistics.send_histogram.add(duration)
+        return None
+
+    return wrapper
+
+
+#: Maximum number of messages read at once when the file descriptor of a bus
+#: becomes readable
+_ASYNC_BATCH_SIZE = 64
+#: Maximum duration of a single :meth:`BusABC.recv` call in the thread pool
+_ASYNC_POLL_INTERVAL = 0.1
+#: Bounds of the back-off while the transmit queue is full
+_ASYNC_MIN_BACKOFF = 50e-6
+_ASYNC_MAX_BACKOFF = 0.01
+
+
+@functools.cache
+def _get_async_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(thread_name_prefix="can-async")
+
+
+class _WakeupSocket:
+    """A socket that becomes readable when :meth:`set` is called, to wake up
+    a thread waiting in :func:`select.select`."""
+
+    def __init__(self) -> None:
+        self._reader, self._writer = socket.socketpair()
+        self._reader.setblocking(False)
+        self._writer.setblocking(False)
+
+    def fileno(self) -> int:
+        return self._reader.fileno()
+
+    def set(self) -> None:
+        # fails if the socket is already full (which is fine) or closed
+        with contextlib.suppress(OSError):
+            self._writer.send(b"\0")
+
+    def clear(self) -> None:
+        with contextlib.suppress(OSError):
+            while self._reader.recv(4096):
+                pass
+
+    def close(self) -> None:
+        self._reader.close()
+        self._writer.close()
+
+
+def _set_ready(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class _AsyncAdapter:
+    """Implements :meth:`BusABC.recv_async` and :meth:`BusABC.send_async`
+    for one bus in one event loop."""
+
+    def __init__(
+        self,
+        bus: BusABC,
+        loop: asyncio.AbstractEventLoop,
+        previous: Optional["_AsyncAdapter"] = None,
+    ) -> None:
+        self.bus = bus
+        self.loop = loop
+        # received messages that were not yet returned
+        self.buffer: deque[Message] = deque(previous.buffer if previous else ())
+        self.waiters: deque[asyncio.Future[None]] = deque()
+        self.reading = False
+        self.executor_lock = asyncio.Lock()
+
+        self.fd = -1
+        with contextlib.suppress(NotImplementedError):
+            fd = bus.fileno()
+            # e.g. the ProactorEventLoop on Windows does not support this
+            loop.add_reader(fd, lambda: None)
+            loop.remove_reader(fd)
+            self.fd = fd
+
+    def close(self) -> None:
+        if self.reading and not self.loop.is_closed():
+            with contextlib.suppress(OSError, RuntimeError, ValueError):
+                self.loop.remove_reader(self.fd)
+        self.reading = False
+        for waiter in self.waiters:
+            if not waiter.done():
+                waiter.set_exception(CanOperationError("The bus was shut down"))
+        self.waiters.clear()
+
+    async def recv(self, timeout: Optional[float]) -> Optional[Message]:
+        if self.buffer:
+            return self.buffer.popleft()
+        if self.fd < 0:
+            return await self._recv_in_executor(timeout)
+
+        deadline = None if timeout is None else self.loop.time() + timeout
+        while not self.buffer:
+            waiter = self.loop.create_future()
+            self.waiters.append(waiter)
+            if not self.reading:
+                self.loop.add_reader(self.fd, self._on_readable)
+                self.reading = True
+            try:
+                remaining = None if deadline is None else deadline - self.loop.time()
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                return None
+            finally:
+                self._discard_waiter(waiter)
+        return self.buffer.popleft()
+
+    def _discard_waiter(self, waiter: "asyncio.Future[None]") -> None:
+        with contextlib.suppress(ValueError):
+            self.waiters.remove(waiter)
+        if not self.waiters and self.reading:
+            self.loop.remove_reader(self.fd)
+            self.reading = False
+
+    def _on_readable(self) -> None:
+        try:
+            for _ in range(_ASYNC_BATCH_SIZE):
+                msg = self.bus.recv(0)
+                if msg is None:
+                    break
+                self.buffer.append(msg)
+        except Exception as exc:  # pylint: disable=broad-except
+            for waiter in self.waiters:
+                if not waiter.done():
+                    waiter.set_exception(exc)
+            return
+
+        # wake up one waiter per message
+        available = len(self.buffer)
+        for waiter in self.waiters:
+            if available == 0:
+                break
+            if not waiter.done():
+                _set_ready(waiter)
+                available -= 1
+
+    async def _recv_in_executor(self, timeout: Optional[float]) -> Optional[Message]:
+        deadline = None if timeout is None else self.loop.time() + timeout
+        # most interfaces do not support concurrent calls of recv()
+        async with self.executor_lock:
+            while True:
+                if self.buffer:
+                    return self.buffer.popleft()
+                poll = _ASYNC_POLL_INTERVAL
+                if deadline is not None:
+                    poll = max(0.0, min(poll, deadline - self.loop.time()))
+                future = self.loop.run_in_executor(
+                    _get_async_executor(), self.bus.recv, poll
+                )
+                try:
+                    msg = await asyncio.shield(future)
+                except asyncio.CancelledError:
+                    # keep a message that arrives after the cancellation
+                    future.add_done_callback(self._keep_message)
+                    raise
+                if msg is not None:
+                    return msg
+                if deadline is not None and self.loop.time() >= deadline:
+                    return None
+
+    def _keep_message(self, future: "asyncio.Future[Optional[Message]]") -> None:
+        if not future.cancelled() and future.exception() is None:
+            if (msg := future.result()) is not None:
+                self.buffer.append(msg)
+
+    async def send(self, msg: Message, timeout: Optional[float]) -> None:
+        # pylint: disable=protected-access
+        if self.fd < 0 or not self.bus._send_with_fileno:
+            await self.loop.run_in_executor(
+                _get_async_executor(), self.bus.send, msg, timeout
+            )
+            return
+
+        deadline = None if timeout is None else self.loop.time() + timeout
+        backoff = 0.0
+        while True:
+            try:
+                self.bus.send(msg, 0)
+                return
+            except (CanOperationError, CanTimeoutError) as error:
+                if (
+                    isinstance(error, CanOperationError)
+                    and error.error_code not in BACKPRESSURE_ERROR_CODES
+                ):
+                    raise
+                if deadline is not None and self.loop.time() >= deadline:
+                    raise CanTimeoutError("Transmit buffer full") from error
+
+            # Wait until the file descriptor is writable. CAN sockets may
+            # still report a full queue afterwards, so back off as well.
+            writable = self.loop.create_future()
+            self.loop.add_writer(self.fd, _set_ready, writable)
+            try:
+                remaining = None if deadline is None else deadline - self.loop.time()
+                await asyncio.wait_for(writable, remaining)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self.loop.remove_writer(self.fd)
+            if backoff:
+                await asyncio.sleep(backoff)
+            backoff = min(max(backoff * 2, _ASYNC_MIN_BACKOFF), _ASYNC_MAX_BACKOFF)
+
+
 class _SelfRemovingCyclicTask(CyclicSendTaskABC, ABC):
     """Removes itself from a bus.
 
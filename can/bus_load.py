@@ -0,0 +1,514 @@
+"""
+Functions to calculate the number of bits of CAN frames on the wire, the
+time it takes to transmit them and the resulting bus load.
+
+The calculation follows the frame formats of ISO 11898-1:2015. The length of
+a frame includes the end of frame field and the intermission, i.e. it is the
+minimum time between the start of two consecutive frames.
+"""
+
+from collections import deque
+from collections.abc import Iterable, Mapping
+from functools import cache
+from typing import Literal, NamedTuple, Optional, Union
+
+from can import typechecking
+from can.bit_timing import BitTiming, BitTimingFd
+from can.listener import Listener
+from can.message import Message
+from can.util import dlc2len, len2dlc
+
+#: How stuff bits are counted: ``"none"`` ignores them, ``"worst"`` assumes the
+#: maximum number a frame of this type and length can contain and ``"exact"``
+#: calculates them from the identifier and the payload
+Stuffing = Literal["none", "worst", "exact"]
+
+#: Bits of an error flag, the error delimiter and the intermission
+ERROR_FRAME_BITS = 6 + 8 + 3
+
+# CRC delimiter, ACK slot, ACK delimiter, end of frame and intermission
+_CLASSIC_TAIL_BITS = 1 + 1 + 1 + 7 + 3
+# ACK slot, ACK delimiter, end of frame and intermission
+_FD_TAIL_BITS = 1 + 1 + 7 + 3
+
+_CRC15_POLYNOMIAL = 0x4599
+
+
+class FrameBitLength(NamedTuple):
+    """The number of bits of a frame, split by bit rate."""
+
+    #: Number of bits transmitted with the nominal (arbitration) bit rate
+    nominal: int
+    #: Number of bits transmitted with the data bit rate of CAN FD frames
+    #: that use bit rate switching
+    data: int
+
+    def duration(
+        self, nominal_bitrate: int, data_bitrate: Optional[int] = None
+    ) -> float:
+        """Return the transmission time in seconds.
+
+        :param nominal_bitrate: The nominal bit rate in bit/s.
+        :param data_bitrate:
+            The data bit rate in bit/s. Defaults to the nominal bit rate.
+        """
+        return self.nominal / nominal_bitrate + self.data / (
+            data_bitrate or nominal_bitrate
+        )
+
+
+class LoadSample(NamedTuple):
+    """The bus load within an interval of a recording."""
+
+    #: Timestamp of the start of the interval
+    start: float
+    #: Share of the interval that the bus was busy, in percent
+    load: float
+
+
+def _worst_case_stuff_bits(length: int) -> int:
+    # after the first five equal bits, every stuff bit starts a new
+    # sequence of equal bits with the following four bits
+    return max(length - 1, 0) // 4
+
+
+def _crc15(bits: list[int]) -> int:
+    crc = 0
+    for bit in bits:
+        feedback = bit ^ (crc >> 14)
+        crc = (crc << 1) & 0x7FFF
+        if feedback:
+            crc ^= _CRC15_POLYNOMIAL
+    return crc
+
+
+def _append_bits(bits: list[int], value: int, count: int) -> None:
+    bits.extend((value >> shift) & 1 for shift in range(count - 1, -1, -1))
+
+
+def _count_stuff_bits(bits: list[int], split: int) -> tuple[int, int]:
+    # returns the number of stuff bits inserted before and after the
+    # first ``split`` bits
+    before = after = 0
+    previous = -1
+    run = 0
+    for index, bit in enumerate(bits):
+        if bit == previous:
+            run += 1
+        else:
+            previous = bit
+            run = 1
+        if run == 5:
+            if index < split - 1:
+                before += 1
+            else:
+                after += 1
+            # the complementary stuff bit starts a new sequence
+            previous = 1 - bit
+            run = 1
+    return before, after
+
+
+@cache
+def _frame_bit_length(
+    is_extended_id: bool,
+    is_fd: bool,
+    bitrate_switch: bool,
+    data_length: int,
+    stuffing: bool,
+) -> FrameBitLength:
+    if not is_fd:
+        # SOF, identifier, RTR, IDE, r0, DLC, data and CRC sequence
+        stuffed = (54 if is_extended_id else 34) + 8 * data_length
+        stuff_bits = _worst_case_stuff_bits(stuffed) if stuffing else 0
+        return FrameBitLength(stuffed + stuff_bits + _CLASSIC_TAIL_BITS, 0)
+
+    # SOF, identifier, RRS, IDE, FDF, res and BRS
+    arbitration = 36 if is_extended_id else 17
+    # ESI, DLC and data
+    control_and_data = 5 + 8 * data_length
+
+    arbitration_stuff_bits = data_stuff_bits = 0
+    if stuffing:
+        arbitration_stuff_bits = _worst_case_stuff_bits(arbitration)
+        data_stuff_bits = (
+            _worst_case_stuff_bits(arbitration + control_and_data)
+            - arbitration_stuff_bits
+        )
+
+    return _fd_frame_bit_length(
+        bitrate_switch,
+        data_length,
+        arbitration + arbitration_stuff_bits,
+        control_and_data + data_stuff_bits,
+    )
+
+
+def _fd_frame_bit_length(
+    bitrate_switch: bool, data_length: int, arbitration: int, control_and_data: int
+) -> FrameBitLength:
+    # stuff count, CRC sequence, fixed stuff bits and CRC delimiter
+    crc = 4 + 17 + 6 + 1 if data_length <= 16 else 4 + 21 + 7 + 1
+
+    nominal = arbitration + _FD_TAIL_BITS
+    data = control_and_data + crc
+    if bitrate_switch:
+        return FrameBitLength(nominal, data)
+    return FrameBitLength(nominal + data, 0)
+
+
+def _exact_frame_bit_length(msg: Message) -> FrameBitLength:
+    bits = [0]  # SOF
+    rtr = int(msg.is_remote_frame and not msg.is_fd)
+    if msg.is_extended_id:
+        _append_bits(bits, msg.arbitration_id >> 18, 11)
+        bits += (1, 1)  # SRR, IDE
+        _append_bits(bits, msg.arbitration_id, 18)
+        bits.append(rtr)  # RTR or RRS
+    else:
+        _append_bits(bits, msg.arbitration_id, 11)
+        bits += (rtr, 0)  # RTR or RRS, IDE
+
+    if msg.is_fd:
+        bits += (1, 0, int(msg.bitrate_switch))  # FDF, res, BRS
+        arbitration = len(bits)
+        bits.append(int(msg.error_state_indicator))
+        dlc = len2dlc(len(msg.data))
+        data_length = dlc2len(dlc)
+        _append_bits(bits, dlc, 4)
+        for byte in msg.data.ljust(data_length, b"\x00"):
+            _append_bits(bits, byte, 8)
+
+        # the stuff count and the CRC sequence use fixed stuff bits
+        arbitration_stuff_bits, data_stuff_bits = _count_stuff_bits(bits, arbitration)
+        return _fd_frame_bit_length(
+            msg.bitrate_switch,
+            data_length,
+            arbitration + arbitration_stuff_bits,
+            len(bits) - arbitration + data_stuff_bits,
+        )
+
+    bits += (0, 0) if msg.is_extended_id else (0,)  # r1, r0
+    _append_bits(bits, msg.dlc, 4)
+    if not msg.is_remote_frame:
+        for byte in msg.data[:8]:
+            _append_bits(bits, byte, 8)
+    _append_bits(bits, _crc15(bits), 15)
+
+    stuff_bits = sum(_count_stuff_bits(bits, len(bits)))
+    return FrameBitLength(len(bits) + stuff_bits + _CLASSIC_TAIL_BITS, 0)
+
+
+def _data_length(msg: Message) -> int:
+    if msg.is_fd:
+        return dlc2len(len2dlc(len(msg.data)))
+    if msg.is_remote_frame:
+        return 0
+    return min(len(msg.data), 8)
+
+
+def frame_bit_length(msg: Message, stuffing: Stuffing = "worst") -> FrameBitLength:
+    """Return the number of bits of a frame on the wire.
+
+    :param msg:
+        The message to calculate the length for.
+    :param stuffing:
+        Whether to ignore stuff bits (``"none"``), to include the maximum
+        number of stuff bits that the frame can contain (``"worst"``) or to
+        calculate the actual stuff bits from the identifier and the payload
+        (``"exact"``). The exact calculation is considerably slower.
+    """
+    if msg.is_error_frame:
+        return FrameBitLength(ERROR_FRAME_BITS, 0)
+    if stuffing == "exact":
+        return _exact_frame_bit_length(msg)
+    return _frame_bit_length(
+        msg.is_extended_id,
+        msg.is_fd,
+        msg.bitrate_switch,
+        _data_length(msg),
+        stuffing == "worst",
+    )
+
+
+def frame_duration(
+    msg: Message,
+    timing: Union[BitTiming, BitTimingFd],
+    stuffing: Stuffing = "worst",
+) -> float:
+    """Return the time in seconds it takes to transmit a frame.
+
+    :param msg:
+        The message to calculate the transmission time for.
+    :param timing:
+        The bit timing configuration of the bus.
+    :param stuffing:
+        How to count stuff bits, see :func:`frame_bit_length`.
+    """
+    nominal_bitrate, data_bitrate = bitrates(timing)
+    return frame_bit_length(msg, stuffing).duration(nominal_bitrate, data_bitrate)
+
+
+def bitrates(timing: Union[BitTiming, BitTimingFd]) -> tuple[int, int]:
+    """Return the nominal and the data bit rate of a bit timing configuration.
+
+    For :class:`~can.BitTiming` both values are the same.
+    """
+    if isinstance(timing, BitTimingFd):
+        return timing.nom_bitrate, timing.data_bitrate
+    return timing.bitrate, timing.bitrate
+
+
+class _DurationTable:
+    """Transmission times of all frame types and data lengths of one bus."""
+
+    def __init__(
+        self, timing: Union[BitTiming, BitTimingFd], stuffing: Stuffing
+    ) -> None:
+        self.nominal_bitrate, self.data_bitrate = bitrates(timing)
+        self.stuffing = stuffing
+        # indexed by the flags (extended ID, FD, bit rate switch) and the
+        # length of the data in bytes
+        self.table = [
+            [
+                frame_bit_length(
+                    Message(
+                        is_extended_id=bool(flags & 1),
+                        is_fd=bool(flags & 2),
+                        bitrate_switch=bool(flags & 4),
+                        data=bytes(length),
+                        check=False,
+                    ),
+                    "none" if stuffing == "none" else "worst",
+                ).duration(self.nominal_bitrate, self.data_bitrate)
+                for length in range(65)
+            ]
+            for flags in range(8)
+        ]
+
+    def __call__(self, msg: Message) -> float:
+        if msg.is_error_frame or self.stuffing == "exact":
+            return frame_bit_length(msg, self.stuffing).duration(
+                self.nominal_bitrate, self.data_bitrate
+            )
+        flags = msg.is_extended_id | msg.is_fd << 1 | msg.bitrate_switch << 2
+        length = 0 if msg.is_remote_frame and not msg.is_fd else len(msg.data)
+        return self.table[flags][min(length, 64)]
+
+
+def _duration_tables(
+    timing: Union[
+        BitTiming,
+        BitTimingFd,
+        Mapping[typechecking.Channel, Union[BitTiming, BitTimingFd]],
+    ],
+    stuffing: Stuffing,
+) -> Union[_DurationTable, dict[typechecking.Channel, _DurationTable]]:
+    if isinstance(timing, (BitTiming, BitTimingFd)):
+        return _DurationTable(timing, stuffing)
+    return {
+        channel: _DurationTable(channel_timing, stuffing)
+        for channel, channel_timing in timing.items()
+    }
+
+
+def _table_of_channel(
+    tables: Union[_DurationTable, dict[typechecking.Channel, _DurationTable]],
+    channel: Optional[typechecking.Channel],
+) -> Optional[_DurationTable]:
+    if isinstance(tables, _DurationTable):
+        return tables
+    if channel is None:
+        return None
+    return tables.get(channel)
+
+
+class _Window:
+    __slots__ = ("busy", "frames")
+
+    def __init__(self) -> None:
+        self.frames: deque[tuple[float, float]] = deque()
+        self.busy = 0.0
+
+    def evict(self, start: float) -> None:
+        frames = self.frames
+        while frames and frames[0][0] <= start:
+            self.busy -= frames.popleft()[1]
+        if not frames:
+            # do not accumulate rounding errors
+            self.busy = 0.0
+
+
+class BusLoad(Listener):
+    """Estimates the bus load of one or several channels from the received
+    messages.
+
+    The load is the share of the time within a sliding window that the bus
+    was busy transmitting the frames. The transmission time of the frames is
+    looked up in tables that are calculated in advance from the bit timing,
+    so the cost per message is low unless exact stuffing is requested::
+
+        timing = can.BitTiming.from_sample_point(
+            f_clock=8_000_000, bitrate=500_000, sample_point=87.5
+        )
+        bus_load = can.BusLoad(timing, window=1.0)
+        notifier = can.Notifier(bus, [bus_load])
+        ...
+        print(bus_load.loads())  # e.g. {'can0': 37.5}
+
+    The window is based on the timestamps of the messages, i.e. it ends with
+    the latest received message unless a timestamp is passed to
+    :meth:`load`.
+
+    Messages are grouped by their :attr:`~can.Message.channel`, messages
+    without channel information are grouped under ``None``.
+    """
+
+    def __init__(
+        self,
+        timing: Union[
+            BitTiming,
+            BitTimingFd,
+            Mapping[typechecking.Channel, Union[BitTiming, BitTimingFd]],
+        ],
+        window: float = 1.0,
+        stuffing: Stuffing = "worst",
+    ) -> None:
+        """
+        :param timing:
+            The bit timing configuration of the bus, or a mapping of the
+            channel to the bit timing configuration of the respective bus.
+            With a mapping, messages of other channels are ignored.
+        :param window:
+            The length of the sliding window in seconds.
+        :param stuffing:
+            How to count stuff bits, see :func:`frame_bit_length`.
+
+        :raises ValueError: If *window* is not positive.
+        """
+        if window <= 0:
+            raise ValueError(f"window must be positive, got {window}")
+        self.window = window
+        self._tables = _duration_tables(timing, stuffing)
+        self._windows: dict[Optional[typechecking.Channel], _Window] = {}
+        self._latest = float("-inf")
+
+    def on_message_received(self, msg: Message) -> None:
+        table = _table_of_channel(self._tables, msg.channel)
+        if table is None:
+            return
+
+        window = self._windows.get(msg.channel)
+        if window is None:
+            window = self._windows[msg.channel] = _Window()
+        duration = table(msg)
+        window.frames.append((msg.timestamp, duration))
+        window.busy += duration
+        self._latest = max(self._latest, msg.timestamp)
+        window.evict(self._latest - self.window)
+
+    @property
+    def channels(self) -> list[Optional[typechecking.Channel]]:
+        """The channels that messages were received from."""
+        return list(self._windows)
+
+    def load(
+        self,
+        channel: Optional[typechecking.Channel] = None,
+        timestamp: Optional[float] = None,
+    ) -> float:
+        """Return the bus load of a channel in percent.
+
+        :param channel:
+            The channel to return the load for.
+        :param timestamp:
+            The end of the window. Defaults to the timestamp of the latest
+            message. Pass the current time in the time base of the message
+            timestamps to let the load decrease when no messages arrive.
+        """
+        window = self._windows.get(channel)
+        if window is None:
+            return 0.0
+        window.evict((self._latest if timestamp is None else timestamp) - self.window)
+        return 100.0 * window.busy / self.window
+
+    def loads(
+        self, timestamp: Optional[float] = None
+    ) -> dict[Optional[typechecking.Channel], float]:
+        """Return the bus load of all channels in percent.
+
+        :param timestamp: The end of the window, see :meth:`load`.
+        """
+        return {channel: self.load(channel, timestamp) for channel in self._windows}
+
+    def reset(self) -> None:
+        """Forget all received messages."""
+        self._windows.clear()
+        self._latest = float("-inf")
+
+
+def load_profile(
+    messages: Iterable[Message],
+    timing: Union[
+        BitTiming,
+        BitTimingFd,
+        Mapping[typechecking.Channel, Union[BitTiming, BitTimingFd]],
+    ],
+    interval: float = 1.0,
+    stuffing: Stuffing = "worst",
+) -> dict[Optional[typechecking.Channel], list[LoadSample]]:
+    """Calculate the bus load over time of recorded messages.
+
+    The recording is divided into consecutive intervals, starting at the
+    timestamp of the first message. This processes all messages in a single
+    pass in Python, which is only about 1.5 times as fast as feeding them to
+    a :class:`BusLoad`, since the cost per message dominates::
+
+        with can.LogReader("recording.blf") as reader:
+            profile = load_profile(reader, timing, interval=0.1)
+
+    :param messages:
+        The messages, sorted by their timestamps.
+    :param timing:
+        The bit timing configuration of the bus, or a mapping of the channel
+        to the bit timing configuration of the respective bus. With a
+        mapping, messages of other channels are ignored.
+    :param interval:
+        The length of the intervals in seconds.
+    :param stuffing:
+        How to count stuff bits, see :func:`frame_bit_length`.
+    :returns:
+        The load of every interval per channel. Messages without channel
+        information are grouped under ``None``.
+
+    :raises ValueError: If *interval* is not positive.
+    """
+    if interval <= 0:
+        raise ValueError(f"interval must be positive, got {interval}")
+    tables = _duration_tables(timing, stuffing)
+
+    start: Optional[float] = None
+    busy: dict[Optional[typechecking.Channel], list[float]] = {}
+    for msg in messages:
+        table = _table_of_channel(tables, msg.channel)
+        if table is None:
+            continue
+        if start is None:
+            start = msg.timestamp
+
+        index = int((msg.timestamp - start) // interval)
+        intervals = busy.get(msg.channel)
+        if intervals is None:
+            intervals = busy[msg.channel] = []
+        if index >= len(intervals):
+            intervals.extend([0.0] * (index + 1 - len(intervals)))
+        intervals[index] += table(msg)
+
+    origin = 0.0 if start is None else start
+    return {
+        channel: [
+            LoadSample(origin + index * interval, 100.0 * value / interval)
+            for index, value in enumerate(intervals)
+        ]
+        for channel, intervals in busy.items()
+    }
@@ -0,0 +1,140 @@
+"""
+Contains :class:`~can.bus_statistics.BusStatistics`, the counters that every
+:class:`~can.BusABC` maintains in :attr:`~can.BusABC.statistics`.
+"""
+
+from bisect import bisect_left
+from typing import NamedTuple, Optional
+
+#: Upper bounds in seconds of the buckets of the timing histograms, from 1 µs
+#: to about 1 s in powers of two. The last bucket counts all longer durations.
+HISTOGRAM_BOUNDS: tuple[float, ...] = tuple(
+    1e-6 * 2**exponent for exponent in range(21)
+)
+
+
+class Histogram:
+    """Counts durations in buckets bounded by :data:`HISTOGRAM_BOUNDS`."""
+
+    __slots__ = ("counts",)
+
+    def __init__(self) -> None:
+        #: Number of durations per bucket, with one more bucket than bounds
+        self.counts = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+
+    def add(self, duration: float) -> None:
+        """Count a duration in seconds."""
+        self.counts[bisect_left(HISTOGRAM_BOUNDS, duration)] += 1
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(counts={self.counts})"
+
+
+class BusStatisticsSnapshot(NamedTuple):
+    """The values of a :class:`BusStatistics` at one point in time."""
+
+    #: Number of messages returned by :meth:`~can.BusABC.recv`
+    messages_received: int
+    #: Number of received messages that were rejected by the software filters
+    messages_filtered: int
+    #: Number of exceptions raised while receiving
+    receive_errors: int
+    #: Total time in seconds spent in :meth:`~can.BusABC._recv_internal`,
+    #: including waiting for messages
+    receive_time: float
+    #: Number of successful calls of :meth:`~can.BusABC.send`
+    messages_sent: int
+    #: Number of calls of :meth:`~can.BusABC.send` that raised an exception
+    send_errors: int
+    #: Total time in seconds spent in :meth:`~can.BusABC.send`
+    send_time: float
+    #: Number of calls of :meth:`~can.BusABC._recv_internal` per duration
+    #: bucket, if enabled
+    receive_histogram: Optional[tuple[int, ...]]
+    #: Number of calls of :meth:`~can.BusABC.send` per duration bucket,
+    #: if enabled
+    send_histogram: Optional[tuple[int, ...]]
+
+
+class BusStatistics:
+    """Counters of the messages that a bus received and sent.
+
+    The counters are plain integers that are updated by
+    :meth:`~can.BusABC.recv` and :meth:`~can.BusABC.send` of every bus::
+
+        print(bus.statistics.messages_sent)
+        snapshot = bus.statistics.snapshot()
+        bus.statistics.reset()
+
+    Histograms of the durations of the individual calls are only collected
+    after calling :meth:`enable_histograms`.
+
+    .. note::
+
+        Interfaces that override :meth:`~can.BusABC.recv` instead of
+        :meth:`~can.BusABC._recv_internal` do not update the receive counters.
+    """
+
+    __slots__ = (
+        "messages_filtered",
+        "messages_received",
+        "messages_sent",
+        "receive_errors",
+        "receive_histogram",
+        "receive_time",
+        "send_errors",
+        "send_histogram",
+        "send_time",
+    )
+
+    def __init__(self) -> None:
+        #: Histogram of the durations of :meth:`~can.BusABC._recv_internal`
+        self.receive_histogram: Optional[Histogram] = None
+        #: Histogram of the durations of :meth:`~can.BusABC.send`
+        self.send_histogram: Optional[Histogram] = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Set all counters to zero and clear the histograms."""
+        self.messages_received = 0
+        self.messages_filtered = 0
+        self.receive_errors = 0
+        self.receive_time = 0.0
+        self.messages_sent = 0
+        self.send_errors = 0
+        self.send_time = 0.0
+        if self.receive_histogram is not None:
+            self.enable_histograms()
+
+    def enable_histograms(self, enable: bool = True) -> None:
+        """Start or stop collecting histograms of the call durations.
+
+        Starting discards previously collected histograms.
+        """
+        self.receive_histogram = Histogram() if enable else None
+        self.send_histogram = Histogram() if enable else None
+
+    def snapshot(self) -> BusStatisticsSnapshot:
+        """Return a copy of the current values."""
+        return BusStatisticsSnapshot(
+            messages_received=self.messages_received,
+            messages_filtered=self.messages_filtered,
+            receive_errors=self.receive_errors,
+            receive_time=self.receive_time,
+            messages_sent=self.messages_sent,
+            send_errors=self.send_errors,
+            send_time=self.send_time,
+            receive_histogram=(
+                None
+                if self.receive_histogram is None
+                else tuple(self.receive_histogram.counts)
+            ),
+            send_histogram=(
+                None
+                if self.send_histogram is None
+                else tuple(self.send_histogram.counts)
+            ),
+        )
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.snapshot()})"
@@ -0,0 +1,196 @@
+"""
+Keeps the results of :func:`can.detect_available_configs` up to date in the
+background, so that they are available without waiting for the detection.
+"""
+
+import logging
+import select
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from typing_extensions import Self
+
+from .bus import _WakeupSocket
+from .interface import detect_available_configs
+from .interfaces import BACKENDS
+from .typechecking import AutoDetectedConfig
+
+if TYPE_CHECKING:
+    from .interfaces.socketcan.utils import LinkMonitor
+
+log = logging.getLogger("can.discovery")
+
+#: Called with a configuration and whether it appeared or disappeared
+ConfigListener = Callable[[AutoDetectedConfig, bool], Any]
+
+
+class ConfigMonitor:
+    """Detects the available configurations of the interfaces in a background
+    thread and reports when they appear or disappear.
+
+    The configurations are detected once when the monitor is created, and
+    then every *refresh_interval* seconds. SocketCAN interfaces are
+    detected again as soon as the kernel reports a change of a CAN
+    interface, instead of periodically::
+
+        def on_change(config, available):
+            print("added" if available else "removed", config)
+
+        with can.ConfigMonitor(refresh_interval=5.0) as monitor:
+            print(monitor.configs)
+            monitor.add_listener(on_change)
+            ...
+
+    Listeners are called from the background thread.
+    """
+
+    def __init__(
+        self,
+        interfaces: Union[None, str, Iterable[str]] = None,
+        refresh_interval: float = 10.0,
+        timeout: float = 5.0,
+    ) -> None:
+        """
+        :param interfaces:
+            The interfaces to detect, like for :func:`can.detect_available_configs`.
+        :param refresh_interval:
+            The number of seconds between two detections of the interfaces
+            which do not report changes.
+        :param timeout:
+            The maximum number of seconds to wait for the detection of the
+            interfaces, see :func:`can.detect_available_configs`.
+        """
+        if interfaces is None:
+            interfaces = BACKENDS
+        elif isinstance(interfaces, str):
+            interfaces = (interfaces,)
+        self.interfaces = tuple(interfaces)
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+
+        self._configs: dict[str, list[AutoDetectedConfig]] = {}
+        self._listeners: list[ConfigListener] = []
+        self._lock = threading.Lock()
+        # subscribe before the first detection to not miss a change
+        self._link_monitor = self._open_link_monitor()
+        self.refresh()
+
+        self._stopped = False
+        self._wakeup = _WakeupSocket()
+        self._thread = threading.Thread(
+            target=self._run, name="can.ConfigMonitor", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def configs(self) -> list[AutoDetectedConfig]:
+        """The currently available configurations."""
+        with self._lock:
+            return [config for configs in self._configs.values() for config in configs]
+
+    def add_listener(self, listener: ConfigListener) -> None:
+        """Add a callable that is called with a configuration and ``True`` when it
+        becomes available, or ``False`` when it is no longer available."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: ConfigListener) -> None:
+        """Remove a listener that was added with :meth:`add_listener`.
+
+        :raises ValueError: If the listener was not added.
+        """
+        with self._lock:
+            self._listeners.remove(listener)
+
+    def refresh(self, interfaces: Optional[Iterable[str]] = None) -> None:
+        """Detect the configurations of the given or all interfaces now and
+        notify the listeners about the changes."""
+        interfaces = self.interfaces if interfaces is None else tuple(interfaces)
+        detected: dict[str, list[AutoDetectedConfig]] = {
+            interface: [] for interface in interfaces
+        }
+        for config in detect_available_configs(interfaces, timeout=self.timeout):
+            detected.setdefault(config["interface"], []).append(config)
+
+        changes: list[tuple[AutoDetectedConfig, bool]] = []
+        with self._lock:
+            for interface, configs in detected.items():
+                previous = self._configs.get(interface, [])
+                changes.extend(
+                    (config, False) for config in previous if config not in configs
+                )
+                changes.extend(
+                    (config, True) for config in configs if config not in previous
+                )
+                self._configs[interface] = configs
+            listeners = list(self._listeners)
+
+        for config, available in changes:
+            for listener in listeners:
+                try:
+                    listener(config, available)
+                except Exception:  # pylint: disable=broad-except
+                    log.exception("Listener %r failed", listener)
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stopped = True
+        self._wakeup.set()
+        self._thread.join()
+        self._wakeup.close()
+        if self._link_monitor is not None:
+            self._link_monitor.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.stop()
+
+    def _open_link_monitor(self) -> Optional["LinkMonitor"]:
+        if "socketcan" not in self.interfaces or sys.platform != "linux":
+            return None
+        # pylint: disable=import-outside-toplevel
+        from .interfaces.socketcan.utils import LinkMonitor  # noqa: PLC0415
+
+        try:
+            return LinkMonitor()
+        except OSError as error:
+            log.debug("Detecting SocketCAN interfaces periodically: %s", error)
+            return None
+
+    def _run(self) -> None:
+        polled = self.interfaces
+        readers: list[Any] = [self._wakeup]
+        if self._link_monitor is not None:
+            polled = tuple(i for i in self.interfaces if i != "socketcan")
+            readers.append(self._link_monitor)
+
+        next_refresh = time.monotonic() + self.refresh_interval
+        while not self._stopped:
+            timeout = max(0.0, next_refresh - time.monotonic())
+            readable, _, _ = select.select(readers, [], [], timeout)
+            if self._stopped:
+                break
+            try:
+                link_monitor = self._link_monitor
+                if (
+                    link_monitor is not None
+                    and link_monitor in readable
+                    and link_monitor.read()
+                ):
+                    self.refresh(("socketcan",))
+                if time.monotonic() >= next_refresh:
+                    next_refresh = time.monotonic() + self.refresh_interval
+                    self.refresh(polled)
+            except Exception:  # pylint: disable=broad-except
+                log.exception("Failed to detect the available configurations")
@@ -15,9 +15,14 @@ For example, validating typical arguments and parameters might result in a
 :class:`ValueError`. This should always be documented for the function at hand.
 """
 
+import errno
 from collections.abc import Generator
 from contextlib import contextmanager
-from typing import Optional
+from typing import Final, Optional
+
+#: Error codes of :class:`CanOperationError` which indicate a full transmit
+#: queue. Sending may succeed when it is retried later.
+BACKPRESSURE_ERROR_CODES: Final = frozenset({errno.ENOBUFS, errno.EAGAIN})
 
 
 class CanError(Exception):
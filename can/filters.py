@@ -0,0 +1,185 @@
+"""
+Compiles the filters of :meth:`can.BusABC.set_filters` into a single
+predicate function, so that checking a message costs about as much as a
+hand written condition.
+
+The predicate first looks up the arbitration ID in the sets of the filters
+that match exact IDs, and then checks the remaining filters in order. The
+attributes of the message are read once, and identical conditions of
+several filters are only checked once.
+"""
+
+import re
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, Optional
+
+from . import typechecking
+from .message import Message
+
+#: A function returning whether a message matches the filters
+FilterPredicate = Callable[[Message], bool]
+
+#: The keys of filters that only depend on the arbitration ID and its type
+ID_FILTER_KEYS = frozenset(("can_id", "can_mask", "extended"))
+
+# masks of filters whose IDs are looked up in a set
+_BUCKET_MASKS = (0x1FFFFFFF, 0x7FF)
+
+# the flags of the filters and the attributes of the messages they check
+_FLAGS = (
+    ("extended", "is_extended_id"),
+    ("fd", "is_fd"),
+    ("remote", "is_remote_frame"),
+    ("error", "is_error_frame"),
+)
+
+_ATTRIBUTES = (
+    "arbitration_id",
+    "is_extended_id",
+    "is_fd",
+    "is_remote_frame",
+    "is_error_frame",
+    "dlc",
+    "data",
+)
+
+
+def _match_all(msg: Message) -> bool:  # pylint: disable=unused-argument
+    return True
+
+
+def _conditions(can_filter: typechecking.CanFilter) -> list[str]:
+    """Return the conditions of a filter, except the one of the ID mask."""
+    conditions = []
+    for key, attribute in _FLAGS:
+        if key in can_filter:
+            conditions.append(attribute if can_filter.get(key) else f"not {attribute}")
+
+    ranges = (
+        ("arbitration_id", can_filter.get("min_id"), can_filter.get("max_id")),
+        ("dlc", can_filter.get("min_dlc"), can_filter.get("max_dlc")),
+    )
+    for attribute, lower, upper in ranges:
+        if lower is not None and upper is not None:
+            conditions.append(f"{int(lower):#x} <= {attribute} <= {int(upper):#x}")
+        elif lower is not None:
+            conditions.append(f"{attribute} >= {int(lower):#x}")
+        elif upper is not None:
+            conditions.append(f"{attribute} <= {int(upper):#x}")
+
+    terms = can_filter.get("data") or ()
+    if terms:
+        offsets = [int(term["offset"]) for term in terms]
+        if min(offsets) < 0:
+            raise ValueError(f"Negative payload offset in {can_filter}")
+        # a single length check covers all terms
+        conditions.append(f"length > {max(offsets):#x}")
+    for term in terms:
+        offset, value = int(term["offset"]), int(term["value"])
+        mask = int(term.get("mask", 0xFF))
+        if mask == 0xFF:
+            conditions.append(f"data[{offset:#x}] == {value:#x}")
+        else:
+            conditions.append(f"data[{offset:#x}] & {mask:#x} == {value & mask:#x}")
+    return conditions
+
+
+def _generate(
+    can_filters: typechecking.CanFilters,
+) -> Optional[tuple[str, dict[str, Any]]]:
+    """Return the source of the predicate and its globals, or ``None`` if
+    it matches every message."""
+    buckets: dict[tuple[int, str], set[int]] = {}
+    checks: dict[str, None] = {}
+    for can_filter in can_filters:
+        conditions = _conditions(can_filter)
+        can_id = int(can_filter["can_id"])
+        can_mask = int(can_filter["can_mask"])
+        if can_mask in _BUCKET_MASKS:
+            bucket = buckets.setdefault((can_mask, " and ".join(conditions)), set())
+            bucket.add(can_id & can_mask)
+            continue
+        if can_mask:
+            conditions.insert(0, f"not (arbitration_id ^ {can_id:#x}) & {can_mask:#x}")
+        if not conditions:
+            return None
+        # identical filters are only checked once
+        checks[" and ".join(conditions)] = None
+
+    namespace: dict[str, Any] = {}
+    body = []
+    for index, ((can_mask, bucket_conditions), ids) in enumerate(buckets.items()):
+        namespace[f"_ids_{index}"] = frozenset(ids)
+        check = f"id_{can_mask:x} in _ids_{index}"
+        if bucket_conditions:
+            check += f" and {bucket_conditions}"
+        body += [f"    if {check}:", "        return True"]
+    for check in checks:
+        body += [f"    if {check}:", "        return True"]
+    body.append("    return False")
+    code = "\n".join(body)
+
+    # read every attribute and compute every masked ID only once
+    masked_ids = [mask for mask in _BUCKET_MASKS if f"id_{mask:x} " in code]
+    needed = set(re.findall(r"\b\w+\b", code))
+    if masked_ids:
+        needed.add("arbitration_id")
+    if "length" in needed:
+        needed.add("data")
+    header = ["def _predicate(msg):"]
+    header += [f"    {name} = msg.{name}" for name in _ATTRIBUTES if name in needed]
+    if "length" in needed:
+        header.append("    length = len(data)")
+    header += [f"    id_{mask:x} = arbitration_id & {mask:#x}" for mask in masked_ids]
+    return "\n".join((*header, code)), namespace
+
+
+def compile_predicate(
+    can_filters: Optional[typechecking.CanFilters],
+) -> FilterPredicate:
+    """Compile filters into a function that returns whether a message matches
+    at least one of them.
+
+    :param can_filters:
+        The filters, see :meth:`can.BusABC.set_filters`. ``None`` or an
+        empty sequence matches every message.
+    :raises ValueError: If a filter is invalid.
+    """
+    if not can_filters:
+        return _match_all
+    try:
+        generated = _generate(can_filters)
+    except (KeyError, TypeError) as error:
+        raise ValueError(f"Invalid filters {can_filters}: {error!r}") from error
+    if generated is None:
+        return _match_all
+
+    source, namespace = generated
+    code = compile(source, "<can filters>", "exec")
+    exec(code, namespace)  # pylint: disable=exec-used
+    predicate: FilterPredicate = namespace["_predicate"]
+    return predicate
+
+
+def matches_only_ids(can_filters: Optional[typechecking.CanFilters]) -> bool:
+    """Return whether the filters only check the arbitration ID and its type,
+    so that their result can be reused for all messages of an ID."""
+    return all(
+        key in ID_FILTER_KEYS for can_filter in can_filters or () for key in can_filter
+    )
+
+
+def filter_messages(
+    messages: Iterable[Message], can_filters: Optional[typechecking.CanFilters]
+) -> Iterator[Message]:
+    """Yield the messages that match the filters, for example of a log file::
+
+        with can.LogReader("logfile.asc") as reader:
+            for msg in can.filters.filter_messages(reader, filters):
+                print(msg)
+
+    :param messages: The messages to filter.
+    :param can_filters: The filters, see :meth:`can.BusABC.set_filters`.
+    :raises ValueError: If a filter is invalid.
+    """
+    return filter(compile_predicate(can_filters), messages)
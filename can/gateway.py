@@ -0,0 +1,491 @@
+"""
+Contains :class:`~can.Gateway`, which forwards messages between several
+buses according to routing rules.
+"""
+
+import contextlib
+import importlib
+import json
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable, Mapping
+from copy import copy
+from types import TracebackType
+from typing import Any, Callable, NamedTuple, Optional, Union, cast
+
+from typing_extensions import Self
+
+from can import typechecking
+from can.bus import BusABC
+from can.bus_statistics import Histogram
+from can.filters import compile_predicate, matches_only_ids
+from can.message import Message
+
+logger = logging.getLogger(__name__)
+
+#: The time in seconds after which the receiving threads check whether they
+#: should stop, if the bus does not support :meth:`~can.BusABC.interrupt`
+_POLL_INTERVAL = 0.1
+
+#: The maximum number of identifiers per source bus whose matching routes
+#: are remembered
+_CACHE_SIZE = 65536
+
+
+class Route(NamedTuple):
+    """A routing rule of a :class:`Gateway`.
+
+    The messages received on the *source* bus that match the *can_filters*
+    are sent on all *target* buses, after rewriting the arbitration ID and
+    applying the *transform*.
+    """
+
+    #: The name of the receiving bus
+    source: str
+    #: The names of the sending buses
+    targets: tuple[str, ...]
+    #: Only forward matching messages, see :meth:`~can.BusABC.set_filters`
+    can_filters: Optional[typechecking.CanFilters] = None
+    #: Replace the arbitration ID of the forwarded messages
+    arbitration_id: Optional[int] = None
+    #: Called with a copy of every forwarded message, which it may modify.
+    #: It returns the message to send or ``None`` to skip it.
+    transform: Optional[Callable[[Message], Optional[Message]]] = None
+
+
+class RouteStatistics(NamedTuple):
+    """The counters of a :class:`Route`."""
+
+    #: Number of messages sent on a target bus
+    forwarded: int
+    #: Number of messages not sent because a queue was full, sending failed
+    #: or the transform raised an exception
+    dropped: int
+    #: Total time in seconds from receiving to sending the forwarded messages
+    latency_total: float
+    #: The longest time in seconds from receiving to sending a message
+    latency_max: float
+    #: Number of forwarded messages per latency bucket, see
+    #: :data:`~can.bus_statistics.HISTOGRAM_BOUNDS`
+    latency_histogram: tuple[int, ...]
+
+    @property
+    def latency_mean(self) -> float:
+        """The mean time in seconds from receiving to sending a message."""
+        return self.latency_total / self.forwarded if self.forwarded else 0.0
+
+
+class _CompiledRoute:
+    __slots__ = (
+        "by_id",
+        "dropped",
+        "forwarded",
+        "latency_histogram",
+        "latency_max",
+        "latency_total",
+        "lock",
+        "predicate",
+        "route",
+        "senders",
+    )
+
+    def __init__(self, route: Route, senders: list["_Sender"]) -> None:
+        self.route = route
+        self.senders = senders
+        # routes whose filters check more than the ID match per message
+        self.by_id = matches_only_ids(route.can_filters)
+        self.predicate = compile_predicate(route.can_filters)
+        self.lock = threading.Lock()
+        self.forwarded = 0
+        self.dropped = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.latency_histogram = Histogram()
+
+    def matches(self, arbitration_id: int, is_extended_id: bool) -> bool:
+        if self.route.can_filters is None:
+            return True
+        for can_filter in self.route.can_filters:
+            if "extended" in can_filter and can_filter["extended"] != is_extended_id:
+                continue
+            if (can_filter["can_id"] ^ arbitration_id) & can_filter["can_mask"] == 0:
+                return True
+        return False
+
+    def apply(self, msg: Message) -> Optional[Message]:
+        route = self.route
+        if route.arbitration_id is None and route.transform is None:
+            return msg
+        msg = copy(msg)
+        if route.arbitration_id is not None:
+            msg.arbitration_id = route.arbitration_id
+            msg.is_extended_id = msg.is_extended_id or route.arbitration_id > 0x7FF
+        if route.transform is not None:
+            try:
+                return route.transform(msg)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.warning("The transform of %s failed: %s", route, exc)
+                self.add_dropped(1)
+                return None
+        return msg
+
+    def add_dropped(self, count: int) -> None:
+        with self.lock:
+            self.dropped += count
+
+    def add_forwarded(self, latency: float) -> None:
+        with self.lock:
+            self.forwarded += 1
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+            self.latency_histogram.add(latency)
+
+    def snapshot(self) -> RouteStatistics:
+        with self.lock:
+            return RouteStatistics(
+                forwarded=self.forwarded,
+                dropped=self.dropped,
+                latency_total=self.latency_total,
+                latency_max=self.latency_max,
+                latency_histogram=tuple(self.latency_histogram.counts),
+            )
+
+
+_Item = tuple[_CompiledRoute, Message, float]
+
+
+class _Sender:
+    """Sends the messages for one target bus in its own thread."""
+
+    def __init__(
+        self,
+        name: str,
+        bus: BusABC,
+        queue_size: int,
+        batch_size: int,
+        timeout: Optional[float],
+    ) -> None:
+        self.bus = bus
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.condition = threading.Condition()
+        self.queue: deque[_Item] = deque()
+        self.stopped = False
+        self.thread = threading.Thread(
+            target=self.run, name=f'Gateway sender for bus "{name}"', daemon=True
+        )
+
+    def put(self, items: list[_Item]) -> None:
+        with self.condition:
+            free = self.queue_size - len(self.queue)
+            self.queue.extend(items[:free])
+            self.condition.notify()
+        for compiled, _, _ in items[free:]:
+            compiled.add_dropped(1)
+
+    def stop(self) -> None:
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+
+    def run(self) -> None:
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.queue or self.stopped)
+                if not self.queue:
+                    return
+                batch = [
+                    self.queue.popleft()
+                    for _ in range(min(len(self.queue), self.batch_size))
+                ]
+            for compiled, msg, received in batch:
+                try:
+                    self.bus.send(msg, self.timeout)
+                except Exception as exc:  # pylint: disable=broad-except
+                    logger.debug("Failed to forward %s: %s", msg, exc)
+                    compiled.add_dropped(1)
+                else:
+                    compiled.add_forwarded(time.perf_counter() - received)
+
+
+class Gateway:
+    """
+    Forwards messages between buses according to a list of :class:`Route`.
+
+    ::
+
+        with (
+            can.Bus(interface="socketcan", channel="can0") as powertrain,
+            can.Bus(interface="socketcan", channel="can1") as body,
+            can.Bus(interface="pcan") as diagnostics,
+        ):
+            routes = [
+                can.Route("powertrain", ("body", "diagnostics"),
+                          can_filters=[{"can_id": 0x100, "can_mask": 0x700}]),
+                can.Route("body", ("powertrain",), arbitration_id=0x123),
+            ]
+            buses = {"powertrain": powertrain, "body": body, "diagnostics": diagnostics}
+            with can.Gateway(buses, routes) as gateway:
+                ...
+                for route, statistics in gateway.statistics():
+                    print(route.source, statistics.forwarded, statistics.latency_mean)
+
+    Every source bus is read by its own thread in batches. The matching
+    routes are looked up by arbitration ID in a dictionary, which is filled
+    on the first message of every ID, so the filters are only evaluated
+    once per ID. Filters that also check the payload, the DLC or the flags
+    of the messages are evaluated for every message by a predicate compiled
+    by :func:`can.filters.compile_predicate`. Every target bus has its own queue and its own sending
+    thread, so a slow bus does not delay the others. If a queue is full,
+    further messages for that bus are dropped and counted.
+
+    A route never sends a message back to its source bus, and messages
+    that were sent on a bus and received back, i.e. whose
+    :attr:`~can.Message.is_rx` is ``False``, are not forwarded again, to
+    prevent loops.
+
+    The buses are not shut down by the gateway.
+    """
+
+    def __init__(
+        self,
+        buses: Mapping[str, BusABC],
+        routes: Iterable[Route],
+        queue_size: int = 10_000,
+        batch_size: int = 64,
+        send_timeout: Optional[float] = None,
+    ) -> None:
+        """
+        :param buses:
+            The buses by name.
+        :param routes:
+            The routing rules. A message matching several routes is
+            forwarded by each of them.
+        :param queue_size:
+            The maximum number of messages waiting to be sent per target bus.
+        :param batch_size:
+            The maximum number of messages received or sent at once.
+        :param send_timeout:
+            The timeout passed to :meth:`~can.BusABC.send`.
+
+        :raises ValueError:
+            If a route refers to an unknown bus, targets its source bus or
+            has invalid filters.
+        """
+        self.buses = dict(buses)
+        self.batch_size = batch_size
+        #: The exception that stopped receiving from a bus, if any
+        self.exception: Optional[Exception] = None
+
+        self._senders: dict[str, _Sender] = {}
+        self._routes: list[_CompiledRoute] = []
+        routes_by_source: dict[str, list[_CompiledRoute]] = {}
+        for route in routes:
+            for name in (route.source, *route.targets):
+                if name not in self.buses:
+                    raise ValueError(f"Unknown bus {name!r} in {route}")
+            if route.source in route.targets:
+                raise ValueError(f"{route} sends back to its source")
+            senders = []
+            for target in route.targets:
+                if target not in self._senders:
+                    self._senders[target] = _Sender(
+                        target, self.buses[target], queue_size, batch_size, send_timeout
+                    )
+                senders.append(self._senders[target])
+            compiled = _CompiledRoute(route, senders)
+            self._routes.append(compiled)
+            routes_by_source.setdefault(route.source, []).append(compiled)
+
+        self._stopped = False
+        for sender in self._senders.values():
+            sender.thread.start()
+        self._receivers = [
+            (
+                self.buses[source],
+                threading.Thread(
+                    target=self._rx_worker,
+                    args=(self.buses[source], source_routes),
+                    name=f'Gateway receiver for bus "{source}"',
+                    daemon=True,
+                ),
+            )
+            for source, source_routes in routes_by_source.items()
+        ]
+        for _, thread in self._receivers:
+            thread.start()
+
+    @property
+    def routes(self) -> list[Route]:
+        """The routing rules."""
+        return [compiled.route for compiled in self._routes]
+
+    def statistics(self) -> list[tuple[Route, RouteStatistics]]:
+        """Return the routes together with their counters."""
+        return [(compiled.route, compiled.snapshot()) for compiled in self._routes]
+
+    def stop(self) -> None:
+        """Stop receiving and wait until the queued messages were sent."""
+        if self._stopped:
+            return
+        self._stopped = True
+        interrupted = []
+        for bus, _ in self._receivers:
+            with contextlib.suppress(NotImplementedError):
+                bus.interrupt()
+                interrupted.append(bus)
+        for bus, thread in self._receivers:
+            thread.join()
+            if bus in interrupted and not thread.is_alive():
+                # the thread may have been busy with a message instead of
+                # waiting, and the buses stay in use by the caller
+                bus._clear_interrupt()  # pylint: disable=protected-access
+        for sender in self._senders.values():
+            sender.stop()
+            sender.thread.join()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.stop()
+
+    def _rx_worker(self, bus: BusABC, routes: list[_CompiledRoute]) -> None:
+        # the matching routes by arbitration ID and IDE bit
+        lookup: dict[tuple[int, bool], tuple[_CompiledRoute, ...]] = {}
+        while not self._stopped:
+            try:
+                msg = bus.recv(_POLL_INTERVAL)
+                if msg is None:
+                    continue
+                batch = [msg]
+                while len(batch) < self.batch_size:
+                    msg = bus.recv(0)
+                    if msg is None:
+                        break
+                    batch.append(msg)
+            except Exception as exc:  # pylint: disable=broad-except
+                if not self._stopped:
+                    logger.warning("Stopped receiving from %s: %s", bus, exc)
+                    self.exception = exc
+                return
+
+            received = time.perf_counter()
+            pending: dict[_Sender, list[_Item]] = {}
+            for msg in batch:
+                if not msg.is_rx:
+                    # sent on this bus, maybe by this gateway
+                    continue
+                key = (msg.arbitration_id, msg.is_extended_id)
+                matching = lookup.get(key)
+                if matching is None:
+                    matching = tuple(
+                        compiled
+                        for compiled in routes
+                        if not compiled.by_id or compiled.matches(*key)
+                    )
+                    if len(lookup) < _CACHE_SIZE:
+                        lookup[key] = matching
+                for compiled in matching:
+                    if not compiled.by_id and not compiled.predicate(msg):
+                        continue
+                    forwarded = compiled.apply(msg)
+                    if forwarded is None:
+                        continue
+                    for sender in compiled.senders:
+                        pending.setdefault(sender, []).append(
+                            (compiled, forwarded, received)
+                        )
+            for sender, items in pending.items():
+                sender.put(items)
+
+
+def load_routes(
+    path: typechecking.StringPathLike,
+) -> tuple[dict[str, dict[str, Any]], list[Route]]:
+    """Read the buses and routes of a :class:`Gateway` from a JSON file.
+
+    The file contains the keyword arguments of :func:`can.Bus` for every bus
+    and the list of routes. Numbers may also be given as strings like
+    ``"0x7FF"``, and a transform as ``"module:function"``::
+
+        {
+            "buses": {
+                "powertrain": {"interface": "socketcan", "channel": "can0"},
+                "body": {"interface": "socketcan", "channel": "can1"}
+            },
+            "routes": [
+                {
+                    "source": "powertrain",
+                    "targets": ["body"],
+                    "can_filters": [{"can_id": "0x100", "can_mask": "0x700"}],
+                    "arbitration_id": "0x200",
+                    "transform": "my_package.transforms:scale_speed"
+                },
+                {"source": "body", "targets": ["powertrain"]}
+            ]
+        }
+
+    :return: The keyword arguments of the buses by name and the routes.
+    :raises ValueError: If the file is invalid.
+    """
+    with open(path, encoding="utf-8") as file:
+        config = json.load(file)
+    try:
+        buses = {str(name): dict(kwargs) for name, kwargs in config["buses"].items()}
+        routes = [_parse_route(entry) for entry in config["routes"]]
+    except (KeyError, TypeError, AttributeError, ImportError) as error:
+        raise ValueError(f"Invalid routing file {path}: {error!r}") from error
+    return buses, routes
+
+
+def _parse_int(value: Union[int, str]) -> int:
+    return value if isinstance(value, int) else int(value, 0)
+
+
+def _parse_filter(raw_filter: dict[str, Any]) -> typechecking.CanFilter:
+    can_filter: dict[str, Any] = {
+        "can_id": _parse_int(raw_filter["can_id"]),
+        "can_mask": _parse_int(raw_filter["can_mask"]),
+    }
+    for key in ("min_id", "max_id", "min_dlc", "max_dlc"):
+        if key in raw_filter:
+            can_filter[key] = _parse_int(raw_filter[key])
+    for key in ("extended", "fd", "remote", "error"):
+        if key in raw_filter:
+            can_filter[key] = bool(raw_filter[key])
+    if "data" in raw_filter:
+        can_filter["data"] = [
+            {key: _parse_int(value) for key, value in term.items()}
+            for term in raw_filter["data"]
+        ]
+    return cast("typechecking.CanFilter", can_filter)
+
+
+def _parse_route(entry: dict[str, Any]) -> Route:
+    can_filters: Optional[list[typechecking.CanFilter]] = None
+    if entry.get("can_filters"):
+        can_filters = [_parse_filter(raw_filter) for raw_filter in entry["can_filters"]]
+
+    transform = None
+    if entry.get("transform"):
+        module_name, _, function_name = entry["transform"].partition(":")
+        transform = getattr(importlib.import_module(module_name), function_name)
+
+    arbitration_id = entry.get("arbitration_id")
+    targets = entry["targets"]
+    return Route(
+        source=entry["source"],
+        targets=(targets,) if isinstance(targets, str) else tuple(targets),
+        can_filters=can_filters,
+        arbitration_id=None if arbitration_id is None else _parse_int(arbitration_id),
+        transform=transform,
+    )
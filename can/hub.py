@@ -0,0 +1,68 @@
+"""
+Shares a CAN bus with other processes.
+
+The bus is opened once, and any number of processes can use it with the
+``hub`` interface.
+"""
+
+import argparse
+import errno
+import sys
+from datetime import datetime
+from typing import Final
+
+from can.cli import add_bus_arguments, create_bus_from_namespace
+from can.interfaces.hub import HubServer
+from can.interfaces.hub.protocol import DEFAULT_PATH
+
+HUB_DESCRIPTION: Final = """\
+Share a CAN bus with other processes.
+
+Other processes connect with the "hub" interface and the path of the socket
+as channel, e.g. can.Bus(interface="hub", channel="/tmp/python-can-hub.sock").
+"""
+
+
+def _parse_hub_args(args: list[str]) -> argparse.Namespace:
+    """Parse command line arguments for hub script."""
+
+    parser = argparse.ArgumentParser(description=HUB_DESCRIPTION)
+    parser.add_argument(
+        "--path",
+        default=DEFAULT_PATH,
+        help=f"The path of the Unix domain socket to listen on (default: {DEFAULT_PATH}).",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=10_000,
+        help="The number of messages queued for every client before the oldest "
+        "are discarded (default: 10000).",
+    )
+    add_bus_arguments(parser)
+
+    # print help message when no arguments were given
+    if not args:
+        parser.print_help(sys.stderr)
+        raise SystemExit(errno.EINVAL)
+
+    results, _unknown_args = parser.parse_known_args(args)
+    return results
+
+
+def main() -> None:
+    results = _parse_hub_args(sys.argv[1:])
+
+    bus = create_bus_from_namespace(results)
+    with HubServer(bus, results.path, rx_queue_size=results.queue_size) as hub:
+        print(f"CAN Hub on {hub.path} (Started on {datetime.now()})")
+        try:
+            hub.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+    print(f"CAN Hub (Stopped on {datetime.now()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,8 @@ CyclicSendTasks.
 import concurrent.futures.thread
 import importlib
 import logging
+import threading
+import time
 from collections.abc import Callable, Iterable, Sequence
 from typing import Any, Optional, Union, cast
 
@@ -19,6 +21,11 @@ from .typechecking import AutoDetectedConfig, Channel
 log = logging.getLogger("can.interface")
 log_autodetect = log.getChild("detect_available_configs")
 
+# the last results of detect_available_configs() with their time of detection,
+# by interface
+_detected_configs: dict[str, tuple[float, list[AutoDetectedConfig]]] = {}
+_detected_configs_lock = threading.Lock()
+
 
 def _get_class_for_interface(interface: str) -> type[BusABC]:
     """
@@ -57,6 +64,16 @@ def _get_class_for_interface(interface: str) -> type[BusABC]:
     return cast("type[BusABC]", bus_class)
 
 
+def _store_detected_configs(
+    interface: str, configs: Sequence[AutoDetectedConfig]
+) -> None:
+    with _detected_configs_lock:
+        _detected_configs[interface] = (
+            time.monotonic(),
+            [cast("AutoDetectedConfig", dict(c)) for c in configs],
+        )
+
+
 @util.deprecated_args_alias(
     deprecation_start="4.2.0",
     deprecation_end="5.0.0",
@@ -142,6 +159,7 @@ def Bus(  # noqa: N802
 def detect_available_configs(
     interfaces: Union[None, str, Iterable[str]] = None,
     timeout: float = 5.0,
+    max_age: Optional[float] = None,
 ) -> Sequence[AutoDetectedConfig]:
     """Detect all configurations/channels that the interfaces could
     currently connect with.
@@ -161,6 +179,10 @@ def detect_available_configs(
         detection tasks to complete. If exceeded, any pending tasks
         will be cancelled, a warning will be logged, and the method
         will return results gathered so far.
+    :param max_age: reuse the configurations of an interface that were
+        detected at most this many seconds ago, instead of detecting them
+        again. By default, all interfaces are detected again.
+        See :class:`can.ConfigMonitor` to keep them up to date in the background.
     :rtype: list[dict]
     :return: an iterable of dicts, each suitable for usage in
              the constructor of :class:`can.BusABC`. Interfaces that
@@ -174,9 +196,17 @@ def detect_available_configs(
         interfaces = (interfaces,)
     # otherwise assume iterable of strings
 
+    result: list[AutoDetectedConfig] = []
+
     # Collect detection callbacks
     callbacks: dict[str, Callable[[], Sequence[AutoDetectedConfig]]] = {}
     for interface_keyword in interfaces:
+        if max_age is not None:
+            with _detected_configs_lock:
+                entry = _detected_configs.get(interface_keyword)
+            if entry is not None and time.monotonic() - entry[0] <= max_age:
+                result.extend(cast("AutoDetectedConfig", dict(c)) for c in entry[1])
+                continue
         try:
             bus_class = _get_class_for_interface(interface_keyword)
             callbacks[interface_keyword] = (
@@ -187,8 +217,7 @@ def detect_available_configs(
                 'interface "%s" cannot be loaded for detection of available configurations',
                 interface_keyword,
             )
-
-    result: list[AutoDetectedConfig] = []
+            _store_detected_configs(interface_keyword, [])
 
     # Use manual executor to allow shutdown without waiting
     executor = concurrent.futures.ThreadPoolExecutor()
@@ -218,6 +247,7 @@ def detect_available_configs(
                     'interface "%s" does not support detection of available configurations',
                     keyword,
                 )
+                available = []
             else:
                 log_autodetect.debug(
                     'interface "%s" detected %i available configurations',
@@ -227,6 +257,7 @@ def detect_available_configs(
                 for config in available:
                     config.setdefault("interface", keyword)
                 result.extend(available)
+            _store_detected_configs(keyword, available)
     finally:
         # shutdown immediately, do not wait for pending threads
         executor.shutdown(wait=False, cancel_futures=True)
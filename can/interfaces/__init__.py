@@ -11,6 +11,7 @@ __all__ = [
     "cantact",
     "etas",
     "gs_usb",
+    "hub",
     "ics_neovi",
     "iscan",
     "ixxat",
@@ -57,6 +58,7 @@ BACKENDS: dict[str, tuple[str, str]] = {
     "neousys": ("can.interfaces.neousys", "NeousysBus"),
     "etas": ("can.interfaces.etas", "EtasBus"),
     "socketcand": ("can.interfaces.socketcand", "SocketCanDaemonBus"),
+    "hub": ("can.interfaces.hub", "HubBus"),
 }
 
 
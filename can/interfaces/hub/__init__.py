@@ -0,0 +1,12 @@
+"""Shares a bus between processes through a local hub."""
+
+__all__ = [
+    "HubBus",
+    "HubServer",
+    "bus",
+    "protocol",
+    "server",
+]
+
+from .bus import HubBus
+from .server import HubServer
@@ -0,0 +1,241 @@
+"""
+Contains :class:`HubBus`, the client of a :class:`~can.interfaces.hub.HubServer`.
+"""
+
+import contextlib
+import logging
+import socket
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Optional
+
+from can import typechecking
+from can.bus import BusABC, _WakeupSocket
+from can.exceptions import (
+    CanInitializationError,
+    CanInterfaceNotImplementedError,
+    CanOperationError,
+)
+from can.message import Message
+
+from . import protocol
+from .protocol import PacketType
+
+logger = logging.getLogger(__name__)
+
+
+class HubBus(BusABC):
+    """
+    A client of a :class:`~can.interfaces.hub.HubServer`, which shares one bus
+    between several processes.
+
+    Connecting only takes a few milliseconds, since the hub has already
+    opened the bus. The filters are sent to the hub, which only passes the
+    matching messages. :meth:`send` and :meth:`set_filters` return after the
+    hub has applied them.
+    """
+
+    def __init__(
+        self,
+        channel: str = protocol.DEFAULT_PATH,
+        can_filters: Optional[typechecking.CanFilters] = None,
+        connect_timeout: float = 1.0,
+        **kwargs: Any,
+    ) -> None:
+        """
+        :param channel:
+            The path of the Unix domain socket of the hub.
+        :param can_filters:
+            See :meth:`~can.BusABC.set_filters`.
+        :param connect_timeout:
+            The maximum time in seconds to wait for the hub.
+
+        :raises ~can.exceptions.CanInitializationError:
+            If the hub can not be reached.
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            raise CanInterfaceNotImplementedError(
+                "The hub requires Unix domain sockets"
+            )
+
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._inbuf = bytearray()
+        try:
+            self._sock.settimeout(connect_timeout)
+            self._sock.connect(channel)
+            packet_type, payload = self._read_packet()
+            if packet_type is not PacketType.INFO:
+                raise CanInitializationError(f"Unexpected packet {packet_type.name}")
+            self._can_protocol, hub_channel_info = protocol.unpack_info(payload)
+            self._sock.settimeout(None)
+        except OSError as error:
+            self._sock.close()
+            raise CanInitializationError(
+                f"Could not connect to the hub at {channel}: {error}"
+            ) from error
+        except Exception:
+            self._sock.close()
+            raise
+
+        self.channel = channel
+        self.channel_info = f"{hub_channel_info} via hub {channel}"
+
+        self._send_lock = threading.Lock()
+        self._acks: deque[Future[None]] = deque()
+        self._rx_condition = threading.Condition()
+        self._rx_queue: deque[Message] = deque()
+        self._rx_ready = _WakeupSocket()
+        self._rx_signalled = False
+        self._rx_stopped = False
+        self._disconnected = False
+        #: The error reported by the hub, which stopped receiving
+        self.exception: Optional[Exception] = None
+        self._rx_thread = threading.Thread(
+            target=self._rx_worker,
+            name=f'{self.__class__.__qualname__} for hub "{channel}"',
+            daemon=True,
+        )
+        self._rx_thread.start()
+
+        super().__init__(channel, can_filters=can_filters, **kwargs)
+
+    def _recv_internal(
+        self, timeout: Optional[float]
+    ) -> tuple[Optional[Message], bool]:
+        with self._rx_condition:
+            if not self._rx_condition.wait_for(
+                lambda: self._rx_queue or self._rx_stopped or self._interrupt_pending,
+                timeout,
+            ):
+                return None, False
+            if self._rx_queue:
+                msg = self._rx_queue.popleft()
+                if not self._rx_queue and self._rx_signalled:
+                    self._rx_ready.clear()
+                    self._rx_signalled = False
+                # messages received before the hub applied new filters
+                # are filtered again
+                return msg, False
+            if self._interrupt_pending:
+                return None, False
+            if self.exception is not None:
+                raise CanOperationError(
+                    f"Receiving failed: {self.exception}"
+                ) from self.exception
+            raise CanOperationError("The connection to the hub was closed")
+
+    def _wake_up(self) -> None:
+        with self._rx_condition:
+            self._rx_condition.notify_all()
+
+    def send(self, msg: Message, timeout: Optional[float] = None) -> None:
+        """Send a message with the bus of the hub.
+
+        :param timeout:
+            Passed to :meth:`~can.BusABC.send` of the bus of the hub.
+
+        :raises ~can.exceptions.CanOperationError:
+            If the hub could not send the message.
+        """
+        self._request(PacketType.SEND, protocol.pack_send([msg], timeout))
+
+    def fileno(self) -> int:
+        """Return a file descriptor that is readable while received messages
+        are available."""
+        return self._rx_ready.fileno()
+
+    def _apply_filters(self, filters: Optional[typechecking.CanFilters]) -> None:
+        # the hub only passes matching messages after acknowledging them
+        self._request(PacketType.FILTERS, protocol.pack_filters(filters))
+
+    def shutdown(self) -> None:
+        """Disconnect from the hub. The bus of the hub stays open."""
+        super().shutdown()
+        with contextlib.suppress(OSError):
+            self._sock.shutdown(socket.SHUT_RDWR)
+        if self._rx_thread is not threading.current_thread():
+            self._rx_thread.join()
+        self._sock.close()
+        self._rx_ready.close()
+
+    def _request(self, packet_type: PacketType, payload: bytes) -> None:
+        future: Future[None] = Future()
+        packet = protocol.pack(packet_type, payload)
+        with self._send_lock:
+            if self._disconnected:
+                raise CanOperationError("The connection to the hub was closed")
+            # the hub acknowledges the packets in order
+            self._acks.append(future)
+            try:
+                self._sock.sendall(packet)
+            except OSError as error:
+                self._acks.pop()
+                raise CanOperationError(
+                    f"Failed to send to the hub: {error.strerror}", error.errno
+                ) from error
+        future.result()
+
+    def _read_packet(self) -> tuple[PacketType, bytes]:
+        # blocking read of a single packet, while connecting
+        while True:
+            packets = protocol.unpack(self._inbuf)
+            if packets:
+                return packets[0]
+            data = self._sock.recv(4096)
+            if not data:
+                raise ConnectionResetError("The hub closed the connection")
+            self._inbuf += data
+
+    def _rx_worker(self) -> None:
+        try:
+            while True:
+                data = self._sock.recv(65536)
+                if not data:
+                    break
+                self._inbuf += data
+                for packet_type, payload in protocol.unpack(self._inbuf):
+                    self._handle(packet_type, payload)
+        except OSError as error:
+            logger.debug("Connection to the hub failed: %s", error)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("Invalid data from the hub: %s", exc)
+            self.exception = exc
+        finally:
+            with self._send_lock:
+                self._disconnected = True
+                while self._acks:
+                    self._acks.popleft().set_exception(
+                        CanOperationError("The connection to the hub was closed")
+                    )
+            with self._rx_condition:
+                self._rx_stopped = True
+                self._rx_ready.set()
+                self._rx_condition.notify_all()
+
+    def _handle(self, packet_type: PacketType, payload: bytes) -> None:
+        if packet_type is PacketType.FRAMES:
+            messages = protocol.unpack_frames(payload)
+            for msg in messages:
+                msg.channel = self.channel
+            with self._rx_condition:
+                self._rx_queue.extend(messages)
+                if not self._rx_signalled:
+                    self._rx_ready.set()
+                    self._rx_signalled = True
+                self._rx_condition.notify_all()
+        elif packet_type is PacketType.ACK:
+            future = self._acks.popleft()
+            if payload:
+                future.set_exception(CanOperationError(payload.decode()))
+            else:
+                future.set_result(None)
+        elif packet_type is PacketType.ERROR:
+            self.exception = CanOperationError(payload.decode())
+            logger.warning("The hub stopped receiving: %s", self.exception)
+            with self._rx_condition:
+                self._rx_stopped = True
+                self._rx_ready.set()
+                self._rx_condition.notify_all()
+        else:
+            logger.warning("Ignoring unexpected packet %s", packet_type.name)
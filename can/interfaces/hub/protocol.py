@@ -0,0 +1,185 @@
+"""
+The binary protocol between a :class:`~can.interfaces.hub.HubServer` and its
+clients.
+
+Every packet consists of a header with the :class:`PacketType` and the length
+of the payload, followed by the payload. All numbers are little endian.
+"""
+
+import math
+import struct
+import tempfile
+from collections.abc import Iterable
+from enum import IntEnum
+from pathlib import Path
+from typing import Optional
+
+from can import typechecking
+from can.bus import CanProtocol
+from can.message import Message
+
+#: The socket path used if no channel is given
+DEFAULT_PATH = str(Path(tempfile.gettempdir()) / "python-can-hub.sock")
+
+#: Packet type, payload length
+HEADER = struct.Struct("<BI")
+#: Timestamp, arbitration ID, flags, DLC, data length
+_FRAME = struct.Struct("<dIBBB")
+#: CAN ID, mask, flags
+_FILTER = struct.Struct("<IIB")
+#: Timeout, NaN for None
+_TIMEOUT = struct.Struct("<d")
+#: Protocol, followed by the channel info
+_INFO = struct.Struct("<B")
+
+_EXTENDED = 0x01
+_REMOTE = 0x02
+_ERROR = 0x04
+_FD = 0x08
+_BRS = 0x10
+_ESI = 0x20
+_RX = 0x40
+
+_FILTER_HAS_EXTENDED = 0x01
+_FILTER_EXTENDED = 0x02
+
+
+class PacketType(IntEnum):
+    """The types of the packets."""
+
+    #: hub → client after connecting: the protocol and the channel info
+    INFO = 1
+    #: client → hub: the filters of the client, the first one opens the view
+    FILTERS = 2
+    #: hub → client: received messages
+    FRAMES = 3
+    #: client → hub: a timeout and the messages to send
+    SEND = 4
+    #: hub → client: the result of a FILTERS or SEND packet, empty or an error message
+    ACK = 5
+    #: hub → client: receiving failed, sending is still possible
+    ERROR = 6
+
+
+def pack(packet_type: PacketType, payload: bytes = b"") -> bytes:
+    """Return a packet with the header."""
+    return HEADER.pack(packet_type, len(payload)) + payload
+
+
+def unpack(buffer: bytearray) -> list[tuple[PacketType, bytes]]:
+    """Remove and return the complete packets at the start of the buffer."""
+    packets = []
+    offset = 0
+    while len(buffer) - offset >= HEADER.size:
+        packet_type, length = HEADER.unpack_from(buffer, offset)
+        end = offset + HEADER.size + length
+        if end > len(buffer):
+            break
+        packets.append(
+            (PacketType(packet_type), bytes(buffer[offset + HEADER.size : end]))
+        )
+        offset = end
+    del buffer[:offset]
+    return packets
+
+
+def pack_info(protocol: CanProtocol, channel_info: str) -> bytes:
+    """Encode the payload of an INFO packet."""
+    return _INFO.pack(protocol.value) + channel_info.encode()
+
+
+def unpack_info(payload: bytes) -> tuple[CanProtocol, str]:
+    """Decode the payload of an INFO packet."""
+    (protocol,) = _INFO.unpack_from(payload)
+    return CanProtocol(protocol), payload[_INFO.size :].decode()
+
+
+def pack_frames(messages: Iterable[Message]) -> bytes:
+    """Encode messages for FRAMES and SEND packets."""
+    parts = []
+    for msg in messages:
+        flags = (
+            (_EXTENDED if msg.is_extended_id else 0)
+            | (_REMOTE if msg.is_remote_frame else 0)
+            | (_ERROR if msg.is_error_frame else 0)
+            | (_FD if msg.is_fd else 0)
+            | (_BRS if msg.bitrate_switch else 0)
+            | (_ESI if msg.error_state_indicator else 0)
+            | (_RX if msg.is_rx else 0)
+        )
+        data = b"" if msg.is_remote_frame else bytes(msg.data)
+        parts.append(
+            _FRAME.pack(msg.timestamp, msg.arbitration_id, flags, msg.dlc, len(data))
+        )
+        parts.append(data)
+    return b"".join(parts)
+
+
+def unpack_frames(payload: bytes) -> list[Message]:
+    """Decode the messages of FRAMES and SEND packets."""
+    messages = []
+    offset = 0
+    while offset < len(payload):
+        timestamp, arbitration_id, flags, dlc, length = _FRAME.unpack_from(
+            payload, offset
+        )
+        offset += _FRAME.size
+        messages.append(
+            Message(
+                timestamp=timestamp,
+                arbitration_id=arbitration_id,
+                is_extended_id=bool(flags & _EXTENDED),
+                is_remote_frame=bool(flags & _REMOTE),
+                is_error_frame=bool(flags & _ERROR),
+                is_fd=bool(flags & _FD),
+                bitrate_switch=bool(flags & _BRS),
+                error_state_indicator=bool(flags & _ESI),
+                is_rx=bool(flags & _RX),
+                dlc=dlc,
+                data=payload[offset : offset + length],
+                check=False,
+            )
+        )
+        offset += length
+    return messages
+
+
+def pack_send(messages: Iterable[Message], timeout: Optional[float]) -> bytes:
+    """Encode the payload of a SEND packet."""
+    return _TIMEOUT.pack(math.nan if timeout is None else timeout) + pack_frames(
+        messages
+    )
+
+
+def unpack_send(payload: bytes) -> tuple[list[Message], Optional[float]]:
+    """Decode the payload of a SEND packet."""
+    (timeout,) = _TIMEOUT.unpack_from(payload)
+    return (
+        unpack_frames(payload[_TIMEOUT.size :]),
+        None if math.isnan(timeout) else timeout,
+    )
+
+
+def pack_filters(filters: Optional[typechecking.CanFilters]) -> bytes:
+    """Encode the payload of a FILTERS packet. ``None`` is encoded as an
+    empty payload."""
+    parts = []
+    for can_filter in filters or ():
+        flags = 0
+        if "extended" in can_filter:
+            flags |= _FILTER_HAS_EXTENDED
+            if can_filter["extended"]:
+                flags |= _FILTER_EXTENDED
+        parts.append(_FILTER.pack(can_filter["can_id"], can_filter["can_mask"], flags))
+    return b"".join(parts)
+
+
+def unpack_filters(payload: bytes) -> Optional[typechecking.CanFilters]:
+    """Decode the payload of a FILTERS packet."""
+    filters: list[typechecking.CanFilter] = []
+    for can_id, can_mask, flags in _FILTER.iter_unpack(payload):
+        can_filter: typechecking.CanFilter = {"can_id": can_id, "can_mask": can_mask}
+        if flags & _FILTER_HAS_EXTENDED:
+            can_filter["extended"] = bool(flags & _FILTER_EXTENDED)
+        filters.append(can_filter)
+    return filters or None
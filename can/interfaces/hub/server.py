@@ -0,0 +1,398 @@
+"""
+Contains :class:`HubServer`, which shares a bus with the :class:`HubBus`
+clients of other processes.
+"""
+
+import contextlib
+import logging
+import os
+import selectors
+import socket
+import struct
+import threading
+from collections import deque
+from queue import SimpleQueue
+from types import TracebackType
+from typing import TYPE_CHECKING, Optional
+
+from typing_extensions import Self
+
+from can.bus import BusABC, _WakeupSocket
+from can.exceptions import CanInitializationError, CanInterfaceNotImplementedError
+from can.multiplexer import BusMultiplexer, BusView
+
+from . import protocol
+from .protocol import PacketType
+
+if TYPE_CHECKING:
+    from can.message import Message
+
+logger = logging.getLogger(__name__)
+
+#: Stop reading the view of a client while more bytes are waiting to be sent
+_HIGH_WATER = 256 * 1024
+
+
+class _Client:
+    __slots__ = (
+        "closed",
+        "events",
+        "inbuf",
+        "outbuf",
+        "packets",
+        "sending",
+        "sock",
+        "view",
+        "watching",
+    )
+
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.view: Optional[BusView] = None
+        self.inbuf = bytearray()
+        self.outbuf = bytearray()
+        # received packets that wait for the acknowledgement of a SEND packet
+        self.packets: deque[tuple[PacketType, bytes]] = deque()
+        self.sending = False
+        self.events = selectors.EVENT_READ
+        self.watching = False
+        self.closed = False
+
+
+_SendRequest = tuple[_Client, list["Message"], Optional[float]]
+
+
+class HubServer:
+    """
+    Owns a bus and serves it to the :class:`~can.interfaces.hub.HubBus`
+    clients of other processes through a Unix domain socket.
+
+    Opening an adapter often takes seconds and most adapters only allow a
+    single owner. The hub opens the bus once, and clients attach to it in
+    milliseconds::
+
+        bus = can.Bus(interface="pcan", channel="PCAN_USBBUS1", bitrate=500_000)
+        with HubServer(bus, "/tmp/pcan1.sock") as hub:
+            hub.serve_forever()
+
+    and in any number of other processes::
+
+        bus = can.Bus(interface="hub", channel="/tmp/pcan1.sock")
+
+    Every client gets a :class:`~can.BusView` of a
+    :class:`~can.BusMultiplexer`. The filters of the clients are applied by
+    the hub, so only matching frames are passed to a client, and they are
+    combined on the shared bus. Frames are passed in batches in a compact
+    binary format. A client that does not read fast enough loses its oldest
+    frames without delaying the others. Frames are sent by a separate
+    thread, so that a client waiting for a full transmit queue does not
+    delay the others either.
+
+    The ``can_hub`` script starts a hub from the command line.
+    """
+
+    def __init__(
+        self,
+        bus: BusABC,
+        path: str = protocol.DEFAULT_PATH,
+        batch_size: int = 64,
+        rx_queue_size: int = 10_000,
+    ) -> None:
+        """
+        :param bus:
+            The bus to share. It is shut down together with the hub.
+        :param path:
+            The path of the Unix domain socket to listen on.
+        :param batch_size:
+            The maximum number of messages passed to a client at once.
+        :param rx_queue_size:
+            The number of messages queued for every client before the oldest
+            are discarded.
+
+        :raises ~can.exceptions.CanInitializationError:
+            If another hub is serving *path* or the socket can not be created.
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            raise CanInterfaceNotImplementedError(
+                "The hub requires Unix domain sockets"
+            )
+
+        self.path = path
+        self.batch_size = batch_size
+        self.rx_queue_size = rx_queue_size
+
+        self._listener = _listen(path)
+        self._multiplexer = BusMultiplexer(bus)
+        self._clients: list[_Client] = []
+        self._wakeup = _WakeupSocket()
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._listener, selectors.EVENT_READ, ("accept", None))
+        self._selector.register(self._wakeup, selectors.EVENT_READ, ("wakeup", None))
+        self._stopped = False
+        self._closed = False
+        self._serving = threading.Lock()
+
+        # the sending thread reports the results of the requests through
+        # the wakeup socket, since only the serving thread writes to clients
+        self._tx_queue: SimpleQueue[Optional[_SendRequest]] = SimpleQueue()
+        self._tx_results: deque[tuple[_Client, str]] = deque()
+        self._tx_thread = threading.Thread(
+            target=self._tx_worker, name=f"HubServer TX for {path}", daemon=True
+        )
+        self._tx_thread.start()
+
+    @property
+    def bus(self) -> BusABC:
+        """The shared bus."""
+        return self._multiplexer.bus
+
+    @property
+    def connections(self) -> int:
+        """The number of connected clients."""
+        return len(self._clients)
+
+    def serve_forever(self) -> None:
+        """Serve the clients until :meth:`shutdown` is called."""
+        with self._serving:
+            while not self._stopped:
+                for key, events in self._selector.select():
+                    kind, client = key.data
+                    if kind == "accept":
+                        self._accept()
+                    elif kind == "wakeup":
+                        self._wakeup.clear()
+                        self._acknowledge_sends()
+                    elif client is None or client.closed:
+                        continue
+                    elif kind == "view":
+                        self._forward(client)
+                    else:
+                        if events & selectors.EVENT_WRITE:
+                            self._flush(client)
+                        if events & selectors.EVENT_READ and not client.closed:
+                            self._read(client)
+
+    def shutdown(self) -> None:
+        """Stop serving, disconnect all clients and shut down the bus."""
+        self._stopped = True
+        self._wakeup.set()
+        with self._serving:
+            if self._closed:
+                return
+            self._closed = True
+            for client in list(self._clients):
+                self._disconnect(client)
+            self._selector.close()
+            self._listener.close()
+            with contextlib.suppress(OSError):
+                os.unlink(self.path)
+            self._wakeup.close()
+            self._multiplexer.shutdown()
+            self._tx_queue.put(None)
+            self._tx_thread.join()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.shutdown()
+
+    def _accept(self) -> None:
+        try:
+            sock, _ = self._listener.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        client = _Client(sock)
+        self._clients.append(client)
+        self._selector.register(sock, selectors.EVENT_READ, ("client", client))
+        logger.debug("Client %d connected", sock.fileno())
+        self._send(
+            client,
+            PacketType.INFO,
+            protocol.pack_info(self.bus.protocol, self.bus.channel_info),
+        )
+
+    def _disconnect(self, client: _Client) -> None:
+        if client.closed:
+            return
+        client.closed = True
+        logger.debug("Client %d disconnected", client.sock.fileno())
+        self._clients.remove(client)
+        self._selector.unregister(client.sock)
+        client.sock.close()
+        if client.view is not None:
+            if client.watching:
+                self._selector.unregister(client.view)
+            client.view.shutdown()
+
+    def _read(self, client: _Client) -> None:
+        try:
+            data = client.sock.recv(65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._disconnect(client)
+            return
+
+        client.inbuf += data
+        try:
+            client.packets.extend(protocol.unpack(client.inbuf))
+        except ValueError:
+            logger.warning("Disconnecting client after an invalid packet")
+            self._disconnect(client)
+            return
+        self._handle_packets(client)
+
+    def _handle_packets(self, client: _Client) -> None:
+        # the client expects the acknowledgements in order, so the packets
+        # after a SEND packet wait until it was handled
+        while client.packets and not client.sending:
+            packet_type, payload = client.packets.popleft()
+            if client.closed:
+                return
+            try:
+                if packet_type is PacketType.FILTERS:
+                    self._set_filters(client, payload)
+                elif packet_type is PacketType.SEND:
+                    self._send_messages(client, payload)
+                else:
+                    logger.warning("Ignoring unexpected packet %s", packet_type.name)
+            except (ValueError, struct.error):
+                logger.warning("Disconnecting client after an invalid packet")
+                self._disconnect(client)
+                return
+
+    def _set_filters(self, client: _Client, payload: bytes) -> None:
+        filters = protocol.unpack_filters(payload)
+        error = ""
+        try:
+            if client.view is None:
+                # the first filters open the view
+                client.view = self._multiplexer.open_view(
+                    filters, rx_queue_size=self.rx_queue_size
+                )
+                self._watch_view(client, True)
+            else:
+                client.view.set_filters(filters)
+        except Exception as exc:  # pylint: disable=broad-except
+            error = str(exc) or exc.__class__.__name__
+        self._send(client, PacketType.ACK, error.encode())
+
+    def _send_messages(self, client: _Client, payload: bytes) -> None:
+        if client.view is None:
+            error = "No filters were sent before sending"
+            self._send(client, PacketType.ACK, error.encode())
+            return
+        messages, timeout = protocol.unpack_send(payload)
+        client.sending = True
+        self._tx_queue.put((client, messages, timeout))
+
+    def _tx_worker(self) -> None:
+        while (request := self._tx_queue.get()) is not None:
+            client, messages, timeout = request
+            error = ""
+            try:
+                for msg in messages:
+                    if client.closed or client.view is None:
+                        break
+                    client.view.send(msg, timeout)
+            except Exception as exc:  # pylint: disable=broad-except
+                error = str(exc) or exc.__class__.__name__
+            self._tx_results.append((client, error))
+            self._wakeup.set()
+
+    def _acknowledge_sends(self) -> None:
+        while self._tx_results:
+            client, error = self._tx_results.popleft()
+            if client.closed:
+                continue
+            client.sending = False
+            self._send(client, PacketType.ACK, error.encode())
+            self._handle_packets(client)
+
+    def _forward(self, client: _Client) -> None:
+        if client.view is None:
+            return
+        messages: list[Message] = []
+        try:
+            while len(messages) < self.batch_size:
+                msg = client.view.recv(0)
+                if msg is None:
+                    break
+                messages.append(msg)
+        except Exception as exc:  # pylint: disable=broad-except
+            if messages:
+                self._send(client, PacketType.FRAMES, protocol.pack_frames(messages))
+            self._watch_view(client, False)
+            self._send(client, PacketType.ERROR, str(exc).encode())
+            return
+
+        if messages:
+            self._send(client, PacketType.FRAMES, protocol.pack_frames(messages))
+
+    def _send(self, client: _Client, packet_type: PacketType, payload: bytes) -> None:
+        client.outbuf += protocol.pack(packet_type, payload)
+        self._flush(client)
+
+    def _flush(self, client: _Client) -> None:
+        if client.outbuf:
+            try:
+                sent = client.sock.send(client.outbuf)
+            except BlockingIOError:
+                sent = 0
+            except OSError:
+                self._disconnect(client)
+                return
+            del client.outbuf[:sent]
+
+        events = selectors.EVENT_READ
+        if client.outbuf:
+            events |= selectors.EVENT_WRITE
+        if events != client.events:
+            self._selector.modify(client.sock, events, ("client", client))
+            client.events = events
+
+        # leave the frames in the queue of the view while the client is slow
+        if client.view is not None and not client.view.multiplexer.exception:
+            self._watch_view(client, len(client.outbuf) < _HIGH_WATER)
+
+    def _watch_view(self, client: _Client, watch: bool) -> None:
+        if client.view is None or watch == client.watching:
+            return
+        if watch:
+            self._selector.register(client.view, selectors.EVENT_READ, ("view", client))
+        else:
+            self._selector.unregister(client.view)
+        client.watching = watch
+
+
+def _listen(path: str) -> socket.socket:
+    if os.path.exists(path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(path)
+            except OSError:
+                # left over by a hub that did not shut down properly
+                os.unlink(path)
+            else:
+                raise CanInitializationError(f"Another hub is serving {path}")
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        listener.bind(path)
+        listener.listen()
+        listener.setblocking(False)
+    except OSError as error:
+        listener.close()
+        raise CanInitializationError(
+            f"Could not listen on {path}: {error.strerror}", error.errno
+        ) from error
+    return listener
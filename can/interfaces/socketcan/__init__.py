@@ -6,8 +6,14 @@ __all__ = [
     "CyclicSendTask",
     "MultiRateCyclicSendTask",
     "SocketcanBus",
+    "bpf",
     "constants",
+    "gateway",
+    "isotp",
+    "netlink",
+    "sharding",
     "socketcan",
+    "statistics",
     "utils",
 ]
 
@@ -0,0 +1,188 @@
+"""
+Compiles filters with payload terms to classic BPF programs, which the kernel
+runs for every frame that a raw socket receives.
+
+The kernel applies the ID filters of ``CAN_RAW_FILTER`` first, so the program
+only sees frames with a matching ID. It checks the filters again, including
+their payload terms, on the ``struct can_frame`` or ``struct canfd_frame``.
+"""
+
+import ctypes
+import socket
+import struct
+from typing import NamedTuple, Optional
+
+from can import typechecking
+
+from . import constants
+
+# instruction classes, sizes, modes and operations of classic BPF
+BPF_LD = 0x00
+BPF_ALU = 0x04
+BPF_JMP = 0x05
+BPF_RET = 0x06
+BPF_W = 0x00
+BPF_B = 0x10
+BPF_ABS = 0x20
+BPF_AND = 0x50
+BPF_JEQ = 0x10
+BPF_JGT = 0x20
+BPF_JSET = 0x40
+BPF_K = 0x00
+
+#: The maximum number of instructions of a program
+BPF_MAXINSNS = 4096
+
+#: struct sock_filter
+_SOCK_FILTER = struct.Struct("=HBBI")
+#: struct sock_fprog
+_SOCK_FPROG = struct.Struct("@HP")
+_U32 = struct.Struct("=I")
+
+# offsets of the members of struct can_frame and struct canfd_frame
+_CAN_ID_OFFSET = 0
+_LEN_OFFSET = 4
+_DATA_OFFSET = 8
+
+#: Placeholder for the jump to the next filter
+_NEXT_FILTER = -1
+
+
+class BpfInstruction(NamedTuple):
+    """An instruction of a classic BPF program, see ``struct sock_filter``."""
+
+    code: int
+    jt: int
+    jf: int
+    k: int
+
+
+def _word(value: int) -> int:
+    # the kernel loads words in network byte order, but the frame stores
+    # the CAN ID in host byte order
+    return int.from_bytes(_U32.pack(value), "big")
+
+
+_ACCEPT = BpfInstruction(BPF_RET | BPF_K, 0, 0, 0xFFFFFFFF)
+_REJECT = BpfInstruction(BPF_RET | BPF_K, 0, 0, 0)
+_LOAD_CAN_ID = BpfInstruction(BPF_LD | BPF_W | BPF_ABS, 0, 0, _CAN_ID_OFFSET)
+
+
+def has_payload_terms(can_filters: Optional[typechecking.CanFilters]) -> bool:
+    """Return whether any of the filters checks the payload."""
+    return any(can_filter.get("data") for can_filter in can_filters or ())
+
+
+def _compile_filter(can_filter: typechecking.CanFilter) -> list[BpfInstruction]:
+    can_id = can_filter["can_id"]
+    can_mask = can_filter["can_mask"]
+    if "extended" in can_filter:
+        can_mask |= constants.CAN_EFF_FLAG
+        if can_filter["extended"]:
+            can_id |= constants.CAN_EFF_FLAG
+
+    block = []
+    if can_mask:
+        block += [
+            _LOAD_CAN_ID,
+            BpfInstruction(BPF_ALU | BPF_AND | BPF_K, 0, 0, _word(can_mask)),
+            BpfInstruction(
+                BPF_JMP | BPF_JEQ | BPF_K, 0, _NEXT_FILTER, _word(can_id & can_mask)
+            ),
+        ]
+
+    terms = can_filter.get("data") or ()
+    for term in terms:
+        offset, value = term["offset"], term["value"]
+        mask = term.get("mask", 0xFF)
+        if not 0 <= offset < constants.CANFD_MAX_DLEN:
+            raise ValueError(f"Invalid payload offset {offset} in {can_filter}")
+        if not (0 <= mask <= 0xFF and 0 <= value <= 0xFF):
+            raise ValueError(f"Invalid payload term {term} in {can_filter}")
+    if terms:
+        # a single length check covers all terms
+        block += [
+            BpfInstruction(BPF_LD | BPF_B | BPF_ABS, 0, 0, _LEN_OFFSET),
+            BpfInstruction(
+                BPF_JMP | BPF_JGT | BPF_K,
+                0,
+                _NEXT_FILTER,
+                max(term["offset"] for term in terms),
+            ),
+        ]
+    for term in terms:
+        mask = term.get("mask", 0xFF)
+        block.append(
+            BpfInstruction(
+                BPF_LD | BPF_B | BPF_ABS, 0, 0, _DATA_OFFSET + term["offset"]
+            )
+        )
+        if mask != 0xFF:
+            block.append(BpfInstruction(BPF_ALU | BPF_AND | BPF_K, 0, 0, mask))
+        block.append(
+            BpfInstruction(
+                BPF_JMP | BPF_JEQ | BPF_K, 0, _NEXT_FILTER, term["value"] & mask
+            )
+        )
+    block.append(_ACCEPT)
+
+    for index, instruction in enumerate(block):
+        if instruction.jf == _NEXT_FILTER:
+            skip = len(block) - index - 1
+            if skip > 0xFF:
+                raise ValueError(f"Too many payload terms in {can_filter}")
+            block[index] = instruction._replace(jf=skip)
+    return block
+
+
+def compile_filters(
+    can_filters: Optional[typechecking.CanFilters],
+) -> list[BpfInstruction]:
+    """Compile filters to a classic BPF program that accepts the frames
+    matching at least one of them.
+
+    Error frames are always accepted, since they are selected by the error
+    mask of the socket instead.
+
+    :param can_filters: The filters, see :meth:`can.BusABC.set_filters`.
+    :raises ValueError: If a payload term is out of range or the program
+        would be too long.
+    """
+    if can_filters is None:
+        can_filters = [{"can_id": 0, "can_mask": 0}]
+    program = [
+        _LOAD_CAN_ID,
+        BpfInstruction(BPF_JMP | BPF_JSET | BPF_K, 0, 1, _word(constants.CAN_ERR_FLAG)),
+        _ACCEPT,
+    ]
+    for can_filter in can_filters:
+        program += _compile_filter(can_filter)
+    program.append(_REJECT)
+
+    if len(program) > BPF_MAXINSNS:
+        raise ValueError(f"The filters need {len(program)} BPF instructions")
+    return program
+
+
+def attach_program(sock: socket.socket, program: list[BpfInstruction]) -> None:
+    """Attach a program to a socket, replacing the previous one.
+
+    :raises OSError: If the kernel rejected the program.
+    """
+    instructions = ctypes.create_string_buffer(
+        b"".join(_SOCK_FILTER.pack(*instruction) for instruction in program)
+    )
+    sock.setsockopt(
+        socket.SOL_SOCKET,
+        constants.SO_ATTACH_FILTER,
+        _SOCK_FPROG.pack(len(program), ctypes.addressof(instructions)),
+    )
+
+
+def detach_program(sock: socket.socket) -> None:
+    """Remove the program of a socket, if it has one."""
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, constants.SO_DETACH_FILTER, 0)
+    except FileNotFoundError:
+        # no program was attached
+        pass
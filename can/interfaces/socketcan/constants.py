@@ -3,7 +3,21 @@ Defines shared CAN constants.
 """
 
 # Generic socket constants
+SO_ATTACH_FILTER = 26
+SO_DETACH_FILTER = 27
+SO_RCVBUFFORCE = 33
 SO_TIMESTAMPNS = 35
+SO_RXQ_OVFL = 40
+SO_BUSY_POLL = 46
+SO_TXTIME = 61
+SCM_TXTIME = SO_TXTIME
+
+# Flags of struct sock_txtime
+SOF_TXTIME_DEADLINE_MODE = 0x1
+SOF_TXTIME_REPORT_ERRORS = 0x2
+
+# Clock used by the etf qdisc for SO_TXTIME launch times
+CLOCK_TAI = 11
 
 CAN_ERR_FLAG = 0x20000000
 CAN_RTR_FLAG = 0x40000000
@@ -30,9 +44,11 @@ CAN_FD_FRAME = 0x0800
 
 CAN_RAW = 1
 CAN_BCM = 2
+CAN_ISOTP = 6
 
 SOL_CAN_BASE = 100
 SOL_CAN_RAW = SOL_CAN_BASE + CAN_RAW
+SOL_CAN_ISOTP = SOL_CAN_BASE + CAN_ISOTP
 
 CAN_RAW_FILTER = 1
 CAN_RAW_ERR_FILTER = 2
@@ -40,6 +56,29 @@ CAN_RAW_LOOPBACK = 3
 CAN_RAW_RECV_OWN_MSGS = 4
 CAN_RAW_FD_FRAMES = 5
 
+# ISO-TP socket options
+CAN_ISOTP_OPTS = 1
+CAN_ISOTP_RECV_FC = 2
+CAN_ISOTP_TX_STMIN = 3
+CAN_ISOTP_RX_STMIN = 4
+CAN_ISOTP_LL_OPTS = 5
+
+# ISO-TP flags of struct can_isotp_options
+CAN_ISOTP_LISTEN_MODE = 0x0001
+CAN_ISOTP_EXTEND_ADDR = 0x0002
+CAN_ISOTP_TX_PADDING = 0x0004
+CAN_ISOTP_RX_PADDING = 0x0008
+CAN_ISOTP_CHK_PAD_LEN = 0x0010
+CAN_ISOTP_CHK_PAD_DATA = 0x0020
+CAN_ISOTP_HALF_DUPLEX = 0x0040
+CAN_ISOTP_FORCE_TXSTMIN = 0x0080
+CAN_ISOTP_FORCE_RXSTMIN = 0x0100
+CAN_ISOTP_RX_EXT_ADDR = 0x0200
+CAN_ISOTP_WAIT_TX_DONE = 0x0400
+CAN_ISOTP_SF_BROADCAST = 0x0800
+CAN_ISOTP_CF_BROADCAST = 0x1000
+CAN_ISOTP_DYN_FC_PARMS = 0x2000
+
 MSK_ARBID = 0x1FFFFFFF
 MSK_FLAGS = 0xE0000000
 
@@ -66,6 +105,7 @@ CAN_MAX_DLEN = 8
 CANFD_MAX_DLC = 15
 CANFD_MAX_DLEN = 64
 
+CAN_MTU = 16
 CANFD_MTU = 72
 
 STD_ACCEPTANCE_MASK_ALL_BITS = 2**11 - 1
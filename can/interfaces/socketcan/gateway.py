@@ -0,0 +1,378 @@
+"""
+Configures the CAN gateway of the Linux kernel (``can-gw``) through netlink.
+
+The kernel forwards frames between SocketCAN interfaces without copying them
+to user space, which saves a context switch and a system call per frame.
+The rules are the same as the ones of the ``cangw`` tool of can-utils.
+Adding and removing rules requires the ``CAP_NET_ADMIN`` capability and the
+``can-gw`` kernel module.
+"""
+
+import socket
+import struct
+from collections.abc import Iterable
+from types import TracebackType
+from typing import NamedTuple, Optional
+
+from typing_extensions import Self
+
+from can import typechecking
+from can.exceptions import CanOperationError
+from can.interfaces.socketcan.constants import AF_CAN, CAN_EFF_FLAG
+
+from .netlink import NLM_F_CREATE, NLM_F_DUMP, NetlinkSocket, pack_attr, unpack_attrs
+
+RTM_NEWROUTE = 24
+RTM_DELROUTE = 25
+RTM_GETROUTE = 26
+
+CGW_TYPE_CAN_CAN = 1
+
+# netlink attributes
+CGW_MOD_AND = 1
+CGW_MOD_OR = 2
+CGW_MOD_XOR = 3
+CGW_MOD_SET = 4
+CGW_HANDLED = 7
+CGW_DROPPED = 8
+CGW_SRC_IF = 9
+CGW_DST_IF = 10
+CGW_FILTER = 11
+CGW_DELETED = 12
+CGW_LIM_HOPS = 13
+CGW_FDMOD_AND = 15
+CGW_FDMOD_OR = 16
+CGW_FDMOD_XOR = 17
+CGW_FDMOD_SET = 18
+
+CGW_FLAGS_CAN_ECHO = 0x01
+CGW_FLAGS_CAN_SRC_TSTAMP = 0x02
+CGW_FLAGS_CAN_IIF_TX_OK = 0x04
+CGW_FLAGS_CAN_FD = 0x08
+
+CGW_MOD_ID = 0x01
+CGW_MOD_LEN = 0x02
+CGW_MOD_DATA = 0x04
+
+#: Address family, gateway type, flags
+_RTCANMSG = struct.Struct("=BBH")
+#: struct can_frame followed by the modification type
+_CGW_FRAME_MOD = struct.Struct("=IB3x8sB")
+#: struct canfd_frame followed by the modification type
+_CGW_FDFRAME_MOD = struct.Struct("=IB3x64sB")
+_CAN_FILTER = struct.Struct("=II")
+_U32 = struct.Struct("=I")
+
+_OPERATIONS = ("and", "or", "xor", "set")
+
+
+class GatewayModification(NamedTuple):
+    """Modifies the frames forwarded by a :class:`GatewayRule`.
+
+    The fields which are not ``None`` are combined with the given
+    *operation*, in the order AND, OR, XOR, SET. For example, to set the
+    first data byte::
+
+        GatewayModification("and", data=b"\\x00" + b"\\xff" * 7),
+        GatewayModification("or", data=b"\\x42" + b"\\x00" * 7),
+    """
+
+    #: One of ``"and"``, ``"or"``, ``"xor"`` or ``"set"``
+    operation: str
+    #: The arbitration ID, including the ``CAN_EFF_FLAG`` for extended IDs
+    arbitration_id: Optional[int] = None
+    #: The data length
+    dlc: Optional[int] = None
+    #: The data, padded with zeros
+    data: Optional[bytes] = None
+
+
+class GatewayRule(NamedTuple):
+    """A rule of the CAN gateway of the kernel, which forwards the frames
+    received on one interface to another one."""
+
+    #: The name of the receiving interface
+    source: str
+    #: The name of the sending interface
+    destination: str
+    #: Only forward matching frames, see :meth:`~can.BusABC.set_filters`
+    can_filter: Optional[typechecking.CanFilter] = None
+    #: Modifications of the forwarded frames, at most one per operation
+    modifications: tuple[GatewayModification, ...] = ()
+    #: Forward CAN FD frames instead of classic frames
+    fd: bool = False
+    #: Receive the forwarded frames on the sockets of the destination, too
+    echo: bool = False
+    #: Keep the timestamp of the received frame
+    source_timestamp: bool = False
+    #: The maximum number of gateway hops, or 0 for the default of the kernel
+    hop_limit: int = 0
+
+
+class GatewayCounters(NamedTuple):
+    """The counters of a :class:`GatewayRule` maintained by the kernel."""
+
+    #: The number of forwarded frames
+    handled: int = 0
+    #: The number of frames that could not be forwarded
+    dropped: int = 0
+    #: The number of frames that were dropped because of the hop limit
+    deleted: int = 0
+
+
+def add_gateway_rule(rule: GatewayRule) -> None:
+    """Add a rule to the CAN gateway of the kernel.
+
+    :raises ValueError: If the rule is invalid.
+    :raises ~can.exceptions.CanOperationError: If the kernel rejected the rule.
+    """
+    _request(RTM_NEWROUTE, _encode_rule(rule), NLM_F_CREATE)
+
+
+def remove_gateway_rule(rule: GatewayRule) -> None:
+    """Remove a rule, which must equal the one that was added.
+
+    :raises ValueError: If the rule is invalid.
+    :raises ~can.exceptions.CanOperationError: If the kernel rejected the request.
+    """
+    _request(RTM_DELROUTE, _encode_rule(rule))
+
+
+def list_gateway_rules() -> list[tuple[GatewayRule, GatewayCounters]]:
+    """Return the rules of the CAN gateway of the kernel and their counters.
+
+    The filters are returned with the raw ``can_id`` and ``can_mask`` of
+    the kernel. Use :func:`normalize_gateway_rule` to compare them with
+    other rules.
+
+    :raises ~can.exceptions.CanOperationError: If the rules could not be read.
+    """
+    replies = _request(
+        RTM_GETROUTE, _RTCANMSG.pack(AF_CAN, CGW_TYPE_CAN_CAN, 0), NLM_F_DUMP
+    )
+    rules = []
+    for _, payload in replies:
+        family, gateway_type, _ = _RTCANMSG.unpack_from(payload)
+        # kernels without the CAN gateway dump the routes of all families
+        if family == AF_CAN and gateway_type == CGW_TYPE_CAN_CAN:
+            rules.append(_decode_rule(payload))
+    return rules
+
+
+def normalize_gateway_rule(rule: GatewayRule) -> GatewayRule:
+    """Return the rule like it is returned by :func:`list_gateway_rules`.
+
+    :raises ValueError: If the rule is invalid.
+    """
+    rule, _ = _decode_rule(_encode_rule(rule))
+    return rule
+
+
+class KernelGateway:
+    """Manages a set of rules of the CAN gateway of the kernel, which are
+    removed again by :meth:`close`::
+
+        with KernelGateway() as gateway:
+            gateway.add(GatewayRule("can0", "can1"))
+            gateway.add(GatewayRule("can1", "can0"))
+            ...
+            for rule, counters in gateway.counters():
+                print(rule.source, rule.destination, counters.handled)
+    """
+
+    def __init__(self, rules: Iterable[GatewayRule] = ()) -> None:
+        """
+        :param rules:
+            Rules to add immediately.
+
+        :raises ~can.exceptions.CanOperationError:
+            If the kernel rejected a rule. The rules added before are removed.
+        """
+        self._rules: list[GatewayRule] = []
+        try:
+            for rule in rules:
+                self.add(rule)
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def rules(self) -> list[GatewayRule]:
+        """The rules that were added, as returned by
+        :func:`normalize_gateway_rule`."""
+        return list(self._rules)
+
+    def add(self, rule: GatewayRule) -> None:
+        """Add a rule, see :func:`add_gateway_rule`."""
+        normalized = normalize_gateway_rule(rule)
+        add_gateway_rule(normalized)
+        self._rules.append(normalized)
+
+    def counters(self) -> list[tuple[GatewayRule, GatewayCounters]]:
+        """Return the rules that were added together with their counters.
+
+        :raises ~can.exceptions.CanOperationError: If the rules could not be read.
+        """
+        installed = list_gateway_rules()
+        counters = []
+        for rule in self._rules:
+            rule_counters = GatewayCounters()
+            for other, other_counters in installed:
+                if other == rule:
+                    rule_counters = other_counters
+                    break
+            counters.append((rule, rule_counters))
+        return counters
+
+    def close(self) -> None:
+        """Remove the rules that were added."""
+        while self._rules:
+            rule = self._rules.pop()
+            try:
+                remove_gateway_rule(rule)
+            except CanOperationError:
+                # e.g. an interface was removed together with its rules
+                pass
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+def _request(msg_type: int, payload: bytes, flags: int = 0) -> list[tuple[int, bytes]]:
+    try:
+        with NetlinkSocket() as netlink:
+            return netlink.request(msg_type, payload, flags)
+    except OSError as error:
+        raise CanOperationError(
+            f"The CAN gateway of the kernel failed: {error.strerror}", error.errno
+        ) from error
+
+
+def _interface_index(name: str) -> int:
+    try:
+        return socket.if_nametoindex(name)
+    except OSError as error:
+        raise CanOperationError(
+            f"Unknown interface {name!r}: {error.strerror}", error.errno
+        ) from error
+
+
+def _interface_name(index: int) -> str:
+    try:
+        return socket.if_indextoname(index)
+    except OSError:
+        return str(index)
+
+
+def _encode_rule(rule: GatewayRule) -> bytes:
+    flags = (
+        (CGW_FLAGS_CAN_ECHO if rule.echo else 0)
+        | (CGW_FLAGS_CAN_SRC_TSTAMP if rule.source_timestamp else 0)
+        | (CGW_FLAGS_CAN_FD if rule.fd else 0)
+    )
+    parts = [_RTCANMSG.pack(AF_CAN, CGW_TYPE_CAN_CAN, flags)]
+
+    operations = set()
+    for modification in rule.modifications:
+        if modification.operation not in _OPERATIONS:
+            raise ValueError(f"Invalid operation {modification.operation!r}")
+        if modification.operation in operations:
+            raise ValueError(f"Only one {modification.operation!r} modification")
+        operations.add(modification.operation)
+        parts.append(_encode_modification(modification, rule.fd))
+
+    if rule.hop_limit:
+        parts.append(pack_attr(CGW_LIM_HOPS, bytes([rule.hop_limit])))
+    if rule.can_filter is not None:
+        can_id = rule.can_filter["can_id"]
+        can_mask = rule.can_filter["can_mask"]
+        if "extended" in rule.can_filter:
+            can_mask |= CAN_EFF_FLAG
+            if rule.can_filter["extended"]:
+                can_id |= CAN_EFF_FLAG
+        parts.append(pack_attr(CGW_FILTER, _CAN_FILTER.pack(can_id, can_mask)))
+    parts.append(pack_attr(CGW_SRC_IF, _U32.pack(_interface_index(rule.source))))
+    parts.append(pack_attr(CGW_DST_IF, _U32.pack(_interface_index(rule.destination))))
+    return b"".join(parts)
+
+
+def _encode_modification(modification: GatewayModification, fd: bool) -> bytes:
+    modification_type = 0
+    if modification.arbitration_id is not None:
+        modification_type |= CGW_MOD_ID
+    if modification.dlc is not None:
+        modification_type |= CGW_MOD_LEN
+    if modification.data is not None:
+        modification_type |= CGW_MOD_DATA
+    if not modification_type:
+        raise ValueError("The modification does not modify anything")
+
+    frame = _CGW_FDFRAME_MOD if fd else _CGW_FRAME_MOD
+    payload = frame.pack(
+        modification.arbitration_id or 0,
+        modification.dlc or 0,
+        modification.data or b"",
+        modification_type,
+    )
+    attr_type = (CGW_FDMOD_AND if fd else CGW_MOD_AND) + _OPERATIONS.index(
+        modification.operation
+    )
+    return pack_attr(attr_type, payload)
+
+
+def _decode_rule(payload: bytes) -> tuple[GatewayRule, GatewayCounters]:
+    _, _, flags = _RTCANMSG.unpack_from(payload)
+    attrs = unpack_attrs(payload[_RTCANMSG.size :])
+    fd = bool(flags & CGW_FLAGS_CAN_FD)
+
+    modifications = []
+    frame, first = (
+        (_CGW_FDFRAME_MOD, CGW_FDMOD_AND) if fd else (_CGW_FRAME_MOD, CGW_MOD_AND)
+    )
+    for index, operation in enumerate(_OPERATIONS):
+        if first + index not in attrs:
+            continue
+        arbitration_id, dlc, data, modification_type = frame.unpack_from(
+            attrs[first + index]
+        )
+        modifications.append(
+            GatewayModification(
+                operation,
+                arbitration_id if modification_type & CGW_MOD_ID else None,
+                dlc if modification_type & CGW_MOD_LEN else None,
+                data if modification_type & CGW_MOD_DATA else None,
+            )
+        )
+
+    can_filter: Optional[typechecking.CanFilter] = None
+    if CGW_FILTER in attrs:
+        can_id, can_mask = _CAN_FILTER.unpack_from(attrs[CGW_FILTER])
+        if can_id or can_mask:
+            can_filter = {"can_id": can_id, "can_mask": can_mask}
+
+    def u32(attr_type: int) -> int:
+        if attr_type not in attrs:
+            return 0
+        (value,) = _U32.unpack_from(attrs[attr_type])
+        return int(value)
+
+    rule = GatewayRule(
+        source=_interface_name(u32(CGW_SRC_IF)),
+        destination=_interface_name(u32(CGW_DST_IF)),
+        can_filter=can_filter,
+        modifications=tuple(modifications),
+        fd=fd,
+        echo=bool(flags & CGW_FLAGS_CAN_ECHO),
+        source_timestamp=bool(flags & CGW_FLAGS_CAN_SRC_TSTAMP),
+        hop_limit=attrs[CGW_LIM_HOPS][0] if CGW_LIM_HOPS in attrs else 0,
+    )
+    counters = GatewayCounters(u32(CGW_HANDLED), u32(CGW_DROPPED), u32(CGW_DELETED))
+    return rule, counters
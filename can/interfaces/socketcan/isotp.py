@@ -0,0 +1,368 @@
+"""
+Transfers ISO 15765-2 (ISO-TP) PDUs with the ``CAN_ISOTP`` sockets of the
+Linux kernel, which segments and reassembles them and handles the flow
+control and separation times itself.
+
+The sockets are available since Linux 5.10, and as the out-of-tree
+``can-isotp`` module for older kernels.
+"""
+
+import asyncio
+import errno
+import logging
+import select
+import socket
+import struct
+import time
+from types import TracebackType
+from typing import NamedTuple, Optional
+
+from typing_extensions import Self
+
+from can.exceptions import (
+    CanInitializationError,
+    CanInterfaceNotImplementedError,
+    CanOperationError,
+    CanTimeoutError,
+)
+
+from . import constants
+
+log = logging.getLogger(__name__)
+
+#: struct can_isotp_options
+_CAN_ISOTP_OPTIONS = struct.Struct("=IIBBBB")
+#: struct can_isotp_fc_options
+_CAN_ISOTP_FC_OPTIONS = struct.Struct("=BBB")
+#: struct can_isotp_ll_options
+_CAN_ISOTP_LL_OPTIONS = struct.Struct("=BBB")
+_U32 = struct.Struct("=I")
+
+#: The size of the largest PDU that the kernel reassembles
+MAX_PDU_SIZE = 66000
+
+
+class IsoTpOptions(NamedTuple):
+    """The general options of an ISO-TP socket, see ``struct can_isotp_options``."""
+
+    #: A combination of the ``CAN_ISOTP_*`` flags of
+    #: :mod:`~can.interfaces.socketcan.constants`, like
+    #: ``CAN_ISOTP_TX_PADDING``
+    flags: int = 0
+    #: The time in nanoseconds between two sent frames, or 0 for the
+    #: default of the kernel
+    frame_txtime: int = 0
+    #: The address byte sent with ``CAN_ISOTP_EXTEND_ADDR``
+    ext_address: int = 0
+    #: The padding byte sent with ``CAN_ISOTP_TX_PADDING``
+    txpad_content: int = 0xCC
+    #: The padding byte checked with ``CAN_ISOTP_CHK_PAD_DATA``
+    rxpad_content: int = 0xCC
+    #: The address byte received with ``CAN_ISOTP_RX_EXT_ADDR``
+    rx_ext_address: int = 0
+
+
+class IsoTpFlowControl(NamedTuple):
+    """The flow control frames that an ISO-TP socket sends while receiving,
+    see ``struct can_isotp_fc_options``."""
+
+    #: The number of consecutive frames between two flow control frames,
+    #: or 0 to send only one
+    bs: int = 0
+    #: The minimum separation time of the consecutive frames, encoded like
+    #: in the flow control frame: 0 to 0x7F milliseconds, or 0xF1 to 0xF9
+    #: for 100 to 900 microseconds
+    stmin: int = 0
+    #: The maximum number of wait frames, or 0 to not send any
+    wftmax: int = 0
+
+
+class IsoTpLinkLayer(NamedTuple):
+    """The CAN frames of an ISO-TP socket, see ``struct can_isotp_ll_options``.
+
+    For CAN FD, use ``IsoTpLinkLayer(mtu=CANFD_MTU, tx_dl=64, tx_flags=CANFD_BRS)``.
+    """
+
+    #: ``CAN_MTU`` for classic CAN or ``CANFD_MTU`` for CAN FD frames
+    mtu: int = constants.CAN_MTU
+    #: The payload length of the sent frames
+    tx_dl: int = constants.CAN_MAX_DLEN
+    #: The ``CANFD_*`` flags of the sent CAN FD frames
+    tx_flags: int = 0
+
+
+def create_isotp_socket() -> socket.socket:
+    """Create an ISO-TP socket, which is not bound to an interface yet."""
+    return socket.socket(constants.PF_CAN, socket.SOCK_DGRAM, constants.CAN_ISOTP)
+
+
+def setup_isotp_socket(
+    sock: socket.socket,
+    channel: str,
+    rx_id: int,
+    tx_id: int,
+    options: IsoTpOptions,
+    flow_control: IsoTpFlowControl,
+    link_layer: IsoTpLinkLayer,
+    tx_stmin: Optional[float] = None,
+    rx_stmin: Optional[float] = None,
+) -> None:
+    """Set the options of an ISO-TP socket and bind it to an interface.
+
+    :param tx_stmin:
+        Overwrite the separation time in seconds that the receiver requests,
+        see :class:`IsoTpChannel`.
+    :param rx_stmin:
+        Ignore received frames that follow each other faster than this
+        number of seconds.
+    :raises OSError: If the kernel rejected an option or the interface
+        was not found.
+    """
+    flags = options.flags
+    if tx_stmin is not None:
+        flags |= constants.CAN_ISOTP_FORCE_TXSTMIN
+        sock.setsockopt(
+            constants.SOL_CAN_ISOTP,
+            constants.CAN_ISOTP_TX_STMIN,
+            _U32.pack(round(tx_stmin * 1e9)),
+        )
+    if rx_stmin is not None:
+        flags |= constants.CAN_ISOTP_FORCE_RXSTMIN
+        sock.setsockopt(
+            constants.SOL_CAN_ISOTP,
+            constants.CAN_ISOTP_RX_STMIN,
+            _U32.pack(round(rx_stmin * 1e9)),
+        )
+    sock.setsockopt(
+        constants.SOL_CAN_ISOTP,
+        constants.CAN_ISOTP_OPTS,
+        _CAN_ISOTP_OPTIONS.pack(*options._replace(flags=flags)),
+    )
+    sock.setsockopt(
+        constants.SOL_CAN_ISOTP,
+        constants.CAN_ISOTP_RECV_FC,
+        _CAN_ISOTP_FC_OPTIONS.pack(*flow_control),
+    )
+    sock.setsockopt(
+        constants.SOL_CAN_ISOTP,
+        constants.CAN_ISOTP_LL_OPTS,
+        _CAN_ISOTP_LL_OPTIONS.pack(*link_layer),
+    )
+    sock.bind((channel, rx_id, tx_id))
+
+
+class IsoTpChannel:
+    """Sends and receives whole ISO-TP PDUs between two arbitration IDs of a
+    SocketCAN interface::
+
+        with IsoTpChannel("can0", rx_id=0x7E8, tx_id=0x7E0) as channel:
+            channel.send(bytes([0x22, 0xF1, 0x90]))
+            response = channel.recv(timeout=1.0)
+
+    The kernel sends the first frame and the consecutive frames of long
+    PDUs and the flow control frames for received ones, so the timing does
+    not depend on the Python interpreter.
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        rx_id: int,
+        tx_id: int,
+        is_extended_id: bool = False,
+        options: Optional[IsoTpOptions] = None,
+        flow_control: Optional[IsoTpFlowControl] = None,
+        link_layer: Optional[IsoTpLinkLayer] = None,
+        tx_stmin: Optional[float] = None,
+        rx_stmin: Optional[float] = None,
+    ) -> None:
+        """
+        :param channel:
+            The name of the CAN interface, like ``"can0"``.
+        :param rx_id:
+            The arbitration ID of the received frames.
+        :param tx_id:
+            The arbitration ID of the sent frames.
+        :param is_extended_id:
+            Whether the IDs are 29-bit IDs.
+        :param options:
+            The general options, like padding and addressing.
+        :param flow_control:
+            The flow control frames sent while receiving.
+        :param link_layer:
+            The CAN frames to use, for example CAN FD frames.
+        :param tx_stmin:
+            Send consecutive frames with this separation time in seconds,
+            instead of the one requested by the receiver.
+        :param rx_stmin:
+            Ignore received consecutive frames that follow each other faster
+            than this number of seconds.
+
+        :raises ~can.exceptions.CanInterfaceNotImplementedError:
+            If the kernel does not support ISO-TP sockets.
+        :raises ~can.exceptions.CanInitializationError:
+            If the socket could not be set up, for example because the
+            interface does not exist.
+        """
+        self.channel = channel
+        self.rx_id = rx_id
+        self.tx_id = tx_id
+        if is_extended_id:
+            rx_id |= constants.CAN_EFF_FLAG
+            tx_id |= constants.CAN_EFF_FLAG
+
+        try:
+            self.socket = create_isotp_socket()
+        except OSError as error:
+            if error.errno in (errno.EPROTONOSUPPORT, errno.EAFNOSUPPORT):
+                raise CanInterfaceNotImplementedError(
+                    f"The kernel does not support ISO-TP sockets: {error.strerror}",
+                    error.errno,
+                ) from error
+            raise CanInitializationError(
+                f"Could not create an ISO-TP socket: {error.strerror}", error.errno
+            ) from error
+        try:
+            setup_isotp_socket(
+                self.socket,
+                channel,
+                rx_id,
+                tx_id,
+                options or IsoTpOptions(),
+                flow_control or IsoTpFlowControl(),
+                link_layer or IsoTpLinkLayer(),
+                tx_stmin,
+                rx_stmin,
+            )
+        except OSError as error:
+            self.socket.close()
+            raise CanInitializationError(
+                f"Could not set up the ISO-TP socket on {channel}: {error.strerror}",
+                error.errno,
+            ) from error
+        # timeouts are implemented with select
+        self.socket.setblocking(False)
+        self._buffer = bytearray(MAX_PDU_SIZE)
+        log.debug(
+            "Opened ISO-TP channel %s, rx_id=0x%X, tx_id=0x%X",
+            channel,
+            self.rx_id,
+            self.tx_id,
+        )
+
+    def fileno(self) -> int:
+        """The file descriptor of the socket, which is readable when a PDU
+        was received."""
+        return self.socket.fileno()
+
+    def send(self, data: bytes, timeout: Optional[float] = None) -> None:
+        """Send a PDU.
+
+        The kernel sends the frames in the background, unless the
+        ``CAN_ISOTP_WAIT_TX_DONE`` flag is set, in which case this waits
+        until the last frame was sent.
+
+        :param data: The PDU.
+        :param timeout:
+            Wait up to this many seconds for the previous PDU to be sent.
+            0 does not wait, None waits indefinitely.
+
+        :raises ~can.exceptions.CanTimeoutError:
+            If the previous PDU was not sent before the timeout expired.
+        :raises ~can.exceptions.CanOperationError:
+            If sending failed, for example because the receiver did not
+            send a flow control frame in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                self.socket.send(data)
+                return
+            except BlockingIOError:
+                pass
+            except OSError as error:
+                raise CanOperationError(
+                    f"Failed to send the PDU: {error.strerror}", error.errno
+                ) from error
+            if not self._wait(deadline, write=True):
+                raise CanTimeoutError("The previous PDU is still being sent")
+
+    def recv(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Receive a PDU.
+
+        :param timeout:
+            Seconds to wait for a PDU. 0 does not wait, None waits
+            indefinitely.
+        :return: The PDU, or ``None`` if the timeout expired.
+
+        :raises ~can.exceptions.CanOperationError:
+            If receiving failed, for example because a consecutive frame
+            was lost.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                size = self.socket.recv_into(self._buffer)
+                return bytes(self._buffer[:size])
+            except BlockingIOError:
+                pass
+            except OSError as error:
+                raise CanOperationError(
+                    f"Failed to receive a PDU: {error.strerror}", error.errno
+                ) from error
+            if not self._wait(deadline, write=False):
+                return None
+
+    async def send_async(self, data: bytes, timeout: Optional[float] = None) -> None:
+        """Send a PDU without blocking the event loop, see :meth:`send`."""
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(loop.sock_sendall(self.socket, data), timeout)
+        except asyncio.TimeoutError as error:
+            raise CanTimeoutError("The previous PDU is still being sent") from error
+        except OSError as error:
+            raise CanOperationError(
+                f"Failed to send the PDU: {error.strerror}", error.errno
+            ) from error
+
+    async def recv_async(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Receive a PDU without blocking the event loop, see :meth:`recv`."""
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(
+                loop.sock_recv(self.socket, MAX_PDU_SIZE), timeout
+            )
+        except asyncio.TimeoutError:
+            return None
+        except OSError as error:
+            raise CanOperationError(
+                f"Failed to receive a PDU: {error.strerror}", error.errno
+            ) from error
+
+    def close(self) -> None:
+        """Close the socket. A PDU that is still being sent is aborted."""
+        self.socket.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def _wait(self, deadline: Optional[float], write: bool) -> bool:
+        """Wait until the socket is ready, and return whether it is."""
+        timeout = None
+        if deadline is not None:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                return False
+        if write:
+            _, ready, _ = select.select([], [self.socket], [], timeout)
+        else:
+            ready, _, _ = select.select([self.socket], [], [], timeout)
+        return bool(ready)
@@ -0,0 +1,184 @@
+"""
+A minimal implementation of the rtnetlink protocol of Linux, which is used
+to configure CAN related features of the kernel without external tools.
+"""
+
+import errno
+import os
+import socket
+import struct
+import threading
+from collections.abc import Iterator
+from types import TracebackType
+from typing import Optional
+
+from typing_extensions import Self
+
+NETLINK_ROUTE = 0
+
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+
+NLM_F_REQUEST = 0x01
+NLM_F_MULTI = 0x02
+NLM_F_ACK = 0x04
+NLM_F_ROOT = 0x100
+NLM_F_MATCH = 0x200
+NLM_F_DUMP = NLM_F_ROOT | NLM_F_MATCH
+NLM_F_EXCL = 0x200
+NLM_F_CREATE = 0x400
+
+NLA_F_NESTED = 0x8000
+NLA_TYPE_MASK = 0x3FFF
+
+#: Length, type, flags, sequence number, port ID
+NLMSGHDR = struct.Struct("=IHHII")
+#: Length, type
+NLATTR = struct.Struct("=HH")
+#: Error code, followed by the header of the request
+_NLMSGERR = struct.Struct("=i")
+
+_RECV_SIZE = 65536
+
+
+def _align(length: int) -> int:
+    return (length + 3) & ~3
+
+
+def pack_attr(attr_type: int, payload: bytes) -> bytes:
+    """Encode a netlink attribute including its padding."""
+    length = NLATTR.size + len(payload)
+    return NLATTR.pack(length, attr_type) + payload + bytes(_align(length) - length)
+
+
+def iter_attrs(data: bytes) -> Iterator[tuple[int, bytes]]:
+    """Decode consecutive netlink attributes into their types and payloads.
+
+    The flags are removed from the types.
+    """
+    offset = 0
+    while offset + NLATTR.size <= len(data):
+        length, attr_type = NLATTR.unpack_from(data, offset)
+        if length < NLATTR.size:
+            break
+        yield attr_type & NLA_TYPE_MASK, data[offset + NLATTR.size : offset + length]
+        offset += _align(length)
+
+
+def unpack_attrs(data: bytes) -> dict[int, bytes]:
+    """Decode consecutive netlink attributes into a dictionary by type."""
+    return dict(iter_attrs(data))
+
+
+def _iter_messages(data: bytes) -> Iterator[tuple[int, int, bytes]]:
+    """Decode the types, sequence numbers and payloads of netlink messages."""
+    offset = 0
+    while offset + NLMSGHDR.size <= len(data):
+        length, msg_type, _, sequence, _ = NLMSGHDR.unpack_from(data, offset)
+        if length < NLMSGHDR.size:
+            break
+        yield msg_type, sequence, data[offset + NLMSGHDR.size : offset + length]
+        offset += _align(length)
+
+
+class NetlinkSocket:
+    """A netlink socket that sends requests and collects their replies.
+
+    Requests are serialized, so the socket may be shared between threads.
+    """
+
+    def __init__(self, protocol: int = NETLINK_ROUTE, groups: int = 0) -> None:
+        """
+        :param protocol: The netlink protocol.
+        :param groups:
+            A bit mask of the multicast groups whose notifications are
+            received with :meth:`receive`.
+        :raises OSError: If netlink is not supported.
+        """
+        if not hasattr(socket, "AF_NETLINK"):
+            raise OSError(errno.EAFNOSUPPORT, "Netlink is only supported on Linux")
+        self._sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, protocol)
+        try:
+            self._sock.bind((0, groups))
+        except OSError:
+            self._sock.close()
+            raise
+        self._lock = threading.Lock()
+        self._sequence = 0
+
+    def request(
+        self, msg_type: int, payload: bytes, flags: int = 0
+    ) -> list[tuple[int, bytes]]:
+        """Send a request and return the types and payloads of the replies.
+
+        Requests without :data:`NLM_F_DUMP` are acknowledged by the kernel,
+        dumps end with a :data:`NLMSG_DONE` message.
+
+        :raises OSError: If the kernel rejected the request.
+        """
+        dump = flags & NLM_F_DUMP == NLM_F_DUMP
+        if not dump:
+            flags |= NLM_F_ACK
+        with self._lock:
+            self._sequence = (self._sequence + 1) & 0xFFFFFFFF
+            sequence = self._sequence
+            self._sock.send(
+                NLMSGHDR.pack(
+                    NLMSGHDR.size + len(payload),
+                    msg_type,
+                    flags | NLM_F_REQUEST,
+                    sequence,
+                    0,
+                )
+                + payload
+            )
+
+            replies: list[tuple[int, bytes]] = []
+            while True:
+                data = self._sock.recv(_RECV_SIZE)
+                for reply_type, reply_sequence, reply in _iter_messages(data):
+                    if reply_sequence != sequence:
+                        # a late reply of an earlier request
+                        continue
+                    if reply_type == NLMSG_ERROR:
+                        (error,) = _NLMSGERR.unpack_from(reply)
+                        if error:
+                            raise OSError(-error, os.strerror(-error))
+                        return replies
+                    if reply_type == NLMSG_DONE:
+                        return replies
+                    replies.append((reply_type, reply))
+
+    def receive(self) -> list[tuple[int, bytes]]:
+        """Return the types and payloads of the pending notifications.
+
+        Does not block if there are none.
+        """
+        notifications: list[tuple[int, bytes]] = []
+        with self._lock:
+            while True:
+                try:
+                    data = self._sock.recv(_RECV_SIZE, socket.MSG_DONTWAIT)
+                except BlockingIOError:
+                    return notifications
+                notifications.extend(
+                    (msg_type, payload) for msg_type, _, payload in _iter_messages(data)
+                )
+
+    def fileno(self) -> int:
+        return self._sock.fileno()
+
+    def close(self) -> None:
+        """Close the socket."""
+        self._sock.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
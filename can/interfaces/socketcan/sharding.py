@@ -0,0 +1,254 @@
+"""
+Receives from a SocketCAN interface with several raw sockets in parallel.
+
+Every socket (shard) gets the frames whose arbitration IDs end with the
+bits of its index through the filters of the kernel, and is read by its
+own thread. The frames of all shards are merged by their kernel timestamps.
+"""
+
+import heapq
+import itertools
+import logging
+import select
+import socket
+import struct
+import threading
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional
+
+from can import typechecking
+from can.bus import _WakeupSocket
+from can.exceptions import CanOperationError
+from can.message import Message
+
+from .socketcan import (
+    _DropCounter,
+    _set_socket_filters,
+    _setup_socket,
+    bind_socket,
+    create_socket,
+)
+
+if TYPE_CHECKING:
+    from .socketcan import SocketcanBus
+
+log = logging.getLogger(__name__)
+
+_CAN_ID = struct.Struct("=I")
+
+
+class ShardStatistics(NamedTuple):
+    """The counters of one shard of a :class:`~can.interfaces.socketcan.SocketcanBus`."""
+
+    #: The filters of the shard in the kernel
+    can_filters: list[typechecking.CanFilter]
+    #: The number of frames received by the shard
+    messages_received: int
+    #: The number of frames that the kernel dropped, because the receive
+    #: queue of the shard was full
+    rx_queue_dropped: int
+
+
+def partition_filters(
+    can_filters: Optional[typechecking.CanFilters], shards: int
+) -> list[list[typechecking.CanFilter]]:
+    """Split filters into disjoint filters for every shard.
+
+    Shard *k* receives the frames that pass the filters and whose arbitration
+    ID modulo *shards* is *k*.
+
+    :param can_filters: The filters of the bus, see :meth:`can.BusABC.set_filters`.
+    :param shards: The number of shards, a power of two.
+    """
+    if not can_filters:
+        can_filters = [{"can_id": 0, "can_mask": 0}]
+    shard_mask = shards - 1
+
+    partitions: list[list[typechecking.CanFilter]] = []
+    for shard in range(shards):
+        partition = []
+        for can_filter in can_filters:
+            can_id, can_mask = can_filter["can_id"], can_filter["can_mask"]
+            if (can_id ^ shard) & can_mask & shard_mask:
+                # the filter only matches IDs of other shards
+                continue
+            shard_filter: typechecking.CanFilter = {
+                **can_filter,
+                "can_id": (can_id & can_mask & ~shard_mask) | shard,
+                "can_mask": can_mask | shard_mask,
+            }
+            partition.append(shard_filter)
+        partitions.append(partition)
+    return partitions
+
+
+class _Shard:
+    def __init__(self, sock: socket.socket, drops: _DropCounter) -> None:
+        self.socket = sock
+        self.drops = drops
+        self.can_filters: list[typechecking.CanFilter] = []
+        self.messages_received = 0
+        self.thread: Optional[threading.Thread] = None
+
+
+class ShardedReceiver:
+    """Receives the frames of a :class:`~can.interfaces.socketcan.SocketcanBus`
+    with several sockets.
+
+    The first shard uses the socket of the bus, the others are created with
+    the same options.
+    """
+
+    def __init__(
+        self,
+        bus: "SocketcanBus",
+        shards: int,
+        merge_delay: float,
+        **socket_options: Any,
+    ) -> None:
+        self._bus = bus
+        self.merge_delay = merge_delay
+        self._shards = [_Shard(bus.socket, bus._rx_drops)]
+        try:
+            for _ in range(shards - 1):
+                sock = create_socket()
+                self._shards.append(_Shard(sock, _DropCounter()))
+                _setup_socket(sock, **socket_options)
+                # do not receive every frame until the filters are set
+                self._set_filters(self._shards[-1], [])
+                bind_socket(sock, bus.channel)
+        except OSError:
+            self._close_sockets()
+            raise
+
+        # frames by kernel timestamp, with the time they were received
+        self._frames: list[tuple[float, int, float, Message]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._woken = False
+        self._stopped = False
+        self._stop_threads = _WakeupSocket()
+        #: The exception that stopped receiving, if any
+        self.exception: Optional[Exception] = None
+
+    def start(self) -> None:
+        """Start a thread for every shard."""
+        for index, shard in enumerate(self._shards):
+            shard.thread = threading.Thread(
+                target=self._run,
+                args=(shard,),
+                name=f"can.socketcan shard {index} of {self._bus.channel}",
+                daemon=True,
+            )
+            shard.thread.start()
+
+    def apply_filters(self, can_filters: Optional[typechecking.CanFilters]) -> None:
+        """Set the partitions of the filters in the kernel.
+
+        :raises OSError: If the kernel rejected the filters.
+        :raises ValueError: If the payload terms cannot be compiled.
+        """
+        partitions = partition_filters(can_filters, len(self._shards))
+        for shard, partition in zip(self._shards, partitions):
+            self._set_filters(shard, partition)
+
+    @staticmethod
+    def _set_filters(shard: _Shard, can_filters: list[typechecking.CanFilter]) -> None:
+        _set_socket_filters(shard.socket, can_filters)
+        shard.can_filters = can_filters
+
+    def socket_for(self, frame: bytes) -> socket.socket:
+        """Return the socket of the shard that receives the given frame.
+
+        Sending a frame with it keeps its loopback from being received by
+        another shard as a frame of a different socket.
+        """
+        (can_id,) = _CAN_ID.unpack_from(frame)
+        return self._shards[can_id & (len(self._shards) - 1)].socket
+
+    def get(self, timeout: Optional[float]) -> Optional[Message]:
+        """Return the received frame with the earliest timestamp.
+
+        :return: The frame, or ``None`` if the timeout expired or
+            :meth:`wake` was called.
+        :raises ~can.exceptions.CanOperationError: If receiving failed.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                wait = None
+                if self._frames:
+                    wait = self._frames[0][2] + self.merge_delay - time.monotonic()
+                    if wait <= 0:
+                        return heapq.heappop(self._frames)[3]
+                elif self.exception is not None:
+                    raise CanOperationError(
+                        f"Receiving failed: {self.exception}"
+                    ) from self.exception
+                if self._woken:
+                    self._woken = False
+                    return None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._condition.wait(wait)
+
+    def wake(self) -> None:
+        """Make a waiting call of :meth:`get` return ``None``."""
+        with self._condition:
+            self._woken = True
+            self._condition.notify_all()
+
+    def statistics(self) -> list[ShardStatistics]:
+        """Return the statistics of every shard."""
+        return [
+            ShardStatistics(
+                list(shard.can_filters), shard.messages_received, shard.drops.total
+            )
+            for shard in self._shards
+        ]
+
+    def stop(self) -> None:
+        """Stop the threads and close the sockets, except the one of the bus."""
+        self._stopped = True
+        self._stop_threads.set()
+        for shard in self._shards:
+            if shard.thread is not None:
+                shard.thread.join()
+        self._stop_threads.close()
+        self._close_sockets()
+
+    def _close_sockets(self) -> None:
+        for shard in self._shards[1:]:
+            shard.socket.close()
+
+    def _run(self, shard: _Shard) -> None:
+        # pylint: disable=protected-access
+        try:
+            while not self._stopped:
+                readable, _, _ = select.select(
+                    [shard.socket, self._stop_threads], [], []
+                )
+                if self._stopped:
+                    return
+                if not readable:
+                    continue
+                msg = self._bus._receive_from(shard.socket, shard.drops)
+                if msg is None:
+                    continue
+                shard.messages_received += 1
+                with self._condition:
+                    heapq.heappush(
+                        self._frames,
+                        (msg.timestamp, next(self._sequence), time.monotonic(), msg),
+                    )
+                    self._condition.notify()
+        except (OSError, CanOperationError) as error:
+            if self._stopped:
+                return
+            log.warning("Stopped receiving with a shard: %s", error)
+            with self._condition:
+                self.exception = error
+                self._condition.notify_all()
@@ -1,3 +1,4 @@
+# pylint: disable=too-many-lines
 """
 The main module of the socketcan interface containing most user-facing classes and methods
 along some internal methods.
@@ -16,7 +17,7 @@ import threading
 import time
 import warnings
 from collections.abc import Sequence
-from typing import Callable, Optional, Union
+from typing import TYPE_CHECKING, Callable, Optional, Union
 
 import can
 from can import BusABC, CanProtocol, Message
@@ -25,10 +26,21 @@ from can.broadcastmanager import (
     ModifiableCyclicTaskABC,
     RestartableCyclicTaskABC,
 )
+from can.bus import _WakeupSocket
 from can.interfaces.socketcan import constants
+from can.interfaces.socketcan.bpf import (
+    attach_program,
+    compile_filters,
+    detach_program,
+    has_payload_terms,
+)
+from can.interfaces.socketcan.statistics import DeviceStatistics, get_device_statistics
 from can.interfaces.socketcan.utils import find_available_interfaces, pack_filters
 from can.typechecking import CanFilters
 
+if TYPE_CHECKING:
+    from can.interfaces.socketcan.sharding import ShardedReceiver, ShardStatistics
+
 log = logging.getLogger(__name__)
 log_tx = log.getChild("tx")
 log_rx = log.getChild("rx")
@@ -44,10 +56,20 @@ except ImportError:
 
 # Constants needed for precise handling of timestamps
 RECEIVED_TIMESTAMP_STRUCT = struct.Struct("@ll")
+# The number of frames dropped in the receive queue, see SO_RXQ_OVFL in socket(7)
+RECEIVED_DROPPED_STRUCT = struct.Struct("@I")
 RECEIVED_ANCILLARY_BUFFER_SIZE = (
-    CMSG_SPACE(RECEIVED_TIMESTAMP_STRUCT.size) if CMSG_SPACE_available else 0
+    CMSG_SPACE(RECEIVED_TIMESTAMP_STRUCT.size)
+    + CMSG_SPACE(RECEIVED_DROPPED_STRUCT.size)
+    if CMSG_SPACE_available
+    else 0
 )
 
+# Constants needed for scheduled transmission with SO_TXTIME, see
+# struct sock_txtime in <linux/net_tstamp.h> and SCM_TXTIME in socket(7)
+SOCK_TXTIME_STRUCT = struct.Struct("@iI")
+TXTIME_STRUCT = struct.Struct("@Q")
+
 
 # Setup BCM struct
 def bcm_header_factory(
@@ -618,15 +640,30 @@ def capture_message(
 
     :return: The received message, or None on failure.
     """
+    return _capture_message(sock, get_channel)[0]
+
+
+def _capture_message(
+    sock: socket.socket, get_channel: bool = False, flags: int = 0
+) -> tuple[Optional[Message], Optional[int]]:
+    """Like :func:`capture_message`, but also returns the number of frames
+    that were dropped in the receive queue of the socket so far, if the
+    kernel reported it with ``SO_RXQ_OVFL``.
+
+    With ``MSG_DONTWAIT`` in *flags*, ``(None, None)`` is returned if no
+    frame was received.
+    """
     # Fetching the Arb ID, DLC and Data
     try:
         cf, ancillary_data, msg_flags, addr = sock.recvmsg(
-            constants.CANFD_MTU, RECEIVED_ANCILLARY_BUFFER_SIZE
+            constants.CANFD_MTU, RECEIVED_ANCILLARY_BUFFER_SIZE, flags
         )
         if get_channel:
             channel = addr[0] if isinstance(addr, tuple) else addr
         else:
             channel = None
+    except BlockingIOError:
+        return None, None
     except OSError as error:
         raise can.CanOperationError(
             f"Error receiving: {error.strerror}", error.errno
@@ -634,19 +671,26 @@ def capture_message(
 
     can_id, can_dlc, flags, data = dissect_can_frame(cf)
 
-    # Fetching the timestamp
-    assert len(ancillary_data) == 1, "only requested a single extra field"
-    cmsg_level, cmsg_type, cmsg_data = ancillary_data[0]
-    assert (
-        cmsg_level == socket.SOL_SOCKET and cmsg_type == constants.SO_TIMESTAMPNS
-    ), "received control message type that was not requested"
-    # see https://man7.org/linux/man-pages/man3/timespec.3.html -> struct timespec for details
-    seconds, nanoseconds = RECEIVED_TIMESTAMP_STRUCT.unpack_from(cmsg_data)
-    if nanoseconds >= 1e9:
-        raise can.CanOperationError(
-            f"Timestamp nanoseconds field was out of range: {nanoseconds} not less than 1e9"
-        )
-    timestamp = seconds + nanoseconds * 1e-9
+    # Fetching the timestamp and the number of dropped frames, which the
+    # kernel only sends once frames were dropped
+    timestamp: Optional[float] = None
+    dropped: Optional[int] = None
+    for cmsg_level, cmsg_type, cmsg_data in ancillary_data:
+        assert cmsg_level == socket.SOL_SOCKET and cmsg_type in (
+            constants.SO_TIMESTAMPNS,
+            constants.SO_RXQ_OVFL,
+        ), "received control message type that was not requested"
+        if cmsg_type == constants.SO_RXQ_OVFL:
+            (dropped,) = RECEIVED_DROPPED_STRUCT.unpack_from(cmsg_data)
+            continue
+        # see https://man7.org/linux/man-pages/man3/timespec.3.html -> struct timespec for details
+        seconds, nanoseconds = RECEIVED_TIMESTAMP_STRUCT.unpack_from(cmsg_data)
+        if nanoseconds >= 1e9:
+            raise can.CanOperationError(
+                f"Timestamp nanoseconds field was out of range: {nanoseconds} not less than 1e9"
+            )
+        timestamp = seconds + nanoseconds * 1e-9
+    assert timestamp is not None, "did not receive the requested timestamp"
 
     # EXT, RTR, ERR flags -> boolean attributes
     #   /* special address description flags for the CAN_ID */
@@ -686,7 +730,159 @@ def capture_message(
         data=data,
     )
 
-    return msg
+    return msg, dropped
+
+
+class _DropCounter:
+    """Accumulates the number of dropped frames that the kernel reports with
+    ``SO_RXQ_OVFL`` as an unsigned 32 bit counter."""
+
+    __slots__ = ("counter", "total")
+
+    def __init__(self) -> None:
+        self.counter = 0
+        self.total = 0
+
+    def update(self, counter: int) -> int:
+        """Return the number of frames dropped since the last update."""
+        dropped = (counter - self.counter) & 0xFFFFFFFF
+        self.counter = counter
+        self.total += dropped
+        return dropped
+
+
+def _setup_socket(
+    sock: socket.socket,
+    receive_own_messages: bool,
+    local_loopback: bool,
+    fd: bool,
+    error_frames: bool,
+    receive_buffer_size: Optional[int],
+    txtime: bool,
+    txtime_clock: int,
+    busy_poll: Optional[int],
+) -> bool:
+    """Set the options of a raw socket of a :class:`SocketcanBus`.
+
+    :return: Whether scheduled transmission is enabled.
+    """
+    # set the local_loopback parameter
+    try:
+        sock.setsockopt(
+            constants.SOL_CAN_RAW,
+            constants.CAN_RAW_LOOPBACK,
+            1 if local_loopback else 0,
+        )
+    except OSError as error:
+        log.error("Could not set local loopback flag(%s)", error)
+
+    # set the receive_own_messages parameter
+    try:
+        sock.setsockopt(
+            constants.SOL_CAN_RAW,
+            constants.CAN_RAW_RECV_OWN_MSGS,
+            1 if receive_own_messages else 0,
+        )
+    except OSError as error:
+        log.error("Could not receive own messages (%s)", error)
+
+    # enable CAN-FD frames if desired
+    if fd:
+        try:
+            sock.setsockopt(constants.SOL_CAN_RAW, constants.CAN_RAW_FD_FRAMES, 1)
+        except OSError as error:
+            log.error("Could not enable CAN-FD frames (%s)", error)
+
+    if error_frames:
+        # enable error frames
+        try:
+            sock.setsockopt(
+                constants.SOL_CAN_RAW, constants.CAN_RAW_ERR_FILTER, 0x1FFFFFFF
+            )
+        except OSError as error:
+            log.error("Could not enable error frames (%s)", error)
+
+    # enable nanosecond resolution timestamping
+    # we can always do this since
+    #  1) it is guaranteed to be at least as precise as without
+    #  2) it is available since Linux 2.6.22, and CAN support was only added afterward
+    #     so this is always supported by the kernel
+    sock.setsockopt(socket.SOL_SOCKET, constants.SO_TIMESTAMPNS, 1)
+
+    # count the frames dropped because the receive queue was full
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, constants.SO_RXQ_OVFL, 1)
+    except OSError as error:
+        log.error("Could not enable counting dropped frames (%s)", error)
+
+    if receive_buffer_size is not None:
+        _set_receive_buffer_size(sock, receive_buffer_size)
+
+    if busy_poll is not None:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, constants.SO_BUSY_POLL, busy_poll)
+        except OSError as error:
+            log.warning(
+                "Could not enable busy polling, which requires CAP_NET_ADMIN "
+                "above net.core.busy_read (%s)",
+                error,
+            )
+
+    # enable scheduled transmission if desired
+    if txtime:
+        try:
+            sock.setsockopt(
+                socket.SOL_SOCKET,
+                constants.SO_TXTIME,
+                SOCK_TXTIME_STRUCT.pack(txtime_clock, 0),
+            )
+        except OSError as error:
+            log.warning(
+                "SO_TXTIME is not supported, falling back to sleeping "
+                "until the launch time (%s)",
+                error,
+            )
+        else:
+            return True
+    return False
+
+
+def _set_receive_buffer_size(sock: socket.socket, size: int) -> None:
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, size)
+    except OSError as error:
+        log.error("Could not set the receive buffer size (%s)", error)
+        return
+    # Linux reports twice the size that was set
+    actual_size = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+    if actual_size >= 2 * size:
+        return
+    # the size was limited by net.core.rmem_max
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, constants.SO_RCVBUFFORCE, size)
+    except OSError as error:
+        log.warning(
+            "The receive buffer size is limited to %d bytes by "
+            "net.core.rmem_max, exceeding it requires CAP_NET_ADMIN (%s)",
+            actual_size // 2,
+            error,
+        )
+
+
+#: The keys of filters that the kernel checks completely
+_KERNEL_FILTER_KEYS = frozenset(("can_id", "can_mask", "extended", "data"))
+
+
+def _set_socket_filters(sock: socket.socket, can_filters: Optional[CanFilters]) -> None:
+    check_payload = has_payload_terms(can_filters)
+    if check_payload:
+        # attach the program first, so that no frame passes by the ID alone
+        attach_program(sock, compile_filters(can_filters))
+    sock.setsockopt(
+        constants.SOL_CAN_RAW, constants.CAN_RAW_FILTER, pack_filters(can_filters)
+    )
+    if not check_payload:
+        detach_program(sock)
 
 
 class SocketcanBus(BusABC):  # pylint: disable=abstract-method
@@ -696,6 +892,10 @@ class SocketcanBus(BusABC):  # pylint: disable=abstract-method
     available interfaces.
     """
 
+    _receiver: Optional["ShardedReceiver"] = None
+    _send_with_fileno = True
+    _rx_spin_time: float = 0.0
+
     def __init__(
         self,
         channel: str = "",
@@ -704,6 +904,14 @@ class SocketcanBus(BusABC):  # pylint: disable=abstract-method
         fd: bool = False,
         can_filters: Optional[CanFilters] = None,
         ignore_rx_error_frames=False,
+        txtime: bool = False,
+        txtime_clock: int = constants.CLOCK_TAI,
+        receive_buffer_size: Optional[int] = None,
+        report_rx_drops: bool = False,
+        rx_shards: int = 1,
+        rx_merge_delay: float = 0.0,
+        rx_spin_time: float = 0.0,
+        busy_poll: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Creates a new socketcan bus.
@@ -712,8 +920,9 @@ class SocketcanBus(BusABC):  # pylint: disable=abstract-method
         but no exception will be thrown. This includes enabling:
 
             - that own messages should be received,
-            - CAN-FD frames and
-            - error frames.
+            - CAN-FD frames,
+            - error frames and
+            - counting the frames dropped in the receive queue.
 
         :param channel:
             The can interface name with which to create this bus.
@@ -736,7 +945,48 @@ class SocketcanBus(BusABC):  # pylint: disable=abstract-method
             See :meth:`can.BusABC.set_filters`.
         :param ignore_rx_error_frames:
             If incoming error frames should be discarded.
+        :param txtime:
+            If scheduled transmission via ``SO_TXTIME`` should be enabled,
+            see :meth:`send_at`. If the kernel does not support it, a warning
+            is logged and :meth:`send_at` falls back to sleeping in Python.
+        :param txtime_clock:
+            The clock id that launch times passed to :meth:`send_at` refer to.
+            The ``etf`` queueing discipline requires ``CLOCK_TAI``.
+        :param receive_buffer_size:
+            The size of the receive buffer of the socket in bytes
+            (``SO_RCVBUF``). Sizes above ``net.core.rmem_max`` are forced
+            with ``SO_RCVBUFFORCE``, which requires the ``CAP_NET_ADMIN``
+            capability. See :attr:`receive_buffer_size` for the actual size.
+        :param report_rx_drops:
+            If a warning should be logged when the kernel dropped frames,
+            because the receive queue was full. It names the timestamp of the
+            first frame after the gap. See :attr:`rx_queue_dropped`.
+        :param rx_shards:
+            The number of raw sockets that receive in parallel, each from its
+            own thread. Must be a power of two. The frames are distributed by
+            the lower bits of their arbitration IDs, see
+            :ref:`socketcan-sharded-receive`.
+        :param rx_merge_delay:
+            The number of seconds that frames received by several shards are
+            held back, to deliver frames with earlier kernel timestamps that
+            another shard received later first.
+        :param rx_spin_time:
+            The number of seconds that :meth:`~can.BusABC.recv` polls the
+            socket without blocking, before it waits for a frame. This
+            saves the wake up of the thread when frames arrive within this
+            time, at the cost of a busy CPU core, see
+            :ref:`socketcan-low-latency`. Not used with several *rx_shards*.
+        :param busy_poll:
+            The number of microseconds that the kernel polls the device for
+            frames when the receive queue is empty (``SO_BUSY_POLL``). This
+            only has an effect with drivers that support busy polling, and
+            values above ``net.core.busy_read`` require the
+            ``CAP_NET_ADMIN`` capability.
         """
+        if rx_shards < 1 or rx_shards & (rx_shards - 1):
+            raise ValueError(f"rx_shards must be a power of two, not {rx_shards}")
+        if rx_spin_time < 0:
+            raise ValueError(f"rx_spin_time must not be negative, not {rx_spin_time}")
         self.socket = create_socket()
         self.channel = channel
         self.channel_info = f"socketcan channel '{channel}'"
@@ -745,51 +995,23 @@ class SocketcanBus(BusABC):  # pylint: disable=abstract-method
         self._task_id = 0
         self._task_id_guard = threading.Lock()
         self._can_protocol = CanProtocol.CAN_FD if fd else CanProtocol.CAN_20
-
-        # set the local_loopback parameter
-        try:
-            self.socket.setsockopt(
-                constants.SOL_CAN_RAW,
-                constants.CAN_RAW_LOOPBACK,
-                1 if local_loopback else 0,
-            )
-        except OSError as error:
-            log.error("Could not set local loopback flag(%s)", error)
-
-        # set the receive_own_messages parameter
-        try:
-            self.socket.setsockopt(
-                constants.SOL_CAN_RAW,
-                constants.CAN_RAW_RECV_OWN_MSGS,
-                1 if receive_own_messages else 0,
-            )
-        except OSError as error:
-            log.error("Could not receive own messages (%s)", error)
-
-        # enable CAN-FD frames if desired
-        if fd:
-            try:
-                self.socket.setsockopt(
-                    constants.SOL_CAN_RAW, constants.CAN_RAW_FD_FRAMES, 1
-                )
-            except OSError as error:
-                log.error("Could not enable CAN-FD frames (%s)", error)
-
-        if not ignore_rx_error_frames:
-            # enable error frames
-            try:
-                self.socket.setsockopt(
-                    constants.SOL_CAN_RAW, constants.CAN_RAW_ERR_FILTER, 0x1FFFFFFF
-                )
-            except OSError as error:
-                log.error("Could not enable error frames (%s)", error)
-
-        # enable nanosecond resolution timestamping
-        # we can always do this since
-        #  1) it is guaranteed to be at least as precise as without
-        #  2) it is available since Linux 2.6.22, and CAN support was only added afterward
-        #     so this is always supported by the kernel
-        self.socket.setsockopt(socket.SOL_SOCKET, constants.SO_TIMESTAMPNS, 1)
+        self._txtime_clock = txtime_clock
+        self._report_rx_drops = report_rx_drops
+        self._rx_drops = _DropCounter()
+        self._rx_spin_time = rx_spin_time
+
+        socket_options = {
+            "receive_own_messages": receive_own_messages,
+            "local_loopback": local_loopback,
+            "fd": fd,
+            "receive_buffer_size": receive_buffer_size,
+            "txtime": txtime,
+            "txtime_clock": txtime_clock,
+            "busy_poll": busy_poll,
+        }
+        self._txtime = _setup_socket(
+            self.socket, error_frames=not ignore_rx_error_frames, **socket_options
+        )
 
         try:
             bind_socket(self.socket, channel)
@@ -798,20 +1020,41 @@ class SocketcanBus(BusABC):  # pylint: disable=abstract-method
                     "receive_own_messages": receive_own_messages,
                     "fd": fd,
                     "local_loopback": local_loopback,
+                    "txtime": txtime,
+                    "txtime_clock": txtime_clock,
+                    "receive_buffer_size": receive_buffer_size,
+                    "report_rx_drops": report_rx_drops,
+                    "rx_shards": rx_shards,
+                    "rx_merge_delay": rx_merge_delay,
+                    "rx_spin_time": rx_spin_time,
+                    "busy_poll": busy_poll,
                 }
             )
         except OSError as error:
             log.error("Could not access SocketCAN device %s (%s)", channel, error)
             raise
+
+        if rx_shards > 1:
+            # pylint: disable=import-outside-toplevel
+            from .sharding import ShardedReceiver  # noqa: PLC0415
+
+            self._receiver = ShardedReceiver(
+                self, rx_shards, rx_merge_delay, error_frames=False, **socket_options
+            )
+        self._wakeup = _WakeupSocket()
         super().__init__(
             channel=channel,
             can_filters=can_filters,
             **kwargs,
         )
+        if self._receiver is not None:
+            self._receiver.start()
 
     def shutdown(self) -> None:
         """Stops all active periodic tasks and closes the socket."""
         super().shutdown()
+        if self._receiver is not None:
+            self._receiver.stop()
         for channel, bcm_socket in self._bcm_sockets.items():
             log.debug("Closing bcm socket for channel %s", channel)
             bcm_socket.close()
@@ -821,27 +1064,113 @@ class SocketcanBus(BusABC):  # pylint: disable=abstract-method
     def _recv_internal(
         self, timeout: Optional[float]
     ) -> tuple[Optional[Message], bool]:
+        if self._receiver is not None:
+            return self._receiver.get(timeout), self._is_filtered
+
+        if self._rx_spin_time:
+            msg, timeout = self._spin(timeout)
+            if msg is not None:
+                return msg, self._is_filtered
+
         try:
             # get all sockets that are ready (can be a list with a single value
             # being self.socket or an empty list if self.socket is not ready)
-            ready_receive_sockets, _, _ = select.select([self.socket], [], [], timeout)
+            ready_receive_sockets, _, _ = select.select(
+                [self.socket, self._wakeup], [], [], timeout
+            )
         except OSError as error:
             # something bad happened (e.g. the interface went down)
             raise can.CanOperationError(
                 f"Failed to receive: {error.strerror}", error.errno
             ) from error
 
-        if ready_receive_sockets:  # not empty
-            get_channel = self.channel == ""
-            msg = capture_message(self.socket, get_channel)
-            if msg and not msg.channel and self.channel:
-                # Default to our own channel
-                msg.channel = self.channel
-            return msg, self._is_filtered
+        if self._wakeup in ready_receive_sockets:
+            # interrupted, see BusABC.interrupt()
+            self._wakeup.clear()
+        elif ready_receive_sockets:  # not empty
+            return self._receive_from(self.socket, self._rx_drops), self._is_filtered
 
         # socket wasn't readable or timeout occurred
         return None, self._is_filtered
 
+    def _spin(
+        self, timeout: Optional[float]
+    ) -> tuple[Optional[Message], Optional[float]]:
+        """Receive without blocking until a frame arrives or the spin time
+        is over.
+
+        :return: The frame or ``None``, and the remaining timeout.
+        """
+        spin_time = self._rx_spin_time
+        if timeout is not None:
+            spin_time = min(spin_time, timeout)
+        msg = None
+        started = time.perf_counter()
+        elapsed = 0.0
+        # interrupt() sets the flag before it wakes up the select call
+        while not self._interrupt_pending:
+            msg = self._receive_from(self.socket, self._rx_drops, socket.MSG_DONTWAIT)
+            elapsed = time.perf_counter() - started
+            if msg is not None or elapsed >= spin_time:
+                break
+        return msg, None if timeout is None else max(0.0, timeout - elapsed)
+
+    def _receive_from(
+        self, sock: socket.socket, drops: _DropCounter, flags: int = 0
+    ) -> Optional[Message]:
+        get_channel = self.channel == ""
+        msg, counter = _capture_message(sock, get_channel, flags)
+        if msg and not msg.channel and self.channel:
+            # Default to our own channel
+            msg.channel = self.channel
+        if counter is not None and counter != drops.counter:
+            dropped = drops.update(counter)
+            if self._report_rx_drops:
+                log_rx.warning(
+                    "%d frames were dropped in the receive queue before the frame at %s",
+                    dropped,
+                    msg.timestamp if msg else None,
+                )
+        return msg
+
+    def _wake_up(self) -> None:
+        if self._receiver is not None:
+            self._receiver.wake()
+        else:
+            super()._wake_up()
+
+    @property
+    def rx_queue_dropped(self) -> int:
+        """The number of frames that the kernel dropped since the bus was
+        created, because its receive queue was full.
+
+        The kernel reports them with the next received frame, so the
+        number is only updated when frames are received. The queue holds
+        :attr:`receive_buffer_size` bytes.
+        """
+        if self._receiver is not None:
+            return sum(shard.rx_queue_dropped for shard in self._receiver.statistics())
+        return self._rx_drops.total
+
+    def shard_statistics(self) -> list["ShardStatistics"]:
+        """Return the statistics of every shard, if the bus receives with
+        several sockets, see the ``rx_shards`` argument.
+
+        :return: The statistics, or an empty list if the bus is not sharded.
+        """
+        if self._receiver is None:
+            return []
+        return self._receiver.statistics()
+
+    @property
+    def receive_buffer_size(self) -> int:
+        """The size of the receive buffer of the socket in bytes.
+
+        Linux reports twice the size that was set, to account for its
+        bookkeeping overhead.
+        """
+        return int(self.socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF))
+
     def send(self, msg: Message, timeout: Optional[float] = None) -> None:
         """Transmit a message to the CAN bus.
 
@@ -857,36 +1186,112 @@ class SocketcanBus(BusABC):  # pylint: disable=abstract-method
         logger_tx = log.getChild("tx")
         logger_tx.debug("sending: %s", msg)
 
+        self._send_frame(build_can_frame(msg), msg.channel, timeout)
+
+    @property
+    def txtime_supported(self) -> bool:
+        """Whether :meth:`send_at` hands the launch time to the kernel."""
+        return self._txtime
+
+    def txtime_now(self) -> float:
+        """Return the current time of the clock used by :meth:`send_at` in seconds."""
+        return time.clock_gettime(self._txtime_clock)
+
+    def send_at(
+        self, msg: Message, launch_time: float, timeout: Optional[float] = None
+    ) -> None:
+        """Transmit a message at the given launch time.
+
+        If the bus was created with ``txtime=True`` and the kernel supports
+        ``SO_TXTIME``, the message is queued immediately together with an
+        ``SCM_TXTIME`` control message and released by the kernel. This
+        requires a time based queueing discipline like ``etf`` on the
+        interface, e.g.::
+
+            tc qdisc replace dev can0 root etf clockid CLOCK_TAI delta 200000
+
+        Otherwise, this method sleeps until the launch time and calls
+        :meth:`send`.
+
+        :param msg: A message object.
+        :param launch_time:
+            The time to put the message on the bus in seconds, according to
+            the clock returned by :meth:`txtime_now`. Launch times in the past
+            are moved to the current time.
+        :param timeout:
+            Wait up to this many seconds for the transmit queue to be ready.
+            If not given, the call may fail immediately.
+
+        :raises ~can.exceptions.CanError:
+            if the message could not be written.
+        """
+        now = self.txtime_now()
+        if not self._txtime:
+            if launch_time > now:
+                time.sleep(launch_time - now)
+            self.send(msg, timeout)
+            return
+
+        log_tx.debug("sending at %.9f: %s", launch_time, msg)
+        txtime_ns = round(max(launch_time, now) * 1e9)
+        ancillary_data = [
+            (socket.SOL_SOCKET, constants.SCM_TXTIME, TXTIME_STRUCT.pack(txtime_ns))
+        ]
+        self._send_frame(build_can_frame(msg), msg.channel, timeout, ancillary_data)
+
+    def _send_frame(
+        self,
+        data: bytes,
+        channel: Optional[can.typechecking.Channel],
+        timeout: Optional[float],
+        ancillary_data: Sequence[tuple[int, int, bytes]] = (),
+    ) -> None:
         started = time.time()
         # If no timeout is given, poll for availability
         if timeout is None:
             timeout = 0
         time_left = timeout
-        data = build_can_frame(msg)
+
+        sock = self.socket
+        if self._receiver is not None:
+            # the loopback of the frame only reaches the shard of its ID
+            sock = self._receiver.socket_for(data)
 
         while time_left >= 0:
             # Wait for write availability
-            ready = select.select([], [self.socket], [], time_left)[1]
+            ready = select.select([], [sock], [], time_left)[1]
             if not ready:
                 # Timeout
                 break
-            channel = str(msg.channel) if msg.channel else None
-            sent = self._send_once(data, channel)
+            sent = self._send_once(
+                data, str(channel) if channel else None, ancillary_data, sock
+            )
             if sent == len(data):
                 return
             # Not all data were sent, try again with remaining data
             data = data[sent:]
             time_left = timeout - (time.time() - started)
 
-        raise can.CanOperationError("Transmit buffer full")
+        raise can.CanOperationError("Transmit buffer full", errno.ENOBUFS)
 
-    def _send_once(self, data: bytes, channel: Optional[str] = None) -> int:
+    def _send_once(
+        self,
+        data: bytes,
+        channel: Optional[str] = None,
+        ancillary_data: Sequence[tuple[int, int, bytes]] = (),
+        sock: Optional[socket.socket] = None,
+    ) -> int:
+        if sock is None:
+            sock = self.socket
         try:
-            if self.channel == "" and channel:
+            if ancillary_data:
+                address = (channel,) if self.channel == "" and channel else None
+                sent = sock.sendmsg([data], ancillary_data, 0, address)
+            elif self.channel == "" and channel:
                 # Message must be addressed to a specific channel
-                sent = self.socket.sendto(data, (channel,))
+                sent = sock.sendto(data, (channel,))
             else:
-                sent = self.socket.send(data)
+                sent = sock.send(data)
         except OSError as error:
             raise can.CanOperationError(
                 f"Failed to transmit: {error.strerror}", error.errno
@@ -976,10 +1381,11 @@ class SocketcanBus(BusABC):  # pylint: disable=abstract-method
 
     def _apply_filters(self, filters: Optional[can.typechecking.CanFilters]) -> None:
         try:
-            self.socket.setsockopt(
-                constants.SOL_CAN_RAW, constants.CAN_RAW_FILTER, pack_filters(filters)
-            )
-        except OSError as error:
+            if self._receiver is not None:
+                self._receiver.apply_filters(filters)
+            else:
+                _set_socket_filters(self.socket, filters)
+        except (OSError, ValueError) as error:
             # fall back to "software filtering" (= not in kernel)
             self._is_filtered = False
             log.error(
@@ -987,11 +1393,36 @@ class SocketcanBus(BusABC):  # pylint: disable=abstract-method
                 error,
             )
         else:
-            self._is_filtered = True
+            # the kernel only checks a superset of the other keys
+            self._is_filtered = all(
+                key in _KERNEL_FILTER_KEYS
+                for can_filter in filters or ()
+                for key in can_filter
+            )
 
     def fileno(self) -> int:
+        if self._receiver is not None:
+            raise NotImplementedError("A sharded bus receives in threads")
         return self.socket.fileno()
 
+    def device_statistics(self) -> DeviceStatistics:
+        """Read the statistics and error counters of the device from the kernel.
+
+        Unlike :attr:`~can.BusABC.statistics`, these include the frames that
+        the kernel or the controller dropped. See
+        :class:`~can.interfaces.socketcan.statistics.DeviceStatisticsSampler`
+        to read them periodically.
+
+        :raises ~can.exceptions.CanOperationError:
+            If the bus is not bound to a single channel, or the statistics
+            could not be read.
+        """
+        if not self.channel:
+            raise can.CanOperationError(
+                "Device statistics require a bus bound to a single channel"
+            )
+        return get_device_statistics(self.channel)
+
     @staticmethod
     def _detect_available_configs() -> list[can.typechecking.AutoDetectedConfig]:
         return [
@@ -0,0 +1,243 @@
+"""
+Reads the statistics and error counters of SocketCAN devices through netlink,
+like ``ip -statistics -details link show`` does.
+"""
+
+import logging
+import struct
+import threading
+import time
+from collections.abc import Callable
+from types import TracebackType
+from typing import Any, NamedTuple, Optional
+
+from typing_extensions import Self
+
+from can.exceptions import CanOperationError
+
+from .netlink import NetlinkSocket, pack_attr, unpack_attrs
+from .utils import (
+    CAN_STATES,
+    IFINFOMSG,
+    IFLA_CAN_STATE,
+    IFLA_IFNAME,
+    IFLA_INFO_DATA,
+    IFLA_LINKINFO,
+    RTM_GETLINK,
+    RTM_NEWLINK,
+)
+
+log = logging.getLogger(__name__)
+
+# netlink attributes
+IFLA_STATS64 = 23
+IFLA_INFO_XSTATS = 3
+IFLA_CAN_BERR_COUNTER = 8
+
+#: The first twelve members of struct rtnl_link_stats64
+_RTNL_LINK_STATS64 = struct.Struct("=12Q")
+#: struct can_device_stats
+_CAN_DEVICE_STATS = struct.Struct("=6I")
+#: struct can_berr_counter
+_CAN_BERR_COUNTER = struct.Struct("=HH")
+_U32 = struct.Struct("=I")
+
+
+class DeviceStatistics(NamedTuple):
+    """The statistics of a SocketCAN device at one point in time.
+
+    The counters of the network device are available for every device. The
+    CAN specific ones are ``None`` if the driver does not report them, for
+    example for virtual devices.
+    """
+
+    #: The time of the reading as returned by :func:`time.time`
+    timestamp: float
+    #: The name of the interface
+    channel: str
+    #: The number of received frames
+    rx_packets: int
+    #: The number of sent frames
+    tx_packets: int
+    #: The number of received bytes
+    rx_bytes: int
+    #: The number of sent bytes
+    tx_bytes: int
+    #: The number of receive errors
+    rx_errors: int
+    #: The number of transmit errors
+    tx_errors: int
+    #: The number of received frames that were dropped by the kernel
+    rx_dropped: int
+    #: The number of frames that could not be sent, for example while bus-off
+    tx_dropped: int
+    #: The number of frames that were lost because the receive buffer of the
+    #: controller was full
+    rx_over_errors: int
+    #: The state of the CAN controller, one of
+    #: :data:`~can.interfaces.socketcan.utils.CAN_STATES`
+    state: Optional[str] = None
+    #: The transmit error counter (TEC) of the controller
+    tx_error_counter: Optional[int] = None
+    #: The receive error counter (REC) of the controller
+    rx_error_counter: Optional[int] = None
+    #: The number of bus errors
+    bus_error: Optional[int] = None
+    #: The number of changes to the error warning state
+    error_warning: Optional[int] = None
+    #: The number of changes to the error passive state
+    error_passive: Optional[int] = None
+    #: The number of changes to the bus-off state
+    bus_off: Optional[int] = None
+    #: The number of lost arbitrations
+    arbitration_lost: Optional[int] = None
+    #: The number of restarts of the controller
+    restarts: Optional[int] = None
+
+
+def _parse_statistics(channel: str, payload: bytes) -> DeviceStatistics:
+    attrs = unpack_attrs(payload[IFINFOMSG.size :])
+    link_info = unpack_attrs(attrs.get(IFLA_LINKINFO, b""))
+    can_info = unpack_attrs(link_info.get(IFLA_INFO_DATA, b""))
+
+    stats = bytes(attrs.get(IFLA_STATS64, b"")).ljust(_RTNL_LINK_STATS64.size, b"\0")
+    counters = _RTNL_LINK_STATS64.unpack_from(stats)
+    extra: dict[str, Any] = {}
+    if IFLA_CAN_STATE in can_info:
+        (state,) = _U32.unpack_from(can_info[IFLA_CAN_STATE])
+        if state < len(CAN_STATES):
+            extra["state"] = CAN_STATES[state]
+    if IFLA_CAN_BERR_COUNTER in can_info:
+        extra["tx_error_counter"], extra["rx_error_counter"] = (
+            _CAN_BERR_COUNTER.unpack_from(can_info[IFLA_CAN_BERR_COUNTER])
+        )
+    if len(link_info.get(IFLA_INFO_XSTATS, b"")) >= _CAN_DEVICE_STATS.size:
+        (
+            extra["bus_error"],
+            extra["error_warning"],
+            extra["error_passive"],
+            extra["bus_off"],
+            extra["arbitration_lost"],
+            extra["restarts"],
+        ) = _CAN_DEVICE_STATS.unpack_from(link_info[IFLA_INFO_XSTATS])
+
+    return DeviceStatistics(
+        time.time(),
+        attrs.get(IFLA_IFNAME, channel.encode()).rstrip(b"\0").decode(),
+        *counters[:8],
+        rx_over_errors=counters[11],
+        **extra,
+    )
+
+
+def get_device_statistics(
+    channel: str, sock: Optional[NetlinkSocket] = None
+) -> DeviceStatistics:
+    """Read the statistics of a SocketCAN device.
+
+    :param channel: The name of the interface, like ``"can0"``.
+    :param sock:
+        A netlink socket to reuse for repeated readings. A new one is
+        opened by default.
+    :raises ~can.exceptions.CanOperationError:
+        If the statistics could not be read, for example because the
+        interface does not exist.
+    """
+    request = IFINFOMSG.pack(0, 0, 0, 0, 0) + pack_attr(
+        IFLA_IFNAME, channel.encode() + b"\0"
+    )
+    try:
+        if sock is None:
+            with NetlinkSocket() as new_sock:
+                replies = new_sock.request(RTM_GETLINK, request)
+        else:
+            replies = sock.request(RTM_GETLINK, request)
+    except OSError as error:
+        raise CanOperationError(
+            f"Could not read the statistics of {channel}: {error.strerror}",
+            error.errno,
+        ) from error
+
+    for reply_type, payload in replies:
+        if reply_type == RTM_NEWLINK:
+            return _parse_statistics(channel, payload)
+    raise CanOperationError(f"The kernel returned no statistics of {channel}")
+
+
+class DeviceStatisticsSampler:
+    """Reads the statistics of a SocketCAN device periodically in a
+    background thread::
+
+        with DeviceStatisticsSampler("can0", interval=1.0) as sampler:
+            ...
+            print(sampler.latest.rx_dropped, sampler.latest.bus_off)
+
+    Failed readings are logged and skipped.
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        interval: float = 1.0,
+        callback: Optional[Callable[[DeviceStatistics], Any]] = None,
+    ) -> None:
+        """
+        :param channel: The name of the interface, like ``"can0"``.
+        :param interval: The number of seconds between two readings.
+        :param callback:
+            Called with every reading from the background thread.
+        :raises ~can.exceptions.CanOperationError:
+            If the first reading failed.
+        """
+        self.channel = channel
+        self.interval = interval
+        self.callback = callback
+        try:
+            self._sock = NetlinkSocket()
+        except OSError as error:
+            raise CanOperationError(
+                f"Could not open a netlink socket: {error.strerror}", error.errno
+            ) from error
+        self._stopped = threading.Event()
+        try:
+            #: The last reading
+            self.latest = get_device_statistics(channel, self._sock)
+        except CanOperationError:
+            self._sock.close()
+            raise
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"can.DeviceStatisticsSampler({channel})",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop reading the statistics."""
+        self._stopped.set()
+        self._thread.join()
+        self._sock.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.latest = get_device_statistics(self.channel, self._sock)
+            except CanOperationError as error:
+                log.warning("%s", error)
+                continue
+            if self.callback is not None:
+                try:
+                    self.callback(self.latest)
+                except Exception:  # pylint: disable=broad-except
+                    log.exception("Callback %r failed", self.callback)
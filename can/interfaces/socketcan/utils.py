@@ -3,19 +3,56 @@ Defines common socketcan functions.
 """
 
 import errno
-import json
 import logging
 import os
 import struct
-import subprocess
 import sys
-from typing import Optional
+from types import TracebackType
+from typing import NamedTuple, Optional
+
+from typing_extensions import Self
 
 from can import typechecking
 from can.interfaces.socketcan.constants import CAN_EFF_FLAG
 
+from .netlink import NLM_F_DUMP, NetlinkSocket, unpack_attrs
+
 log = logging.getLogger(__name__)
 
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+RTM_GETLINK = 18
+
+RTMGRP_LINK = 0x1
+
+ARPHRD_CAN = 280
+IFF_UP = 0x1
+
+# netlink attributes of links
+IFLA_IFNAME = 3
+IFLA_LINKINFO = 18
+IFLA_INFO_KIND = 1
+IFLA_INFO_DATA = 2
+
+# netlink attributes of CAN devices
+IFLA_CAN_BITTIMING = 1
+IFLA_CAN_STATE = 4
+IFLA_CAN_DATA_BITTIMING = 9
+
+#: The names of ``enum can_state``, like ``ip -details link`` prints them
+CAN_STATES = (
+    "ERROR-ACTIVE",
+    "ERROR-WARNING",
+    "ERROR-PASSIVE",
+    "BUS-OFF",
+    "STOPPED",
+    "SLEEPING",
+)
+
+#: Family, type, index, flags, change mask
+IFINFOMSG = struct.Struct("=BxHiII")
+_U32 = struct.Struct("=I")
+
 
 def pack_filters(can_filters: Optional[typechecking.CanFilters] = None) -> bytes:
     if can_filters is None:
@@ -38,38 +75,153 @@ def pack_filters(can_filters: Optional[typechecking.CanFilters] = None) -> bytes
     return struct.pack(can_filter_fmt, *filter_data)
 
 
+class CanInterfaceInfo(NamedTuple):
+    """Describes a CAN network interface of the kernel."""
+
+    #: The name of the interface, like ``"can0"``
+    name: str
+    #: The index of the interface
+    index: int
+    #: The kind of the link, like ``"can"``, ``"vcan"`` or ``"vxcan"``, or
+    #: ``None`` for devices without one, like ``slcan``
+    kind: Optional[str]
+    #: Whether the interface is up
+    is_up: bool
+    #: The state of the CAN controller, one of :data:`CAN_STATES`, or ``None``
+    #: for virtual devices
+    state: Optional[str]
+    #: The nominal bitrate, or ``None`` if it is not configured
+    bitrate: Optional[int]
+    #: The data bitrate of CAN FD, or ``None`` if it is not configured
+    data_bitrate: Optional[int]
+
+
+def _parse_link(payload: bytes) -> Optional[CanInterfaceInfo]:
+    _, link_type, index, flags, _ = IFINFOMSG.unpack_from(payload)
+    if link_type != ARPHRD_CAN:
+        return None
+    attrs = unpack_attrs(payload[IFINFOMSG.size :])
+    link_info = unpack_attrs(attrs.get(IFLA_LINKINFO, b""))
+    can_info = unpack_attrs(link_info.get(IFLA_INFO_DATA, b""))
+
+    kind = None
+    if IFLA_INFO_KIND in link_info:
+        kind = link_info[IFLA_INFO_KIND].rstrip(b"\0").decode()
+    state = None
+    if IFLA_CAN_STATE in can_info:
+        (state_index,) = _U32.unpack_from(can_info[IFLA_CAN_STATE])
+        if state_index < len(CAN_STATES):
+            state = CAN_STATES[state_index]
+    # the bitrate is the first member of struct can_bittiming
+    bitrates: list[Optional[int]] = []
+    for attr in (IFLA_CAN_BITTIMING, IFLA_CAN_DATA_BITTIMING):
+        bitrate = _U32.unpack_from(can_info[attr])[0] if attr in can_info else 0
+        bitrates.append(bitrate or None)
+
+    return CanInterfaceInfo(
+        name=attrs.get(IFLA_IFNAME, b"").rstrip(b"\0").decode(),
+        index=index,
+        kind=kind,
+        is_up=bool(flags & IFF_UP),
+        state=state,
+        bitrate=bitrates[0],
+        data_bitrate=bitrates[1],
+    )
+
+
+def list_can_interfaces() -> list[CanInterfaceInfo]:
+    """Returns all CAN interfaces of the kernel, including the ones which are down.
+
+    The interfaces are queried through netlink, so no external tools are
+    required.
+
+    :raises OSError: If the query failed.
+    """
+    with NetlinkSocket() as sock:
+        replies = sock.request(RTM_GETLINK, IFINFOMSG.pack(0, 0, 0, 0, 0), NLM_F_DUMP)
+
+    interfaces = []
+    for reply_type, payload in replies:
+        if reply_type != RTM_NEWLINK:
+            continue
+        interface = _parse_link(payload)
+        if interface is not None:
+            interfaces.append(interface)
+    return interfaces
+
+
+class LinkMonitor:
+    """Receives the notifications of the kernel about added, removed or
+    changed CAN interfaces.
+
+    The monitor can be passed to :func:`select.select` to wait for them.
+    """
+
+    def __init__(self) -> None:
+        """
+        :raises OSError: If netlink is not supported.
+        """
+        self._sock = NetlinkSocket(groups=RTMGRP_LINK)
+
+    def fileno(self) -> int:
+        return self._sock.fileno()
+
+    def read(self) -> list[tuple[bool, CanInterfaceInfo]]:
+        """Return the pending notifications without blocking.
+
+        :return:
+            Whether the interface exists, and the interface, for every
+            notification.
+        """
+        changes = []
+        for msg_type, payload in self._sock.receive():
+            if msg_type not in (RTM_NEWLINK, RTM_DELLINK):
+                continue
+            interface = _parse_link(payload)
+            if interface is not None:
+                changes.append((msg_type == RTM_NEWLINK, interface))
+        return changes
+
+    def close(self) -> None:
+        """Stop receiving notifications."""
+        self._sock.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
 def find_available_interfaces() -> list[str]:
-    """Returns the names of all open can/vcan interfaces
+    """Returns the names of all open CAN interfaces
 
-    The function calls the ``ip link list`` command. If the lookup fails, an error
-    is logged to the console and an empty list is returned.
+    The function queries the interfaces through netlink, see
+    :func:`list_can_interfaces`. If the lookup fails, an error is logged to
+    the console and an empty list is returned.
 
-    :return: The list of available and active CAN interfaces or an empty list of the command failed
+    :return: The list of available and active CAN interfaces or an empty list if the query failed
     """
     if sys.platform != "linux":
         return []
 
     try:
-        command = ["ip", "-json", "link", "list", "up"]
-        output_str = subprocess.check_output(command, text=True)
-    except Exception:  # pylint: disable=broad-except
-        # subprocess.CalledProcessError is too specific
-        log.exception("failed to fetch opened can devices from ip link")
-        return []
-
-    try:
-        output_json = json.loads(output_str)
-    except json.JSONDecodeError:
-        log.exception("Failed to parse ip link JSON output: %s", output_str)
+        interfaces = list_can_interfaces()
+    except OSError:
+        log.exception("failed to fetch opened can devices through netlink")
         return []
 
     log.debug(
         "find_available_interfaces(): detected these interfaces (before filtering): %s",
-        output_json,
+        interfaces,
     )
 
-    interfaces = [i["ifname"] for i in output_json if i.get("link_type") == "can"]
-    return interfaces
+    return [interface.name for interface in interfaces if interface.is_up]
 
 
 def error_code_to_str(code: Optional[int]) -> str:
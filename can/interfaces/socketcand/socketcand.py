@@ -19,6 +19,7 @@ import xml.etree.ElementTree as ET
 from collections import deque
 
 import can
+from can.bus import _WakeupSocket
 
 log = logging.getLogger(__name__)
 
@@ -258,6 +259,7 @@ class SocketCanDaemonBus(can.BusABC):
         self._expect_msg("< ok >")
         self._tcp_send("< rawmode >")
         self._expect_msg("< ok >")
+        self._wakeup = _WakeupSocket()
         super().__init__(channel=channel, can_filters=can_filters, **kwargs)
 
     def _recv_internal(self, timeout):
@@ -269,13 +271,18 @@ class SocketCanDaemonBus(can.BusABC):
             # get all sockets that are ready (can be a list with a single value
             # being self.socket or an empty list if self.socket is not ready)
             ready_receive_sockets, _, _ = select.select(
-                [self.__socket], [], [], timeout
+                [self.__socket, self._wakeup], [], [], timeout
             )
         except OSError as exc:
             # something bad happened (e.g. the interface went down)
             log.error(f"Failed to receive: {exc}")
             raise can.CanError(f"Failed to receive: {exc}") from exc
 
+        if self._wakeup in ready_receive_sockets:
+            # interrupted, see BusABC.interrupt()
+            self._wakeup.clear()
+            return None, False
+
         try:
             if not ready_receive_sockets:
                 # socket wasn't readable or timeout occurred
@@ -10,6 +10,7 @@ from typing import Any, Optional, Union
 
 import can
 from can import BusABC, CanProtocol, Message
+from can.bus import _WakeupSocket
 from can.typechecking import AutoDetectedConfig
 
 from .utils import is_msgpack_installed, pack_message, unpack_message
@@ -91,6 +92,8 @@ class UdpMulticastBus(BusABC):
     #: This is provided as a default fallback channel if IPv6 is (still) not supported.
     DEFAULT_GROUP_IPv4 = "239.74.163.2"
 
+    _send_with_fileno = True
+
     def __init__(
         self,
         channel: str = DEFAULT_GROUP_IPv6,
@@ -161,6 +164,9 @@ class UdpMulticastBus(BusABC):
         """Provides the internally used file descriptor of the socket or `-1` if not available."""
         return self._multicast.fileno()
 
+    def _wake_up(self) -> None:
+        self._multicast.interrupt()
+
     def shutdown(self) -> None:
         """Close all sockets and free up any resources.
 
@@ -244,6 +250,9 @@ class GeneralPurposeUdpMulticastBus:
         self._send_destination = (self.group, self.port)
         self._last_send_timeout: Optional[float] = None
 
+        # used by interrupt()
+        self._wakeup = _WakeupSocket()
+
     def _create_socket(self, address_family: socket.AddressFamily) -> socket.socket:
         """Creates a new socket. This might fail and raise an exception!
 
@@ -348,6 +357,7 @@ class GeneralPurposeUdpMulticastBus:
         Receive up to **max_buffer** bytes.
 
         :param timeout: the timeout in seconds after which `None` is returned if no data arrived
+            or :meth:`interrupt` was called
         :returns: `None` on timeout, or a 3-tuple comprised of:
             - received data,
             - the sender of the data, and
@@ -358,14 +368,18 @@ class GeneralPurposeUdpMulticastBus:
         try:
             # get all sockets that are ready (can be a list with a single value
             # being self.socket or an empty list if self.socket is not ready)
-            ready_receive_sockets, _, _ = select.select([self._socket], [], [], timeout)
+            ready_receive_sockets, _, _ = select.select(
+                [self._socket, self._wakeup], [], [], timeout
+            )
         except OSError as exc:
             # something bad (not a timeout) happened (e.g. the interface went down)
             raise can.CanOperationError(
                 f"Failed to wait for IP/UDP socket: {exc}"
             ) from exc
 
-        if ready_receive_sockets:  # not empty
+        if self._wakeup in ready_receive_sockets:
+            self._wakeup.clear()
+        elif ready_receive_sockets:  # not empty
             # fetch timestamp; this is configured in _create_socket()
             if self.timestamp_nanosecond:
                 # fetch data, timestamp & source address
@@ -436,6 +450,10 @@ class GeneralPurposeUdpMulticastBus:
         """Provides the internally used file descriptor of the socket or `-1` if not available."""
         return self._socket.fileno()
 
+    def interrupt(self) -> None:
+        """Make a waiting or the next call of :meth:`recv` return `None` immediately."""
+        self._wakeup.set()
+
     def shutdown(self) -> None:
         """Close all sockets and free up any resources.
 
@@ -443,5 +461,6 @@ class GeneralPurposeUdpMulticastBus:
         """
         try:
             self._socket.close()
+            self._wakeup.close()
         except OSError as exception:
             log.error("could not close IP socket: %s", exception)
@@ -6,6 +6,8 @@ Any VirtualBus instances connecting to the same channel
 and reside in the same process will receive the same messages.
 """
 
+import contextlib
+import errno
 import logging
 import queue
 import time
@@ -22,7 +24,7 @@ from can.typechecking import AutoDetectedConfig, Channel
 logger = logging.getLogger(__name__)
 
 # Channels are lists of queues, one for each connection
-channels: Final[dict[Channel, list[queue.Queue[Message]]]] = {}
+channels: Final[dict[Channel, list[queue.Queue[Optional[Message]]]]] = {}
 channels_lock: Final = RLock()
 
 
@@ -107,7 +109,8 @@ class VirtualBus(BusABC):
                 channels[self.channel_id] = []
             self.channel = channels[self.channel_id]
 
-            self.queue: queue.Queue[Message] = queue.Queue(rx_queue_size)
+            # None is queued by interrupt()
+            self.queue: queue.Queue[Optional[Message]] = queue.Queue(rx_queue_size)
             self.channel.append(self.queue)
 
     def _check_if_open(self) -> None:
@@ -129,6 +132,11 @@ class VirtualBus(BusABC):
         else:
             return msg, False
 
+    def _wake_up(self) -> None:
+        # if the queue is full, recv() does not wait anyway
+        with contextlib.suppress(queue.Full):
+            self.queue.put_nowait(None)
+
     def send(self, msg: Message, timeout: Optional[float] = None) -> None:
         self._check_if_open()
 
@@ -148,7 +156,9 @@ class VirtualBus(BusABC):
                 all_sent = False
 
         if not all_sent:
-            raise CanOperationError("Could not send message to one or more recipients")
+            raise CanOperationError(
+                "Could not send message to one or more recipients", errno.ENOBUFS
+            )
 
     def shutdown(self) -> None:
         super().shutdown()
@@ -15,12 +15,14 @@ __all__ = [
     "CSVWriter",
     "CanutilsLogReader",
     "CanutilsLogWriter",
+    "ChannelRouter",
     "LogReader",
     "Logger",
     "MF4Reader",
     "MF4Writer",
     "MessageSync",
     "Printer",
+    "ReplayStatistics",
     "SizedRotatingLogger",
     "SqliteReader",
     "SqliteWriter",
@@ -36,13 +38,21 @@ __all__ = [
     "mf4",
     "player",
     "printer",
+    "replay_max_throughput",
     "sqlite",
     "trc",
 ]
 
 # Generic
 from .logger import MESSAGE_WRITERS, BaseRotatingLogger, Logger, SizedRotatingLogger
-from .player import MESSAGE_READERS, LogReader, MessageSync
+from .player import (
+    MESSAGE_READERS,
+    ChannelRouter,
+    LogReader,
+    MessageSync,
+    ReplayStatistics,
+    replay_max_throughput,
+)
 
 # isort: split
 
@@ -5,17 +5,29 @@ in the recorded order and time intervals.
 """
 
 import gzip
+import itertools
+import logging
 import pathlib
+import queue
+import threading
 import time
-from collections.abc import Generator, Iterable
+from collections.abc import Generator, Iterable, Mapping
+from types import TracebackType
 from typing import (
     Any,
+    Callable,
     Final,
+    NamedTuple,
+    Optional,
 )
 
+from typing_extensions import Self
+
 from .._entry_points import read_entry_points
+from ..bus import BusABC
+from ..exceptions import BACKPRESSURE_ERROR_CODES, CanOperationError, CanTimeoutError
 from ..message import Message
-from ..typechecking import StringPathLike
+from ..typechecking import Channel, StringPathLike
 from .asc import ASCReader
 from .blf import BLFReader
 from .canutils import CanutilsLogReader
@@ -25,6 +37,8 @@ from .mf4 import MF4Reader
 from .sqlite import SqliteReader
 from .trc import TRCReader
 
+logger = logging.getLogger("can.io.player")
+
 #: A map of file suffixes to their corresponding
 #: :class:`can.io.generic.MessageReader` class
 MESSAGE_READERS: Final[dict[str, type[MessageReader]]] = {
@@ -136,6 +150,7 @@ class MessageSync:
         timestamps: bool = True,
         gap: float = 0.0001,
         skip: float = 60.0,
+        speed: float = 1.0,
     ) -> None:
         """Creates an new **MessageSync** instance.
 
@@ -144,6 +159,8 @@ class MessageSync:
                            as the time between messages.
         :param gap: Minimum time between sent messages in seconds
         :param skip: Skip periods of inactivity greater than this (in seconds).
+        :param speed: Replay speed multiplier for the recorded time intervals,
+                      e.g. ``2.0`` replays twice as fast as recorded.
 
         Example::
 
@@ -160,8 +177,35 @@ class MessageSync:
         self.gap = gap
         self.skip = skip
 
+        if speed <= 0:
+            raise ValueError(f"speed must be positive, got {speed}")
+        self.speed = speed
+
     def __iter__(self) -> Generator[Message, None, None]:
-        t_wakeup = playback_start_time = time.perf_counter()
+        for _, message in self.scheduled():
+            yield message
+
+    def scheduled(
+        self,
+        lead: float = 0.0,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> Generator[tuple[float, Message], None, None]:
+        """Iterate over the messages together with their scheduled send time.
+
+        This allows handing messages to a transmitter that schedules them
+        itself, e.g. :meth:`can.interfaces.socketcan.SocketcanBus.send_at`,
+        instead of relying on the accuracy of :func:`time.sleep`.
+
+        :param lead:
+            Yield every message up to this many seconds before its
+            scheduled send time.
+        :param clock:
+            The clock that the returned send times refer to, e.g.
+            :meth:`can.interfaces.socketcan.SocketcanBus.txtime_now`.
+        :return:
+            A generator of ``(send_time, message)`` tuples.
+        """
+        t_wakeup = playback_start_time = clock()
         recorded_start_time = None
         t_skipped = 0.0
 
@@ -172,18 +216,233 @@ class MessageSync:
                     recorded_start_time = message.timestamp
 
                 t_wakeup = playback_start_time + (
-                    message.timestamp - t_skipped - recorded_start_time
+                    (message.timestamp - recorded_start_time) / self.speed - t_skipped
                 )
             else:
                 t_wakeup += self.gap
 
-            sleep_period = t_wakeup - time.perf_counter()
+            now = clock()
+            sleep_period = t_wakeup - now
 
             if self.skip and sleep_period > self.skip:
                 t_skipped += sleep_period - self.skip
                 sleep_period = self.skip
 
-            if sleep_period > 1e-4:
-                time.sleep(sleep_period)
+            if sleep_period - lead > 1e-4:
+                time.sleep(sleep_period - lead)
+
+            yield now + sleep_period, message
+
+
+class ReplayStatistics(NamedTuple):
+    """Statistics of a replay returned by :func:`replay_max_throughput`."""
+
+    #: Number of messages that were sent
+    frames_sent: int
+    #: Duration of the replay in seconds
+    duration: float
+    #: Number of times the bus signalled a full transmit queue
+    backoffs: int
+
+    @property
+    def frames_per_second(self) -> float:
+        """The achieved average transmit rate."""
+        return self.frames_sent / self.duration if self.duration > 0 else 0.0
+
+
+def replay_max_throughput(
+    bus: BusABC,
+    messages: Iterable[Message],
+    batch_size: int = 64,
+    min_backoff: float = 50e-6,
+    max_backoff: float = 0.01,
+    timeout: float = 5.0,
+) -> ReplayStatistics:
+    """Send messages as fast as the bus accepts them, ignoring recorded timing.
+
+    In contrast to :class:`MessageSync` with ``timestamps=False``, there is no
+    fixed gap between the messages. Instead, the messages are read in batches
+    and sent back to back. Whenever the bus reports a full transmit queue, i.e.
+    raises a :class:`~can.CanTimeoutError` or a :class:`~can.CanOperationError`
+    with an error code in :data:`~can.exceptions.BACKPRESSURE_ERROR_CODES`,
+    the sender backs off and retries the same message. The back-off time
+    doubles with every failed attempt and is halved again with every
+    successful batch, so it adapts to the rate the receiver can absorb.
+
+    Example::
+
+        with can.LogReader("drive.blf") as reader, can.Bus(interface="virtual") as bus:
+            stats = can.io.replay_max_throughput(bus, reader)
+            print(f"{stats.frames_per_second:.0f} frames/s")
+
+    :param bus: The bus to send the messages to.
+    :param messages: An iterable of :class:`can.Message` instances.
+    :param batch_size: The number of messages to read ahead before sending.
+    :param min_backoff: The initial back-off time in seconds.
+    :param max_backoff: The maximum back-off time in seconds.
+    :param timeout:
+        Give up and re-raise the error if a single message could not be sent
+        for this many seconds.
+    :return: The statistics of the replay.
+    :raises ~can.exceptions.CanError:
+        If a message could not be sent for other reasons than a full transmit
+        queue or if the *timeout* elapsed.
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+
+    iterator = iter(messages)
+    frames_sent = 0
+    backoffs = 0
+    backoff = min_backoff
+    start = time.perf_counter()
+
+    while batch := list(itertools.islice(iterator, batch_size)):
+        for message in batch:
+            retry_until = None
+            while True:
+                try:
+                    bus.send(message)
+                    break
+                except (CanOperationError, CanTimeoutError) as error:
+                    if (
+                        isinstance(error, CanOperationError)
+                        and error.error_code not in BACKPRESSURE_ERROR_CODES
+                    ):
+                        raise
+                    now = time.perf_counter()
+                    if retry_until is None:
+                        retry_until = now + timeout
+                    elif now > retry_until:
+                        raise
+
+                backoffs += 1
+                time.sleep(backoff)
+                backoff = min(backoff * 2, max_backoff)
+
+            frames_sent += 1
+
+        backoff = max(backoff / 2, min_backoff)
+
+    return ReplayStatistics(
+        frames_sent=frames_sent,
+        duration=time.perf_counter() - start,
+        backoffs=backoffs,
+    )
+
+
+class ChannelRouter:
+    """
+    Distributes messages to several buses depending on their
+    :attr:`~can.Message.channel`.
+
+    This allows a single :class:`MessageSync` timing loop to replay a
+    recording of several channels on several interfaces, which keeps the
+    order of the messages across the channels intact. Every bus is served by
+    its own transmit thread, so a slow interface does not delay the others.
+
+    Example::
+
+        with (
+            can.Bus(interface="socketcan", channel="can0") as bus0,
+            can.Bus(interface="socketcan", channel="can1") as bus1,
+            can.LogReader("recording.asc") as reader,
+            can.io.ChannelRouter({0: bus0, 1: bus1}) as router,
+        ):
+            for msg in can.MessageSync(reader):
+                router.send(msg)
+    """
 
-            yield message
+    def __init__(
+        self,
+        buses: Mapping[Channel, BusABC],
+        send_timeout: Optional[float] = None,
+    ) -> None:
+        """
+        :param buses:
+            A mapping of message channels to the buses that the messages of
+            the respective channel shall be sent to. The same bus may be used
+            for several channels.
+        :param send_timeout:
+            The timeout passed to :meth:`can.BusABC.send`.
+        """
+        self.buses: dict[Channel, BusABC] = dict(buses)
+        self.send_timeout = send_timeout
+
+        #: Number of sent messages per channel
+        self.sent: dict[Channel, int] = dict.fromkeys(self.buses, 0)
+        #: Number of messages per channel that could not be sent
+        self.errors: dict[Channel, int] = dict.fromkeys(self.buses, 0)
+        #: Number of messages without a bus for their channel
+        self.unrouted = 0
+        #: The last exception raised in a transmit thread
+        self.exception: Optional[Exception] = None
+
+        self._queues: dict[Channel, queue.SimpleQueue[Optional[Message]]] = {}
+        self._threads: list[threading.Thread] = []
+        bus_queues: dict[int, queue.SimpleQueue[Optional[Message]]] = {}
+        for channel, bus in self.buses.items():
+            if id(bus) not in bus_queues:
+                bus_queues[id(bus)] = queue.SimpleQueue()
+                thread = threading.Thread(
+                    target=self._tx_thread,
+                    args=(bus, bus_queues[id(bus)]),
+                    name=f'{self.__class__.__qualname__} for bus "{bus.channel_info}"',
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+            self._queues[channel] = bus_queues[id(bus)]
+
+    def send(self, msg: Message) -> None:
+        """Queue a message for transmission on the bus of its channel.
+
+        This method does not block. Messages of a channel without a bus are
+        discarded and counted in :attr:`unrouted`.
+
+        :param msg: The message to send.
+        :raises RuntimeError: If the router has already been stopped.
+        """
+        if not self._threads:
+            raise RuntimeError("router has already been stopped")
+        try:
+            self._queues[msg.channel].put(msg)  # type: ignore[index]
+        except KeyError:
+            self.unrouted += 1
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Send all queued messages and stop the transmit threads.
+
+        :param timeout:
+            Max time in seconds to wait for each transmit thread to finish.
+        """
+        for bus_queue in {id(q): q for q in self._queues.values()}.values():
+            bus_queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+    def _tx_thread(
+        self, bus: BusABC, bus_queue: "queue.SimpleQueue[Optional[Message]]"
+    ) -> None:
+        while (msg := bus_queue.get()) is not None:
+            channel = msg.channel
+            try:
+                bus.send(msg, self.send_timeout)
+            except Exception as exc:  # pylint: disable=broad-except
+                self.exception = exc
+                self.errors[channel] += 1  # type: ignore[index]
+                logger.debug("failed to send %s on %s: %s", msg, bus.channel_info, exc)
+            else:
+                self.sent[channel] += 1  # type: ignore[index]
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.stop()
@@ -0,0 +1,310 @@
+"""
+Contains :class:`~can.BusMultiplexer`, which shares one bus between several
+independent :class:`~can.BusView` instances.
+"""
+
+import contextlib
+import logging
+import threading
+import time
+from collections import deque
+from copy import copy
+from types import TracebackType
+from typing import Any, Optional
+
+from typing_extensions import Self
+
+from can import typechecking
+from can.bus import BusABC, BusState, _WakeupSocket
+from can.exceptions import CanOperationError
+from can.message import Message
+
+logger = logging.getLogger(__name__)
+
+#: The time in seconds after which the receiving thread checks whether it
+#: should stop, if the bus does not support :meth:`~can.BusABC.interrupt`
+_POLL_INTERVAL = 0.1
+
+
+class BusView(BusABC):
+    """
+    One of several buses that share the underlying bus of a
+    :class:`BusMultiplexer`. Use :meth:`BusMultiplexer.open_view` to create it.
+
+    Every view has its own filters and its own receive queue. Shutting down
+    a view does not affect the other views or the underlying bus.
+    """
+
+    def __init__(
+        self,
+        multiplexer: "BusMultiplexer",
+        can_filters: Optional[typechecking.CanFilters] = None,
+        rx_queue_size: int = 0,
+        **kwargs: object,
+    ) -> None:
+        self.multiplexer = multiplexer
+        self.channel_info = f"view of {multiplexer.bus.channel_info}"
+        self._can_protocol = multiplexer.bus.protocol
+
+        self._rx_condition = threading.Condition()
+        self._rx_queue: deque[Message] = deque(maxlen=rx_queue_size or None)
+        self._rx_ready = _WakeupSocket()
+        self._rx_signalled = False
+        self._closed = False
+
+        super().__init__(
+            channel=multiplexer.bus.channel_info, can_filters=can_filters, **kwargs
+        )
+
+    def _recv_internal(
+        self, timeout: Optional[float]
+    ) -> tuple[Optional[Message], bool]:
+        with self._rx_condition:
+            if not self._rx_condition.wait_for(
+                lambda: self._rx_queue or self._closed or self._interrupt_pending,
+                timeout,
+            ):
+                return None, True
+            if self._rx_queue:
+                msg = self._rx_queue.popleft()
+                if not self._rx_queue and self._rx_signalled:
+                    self._rx_ready.clear()
+                    self._rx_signalled = False
+                # the multiplexer only queues matching messages
+                return msg, True
+            if self._interrupt_pending:
+                return None, True
+
+        exception = self.multiplexer.exception
+        if exception is not None:
+            raise CanOperationError(f"Receiving failed: {exception}") from exception
+        raise CanOperationError("Cannot receive on a closed bus")
+
+    def _wake_up(self) -> None:
+        with self._rx_condition:
+            self._rx_condition.notify_all()
+
+    def send(self, msg: Message, timeout: Optional[float] = None) -> None:
+        """Transmit a message with the underlying bus.
+
+        The calls of all views are serialized.
+
+        :raises ~can.exceptions.CanOperationError:
+            If an error occurred while sending or the view was shut down.
+        """
+        if self._closed:
+            raise CanOperationError("Cannot send on a closed bus")
+        self.multiplexer._send(self, msg, timeout)  # pylint: disable=protected-access
+
+    def fileno(self) -> int:
+        """Return a file descriptor that is readable while messages are
+        queued."""
+        return self._rx_ready.fileno()
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of received messages that were not yet returned."""
+        return len(self._rx_queue)
+
+    @property
+    def state(self) -> BusState:
+        """The state of the underlying bus."""
+        return self.multiplexer.bus.state
+
+    @state.setter
+    def state(self, new_state: BusState) -> None:
+        raise NotImplementedError("The state of a shared bus can not be changed")
+
+    def _apply_filters(self, filters: Optional[typechecking.CanFilters]) -> None:
+        # pylint: disable=protected-access
+        self.multiplexer._update_filters()
+
+    def shutdown(self) -> None:
+        """Stop receiving. The underlying bus and the other views stay open."""
+        if self._is_shutdown:
+            return
+        super().shutdown()
+        self.multiplexer._remove_view(self)  # pylint: disable=protected-access
+        self._close()
+        self._rx_ready.close()
+
+    def _deliver(self, msg: Message) -> None:
+        # called by the multiplexer for every message matching the filters
+        with self._rx_condition:
+            self._rx_queue.append(msg)
+            if not self._rx_signalled:
+                self._rx_ready.set()
+                self._rx_signalled = True
+            self._rx_condition.notify_all()
+
+    def _close(self) -> None:
+        with self._rx_condition:
+            self._closed = True
+            if not self._rx_signalled:
+                # wake up waiting readers to let them raise an error
+                self._rx_ready.set()
+                self._rx_signalled = True
+            self._rx_condition.notify_all()
+
+
+class BusMultiplexer:
+    """
+    Shares one bus between several components, each of which gets its own
+    :class:`BusView`.
+
+    Most interfaces only allow to open a channel once. The multiplexer owns
+    that bus and receives from it in a thread. Every view is a complete
+    :class:`~can.BusABC` with its own filters and its own receive queue, so
+    independent components can use them like separate buses::
+
+        multiplexer = can.BusMultiplexer(can.Bus(interface="pcan"))
+        diagnostics = multiplexer.open_view(
+            can_filters=[{"can_id": 0x7E8, "can_mask": 0x7F8}]
+        )
+        logger = multiplexer.open_view()
+
+    The filters of all views are combined and replace the filters of the
+    underlying bus, so they are applied by the kernel or the hardware where
+    supported. Sending
+    is serialized. With *local_loopback*, a message sent by one view is also
+    received by the other views with matching filters, as if they were
+    separate nodes on the same bus.
+    """
+
+    def __init__(self, bus: BusABC, local_loopback: bool = True) -> None:
+        """
+        :param bus:
+            The bus to share. It is shut down together with the multiplexer.
+        :param local_loopback:
+            Deliver the messages sent by one view to the other views.
+        """
+        self.bus = bus
+        self.local_loopback = local_loopback
+        #: The exception raised by the underlying bus, which stopped receiving
+        self.exception: Optional[Exception] = None
+
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        # the list is replaced instead of modified, so no lock is needed to read
+        self._views: list[BusView] = []
+        self._stopped = False
+
+        self._rx_thread = threading.Thread(
+            target=self._rx_worker,
+            name=f'{self.__class__.__qualname__} for bus "{bus.channel_info}"',
+            daemon=True,
+        )
+        self._rx_thread.start()
+
+    @property
+    def views(self) -> list[BusView]:
+        """The views that are open."""
+        return list(self._views)
+
+    def open_view(
+        self,
+        can_filters: Optional[typechecking.CanFilters] = None,
+        rx_queue_size: int = 0,
+        **kwargs: Any,
+    ) -> BusView:
+        """Create a new view of the bus.
+
+        :param can_filters:
+            The filters of the view, see :meth:`~can.BusABC.set_filters`.
+        :param rx_queue_size:
+            The maximum number of queued messages. If the view is not read
+            fast enough, the oldest messages are discarded. If set to 0, the
+            queue has an infinite capacity.
+
+        :raises RuntimeError: If the multiplexer was shut down.
+        """
+        if self._stopped:
+            raise RuntimeError("The multiplexer was shut down")
+        view = BusView(self, can_filters, rx_queue_size, **kwargs)
+        with self._lock:
+            self._views = [*self._views, view]
+            if self.exception is not None:
+                # receiving has failed already
+                view._close()  # pylint: disable=protected-access
+        self._update_filters()
+        return view
+
+    def shutdown(self) -> None:
+        """Shut down all views, stop receiving and shut down the bus."""
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+        for view in self.views:
+            view.shutdown()
+        with contextlib.suppress(NotImplementedError):
+            self.bus.interrupt()
+        if self._rx_thread is not threading.current_thread():
+            self._rx_thread.join()
+        self.bus.shutdown()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.shutdown()
+
+    def _remove_view(self, view: BusView) -> None:
+        with self._lock:
+            self._views = [other for other in self._views if other is not view]
+        if not self._stopped:
+            self._update_filters()
+
+    def _update_filters(self) -> None:
+        # receive everything that at least one view is interested in
+        with self._lock:
+            merged: Optional[list[typechecking.CanFilter]] = []
+            for view in self._views:
+                if view.filters is None:
+                    merged = None
+                    break
+                for can_filter in view.filters:
+                    if merged is not None and can_filter not in merged:
+                        merged.append(can_filter)
+            if not self._views:
+                merged = None
+            self.bus.set_filters(merged)
+
+    def _send(self, sender: BusView, msg: Message, timeout: Optional[float]) -> None:
+        # pylint: disable=protected-access
+        with self._send_lock:
+            self.bus.send(msg, timeout)
+
+        if self.local_loopback:
+            looped_back: Optional[Message] = None
+            for view in self._views:
+                if view is not sender and view._matches_filters(msg):
+                    if looped_back is None:
+                        looped_back = copy(msg)
+                        looped_back.timestamp = time.time()
+                        looped_back.is_rx = False
+                    view._deliver(looped_back)
+
+    def _rx_worker(self) -> None:
+        # pylint: disable=protected-access
+        while not self._stopped:
+            try:
+                msg = self.bus.recv(_POLL_INTERVAL)
+            except Exception as exc:  # pylint: disable=broad-except
+                with self._lock:
+                    if not self._stopped:
+                        logger.warning("Stopped receiving from %s: %s", self.bus, exc)
+                        self.exception = exc
+                    for view in self._views:
+                        view._close()
+                return
+            if msg is None:
+                continue
+            for view in self._views:
+                if view._matches_filters(msg):
+                    view._deliver(msg)
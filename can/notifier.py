@@ -3,6 +3,7 @@ This module contains the implementation of :class:`~can.Notifier`.
 """
 
 import asyncio
+import contextlib
 import functools
 import logging
 import threading
@@ -198,17 +199,33 @@ class Notifier(AbstractContextManager["Notifier"]):
         """Stop notifying Listeners when new :class:`~can.Message` objects arrive
         and call :meth:`~can.Listener.stop` on each Listener.
 
+        The receive threads are woken up with :meth:`~can.BusABC.interrupt`.
+        If a bus does not support this, its thread finishes after the
+        timeout given at instantiation.
+
         :param timeout:
             Max time in seconds to wait for receive threads to finish.
             Should be longer than timeout given at instantiation.
         """
         self._stopped = True
+        interrupted = []
+        for bus, reader in zip(self._bus_list, self._readers):
+            if isinstance(reader, threading.Thread):
+                # wake up the thread instead of waiting for the recv() timeout
+                with contextlib.suppress(NotImplementedError):
+                    bus.interrupt()
+                    interrupted.append(bus)
         end_time = time.time() + timeout
-        for reader in self._readers:
+        for bus, reader in zip(self._bus_list, self._readers):
             if isinstance(reader, threading.Thread):
                 now = time.time()
                 if now < end_time:
                     reader.join(end_time - now)
+                if bus in interrupted and not reader.is_alive():
+                    # the thread may have been busy with a message instead of
+                    # waiting, so that the next recv() of the user would
+                    # consume the interrupt
+                    bus._clear_interrupt()  # pylint: disable=protected-access
             elif self._loop:
                 # reader is a file descriptor
                 self._loop.remove_reader(reader)
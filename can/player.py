@@ -6,10 +6,13 @@ Similar to canplayer in the can-utils package.
 """
 
 import argparse
+import contextlib
 import errno
 import sys
+import time
+from collections.abc import Sequence
 from datetime import datetime
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, Optional, Union, cast
 
 from can import LogReader, MessageSync
 from can.cli import (
@@ -19,11 +22,14 @@ from can.cli import (
     add_bus_arguments,
     create_bus_from_namespace,
 )
+from can.io.player import ChannelRouter, replay_max_throughput
+from can.typechecking import Channel, TAdditionalCliArgs
+from can.util import cast_from_string
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
 
-    from can import Message
+    from can import BusABC, Message
 
 
 def main() -> None:
@@ -76,6 +82,43 @@ def main() -> None:
         help="<s> skip gaps greater than 's' seconds",
     )
 
+    player_group.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="replay speed multiplier for the recorded timestamps, "
+        "e.g. 2 replays twice as fast as recorded",
+    )
+
+    player_group.add_argument(
+        "--max-throughput",
+        help="""Ignore timestamps and gap, send frames as fast as the bus accepts
+                them (backing off while its transmit queue is full) and report
+                the achieved frame rate""",
+        action="store_true",
+    )
+
+    player_group.add_argument(
+        "--txtime-lead",
+        type=float,
+        default=None,
+        metavar="LEAD",
+        help="<s> hand frames to the kernel up to 's' seconds ahead of time and let it "
+        "release them at their recorded offset (SocketCAN with SO_TXTIME only, see "
+        "the txtime bus argument)",
+    )
+
+    player_group.add_argument(
+        "--channel-map",
+        action=_ChannelMapAction,
+        default=None,
+        metavar="LOG_CHANNEL=BUS_CHANNEL[,...]",
+        help="Replay several recorded channels on several buses, e.g. "
+        "`--channel-map 0=can0,1=can1`. A bus is created for every BUS_CHANNEL "
+        "with the remaining bus arguments and served by its own transmit thread. "
+        "Frames of unmapped channels are skipped.",
+    )
+
     player_group.add_argument(
         "infile",
         metavar="input-file",
@@ -95,6 +138,12 @@ def main() -> None:
         raise SystemExit(errno.EINVAL)
 
     results, unknown_args = parser.parse_known_args()
+    if results.channel_map and (
+        results.max_throughput or results.txtime_lead is not None
+    ):
+        parser.error(
+            "--channel-map cannot be combined with --max-throughput or --txtime-lead"
+        )
     additional_config = _parse_additional_config([*results.extra_args, *unknown_args])
 
     _set_logging_level_from_namespace(results)
@@ -102,27 +151,141 @@ def main() -> None:
 
     error_frames = results.error_frames
 
-    with create_bus_from_namespace(results) as bus:
+    if results.channel_map:
+        _replay_on_channels(results, additional_config)
+        return
+
+    bus_kwargs: dict[str, Any] = {}
+    if results.txtime_lead is not None:
+        bus_kwargs["txtime"] = True
+    with create_bus_from_namespace(results, **bus_kwargs) as bus:
         with LogReader(results.infile, **additional_config) as reader:
+            messages = cast("Iterable[Message]", reader)
+
+            print(f"Can LogReader (Started on {datetime.now()})")
+
+            if results.max_throughput:
+                try:
+                    stats = replay_max_throughput(
+                        bus,
+                        (
+                            message
+                            for message in messages
+                            if _should_send(message, error_frames, verbosity)
+                        ),
+                    )
+                except KeyboardInterrupt:
+                    return
+                print(
+                    f"Sent {stats.frames_sent} frames in {stats.duration:.3f} s "
+                    f"({stats.frames_per_second:.0f} frames/s, {stats.backoffs} back-offs)"
+                )
+                return
+
             in_sync = MessageSync(
-                cast("Iterable[Message]", reader),
+                messages,
                 timestamps=results.timestamps,
                 gap=results.gap,
                 skip=results.skip,
+                speed=results.speed,
             )
 
-            print(f"Can LogReader (Started on {datetime.now()})")
+            send_at = None
+            if results.txtime_lead is not None:
+                send_at = getattr(bus, "send_at", None)
+                if send_at is None:
+                    print(
+                        "Bus does not support scheduled transmission, ignoring --txtime-lead"
+                    )
+
+            try:
+                if send_at is not None:
+                    for launch_time, message in in_sync.scheduled(
+                        results.txtime_lead,
+                        clock=getattr(bus, "txtime_now", time.perf_counter),
+                    ):
+                        if _should_send(message, error_frames, verbosity):
+                            send_at(message, launch_time)
+                else:
+                    for message in in_sync:
+                        if _should_send(message, error_frames, verbosity):
+                            bus.send(message)
+            except KeyboardInterrupt:
+                pass
+
+
+def _replay_on_channels(
+    results: argparse.Namespace, additional_config: TAdditionalCliArgs
+) -> None:
+    with contextlib.ExitStack() as stack:
+        buses: dict[Channel, BusABC] = {}
+        for log_channel, bus_channel in results.channel_map.items():
+            namespace = argparse.Namespace(**vars(results))
+            namespace.channel = bus_channel
+            buses[log_channel] = stack.enter_context(
+                create_bus_from_namespace(namespace)
+            )
 
+        reader = stack.enter_context(LogReader(results.infile, **additional_config))
+        in_sync = MessageSync(
+            cast("Iterable[Message]", reader),
+            timestamps=results.timestamps,
+            gap=results.gap,
+            skip=results.skip,
+            speed=results.speed,
+        )
+
+        print(f"Can LogReader (Started on {datetime.now()})")
+
+        with ChannelRouter(buses) as router:
             try:
                 for message in in_sync:
-                    if message.is_error_frame and not error_frames:
-                        continue
-                    if verbosity >= 3:
-                        print(message)
-                    bus.send(message)
+                    if _should_send(message, results.error_frames, results.verbosity):
+                        router.send(message)
             except KeyboardInterrupt:
                 pass
 
+        for log_channel, bus in buses.items():
+            print(
+                f"{log_channel} -> {bus.channel_info}: {router.sent[log_channel]} sent, "
+                f"{router.errors[log_channel]} failed"
+            )
+        if router.unrouted:
+            print(f"{router.unrouted} frames of unmapped channels skipped")
+
+
+class _ChannelMapAction(argparse.Action):
+    def __call__(
+        self,
+        parser: argparse.ArgumentParser,
+        namespace: argparse.Namespace,
+        values: Union[str, Sequence[Any], None],
+        option_string: Optional[str] = None,
+    ) -> None:
+        if not isinstance(values, str):
+            raise argparse.ArgumentError(self, "Invalid --channel-map argument")
+
+        channel_map: dict[Channel, Union[str, int, float, bool]] = {}
+        for arg in values.split(","):
+            log_channel, sep, bus_channel = arg.partition("=")
+            if not (sep and log_channel and bus_channel):
+                raise argparse.ArgumentError(
+                    self, f"Unable to parse channel mapping '{arg}'"
+                )
+            # log readers use integers for numbered channels
+            key: Channel = int(log_channel) if log_channel.isdigit() else log_channel
+            channel_map[key] = cast_from_string(bus_channel)
+
+        setattr(namespace, self.dest, channel_map)
+
+
+def _should_send(message: "Message", error_frames: bool, verbosity: int) -> bool:
+    if message.is_error_frame and not error_frames:
+        return False
+    if verbosity >= 3:
+        print(message)
+    return True
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,354 @@
+"""
+Contains :class:`~can.BusPoller`, which receives from many buses without
+file descriptors in one or a few threads.
+"""
+
+import asyncio
+import contextlib
+import logging
+import socket
+import threading
+from collections import deque
+from collections.abc import AsyncIterator
+from types import TracebackType
+from typing import Optional, cast
+
+from typing_extensions import Self
+
+from can.bus import BusABC, _AsyncAdapter, _get_async_executor
+from can.exceptions import CanOperationError
+from can.message import Message
+
+try:
+    # Only raise an exception on instantiation but allow module
+    # to be imported
+    from wrapt import ObjectProxy
+
+    import_exc = None
+except ImportError as exc:
+    ObjectProxy = object
+    import_exc = exc
+
+logger = logging.getLogger(__name__)
+
+
+class PolledBus(ObjectProxy):  # pylint: disable=abstract-method
+    """
+    A bus that is driven by a :class:`BusPoller`. Use
+    :meth:`BusPoller.add_bus` to create it.
+
+    The poller stores the received messages in a queue, from which
+    :meth:`recv` returns them. :meth:`fileno` returns a file descriptor that
+    is readable while messages are queued, so the bus can be used with
+    :func:`select.select`, a :class:`~can.Notifier` in an :mod:`asyncio`
+    event loop or :meth:`~can.BusABC.recv_async`. All other methods are
+    forwarded to the underlying bus.
+    """
+
+    __wrapped__: BusABC
+
+    def __init__(self, bus: BusABC, poller: "BusPoller") -> None:
+        if import_exc is not None:
+            raise import_exc
+
+        super().__init__(bus)
+
+        self.poller = poller
+        #: The exception raised by the underlying bus, which stopped polling
+        self.exception: Optional[Exception] = None
+
+        self._rx_condition = threading.Condition()
+        self._rx_queue: deque[Message] = deque()
+        self._signalled = False
+        self._poll_stopped = False
+        self._interrupted = False
+        self._async_adapter_of_poller: Optional[_AsyncAdapter] = None
+        self._wakeup_reader, self._wakeup_writer = socket.socketpair()
+        self._wakeup_reader.setblocking(False)
+
+    def recv(self, timeout: Optional[float] = None) -> Optional[Message]:
+        """Return the next message received by the poller.
+
+        :param timeout:
+            seconds to wait for a message or None to wait indefinitely
+
+        :raises ~can.exceptions.CanOperationError:
+            If the underlying bus failed or was removed from the poller.
+        """
+        with self._rx_condition:
+            if not self._rx_condition.wait_for(
+                lambda: self._rx_queue or self._poll_stopped or self._interrupted,
+                timeout,
+            ):
+                return None
+            if not self._rx_queue:
+                if self._interrupted:
+                    self._interrupted = False
+                    return None
+                if self.exception is not None:
+                    raise CanOperationError(
+                        f"Receiving failed: {self.exception}"
+                    ) from self.exception
+                raise CanOperationError("The bus is not polled anymore")
+
+            msg = self._rx_queue.popleft()
+            if not self._rx_queue and self._signalled:
+                # the queue is empty, make the file descriptor unreadable
+                with contextlib.suppress(BlockingIOError):
+                    while self._wakeup_reader.recv(4096):
+                        pass
+                self._signalled = False
+            return msg
+
+    def fileno(self) -> int:
+        """Return a file descriptor that is readable while messages are
+        queued."""
+        return self._wakeup_reader.fileno()
+
+    def interrupt(self) -> None:
+        """Make a waiting or the next call of :meth:`recv` return ``None``
+        immediately, see :meth:`~can.BusABC.interrupt`."""
+        with self._rx_condition:
+            self._interrupted = True
+            self._rx_condition.notify_all()
+
+    def _clear_interrupt(self) -> None:
+        """Discard an interrupt that no call of :meth:`recv` consumed, see
+        :meth:`~can.BusABC._clear_interrupt`."""
+        with self._rx_condition:
+            self._interrupted = False
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of received messages that were not yet returned."""
+        return len(self._rx_queue)
+
+    async def recv_async(self, timeout: Optional[float] = None) -> Optional[Message]:
+        """Wait for a message from the poller without blocking the event loop.
+
+        See :meth:`~can.BusABC.recv_async`.
+        """
+        loop = asyncio.get_running_loop()
+        adapter = self._async_adapter_of_poller
+        if adapter is None or adapter.loop is not loop:
+            adapter = self._async_adapter_of_poller = _AsyncAdapter(
+                cast("BusABC", self), loop, adapter
+            )
+        return await adapter.recv(timeout)
+
+    async def send_async(self, msg: Message, timeout: Optional[float] = None) -> None:
+        """Transmit a message without blocking the event loop.
+
+        See :meth:`~can.BusABC.send_async`.
+        """
+        await asyncio.get_running_loop().run_in_executor(
+            _get_async_executor(), self.__wrapped__.send, msg, timeout
+        )
+
+    async def __aiter__(self) -> AsyncIterator[Message]:
+        while True:
+            msg = await self.recv_async()
+            if msg is not None:
+                yield msg
+
+    def shutdown(self) -> None:
+        """Stop polling the bus and shut down the underlying bus."""
+        self.poller.remove_bus(self)
+        if self._async_adapter_of_poller is not None:
+            self._async_adapter_of_poller.close()
+        self.__wrapped__.shutdown()
+        self._wakeup_reader.close()
+        self._wakeup_writer.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.shutdown()
+
+    def _poll(self, batch_size: int) -> int:
+        # called by the poller thread, returns the number of messages
+        received = []
+        try:
+            for _ in range(batch_size):
+                msg = self.__wrapped__.recv(0)
+                if msg is None:
+                    break
+                received.append(msg)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("Stopped polling %s: %s", self.channel_info, exc)
+            self.exception = exc
+            self._stop_polling()
+            self.poller.remove_bus(self)
+
+        if received:
+            with self._rx_condition:
+                self._rx_queue.extend(received)
+                if not self._signalled:
+                    self._wakeup_writer.send(b"\0")
+                    self._signalled = True
+                self._rx_condition.notify_all()
+        return len(received)
+
+    def _stop_polling(self) -> None:
+        with self._rx_condition:
+            self._poll_stopped = True
+            if not self._signalled:
+                # wake up waiting readers to let them raise the error
+                with contextlib.suppress(OSError):
+                    self._wakeup_writer.send(b"\0")
+                self._signalled = True
+            self._rx_condition.notify_all()
+
+
+class BusPoller:
+    """
+    Receives messages from many buses in a few shared threads.
+
+    Interfaces without a file descriptor otherwise need a thread per bus,
+    e.g. for a :class:`~can.Notifier`, which mostly waits in a blocking
+    call of the vendor library. The poller instead calls the non-blocking
+    :meth:`~can.BusABC.recv` of all buses in turn. While messages arrive it
+    polls continuously; when all buses are idle, it sleeps for exponentially
+    increasing intervals up to *max_interval*::
+
+        poller = can.BusPoller()
+        bus_1 = poller.add_bus(can.Bus(interface="pcan", channel="PCAN_USBBUS1"))
+        bus_2 = poller.add_bus(can.Bus(interface="pcan", channel="PCAN_USBBUS2"))
+        notifier = can.Notifier([bus_1, bus_2], [can.Printer()], loop=loop)
+
+    The returned :class:`PolledBus` objects provide a :meth:`~PolledBus.fileno`,
+    such that the :class:`~can.Notifier` above does not start any threads.
+    """
+
+    def __init__(
+        self,
+        threads: int = 1,
+        max_interval: float = 0.01,
+        min_interval: float = 50e-6,
+        batch_size: int = 32,
+    ) -> None:
+        """
+        :param threads:
+            The number of polling threads. The buses are distributed evenly.
+        :param max_interval:
+            The maximum time in seconds between two polls of an idle bus,
+            which limits the additional latency.
+        :param min_interval:
+            The first interval after the buses became idle.
+        :param batch_size:
+            The maximum number of messages read from a bus at once.
+
+        :raises ValueError: If an argument is out of range.
+        """
+        if threads < 1:
+            raise ValueError(f"threads must be at least 1, got {threads}")
+        if not 0.0 < min_interval <= max_interval:
+            raise ValueError("0 < min_interval <= max_interval is required")
+
+        self.max_interval = max_interval
+        self.min_interval = min_interval
+        self.batch_size = batch_size
+
+        self._lock = threading.Lock()
+        self._groups: list[list[PolledBus]] = [[] for _ in range(threads)]
+        self._wakeups = [threading.Event() for _ in range(threads)]
+        self._stopped = False
+        self._threads = [
+            threading.Thread(
+                target=self._poll_thread,
+                args=(index,),
+                name=f"{self.__class__.__qualname__} {index}",
+                daemon=True,
+            )
+            for index in range(threads)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def buses(self) -> list[PolledBus]:
+        """The buses that are polled."""
+        with self._lock:
+            return [bus for group in self._groups for bus in group]
+
+    def add_bus(self, bus: BusABC) -> PolledBus:
+        """Start polling a bus.
+
+        :param bus: The bus to receive from.
+        :return: The bus to use instead of *bus*.
+
+        :raises RuntimeError: If the poller was stopped.
+        """
+        if self._stopped:
+            raise RuntimeError("The poller was stopped")
+        polled = PolledBus(bus, self)
+        with self._lock:
+            index = min(range(len(self._groups)), key=lambda i: len(self._groups[i]))
+            self._groups[index] = [*self._groups[index], polled]
+        # poll the new bus without waiting for the current interval
+        self._wakeups[index].set()
+        return polled
+
+    def remove_bus(self, bus: PolledBus) -> None:
+        """Stop polling a bus. Its queued messages can still be received.
+
+        The underlying bus is not shut down.
+        """
+        with self._lock:
+            for index, group in enumerate(self._groups):
+                if bus in group:
+                    self._groups[index] = [other for other in group if other is not bus]
+        bus._stop_polling()  # pylint: disable=protected-access
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop the polling threads.
+
+        The buses are not shut down.
+        """
+        with self._lock:
+            self._stopped = True
+            buses = [bus for group in self._groups for bus in group]
+            self._groups = [[] for _ in self._groups]
+        for wakeup in self._wakeups:
+            wakeup.set()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+        for bus in buses:
+            bus._stop_polling()  # pylint: disable=protected-access
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.stop()
+
+    def _poll_thread(self, index: int) -> None:
+        # pylint: disable=protected-access
+        wakeup = self._wakeups[index]
+        interval = 0.0
+        while not self._stopped:
+            # the list is replaced instead of modified, so no lock is needed
+            received = 0
+            for bus in self._groups[index]:
+                received += bus._poll(self.batch_size)
+
+            if received:
+                interval = 0.0
+                continue
+
+            interval = min(max(interval * 2, self.min_interval), self.max_interval)
+            if wakeup.wait(interval):
+                wakeup.clear()
+                interval = 0.0
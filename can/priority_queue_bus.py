@@ -0,0 +1,307 @@
+"""
+Contains :class:`~can.PriorityQueueBus`, which sends messages in the
+order of CAN bus arbitration instead of the order of the calls.
+"""
+
+import errno
+import heapq
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import suppress
+from types import TracebackType
+from typing import NamedTuple, Optional
+
+from typing_extensions import Self
+
+from can.bus import BusABC
+from can.exceptions import CanOperationError
+from can.message import Message
+
+try:
+    # Only raise an exception on instantiation but allow module
+    # to be imported
+    from wrapt import ObjectProxy
+
+    import_exc = None
+except ImportError as exc:
+    ObjectProxy = object
+    import_exc = exc
+
+logger = logging.getLogger(__name__)
+
+
+def arbitration_key(msg: Message) -> int:
+    """Return a key that sorts messages like the arbitration on a CAN bus.
+
+    The key contains the arbitration field bits in the order they are
+    transmitted, such that the message with the lower key wins the
+    arbitration:
+
+    * the 11 bit base identifier,
+    * the RTR bit of base frames or the SRR bit of extended frames,
+    * the IDE bit,
+    * the 18 bit identifier extension and
+    * the RTR bit of extended frames.
+
+    :param msg: The message to create the key for.
+    """
+    rtr = int(msg.is_remote_frame)
+    if msg.is_extended_id:
+        base_id = msg.arbitration_id >> 18
+        id_extension = msg.arbitration_id & 0x3FFFF
+        return base_id << 21 | 0b11 << 19 | id_extension << 1 | rtr
+    return msg.arbitration_id << 21 | rtr << 20
+
+
+class WaitTimeStatistics(NamedTuple):
+    """Waiting times of the messages with a single arbitration ID in a
+    :class:`~can.PriorityQueueBus`."""
+
+    #: Number of messages that were handed to the underlying bus
+    sent: int
+    #: Average time in seconds between queuing and sending
+    mean: float
+    #: Longest time in seconds between queuing and sending
+    max: float
+
+
+class _Entry:
+    __slots__ = ("enqueued", "key", "msg", "pending", "sequence")
+
+    def __init__(self, key: int, sequence: int, msg: Message, enqueued: float) -> None:
+        self.key = key
+        self.sequence = sequence
+        self.msg = msg
+        self.enqueued = enqueued
+        self.pending = True
+
+    def __lt__(self, other: "_Entry") -> bool:
+        return (self.key, self.sequence) < (other.key, other.sequence)
+
+
+class PriorityQueueBus(ObjectProxy):  # pylint: disable=abstract-method
+    """
+    Wraps around an existing :class:`~can.BusABC` instance and transmits
+    the messages passed to :meth:`send` in the order in which they would
+    win the arbitration on a real CAN bus, i.e. the pending message with the
+    lowest arbitration ID is sent first. Messages that would arbitrate
+    equally are sent in the order of the calls.
+
+    :meth:`send` only queues the message, a single worker thread hands them
+    to the underlying bus. This is useful for interfaces like ``slcan``,
+    ``serial`` or ``socketcand`` that transmit in the order of the calls,
+    where a bulk transfer with low priority could otherwise delay urgent
+    frames.
+
+    Use this as a drop-in replacement for :class:`~can.BusABC`::
+
+        bus = can.PriorityQueueBus(can.Bus(interface="slcan", channel="/dev/ttyACM0"))
+
+    .. note::
+
+        Errors that occur in the worker thread can not be raised by
+        :meth:`send`. They are logged, counted in :attr:`send_errors` and the
+        last one is stored in :attr:`exception`.
+
+    .. note::
+
+        Periodic tasks started with :meth:`~can.BusABC.send_periodic` are
+        sent by the underlying bus directly and bypass the queue.
+    """
+
+    __wrapped__: BusABC
+
+    def __init__(
+        self,
+        bus: BusABC,
+        max_size: int = 0,
+        max_wait: Optional[float] = None,
+        send_timeout: Optional[float] = None,
+    ) -> None:
+        """
+        :param bus:
+            The bus instance to send the messages with.
+        :param max_size:
+            The maximum number of pending messages. If set to 0, the queue
+            has an infinite capacity.
+        :param max_wait:
+            Adapt the order to prevent starvation: A message that has been
+            pending for longer than this many seconds is sent next,
+            regardless of its priority. If ``None``, the order is only
+            determined by the arbitration.
+        :param send_timeout:
+            The timeout passed to the :meth:`~can.BusABC.send` method of the
+            underlying bus.
+        """
+        if import_exc is not None:
+            raise import_exc
+
+        super().__init__(bus)
+
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self.send_timeout = send_timeout
+
+        #: Number of messages that could not be sent by the underlying bus
+        self.send_errors = 0
+        #: The last exception raised by the underlying bus
+        self.exception: Optional[Exception] = None
+
+        self._tx_condition = threading.Condition()
+        self._tx_heap: list[_Entry] = []
+        self._tx_fifo: deque[_Entry] = deque()
+        self._tx_sequence = 0
+        self._tx_stopped = False
+        self._peak_queue_depth = 0
+        # arbitration ID -> [count, total wait time, max wait time]
+        self._wait_times: dict[int, list[float]] = {}
+
+        self._tx_thread = threading.Thread(
+            target=self._tx_worker,
+            name=f'{self.__class__.__qualname__} for bus "{bus.channel_info}"',
+            daemon=True,
+        )
+        self._tx_thread.start()
+
+    def send(self, msg: Message, timeout: Optional[float] = None) -> None:
+        """Queue a message for transmission.
+
+        :param msg: A message object.
+        :param timeout:
+            If the queue is full, wait up to this many seconds for a free
+            slot. ``None`` blocks indefinitely.
+
+        :raises ~can.exceptions.CanOperationError:
+            If the queue is full or the bus was shut down.
+        """
+        with self._tx_condition:
+            if self.max_size:
+                if not self._tx_condition.wait_for(
+                    lambda: len(self._tx_heap) < self.max_size or self._tx_stopped,
+                    timeout,
+                ):
+                    raise CanOperationError("Transmit queue full", errno.ENOBUFS)
+            if self._tx_stopped:
+                raise CanOperationError("Cannot send on a closed bus")
+
+            entry = _Entry(
+                arbitration_key(msg), self._tx_sequence, msg, time.perf_counter()
+            )
+            self._tx_sequence += 1
+            heapq.heappush(self._tx_heap, entry)
+            if self.max_wait is not None:
+                self._tx_fifo.append(entry)
+            self._peak_queue_depth = max(self._peak_queue_depth, len(self._tx_heap))
+            self._tx_condition.notify_all()
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of messages waiting to be sent."""
+        return len(self._tx_heap)
+
+    @property
+    def peak_queue_depth(self) -> int:
+        """The maximum number of pending messages since the last
+        :meth:`reset_statistics`."""
+        return self._peak_queue_depth
+
+    def wait_time_statistics(self) -> dict[int, WaitTimeStatistics]:
+        """Return the waiting times of the sent messages per arbitration ID."""
+        with self._tx_condition:
+            return {
+                arbitration_id: WaitTimeStatistics(
+                    sent=int(count), mean=total / count, max=maximum
+                )
+                for arbitration_id, (count, total, maximum) in self._wait_times.items()
+            }
+
+    def reset_statistics(self) -> None:
+        """Reset the waiting times, the peak queue depth and the error count."""
+        with self._tx_condition:
+            self._wait_times.clear()
+            self._peak_queue_depth = len(self._tx_heap)
+            self.send_errors = 0
+
+    def flush_tx_buffer(self) -> None:
+        """Discard all pending messages, including those in the buffer of
+        the underlying bus if supported."""
+        with self._tx_condition:
+            for entry in self._tx_heap:
+                entry.pending = False
+            self._tx_heap.clear()
+            self._tx_fifo.clear()
+            self._tx_condition.notify_all()
+        with suppress(NotImplementedError):
+            self.__wrapped__.flush_tx_buffer()
+
+    def shutdown(self) -> None:
+        """Stop the worker thread, discard all pending messages and shut
+        down the underlying bus."""
+        with self._tx_condition:
+            self._tx_stopped = True
+            if self._tx_heap:
+                logger.debug("discarding %d pending messages", len(self._tx_heap))
+            self._tx_heap.clear()
+            self._tx_fifo.clear()
+            self._tx_condition.notify_all()
+        if self._tx_thread is not threading.current_thread():
+            self._tx_thread.join()
+        self.__wrapped__.shutdown()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.shutdown()
+
+    def _pop_next(self) -> _Entry:
+        # promote messages that have been waiting for too long
+        if self.max_wait is not None:
+            while self._tx_fifo and not self._tx_fifo[0].pending:
+                self._tx_fifo.popleft()
+            if (
+                self._tx_fifo
+                and time.perf_counter() - self._tx_fifo[0].enqueued > self.max_wait
+            ):
+                entry = self._tx_fifo.popleft()
+                self._tx_heap.remove(entry)
+                heapq.heapify(self._tx_heap)
+                entry.pending = False
+                return entry
+
+        entry = heapq.heappop(self._tx_heap)
+        entry.pending = False
+        return entry
+
+    def _tx_worker(self) -> None:
+        while True:
+            with self._tx_condition:
+                self._tx_condition.wait_for(lambda: self._tx_heap or self._tx_stopped)
+                if self._tx_stopped:
+                    return
+                entry = self._pop_next()
+                # wake up senders waiting for a free slot
+                self._tx_condition.notify_all()
+
+            wait_time = time.perf_counter() - entry.enqueued
+            try:
+                self.__wrapped__.send(entry.msg, self.send_timeout)
+            except Exception as exc:  # pylint: disable=broad-except
+                self.exception = exc
+                self.send_errors += 1
+                logger.warning("Failed to send %s: %s", entry.msg, exc)
+            else:
+                with self._tx_condition:
+                    stats = self._wait_times.setdefault(
+                        entry.msg.arbitration_id, [0, 0.0, 0.0]
+                    )
+                    stats[0] += 1
+                    stats[1] += wait_time
+                    stats[2] = max(stats[2], wait_time)
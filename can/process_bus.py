@@ -0,0 +1,431 @@
+"""
+Contains :class:`~can.ProcessBus`, which runs an interface in a child
+process.
+"""
+
+import contextlib
+import logging
+import multiprocessing
+import pickle
+import threading
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing.connection import Connection
+from queue import Empty, SimpleQueue
+from typing import Any, Optional
+
+from can import typechecking
+from can.bus import BusABC, BusState, _WakeupSocket
+from can.exceptions import CanInitializationError, CanOperationError
+from can.interface import Bus
+from can.message import Message
+
+logger = logging.getLogger(__name__)
+
+#: The time in seconds after which the receiving thread of the child process
+#: checks whether it should stop, if the interface does not support
+#: :meth:`~can.BusABC.interrupt`
+_CHILD_POLL_INTERVAL = 0.1
+
+_SendRequest = tuple[Message, Optional[float], "Future[None]"]
+
+
+class ProcessBus(BusABC):
+    """
+    Runs an interface in a child process, such that receiving keeps up
+    with the bus regardless of the load of the current process.
+
+    When a logger, a GUI and an analysis share one process with a busy bus,
+    the interface often can not read the received frames fast enough while
+    other threads hold the GIL, and the kernel or the adapter drops frames.
+    This class creates the real bus in a child process, which receives
+    continuously and forwards the messages in batches through a pipe::
+
+        with can.ProcessBus(interface="socketcan", channel="can0") as bus:
+            for msg in bus:
+                print(msg)
+
+    The filters are applied by the bus in the child process, i.e. in the
+    kernel or the hardware where supported. Messages that were received
+    before the filters changed are checked again in the current process.
+    Sent messages are forwarded in batches, too, if several threads send
+    concurrently. :meth:`fileno` returns a file descriptor that is readable
+    while messages are available, so the bus can be used with
+    :func:`select.select` or a :class:`~can.Notifier` in an :mod:`asyncio`
+    event loop.
+
+    .. note::
+
+        The child process is started with the ``spawn`` method. The
+        interface arguments must therefore be picklable, and the received
+        messages are copies. Periodic tasks are sent by the current process.
+    """
+
+    def __init__(
+        self,
+        channel: Optional[typechecking.Channel] = None,
+        interface: Optional[str] = None,
+        config_context: Optional[str] = None,
+        ignore_config: bool = False,
+        can_filters: Optional[typechecking.CanFilters] = None,
+        batch_size: int = 64,
+        **kwargs: Any,
+    ) -> None:
+        """
+        The arguments except for the following are passed to :func:`can.Bus`
+        in the child process.
+
+        :param can_filters:
+            See :meth:`~can.BusABC.set_filters`.
+        :param batch_size:
+            The maximum number of messages that are forwarded at once.
+
+        :raises ~can.exceptions.CanInitializationError:
+            If the child process could not be started.
+        :raises Exception:
+            Any exception raised by :func:`can.Bus` in the child process.
+        """
+        context = multiprocessing.get_context("spawn")
+        self._cmd_conn, child_cmd_conn = context.Pipe()
+        self._rx_conn, child_rx_conn = context.Pipe(duplex=False)
+        self._process = context.Process(
+            target=_serve,
+            args=(
+                child_cmd_conn,
+                child_rx_conn,
+                {
+                    "channel": channel,
+                    "interface": interface,
+                    "config_context": config_context,
+                    "ignore_config": ignore_config,
+                    "can_filters": can_filters,
+                    **kwargs,
+                },
+                batch_size,
+            ),
+            name=f"{self.__class__.__qualname__} {interface or ''} {channel or ''}",
+            daemon=True,
+        )
+        self._process.start()
+        # only the child process may keep these ends open, to detect its exit
+        child_cmd_conn.close()
+        child_rx_conn.close()
+
+        try:
+            status, result = self._cmd_conn.recv()
+        except (EOFError, OSError) as error:
+            self._close_process()
+            raise CanInitializationError(
+                "The child process exited unexpectedly"
+            ) from error
+        if status == "error":
+            self._close_process()
+            raise result
+        self.channel_info, self._can_protocol = result
+
+        self._cmd_lock = threading.Lock()
+        self._rx_condition = threading.Condition()
+        # received messages with the number of the filters of the child
+        # process that passed them
+        self._rx_queue: deque[tuple[int, Message]] = deque()
+        self._filter_generation = 0
+        self._rx_ready = _WakeupSocket()
+        self._rx_signalled = False
+        #: The exception that stopped receiving, if any
+        self.exception: Optional[Exception] = None
+        self._rx_stopped = False
+        self._rx_thread = threading.Thread(
+            target=self._rx_worker,
+            name=f'{self.__class__.__qualname__} RX for bus "{self.channel_info}"',
+            daemon=True,
+        )
+        self._rx_thread.start()
+
+        self.batch_size = batch_size
+        self._tx_queue: SimpleQueue[Optional[_SendRequest]] = SimpleQueue()
+        self._tx_lock = threading.Lock()
+        self._tx_closed = False
+        self._tx_thread = threading.Thread(
+            target=self._tx_worker,
+            name=f'{self.__class__.__qualname__} TX for bus "{self.channel_info}"',
+            daemon=True,
+        )
+        self._tx_thread.start()
+
+        super().__init__(
+            channel=channel or self.channel_info, can_filters=can_filters, **kwargs
+        )
+
+    def _recv_internal(
+        self, timeout: Optional[float]
+    ) -> tuple[Optional[Message], bool]:
+        with self._rx_condition:
+            if not self._rx_condition.wait_for(
+                lambda: self._rx_queue or self._rx_stopped or self._interrupt_pending,
+                timeout,
+            ):
+                return None, True
+            if self._rx_queue:
+                generation, msg = self._rx_queue.popleft()
+                if not self._rx_queue and self._rx_signalled:
+                    self._rx_ready.clear()
+                    self._rx_signalled = False
+                # messages received before the child process applied the
+                # current filters are checked again
+                return msg, generation == self._filter_generation
+            if self._interrupt_pending:
+                return None, True
+            if self.exception is not None:
+                raise CanOperationError(
+                    f"Receiving failed: {self.exception}"
+                ) from self.exception
+            raise CanOperationError("The child process exited")
+
+    def _wake_up(self) -> None:
+        with self._rx_condition:
+            self._rx_condition.notify_all()
+
+    def send(self, msg: Message, timeout: Optional[float] = None) -> None:
+        """Transmit a message with the bus in the child process.
+
+        :raises ~can.exceptions.CanOperationError:
+            If an error occurred while sending or the bus was shut down.
+        """
+        future: Future[None] = Future()
+        with self._tx_lock:
+            if self._tx_closed:
+                raise CanOperationError("Cannot send on a closed bus")
+            self._tx_queue.put((msg, timeout, future))
+        future.result()
+
+    def fileno(self) -> int:
+        """Return a file descriptor that is readable while received messages
+        are available."""
+        return self._rx_ready.fileno()
+
+    def _apply_filters(self, filters: Optional[typechecking.CanFilters]) -> None:
+        self._filter_generation += 1
+        self._request("set_filters", filters, self._filter_generation)
+
+    def flush_tx_buffer(self) -> None:
+        self._request("flush_tx_buffer")
+
+    @property
+    def state(self) -> BusState:
+        """The state of the bus in the child process."""
+        state: BusState = self._request("get_state")
+        return state
+
+    @state.setter
+    def state(self, new_state: BusState) -> None:
+        self._request("set_state", new_state)
+
+    def shutdown(self) -> None:
+        """Shut down the bus in the child process and stop the process."""
+        if self._is_shutdown:
+            return
+        super().shutdown()
+        with self._tx_lock:
+            # the TX thread sends the queued messages first
+            self._tx_closed = True
+            self._tx_queue.put(None)
+        if self._tx_thread is not threading.current_thread():
+            self._tx_thread.join()
+        with contextlib.suppress(CanOperationError):
+            self._request("shutdown")
+        self._close_process()
+        self._rx_thread.join()
+        self._rx_ready.close()
+
+    def _close_process(self) -> None:
+        self._process.join(5.0)
+        if self._process.is_alive():
+            logger.warning("Terminating the child process of %s", self.channel_info)
+            self._process.terminate()
+            self._process.join()
+        self._cmd_conn.close()
+        self._rx_conn.close()
+
+    def _request(self, command: str, *args: Any) -> Any:
+        with self._cmd_lock:
+            try:
+                self._cmd_conn.send((command, args))
+                status, result = self._cmd_conn.recv()
+            except (EOFError, OSError) as error:
+                raise CanOperationError(
+                    f"Lost the connection to the child process: {error}"
+                ) from error
+        if status == "error":
+            raise result
+        return result
+
+    def _rx_worker(self) -> None:
+        while True:
+            try:
+                batch = self._rx_conn.recv()
+            except (EOFError, OSError):
+                batch = None
+            with self._rx_condition:
+                if isinstance(batch, tuple):
+                    generation, messages = batch
+                    self._rx_queue.extend((generation, msg) for msg in messages)
+                    if not self._rx_signalled:
+                        self._rx_ready.set()
+                        self._rx_signalled = True
+                else:
+                    if isinstance(batch, Exception):
+                        logger.warning("Stopped receiving: %s", batch)
+                        self.exception = batch
+                    self._rx_stopped = True
+                    self._rx_ready.set()
+                self._rx_condition.notify_all()
+                if self._rx_stopped:
+                    return
+
+    def _tx_worker(self) -> None:
+        while True:
+            request = self._tx_queue.get()
+            batch: list[_SendRequest] = []
+            while request is not None:
+                batch.append(request)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    request = self._tx_queue.get_nowait()
+                except Empty:
+                    break
+
+            if batch:
+                try:
+                    errors = self._request(
+                        "send", [(msg, timeout) for msg, timeout, _ in batch]
+                    )
+                except CanOperationError as exc:
+                    errors = [exc] * len(batch)
+                for (_, _, future), error in zip(batch, errors):
+                    if error is None:
+                        future.set_result(None)
+                    else:
+                        future.set_exception(error)
+
+            if request is None:
+                return
+
+
+def _picklable(exc: Exception) -> Exception:
+    try:
+        pickle.dumps(exc)
+    except Exception:  # pylint: disable=broad-except
+        return CanOperationError(f"{exc.__class__.__name__}: {exc}")
+    return exc
+
+
+def _serve(
+    cmd_conn: Connection,
+    rx_conn: Connection,
+    bus_kwargs: dict[str, Any],
+    batch_size: int,
+) -> None:
+    """The main function of the child process of a :class:`ProcessBus`."""
+    try:
+        bus = Bus(**bus_kwargs)
+    except Exception as exc:  # pylint: disable=broad-except
+        cmd_conn.send(("error", _picklable(exc)))
+        return
+    cmd_conn.send(("ok", (bus.channel_info, bus.protocol)))
+
+    # the number of the filters that the bus applies, which the parent
+    # process increments with every call of set_filters()
+    filter_generation = [0]
+    stopped = threading.Event()
+    rx_thread = threading.Thread(
+        target=_forward_received,
+        args=(bus, rx_conn, batch_size, stopped, filter_generation),
+        name="ProcessBus forwarder",
+        daemon=True,
+    )
+    rx_thread.start()
+
+    try:
+        while True:
+            try:
+                command, args = cmd_conn.recv()
+            except (EOFError, OSError):
+                # the parent process exited
+                return
+            if command == "shutdown":
+                break
+            try:
+                result = _execute(bus, command, args)
+                if command == "set_filters":
+                    filter_generation[0] = args[1]
+            except Exception as exc:  # pylint: disable=broad-except
+                cmd_conn.send(("error", _picklable(exc)))
+            else:
+                cmd_conn.send(("ok", result))
+    finally:
+        stopped.set()
+        with contextlib.suppress(NotImplementedError):
+            bus.interrupt()
+        rx_thread.join()
+        bus.shutdown()
+        rx_conn.close()
+
+    cmd_conn.send(("ok", None))
+    cmd_conn.close()
+
+
+def _execute(bus: BusABC, command: str, args: tuple[Any, ...]) -> Any:
+    if command == "send":
+        errors: list[Optional[Exception]] = []
+        for msg, timeout in args[0]:
+            try:
+                bus.send(msg, timeout)
+            except Exception as exc:  # pylint: disable=broad-except
+                errors.append(_picklable(exc))
+            else:
+                errors.append(None)
+        return errors
+    if command == "set_filters":
+        bus.set_filters(args[0])
+        return None
+    if command == "flush_tx_buffer":
+        bus.flush_tx_buffer()
+        return None
+    if command == "get_state":
+        return bus.state
+    if command == "set_state":
+        bus.state = args[0]
+        return None
+    raise ValueError(f"Unknown command {command!r}")
+
+
+def _forward_received(
+    bus: BusABC,
+    rx_conn: Connection,
+    batch_size: int,
+    stopped: threading.Event,
+    filter_generation: list[int],
+) -> None:
+    while not stopped.is_set():
+        # read before receiving, so that messages which passed older
+        # filters are never attributed to newer ones
+        generation = filter_generation[0]
+        try:
+            msg = bus.recv(_CHILD_POLL_INTERVAL)
+            if msg is None:
+                continue
+            batch = [msg]
+            while len(batch) < batch_size:
+                msg = bus.recv(0)
+                if msg is None:
+                    break
+                batch.append(msg)
+        except Exception as exc:  # pylint: disable=broad-except
+            rx_conn.send(_picklable(exc))
+            return
+        try:
+            rx_conn.send((generation, batch))
+        except OSError:
+            # the parent process exited
+            return
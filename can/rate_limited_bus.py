@@ -0,0 +1,177 @@
+"""
+Contains :class:`~can.RateLimitedBus`, which paces the transmitted messages
+such that they do not exceed a given share of the bus capacity.
+"""
+
+import threading
+import time
+from collections.abc import Iterable
+from types import TracebackType
+from typing import Optional, Union
+
+from typing_extensions import Self
+
+from can.bit_timing import BitTiming, BitTimingFd
+from can.bus import BusABC
+from can.bus_load import bitrates, frame_bit_length
+from can.exceptions import CanTimeoutError
+from can.message import Message
+
+try:
+    # Only raise an exception on instantiation but allow module
+    # to be imported
+    from wrapt import ObjectProxy
+
+    import_exc = None
+except ImportError as exc:
+    ObjectProxy = object
+    import_exc = exc
+
+
+class RateLimitedBus(ObjectProxy):  # pylint: disable=abstract-method
+    """
+    Wraps around an existing :class:`~can.BusABC` instance and delays
+    :meth:`send` such that the transmitted frames occupy at most a given
+    share of the bus time.
+
+    The transmission time of every frame is calculated from the bit timing
+    of the bus, assuming the maximum number of stuff bits (see
+    :func:`can.bus_load.frame_bit_length`). A token bucket allows short bursts
+    and enforces the limit on average. This prevents the transmit buffers of
+    an interface from overflowing, e.g. when recorded traffic of a fast bus
+    is replayed on a slower one::
+
+        timing = can.BitTiming.from_sample_point(
+            f_clock=8_000_000, bitrate=500_000, sample_point=87.5
+        )
+        bus = can.RateLimitedBus(can.Bus(interface="pcan"), timing, max_load=0.8)
+
+    Use this as a drop-in replacement for :class:`~can.BusABC`.
+
+    .. note::
+
+        Periodic tasks started with :meth:`~can.BusABC.send_periodic` are
+        sent by the underlying bus directly and are not limited.
+    """
+
+    __wrapped__: BusABC
+
+    def __init__(
+        self,
+        bus: BusABC,
+        timing: Union[BitTiming, BitTimingFd],
+        max_load: float = 1.0,
+        max_burst: float = 0.005,
+    ) -> None:
+        """
+        :param bus:
+            The bus instance to send the messages with.
+        :param timing:
+            The bit timing configuration of the bus. A
+            :class:`~can.BitTimingFd` is required to account for the data
+            phase of CAN FD frames with bit rate switching.
+        :param max_load:
+            The maximum share of the bus time used by the sent frames,
+            between 0 (exclusive) and 1.
+        :param max_burst:
+            The amount of bus time in seconds that may be sent without delay
+            after an idle period.
+
+        :raises ValueError: If *max_load* or *max_burst* is out of range.
+        """
+        if import_exc is not None:
+            raise import_exc
+
+        if not 0.0 < max_load <= 1.0:
+            raise ValueError(f"max_load must be in (0, 1], got {max_load}")
+        if max_burst < 0.0:
+            raise ValueError(f"max_burst must not be negative, got {max_burst}")
+
+        super().__init__(bus)
+
+        self.timing = timing
+        self.max_load = max_load
+        self.max_burst = max_burst
+
+        #: Total time in seconds that :meth:`send` was delayed
+        self.total_delay = 0.0
+
+        self._nominal_bitrate, self._data_bitrate = bitrates(timing)
+        self._bucket_lock = threading.Lock()
+        self._bucket = max_burst
+        self._bucket_updated = time.perf_counter()
+
+    def frame_duration(self, msg: Message) -> float:
+        """Return the worst case transmission time of a message on this bus."""
+        return frame_bit_length(msg).duration(self._nominal_bitrate, self._data_bitrate)
+
+    def send(self, msg: Message, timeout: Optional[float] = None) -> None:
+        """Wait until the message may be sent without exceeding the maximum
+        bus load and transmit it.
+
+        :param msg: A message object.
+        :param timeout:
+            The maximum time in seconds to wait in total. ``None`` waits
+            indefinitely.
+
+        :raises ~can.exceptions.CanTimeoutError:
+            If the message can not be sent within *timeout* without exceeding
+            the maximum bus load.
+        """
+        if timeout is None:
+            self._acquire(self.frame_duration(msg), None)
+            self.__wrapped__.send(msg)
+        else:
+            started = time.perf_counter()
+            self._acquire(self.frame_duration(msg), timeout)
+            remaining = max(0.0, timeout - (time.perf_counter() - started))
+            self.__wrapped__.send(msg, remaining)
+
+    def send_many(
+        self, msgs: Iterable[Message], timeout: Optional[float] = None
+    ) -> None:
+        """Send several messages in order, paced like :meth:`send`.
+
+        :param msgs: The messages to send.
+        :param timeout: The timeout for every single message.
+
+        :raises ~can.exceptions.CanTimeoutError:
+            If a message can not be sent in time. The following messages
+            are not sent.
+        """
+        for msg in msgs:
+            self.send(msg, timeout)
+
+    def _acquire(self, duration: float, timeout: Optional[float]) -> None:
+        # The bucket contains the bus time (in seconds) that may be used
+        # without waiting. It is refilled with max_load seconds per second
+        # and may become negative, such that concurrent senders queue up.
+        with self._bucket_lock:
+            now = time.perf_counter()
+            self._bucket = min(
+                self.max_burst,
+                self._bucket + (now - self._bucket_updated) * self.max_load,
+            )
+            self._bucket_updated = now
+            delay = (duration - self._bucket) / self.max_load
+            if timeout is not None and delay > timeout:
+                raise CanTimeoutError(
+                    f"Sending would exceed the maximum bus load for {delay:.6f} s"
+                )
+            self._bucket -= duration
+            if delay > 0.0:
+                self.total_delay += delay
+
+        if delay > 0.0:
+            time.sleep(delay)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.shutdown()
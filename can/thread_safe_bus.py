@@ -1,13 +1,27 @@
-from contextlib import nullcontext
+import logging
+import threading
+from concurrent.futures import Future
+from contextlib import nullcontext, suppress
+from queue import Empty, SimpleQueue
 from threading import RLock
-from typing import Any, Optional
+from types import TracebackType
+from typing import Any, Callable, Optional
+
+from typing_extensions import Self
 
 from can import typechecking
 from can.bus import BusABC, BusState, CanProtocol
+from can.exceptions import CanOperationError
 from can.message import Message
 
 from .interface import Bus
 
+logger = logging.getLogger(__name__)
+
+#: Callback of :class:`ThreadSafeBus` in TX worker mode, called with the
+#: message and the exception or ``None`` if the message was sent
+TxCallback = Callable[[Message, Optional[Exception]], None]
+
 try:
     # Only raise an exception on instantiation but allow module
     # to be imported
@@ -34,6 +48,17 @@ class ThreadSafeBus(ObjectProxy):  # pylint: disable=abstract-method
         :meth:`~can.BusABC._recv_internal` of the underlying bus instance can be
         called simultaneously, and that the methods use :meth:`~can.BusABC._recv_internal`
         instead of :meth:`~can.BusABC.recv` directly.
+
+    With ``tx_worker=True``, :meth:`send` does not call the underlying bus.
+    It appends the message to a queue and returns a
+    :class:`~concurrent.futures.Future` immediately. A dedicated thread sends
+    the queued messages in batches, in the order in which they were queued.
+    Errors are reported through the future and the optional *tx_callback*::
+
+        bus = can.ThreadSafeBus(interface="pcan", tx_worker=True)
+        future = bus.send(msg)
+        ...
+        future.result()  # raises the exception of the underlying bus, if any
     """
 
     __wrapped__: BusABC
@@ -44,8 +69,24 @@ class ThreadSafeBus(ObjectProxy):  # pylint: disable=abstract-method
         interface: Optional[str] = None,
         config_context: Optional[str] = None,
         ignore_config: bool = False,
+        tx_worker: bool = False,
+        tx_batch_size: int = 64,
+        tx_callback: Optional[TxCallback] = None,
         **kwargs: Any,
     ) -> None:
+        """
+        The arguments except for the following are passed to :func:`can.Bus`.
+
+        :param tx_worker:
+            If ``True``, :meth:`send` only queues the messages and a dedicated
+            thread sends them.
+        :param tx_batch_size:
+            The maximum number of queued messages that the TX thread sends
+            while holding the send lock.
+        :param tx_callback:
+            Called by the TX thread after every message with the message and
+            the exception raised by the underlying bus, or ``None``.
+        """
         if import_exc is not None:
             raise import_exc
 
@@ -67,13 +108,125 @@ class ThreadSafeBus(ObjectProxy):  # pylint: disable=abstract-method
         self._lock_send = RLock()
         self._lock_recv = RLock()
 
+        self.tx_batch_size = tx_batch_size
+        self.tx_callback = tx_callback
+        # queued messages are numbered, so that flush_tx_buffer() can also
+        # discard the ones that the TX thread already took from the queue
+        self._tx_queue: SimpleQueue[
+            Optional[tuple[int, Message, Optional[float], Future[None]]]
+        ] = SimpleQueue()
+        self._tx_state_lock = threading.Lock()
+        self._tx_sequence = 0
+        self._tx_flushed = 0
+        self._tx_closed = False
+        self._tx_thread: Optional[threading.Thread] = None
+        if tx_worker:
+            self._tx_thread = threading.Thread(
+                target=self._tx_worker,
+                name=f'{self.__class__.__qualname__} TX for bus "{self.channel_info}"',
+                daemon=True,
+            )
+            self._tx_thread.start()
+
     def recv(self, timeout: Optional[float] = None) -> Optional[Message]:
         with self._lock_recv:
             return self.__wrapped__.recv(timeout=timeout)
 
-    def send(self, msg: Message, timeout: Optional[float] = None) -> None:
-        with self._lock_send:
-            return self.__wrapped__.send(msg=msg, timeout=timeout)
+    def send(
+        self, msg: Message, timeout: Optional[float] = None
+    ) -> Optional["Future[None]"]:
+        """Transmit a message to the CAN bus.
+
+        :param msg: A message object.
+        :param timeout: The timeout passed to the underlying bus.
+        :return:
+            In TX worker mode, a future that completes when the message was
+            handed to the underlying bus. Otherwise ``None``.
+
+        :raises ~can.exceptions.CanOperationError:
+            If an error occurred while sending, or in TX worker mode if the
+            bus was shut down.
+        """
+        if self._tx_thread is None:
+            with self._lock_send:
+                return self.__wrapped__.send(msg=msg, timeout=timeout)
+
+        future: Future[None] = Future()
+        with self._tx_state_lock:
+            if self._tx_closed or not self._tx_thread.is_alive():
+                raise CanOperationError("Cannot send on a closed bus")
+            self._tx_sequence += 1
+            self._tx_queue.put((self._tx_sequence, msg, timeout, future))
+        return future
+
+    @property
+    def tx_queue_size(self) -> int:
+        """The approximate number of messages waiting for the TX thread."""
+        return self._tx_queue.qsize()
+
+    def _tx_worker(self) -> None:
+        while True:
+            batch = [self._tx_queue.get()]
+            try:
+                while len(batch) < self.tx_batch_size:
+                    batch.append(self._tx_queue.get_nowait())
+            except Empty:
+                pass
+
+            with self._lock_send:
+                for index, item in enumerate(batch):
+                    if item is None:
+                        self._tx_fail(batch[index + 1 :])
+                        return
+                    self._tx_one(*item)
+
+    def _tx_one(
+        self,
+        sequence: int,
+        msg: Message,
+        timeout: Optional[float],
+        future: "Future[None]",
+    ) -> None:
+        if sequence <= self._tx_flushed:
+            # discarded by flush_tx_buffer() after it was taken from the queue
+            future.cancel()
+        if not future.set_running_or_notify_cancel():
+            return
+        error: Optional[Exception] = None
+        try:
+            self.__wrapped__.send(msg=msg, timeout=timeout)
+        except Exception as exc:  # pylint: disable=broad-except
+            error = exc
+        self._tx_complete(msg, future, error)
+
+    def _tx_fail(
+        self,
+        items: list[Optional[tuple[int, Message, Optional[float], "Future[None]"]]],
+    ) -> None:
+        """Fail the messages that were queued after the bus was shut down."""
+        try:
+            while True:
+                items.append(self._tx_queue.get_nowait())
+        except Empty:
+            pass
+        for item in items:
+            if item is not None and item[3].set_running_or_notify_cancel():
+                error = CanOperationError("The bus was shut down before sending")
+                self._tx_complete(item[1], item[3], error)
+
+    def _tx_complete(
+        self, msg: Message, future: "Future[None]", error: Optional[Exception]
+    ) -> None:
+        if error is None:
+            future.set_result(None)
+        else:
+            future.set_exception(error)
+
+        if self.tx_callback is not None:
+            try:
+                self.tx_callback(msg, error)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("TX callback failed")
 
     # send_periodic does not need a lock, since the underlying
     # `send` method is already synchronized
@@ -93,13 +246,55 @@ class ThreadSafeBus(ObjectProxy):  # pylint: disable=abstract-method
             return self.__wrapped__.set_filters(filters=filters)
 
     def flush_tx_buffer(self) -> None:
+        # discard the messages queued for the TX thread
         with self._lock_send:
-            return self.__wrapped__.flush_tx_buffer()
+            with self._tx_state_lock:
+                self._tx_flushed = self._tx_sequence
+            stop = False
+            try:
+                while True:
+                    item = self._tx_queue.get_nowait()
+                    if item is None:
+                        stop = True
+                    elif item[3].cancel():
+                        # notify the waiters of concurrent.futures.wait()
+                        item[3].set_running_or_notify_cancel()
+            except Empty:
+                pass
+            if stop:
+                # keep the stop request of shutdown()
+                self._tx_queue.put(None)
+            if self._tx_thread is None:
+                return self.__wrapped__.flush_tx_buffer()
+            with suppress(NotImplementedError):
+                self.__wrapped__.flush_tx_buffer()
+            return None
 
     def shutdown(self) -> None:
+        if self._tx_thread is not None:
+            # send the queued messages first, and refuse new ones
+            with self._tx_state_lock:
+                if not self._tx_closed:
+                    self._tx_closed = True
+                    self._tx_queue.put(None)
+            if self._tx_thread is not threading.current_thread():
+                self._tx_thread.join()
+                # in case the TX thread did not reach the stop request
+                self._tx_fail([])
         with self._lock_send, self._lock_recv:
             return self.__wrapped__.shutdown()
 
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.shutdown()
+
     @property
     def state(self) -> BusState:
         with self._lock_send, self._lock_recv:
@@ -26,8 +26,25 @@ class _CanFilterBase(TypedDict):
     can_mask: int
 
 
+class _CanDataFilterBase(TypedDict):
+    offset: int
+    value: int
+
+
+class CanDataFilter(_CanDataFilterBase, total=False):
+    mask: int
+
+
 class CanFilter(_CanFilterBase, total=False):
     extended: bool
+    data: Sequence[CanDataFilter]
+    min_id: int
+    max_id: int
+    min_dlc: int
+    max_dlc: int
+    fd: bool
+    remote: bool
+    error: bool
 
 
 CanFilters = Sequence[CanFilter]
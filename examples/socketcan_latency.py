@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+"""
+Measures the round-trip latency of SocketCAN buses on a virtual interface,
+with the default receive mode and with busy polling.
+
+An echo thread answers every request on its own bus, and the main thread
+measures the time from sending a request until the answer was received. Set
+up the interface first with::
+
+    sudo modprobe vcan
+    sudo ip link add dev vcan0 type vcan
+    sudo ip link set up vcan0
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from typing import Any
+
+import can
+
+REQUEST_ID = 0x100
+RESPONSE_ID = 0x101
+
+MODES = {
+    "select": {},
+    "spin": {"rx_spin_time": 0.001},
+    "spin+busy_poll": {"rx_spin_time": 0.001, "busy_poll": 50},
+}
+
+
+def echo(bus: can.BusABC, stop: threading.Event) -> None:
+    """Answer every request with a response carrying the same data."""
+    while not stop.is_set():
+        msg = bus.recv(0.1)
+        if msg is not None and msg.arbitration_id == REQUEST_ID:
+            bus.send(
+                can.Message(
+                    arbitration_id=RESPONSE_ID, is_extended_id=False, data=msg.data
+                )
+            )
+
+
+def measure(channel: str, count: int, **kwargs: Any) -> list[float]:
+    """Return the round-trip times in seconds of *count* requests."""
+    filters = [{"can_id": RESPONSE_ID, "can_mask": 0x7FF, "extended": False}]
+    echo_filters = [{"can_id": REQUEST_ID, "can_mask": 0x7FF, "extended": False}]
+    bus = can.Bus(interface="socketcan", channel=channel, can_filters=filters, **kwargs)
+    echo_bus = can.Bus(
+        interface="socketcan", channel=channel, can_filters=echo_filters, **kwargs
+    )
+    with bus, echo_bus:
+        stop = threading.Event()
+        thread = threading.Thread(target=echo, args=(echo_bus, stop))
+        thread.start()
+        try:
+            round_trips = []
+            for index in range(count):
+                request = can.Message(
+                    arbitration_id=REQUEST_ID,
+                    is_extended_id=False,
+                    data=index.to_bytes(4, "little"),
+                )
+                started = time.perf_counter()
+                bus.send(request)
+                response = bus.recv(1.0)
+                if response is None:
+                    raise can.CanTimeoutError("No response received")
+                round_trips.append(time.perf_counter() - started)
+        finally:
+            stop.set()
+            thread.join()
+    return round_trips
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--channel", default="vcan0", help="Default: vcan0")
+    parser.add_argument(
+        "--count", type=int, default=10_000, help="Round trips per mode"
+    )
+    args = parser.parse_args()
+
+    print(f"{'mode':<16}{'min':>10}{'median':>10}{'p99':>10}{'max':>10}  (µs)")
+    for mode, kwargs in MODES.items():
+        round_trips = sorted(measure(args.channel, args.count, **kwargs))
+        values = (
+            round_trips[0],
+            statistics.median(round_trips),
+            round_trips[int(len(round_trips) * 0.99)],
+            round_trips[-1],
+        )
+        print(f"{mode:<16}" + "".join(f"{value * 1e6:>10.1f}" for value in values))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 
 import asyncio
+import threading
 import time
 import unittest
 
@@ -70,6 +71,43 @@ class NotifierTest(unittest.TestCase):
                 # find_instance must return the existing instance
                 self.assertEqual(can.Notifier.find_instances(bus), (notifier,))
 
+    def test_stop_interrupts_recv(self):
+        with can.Bus("test", interface="virtual") as bus:
+            notifier = can.Notifier(bus, [can.BufferedReader()], timeout=10.0)
+            time.sleep(0.05)
+            started = time.perf_counter()
+            notifier.stop()
+            self.assertLess(time.perf_counter() - started, 1.0)
+            self.assertFalse(any(reader.is_alive() for reader in notifier._readers))
+
+    def test_stop_during_callback_keeps_recv_working(self):
+        entered = threading.Event()
+        release = threading.Event()
+
+        def on_message(msg):
+            entered.set()
+            release.wait(5)
+
+        with (
+            can.Bus("test", interface="virtual") as bus,
+            can.Bus("test", interface="virtual") as sender,
+        ):
+            notifier = can.Notifier(bus, [on_message], timeout=10.0)
+            sender.send(can.Message(arbitration_id=1))
+            self.assertTrue(entered.wait(5))
+
+            # the reader is in the callback and not waiting in recv()
+            stopper = threading.Thread(target=notifier.stop)
+            stopper.start()
+            time.sleep(0.05)
+            release.set()
+            stopper.join(5)
+
+            sender.send(can.Message(arbitration_id=2))
+            msg = bus.recv(1)
+            self.assertIsNotNone(msg)
+            self.assertEqual(msg.arbitration_id, 2)
+
 
 class AsyncNotifierTest(unittest.TestCase):
     def test_asyncio_notifier(self):
@@ -121,6 +121,92 @@ class TestBridgeScriptModule(unittest.TestCase, ComparingMessagesTestCase):
                 self.assertNotIn(self.channel1, virtual.channels)
                 self.assertNotIn(self.channel2, virtual.channels)
 
+    def test_offload_requires_socketcan(self):
+        with (
+            unittest.mock.patch(
+                "can.bridge.sys.argv",
+                [sys.argv[0], *self.cli_args, "--offload", "kernel"],
+            ),
+            self.assertRaises(SystemExit),
+        ):
+            can.bridge.main()
+
+        # the buses were shut down
+        with virtual.channels_lock:
+            self.assertNotIn(self.channel1, virtual.channels)
+            self.assertNotIn(self.channel2, virtual.channels)
+
+    def test_invalid_routes(self):
+        with (
+            unittest.mock.patch(
+                "can.bridge.sys.argv",
+                [sys.argv[0], "--routes", "does-not-exist.json"],
+            ),
+            self.assertRaises(SystemExit),
+        ):
+            can.bridge.main()
+
+
+class TestKernelGatewayOffload(unittest.TestCase):
+    def setUp(self):
+        from can.interfaces.socketcan import SocketcanBus
+
+        self.bus1 = unittest.mock.Mock(
+            spec=SocketcanBus,
+            channel="vcan0",
+            filters=[{"can_id": 0x100, "can_mask": 0x700}],
+            protocol=can.CanProtocol.CAN_20,
+        )
+        self.bus2 = unittest.mock.Mock(
+            spec=SocketcanBus,
+            channel="vcan1",
+            filters=None,
+            protocol=can.CanProtocol.CAN_20,
+        )
+
+    def test_rules(self):
+        from can.interfaces.socketcan.gateway import GatewayRule
+
+        with unittest.mock.patch(
+            "can.interfaces.socketcan.gateway.KernelGateway"
+        ) as kernel_gateway:
+            gateway = can.bridge._start_kernel_gateway(
+                self.bus1, self.bus2, required=False
+            )
+        self.assertIs(gateway, kernel_gateway.return_value)
+        kernel_gateway.assert_called_once_with(
+            [
+                GatewayRule("vcan0", "vcan1", {"can_id": 0x100, "can_mask": 0x700}),
+                GatewayRule("vcan1", "vcan0"),
+            ]
+        )
+
+    def test_fd_rules(self):
+        self.bus1.protocol = self.bus2.protocol = can.CanProtocol.CAN_FD
+        with unittest.mock.patch(
+            "can.interfaces.socketcan.gateway.KernelGateway"
+        ) as kernel_gateway:
+            can.bridge._start_kernel_gateway(self.bus1, self.bus2, required=False)
+        rules = kernel_gateway.call_args.args[0]
+        self.assertEqual([rule.fd for rule in rules], [False, True, False, True])
+
+    def test_fallback(self):
+        with unittest.mock.patch(
+            "can.interfaces.socketcan.gateway.KernelGateway",
+            side_effect=can.CanOperationError("Operation not permitted"),
+        ):
+            self.assertIsNone(
+                can.bridge._start_kernel_gateway(self.bus1, self.bus2, required=False)
+            )
+            with self.assertRaises(can.CanOperationError):
+                can.bridge._start_kernel_gateway(self.bus1, self.bus2, required=True)
+
+    def test_virtual_buses(self):
+        with can.Bus(interface="virtual") as bus1, can.Bus(interface="virtual") as bus2:
+            self.assertIsNone(
+                can.bridge._start_kernel_gateway(bus1, bus2, required=False)
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
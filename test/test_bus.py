@@ -1,7 +1,14 @@
 import gc
+import select
+import socket
+import threading
+import time
 from unittest.mock import patch
 
+import pytest
+
 import can
+from can.bus import _WakeupSocket
 
 
 def test_bus_ignore_config():
@@ -21,3 +28,61 @@ def test_bus_attempts_self_cleanup(mock_shutdown):
     del bus
     gc.collect()
     mock_shutdown.assert_called()
+
+
+class SelectBus(can.BusABC):
+    """Receives the bytes written to a socket as message data."""
+
+    def __init__(self, **kwargs):
+        self.reader, self.writer = socket.socketpair()
+        self._wakeup = _WakeupSocket()
+        super().__init__(None, **kwargs)
+
+    def _recv_internal(self, timeout):
+        readable = select.select([self.reader, self._wakeup], [], [], timeout)[0]
+        if self._wakeup in readable:
+            self._wakeup.clear()
+        elif readable:
+            return can.Message(data=self.reader.recv(8)), False
+        return None, False
+
+    def send(self, msg, timeout=None):
+        self.writer.send(msg.data)
+
+    def shutdown(self):
+        super().shutdown()
+        self.reader.close()
+        self.writer.close()
+
+
+def test_interrupt_waiting_recv():
+    with SelectBus() as bus:
+        results = []
+        thread = threading.Thread(target=lambda: results.append(bus.recv()))
+        thread.start()
+        time.sleep(0.05)
+        bus.interrupt()
+        thread.join(1.0)
+        assert not thread.is_alive()
+        assert results == [None]
+
+        # the interrupt is consumed
+        assert bus.recv(0.01) is None
+        bus.send(can.Message(data=[1]))
+        assert bus.recv().data == bytearray([1])
+
+
+def test_interrupt_next_recv():
+    with SelectBus() as bus:
+        bus.interrupt()
+        bus.interrupt()
+        assert bus.recv() is None
+        assert bus.recv(0.01) is None
+
+
+def test_interrupt_not_supported():
+    with can.Bus(interface="virtual") as bus:
+        with patch.object(bus, "_wake_up", side_effect=NotImplementedError):
+            with pytest.raises(NotImplementedError):
+                bus.interrupt()
+        assert not bus._interrupt_pending
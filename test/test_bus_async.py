@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+
+"""
+This module tests :meth:`can.BusABC.recv_async`, :meth:`can.BusABC.send_async`
+and the asynchronous iteration over a bus.
+"""
+
+import asyncio
+import errno
+import select
+import socket
+import sys
+import threading
+import unittest
+from typing import Optional
+
+import can
+from can.interfaces.virtual import VirtualBus
+
+
+class SocketPairBus(can.BusABC):
+    """A bus that exchanges messages over one end of a socket pair."""
+
+    _send_with_fileno = True
+
+    def __init__(self, sock: socket.socket, **kwargs):
+        self.socket = sock
+        self.socket.setblocking(False)
+        super().__init__(channel="socketpair", **kwargs)
+
+    def _recv_internal(self, timeout: Optional[float]):
+        if not select.select([self.socket], [], [], timeout)[0]:
+            return None, False
+        data = self.socket.recv(16)
+        return can.Message(arbitration_id=data[0], data=data[1:]), False
+
+    def send(self, msg: can.Message, timeout: Optional[float] = None) -> None:
+        try:
+            self.socket.send(bytes([msg.arbitration_id]) + msg.data)
+        except BlockingIOError as error:
+            raise can.CanOperationError("Transmit buffer full", errno.EAGAIN) from error
+
+    def fileno(self) -> int:
+        return self.socket.fileno()
+
+    def shutdown(self) -> None:
+        super().shutdown()
+        self.socket.close()
+
+
+@unittest.skipIf(sys.platform == "win32", "requires Unix domain sockets")
+class TestFilenoBus(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        sock_a, sock_b = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        self.bus = SocketPairBus(sock_a)
+        self.peer = SocketPairBus(sock_b)
+
+    def tearDown(self):
+        self.bus.shutdown()
+        self.peer.shutdown()
+
+    async def test_timeout(self):
+        self.assertIsNone(await self.bus.recv_async(0.01))
+        self.assertFalse(self.bus._async_adapter.reading)
+
+    async def test_recv(self):
+        for arbitration_id in range(10):
+            self.peer.send(can.Message(arbitration_id=arbitration_id))
+
+        received = [await self.bus.recv_async(1) for _ in range(10)]
+        self.assertEqual([msg.arbitration_id for msg in received], list(range(10)))
+        self.assertEqual(self.bus.statistics.messages_received, 10)
+
+    async def test_concurrent_recv(self):
+        tasks = [asyncio.create_task(self.bus.recv_async(1)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        for arbitration_id in range(3):
+            self.peer.send(can.Message(arbitration_id=arbitration_id))
+
+        received = await asyncio.gather(*tasks)
+        self.assertEqual(sorted(msg.arbitration_id for msg in received), [0, 1, 2])
+
+    async def test_filters(self):
+        self.bus.set_filters([{"can_id": 2, "can_mask": 0xFF}])
+        for arbitration_id in range(3):
+            self.peer.send(can.Message(arbitration_id=arbitration_id))
+
+        msg = await self.bus.recv_async(1)
+        self.assertEqual(msg.arbitration_id, 2)
+        self.assertIsNone(await self.bus.recv_async(0.01))
+
+    async def test_async_iteration(self):
+        for arbitration_id in range(5):
+            self.peer.send(can.Message(arbitration_id=arbitration_id))
+
+        received = []
+        async for msg in self.bus:
+            received.append(msg.arbitration_id)
+            if len(received) == 5:
+                break
+        self.assertEqual(received, list(range(5)))
+
+    async def test_send(self):
+        await self.bus.send_async(can.Message(arbitration_id=7, data=[1, 2]))
+        msg = self.peer.recv(1)
+        self.assertEqual(msg.arbitration_id, 7)
+        self.assertEqual(msg.data, bytearray([1, 2]))
+
+    async def test_send_backpressure(self):
+        # fill the socket buffer
+        sent = 0
+        while True:
+            try:
+                self.bus.send(can.Message(arbitration_id=1, data=bytes(8)))
+            except can.CanOperationError:
+                break
+            sent += 1
+
+        with self.assertRaises(can.CanTimeoutError):
+            await self.bus.send_async(can.Message(arbitration_id=2), timeout=0.01)
+
+        async def drain():
+            for _ in range(sent):
+                await self.peer.recv_async(1)
+
+        drain_task = asyncio.create_task(drain())
+        await self.bus.send_async(can.Message(arbitration_id=3), timeout=5)
+        await drain_task
+        self.assertEqual((await self.peer.recv_async(1)).arbitration_id, 3)
+
+    async def test_shutdown_wakes_up_waiters(self):
+        task = asyncio.create_task(self.bus.recv_async())
+        await asyncio.sleep(0.01)
+        self.bus.shutdown()
+        with self.assertRaises(can.CanOperationError):
+            await task
+
+
+class TestExecutorBus(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.bus = can.Bus(interface="virtual", channel="async")
+        self.peer = can.Bus(interface="virtual", channel="async")
+
+    def tearDown(self):
+        self.bus.shutdown()
+        self.peer.shutdown()
+
+    async def test_recv(self):
+        self.assertIsNone(await self.bus.recv_async(0.01))
+        self.peer.send(can.Message(arbitration_id=1))
+        self.assertEqual((await self.bus.recv_async(1)).arbitration_id, 1)
+
+    async def test_recv_without_timeout(self):
+        task = asyncio.create_task(self.bus.recv_async())
+        await asyncio.sleep(0.2)
+        self.peer.send(can.Message(arbitration_id=1))
+        self.assertEqual((await asyncio.wait_for(task, 5)).arbitration_id, 1)
+
+    async def test_cancelled_recv_keeps_message(self):
+        task = asyncio.create_task(self.bus.recv_async())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        self.peer.send(can.Message(arbitration_id=2))
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        self.assertEqual((await self.bus.recv_async(1)).arbitration_id, 2)
+
+    async def test_send(self):
+        await self.bus.send_async(can.Message(arbitration_id=3))
+        self.assertEqual(self.peer.recv(1).arbitration_id, 3)
+
+    async def test_async_iteration(self):
+        self.peer.send(can.Message(arbitration_id=4))
+        async for msg in self.bus:
+            self.assertEqual(msg.arbitration_id, 4)
+            break
+
+
+class BlockingBus(VirtualBus):
+    """Blocks sending until released."""
+
+    def __init__(self, channel=None, **kwargs):
+        super().__init__(channel, **kwargs)
+        self.release = threading.Event()
+
+    def send(self, msg: can.Message, timeout: Optional[float] = None) -> None:
+        self.release.wait(5)
+        super().send(msg, timeout)
+
+
+class TestProxyBus(unittest.IsolatedAsyncioTestCase):
+    async def test_send_does_not_block_event_loop(self):
+        # the file descriptor of a view only signals received messages
+        with can.BusMultiplexer(BlockingBus(channel="async_proxy")) as multiplexer:
+            view = multiplexer.open_view()
+            self.assertGreaterEqual(view.fileno(), 0)
+
+            task = asyncio.create_task(view.send_async(can.Message(), timeout=5))
+            ticks = 0
+            for _ in range(10):
+                await asyncio.sleep(0.01)
+                ticks += 1
+            self.assertEqual(ticks, 10)
+            self.assertFalse(task.done())
+
+            multiplexer.bus.release.set()
+            await asyncio.wait_for(task, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+
+"""
+This module tests :mod:`can.bus_load`.
+"""
+
+import random
+import unittest
+
+import can
+from can.bus_load import (
+    ERROR_FRAME_BITS,
+    FrameBitLength,
+    LoadSample,
+    bitrates,
+    frame_bit_length,
+    frame_duration,
+    load_profile,
+)
+
+TIMING = can.BitTiming.from_sample_point(
+    f_clock=8_000_000, bitrate=500_000, sample_point=87.5
+)
+
+
+class TestFrameBitLength(unittest.TestCase):
+    def test_classic_worst_case(self):
+        # the well known worst case lengths of classic CAN frames
+        for is_extended_id, length, expected in (
+            (False, 0, 55),
+            (False, 8, 135),
+            (True, 0, 80),
+            (True, 8, 160),
+        ):
+            with self.subTest(is_extended_id=is_extended_id, length=length):
+                msg = can.Message(
+                    arbitration_id=0x100,
+                    is_extended_id=is_extended_id,
+                    data=bytes(length),
+                )
+                self.assertEqual(frame_bit_length(msg), (expected, 0))
+
+    def test_classic_without_stuffing(self):
+        msg = can.Message(arbitration_id=0x100, is_extended_id=False, data=bytes(8))
+        self.assertEqual(frame_bit_length(msg, stuffing="none"), (111, 0))
+
+    def test_remote_frame_has_no_data(self):
+        msg = can.Message(
+            arbitration_id=0x100, is_extended_id=False, is_remote_frame=True, dlc=8
+        )
+        self.assertEqual(frame_bit_length(msg), (55, 0))
+
+    def test_error_frame(self):
+        msg = can.Message(is_error_frame=True)
+        self.assertEqual(frame_bit_length(msg), (ERROR_FRAME_BITS, 0))
+
+    def test_fd_without_bitrate_switch(self):
+        msg = can.Message(
+            arbitration_id=0x100, is_extended_id=False, is_fd=True, data=bytes(8)
+        )
+        length = frame_bit_length(msg, stuffing="none")
+        # 17 arbitration bits, 69 control and data bits, 28 CRC bits, 12 tail bits
+        self.assertEqual(length, (126, 0))
+
+    def test_fd_with_bitrate_switch(self):
+        msg = can.Message(
+            arbitration_id=0x100,
+            is_extended_id=False,
+            is_fd=True,
+            bitrate_switch=True,
+            data=bytes(64),
+        )
+        self.assertEqual(frame_bit_length(msg, stuffing="none"), (29, 550))
+        self.assertEqual(frame_bit_length(msg), (33, 679))
+
+        # the total length does not depend on bit rate switching
+        msg.bitrate_switch = False
+        self.assertEqual(frame_bit_length(msg), (712, 0))
+
+    def test_fd_data_length_is_padded(self):
+        msg_9 = can.Message(is_fd=True, bitrate_switch=True, data=bytes(9))
+        msg_12 = can.Message(is_fd=True, bitrate_switch=True, data=bytes(12))
+        self.assertEqual(frame_bit_length(msg_9), frame_bit_length(msg_12))
+
+    def test_exact_stuffing(self):
+        # 34 dominant bits from SOF to the end of the CRC need 6 stuff bits
+        msg = can.Message(arbitration_id=0, is_extended_id=False)
+        self.assertEqual(frame_bit_length(msg, "exact"), (53, 0))
+
+        # alternating bits need no stuff bits at all
+        msg = can.Message(arbitration_id=0x555, is_extended_id=False, data=b"\x55")
+        self.assertLess(frame_bit_length(msg, "exact").nominal, 70)
+
+    def test_exact_stuffing_within_bounds(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            is_fd = rng.random() < 0.5
+            is_extended_id = rng.random() < 0.5
+            length = rng.choice((0, 3, 8, 12, 20, 64)) if is_fd else rng.randint(0, 8)
+            msg = can.Message(
+                arbitration_id=rng.getrandbits(29 if is_extended_id else 11),
+                is_extended_id=is_extended_id,
+                is_fd=is_fd,
+                bitrate_switch=is_fd and rng.random() < 0.5,
+                data=rng.randbytes(length),
+            )
+            with self.subTest(msg=msg):
+                lower = frame_bit_length(msg, "none")
+                exact = frame_bit_length(msg, "exact")
+                upper = frame_bit_length(msg, "worst")
+                self.assertTrue(lower.nominal <= exact.nominal <= upper.nominal)
+                self.assertTrue(lower.data <= exact.data <= upper.data)
+
+    def test_duration(self):
+        length = FrameBitLength(nominal=100, data=200)
+        self.assertAlmostEqual(length.duration(500_000, 2_000_000), 300e-6)
+        self.assertAlmostEqual(length.duration(500_000), 600e-6)
+
+
+class TestFrameDuration(unittest.TestCase):
+    def test_classic(self):
+        self.assertEqual(bitrates(TIMING), (500_000, 500_000))
+        msg = can.Message(arbitration_id=0x100, is_extended_id=False, data=bytes(8))
+        self.assertAlmostEqual(frame_duration(msg, TIMING), 270e-6)
+
+    def test_fd(self):
+        timing = can.BitTimingFd.from_sample_point(
+            f_clock=80_000_000,
+            nom_bitrate=500_000,
+            nom_sample_point=80.0,
+            data_bitrate=2_000_000,
+            data_sample_point=80.0,
+        )
+        self.assertEqual(bitrates(timing), (500_000, 2_000_000))
+        msg = can.Message(
+            arbitration_id=0x100,
+            is_extended_id=False,
+            is_fd=True,
+            bitrate_switch=True,
+            data=bytes(64),
+        )
+        self.assertAlmostEqual(frame_duration(msg, timing), 33 / 500e3 + 679 / 2e6)
+
+
+def _messages(count, period, channel=None):
+    # 135 bits or 270 µs per message at 500 kbit/s
+    return [
+        can.Message(
+            timestamp=(index + 0.5) * period,
+            arbitration_id=0x100,
+            is_extended_id=False,
+            data=bytes(8),
+            channel=channel,
+        )
+        for index in range(count)
+    ]
+
+
+class TestBusLoad(unittest.TestCase):
+    def test_invalid_window(self):
+        with self.assertRaises(ValueError):
+            can.BusLoad(TIMING, window=0)
+
+    def test_sliding_window(self):
+        bus_load = can.BusLoad(TIMING, window=0.1)
+        self.assertEqual(bus_load.loads(), {})
+
+        for msg in _messages(1000, 0.001):
+            bus_load(msg)
+        self.assertEqual(bus_load.channels, [None])
+        self.assertAlmostEqual(bus_load.load(), 27.0)
+
+        # the window moves on without messages
+        self.assertAlmostEqual(bus_load.load(timestamp=1.05), 13.5)
+        self.assertEqual(bus_load.load(timestamp=2.0), 0.0)
+
+        bus_load.reset()
+        self.assertEqual(bus_load.loads(), {})
+
+    def test_channels(self):
+        fast = can.BitTiming.from_sample_point(
+            f_clock=8_000_000, bitrate=1_000_000, sample_point=75.0
+        )
+        bus_load = can.BusLoad({"can0": TIMING, "can1": fast}, window=0.1)
+        for msg in _messages(200, 0.001, "can0") + _messages(200, 0.001, "can1"):
+            bus_load.on_message_received(msg)
+        bus_load(can.Message(timestamp=0.199, channel="can2"))
+
+        loads = bus_load.loads()
+        self.assertEqual(set(loads), {"can0", "can1"})
+        self.assertAlmostEqual(loads["can0"], 27.0)
+        self.assertAlmostEqual(loads["can1"], 13.5)
+
+    def test_exact_stuffing(self):
+        worst = can.BusLoad(TIMING, stuffing="worst")
+        exact = can.BusLoad(TIMING, stuffing="exact")
+        for msg in _messages(100, 0.001):
+            worst(msg)
+            exact(msg)
+        self.assertLess(exact.load(), worst.load())
+
+
+class TestLoadProfile(unittest.TestCase):
+    def test_intervals(self):
+        messages = _messages(100, 0.001)
+        # nothing happens between 0.1 s and 0.25 s
+        messages += _messages(50, 0.002)
+        for msg in messages[100:]:
+            msg.timestamp += 0.25
+
+        profile = load_profile(messages, TIMING, interval=0.05)
+        self.assertEqual(list(profile), [None])
+        samples = profile[None]
+        self.assertEqual(len(samples), 7)
+        self.assertIsInstance(samples[0], LoadSample)
+        self.assertAlmostEqual(samples[0].start, 0.0005)
+        self.assertAlmostEqual(samples[6].start, 0.3005)
+        for sample, expected in zip(samples, (27.0, 27.0, 0.0, 0.0, 0.0, 13.5, 13.5)):
+            self.assertAlmostEqual(sample.load, expected)
+
+    def test_matches_listener(self):
+        messages = _messages(100, 0.001, "can0")
+        bus_load = can.BusLoad(TIMING, window=0.1)
+        for msg in messages:
+            bus_load(msg)
+        profile = load_profile(messages, {"can0": TIMING}, interval=0.1)
+        self.assertAlmostEqual(profile["can0"][0].load, bus_load.load("can0"))
+
+    def test_invalid_interval(self):
+        with self.assertRaises(ValueError):
+            load_profile([], TIMING, interval=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
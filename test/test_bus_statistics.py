@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+
+"""
+This module tests :attr:`can.BusABC.statistics`.
+"""
+
+import unittest
+from typing import Optional
+
+import can
+from can.interfaces.virtual import VirtualBus
+from can.bus_statistics import HISTOGRAM_BOUNDS, BusStatistics, Histogram
+
+
+class FailingBus(can.BusABC):
+    def __init__(self, channel=None, **kwargs):
+        super().__init__(channel, **kwargs)
+
+    def _recv_internal(self, timeout: Optional[float]):
+        raise can.CanOperationError("receive failed")
+
+    def send(self, msg: can.Message, timeout: Optional[float] = None) -> None:
+        raise can.CanOperationError("send failed")
+
+
+class DerivedBus(VirtualBus):
+    def send(self, msg: can.Message, timeout: Optional[float] = None) -> None:
+        super().send(msg, timeout)
+
+
+class ZeroTimeoutBus(VirtualBus):
+    def send(self, msg: can.Message, timeout: Optional[float] = 0) -> None:
+        self.timeouts.append(timeout)
+
+
+class TestHistogram(unittest.TestCase):
+    def test_buckets(self):
+        histogram = Histogram()
+        histogram.add(0.0)
+        histogram.add(1e-6)
+        histogram.add(1.5e-6)
+        histogram.add(100.0)
+        self.assertEqual(len(histogram.counts), len(HISTOGRAM_BOUNDS) + 1)
+        self.assertEqual(histogram.counts[0], 2)
+        self.assertEqual(histogram.counts[1], 1)
+        self.assertEqual(histogram.counts[-1], 1)
+
+
+class TestBusStatistics(unittest.TestCase):
+    def setUp(self):
+        self.sender = can.Bus(interface="virtual", channel="statistics")
+        self.receiver = can.Bus(interface="virtual", channel="statistics")
+
+    def tearDown(self):
+        self.sender.shutdown()
+        self.receiver.shutdown()
+
+    def test_initially_zero(self):
+        snapshot = self.sender.statistics.snapshot()
+        self.assertEqual(snapshot.messages_received, 0)
+        self.assertEqual(snapshot.messages_sent, 0)
+        self.assertIsNone(snapshot.send_histogram)
+
+    def test_send_and_receive(self):
+        self.receiver.set_filters([{"can_id": 0x100, "can_mask": 0x7FF}])
+        for arbitration_id in (0x100, 0x200, 0x100):
+            self.sender.send(can.Message(arbitration_id=arbitration_id))
+
+        self.assertIsNotNone(self.receiver.recv(0.1))
+        self.assertIsNotNone(self.receiver.recv(0.1))
+        self.assertIsNone(self.receiver.recv(0))
+
+        self.assertEqual(self.sender.statistics.messages_sent, 3)
+        self.assertEqual(self.sender.statistics.send_errors, 0)
+        self.assertGreater(self.sender.statistics.send_time, 0.0)
+
+        snapshot = self.receiver.statistics.snapshot()
+        self.assertEqual(snapshot.messages_received, 2)
+        self.assertEqual(snapshot.messages_filtered, 1)
+        self.assertEqual(snapshot.receive_errors, 0)
+        self.assertGreater(snapshot.receive_time, 0.0)
+
+    def test_buses_have_separate_statistics(self):
+        self.assertIsInstance(self.sender.statistics, BusStatistics)
+        self.assertIsNot(self.sender.statistics, self.receiver.statistics)
+
+    def test_snapshot_and_reset(self):
+        self.sender.send(can.Message())
+        snapshot = self.sender.statistics.snapshot()
+        self.sender.statistics.reset()
+        self.sender.send(can.Message())
+
+        self.assertEqual(snapshot.messages_sent, 1)
+        self.assertEqual(self.sender.statistics.messages_sent, 1)
+
+    def test_histograms(self):
+        self.sender.statistics.enable_histograms()
+        self.receiver.statistics.enable_histograms()
+        self.sender.send(can.Message())
+        self.receiver.recv(0)
+        self.receiver.recv(0)
+
+        self.assertEqual(sum(self.sender.statistics.snapshot().send_histogram), 1)
+        self.assertEqual(sum(self.receiver.statistics.snapshot().receive_histogram), 2)
+
+        self.sender.statistics.reset()
+        self.assertEqual(sum(self.sender.statistics.snapshot().send_histogram), 0)
+
+        self.sender.statistics.enable_histograms(False)
+        self.assertIsNone(self.sender.statistics.snapshot().send_histogram)
+
+    def test_errors(self):
+        with FailingBus() as bus:
+            with self.assertRaises(can.CanOperationError):
+                bus.send(can.Message())
+            with self.assertRaises(can.CanOperationError):
+                bus.recv(0)
+            self.assertEqual(bus.statistics.send_errors, 1)
+            self.assertEqual(bus.statistics.messages_sent, 0)
+            self.assertEqual(bus.statistics.receive_errors, 1)
+
+    def test_overridden_send_is_counted_once(self):
+        with DerivedBus(channel="statistics") as bus:
+            bus.send(can.Message())
+            self.assertEqual(bus.statistics.messages_sent, 1)
+
+    def test_default_send_timeout_is_kept(self):
+        with ZeroTimeoutBus(channel="statistics") as bus:
+            bus.timeouts = []
+            bus.send(can.Message())
+            bus.send(can.Message(), 1.0)
+            bus.send(can.Message(), timeout=None)
+            self.assertEqual(bus.timeouts, [0, 1.0, None])
+            self.assertEqual(bus.statistics.messages_sent, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
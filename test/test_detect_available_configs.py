@@ -6,8 +6,11 @@ This module tests :meth:`can.BusABC._detect_available_configs` and
 """
 
 import unittest
+from unittest import mock
 
+import can.interface
 from can import detect_available_configs
+from can.interfaces.virtual import VirtualBus
 
 from .config import IS_CI, IS_UNIX, TEST_INTERFACE_SOCKETCAN
 
@@ -62,6 +65,29 @@ class TestDetectAvailableConfigs(unittest.TestCase):
 
     # see TestSocketCanHelpers.test_find_available_interfaces() too
 
+    def test_max_age(self):
+        configs = [{"interface": "virtual", "channel": "a"}]
+        with (
+            mock.patch.dict(can.interface._detected_configs, clear=True),
+            mock.patch.object(
+                VirtualBus,
+                "_detect_available_configs",
+                side_effect=lambda: [dict(c) for c in configs],
+            ) as detect,
+        ):
+            self.assertEqual(detect_available_configs("virtual", max_age=60), configs)
+            self.assertEqual(detect.call_count, 1)
+
+            # the cached results are copies
+            detect_available_configs("virtual", max_age=60)[0]["channel"] = "b"
+            self.assertEqual(detect_available_configs("virtual", max_age=60), configs)
+            self.assertEqual(detect.call_count, 1)
+
+            detect_available_configs("virtual")
+            self.assertEqual(detect.call_count, 2)
+            detect_available_configs("virtual", max_age=0)
+            self.assertEqual(detect.call_count, 3)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+
+"""
+This module tests :class:`can.ConfigMonitor`.
+"""
+
+import socket
+import threading
+import unittest
+from unittest import mock
+
+import can
+from can.interfaces.socketcan import SocketcanBus
+from can.interfaces.virtual import VirtualBus
+
+
+class FakeLinkMonitor:
+    def __init__(self):
+        self._reader, self._writer = socket.socketpair()
+
+    def notify(self):
+        self._writer.send(b"\0")
+
+    def fileno(self):
+        return self._reader.fileno()
+
+    def read(self):
+        self._reader.recv(4096)
+        return [(True, None)]
+
+    def close(self):
+        self._reader.close()
+        self._writer.close()
+
+
+class TestConfigMonitor(unittest.TestCase):
+    def setUp(self):
+        self.virtual_configs = [{"interface": "virtual", "channel": "a"}]
+        self.socketcan_configs = []
+        self.changes = []
+        self.changed = threading.Event()
+        self.link_monitor = FakeLinkMonitor()
+
+        for bus_class, configs in (
+            (VirtualBus, self.virtual_configs),
+            (SocketcanBus, self.socketcan_configs),
+        ):
+            patcher = mock.patch.object(
+                bus_class,
+                "_detect_available_configs",
+                side_effect=lambda configs=configs: [dict(c) for c in configs],
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(
+            can.ConfigMonitor, "_open_link_monitor", return_value=self.link_monitor
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def on_change(self, config, available):
+        self.changes.append((config, available))
+        self.changed.set()
+
+    def test_configs(self):
+        with can.ConfigMonitor("virtual") as monitor:
+            self.assertEqual(monitor.interfaces, ("virtual",))
+            self.assertEqual(monitor.configs, self.virtual_configs)
+
+    def test_refresh(self):
+        with can.ConfigMonitor(["virtual"], refresh_interval=60) as monitor:
+            monitor.add_listener(self.on_change)
+            self.virtual_configs[:] = [{"interface": "virtual", "channel": "b"}]
+            monitor.refresh()
+            self.assertEqual(monitor.configs, self.virtual_configs)
+            self.assertEqual(
+                self.changes,
+                [
+                    ({"interface": "virtual", "channel": "a"}, False),
+                    ({"interface": "virtual", "channel": "b"}, True),
+                ],
+            )
+
+            monitor.remove_listener(self.on_change)
+            self.virtual_configs.clear()
+            monitor.refresh()
+            self.assertEqual(monitor.configs, [])
+            self.assertEqual(len(self.changes), 2)
+
+    def test_periodic_refresh(self):
+        with can.ConfigMonitor(["virtual"], refresh_interval=0.01) as monitor:
+            monitor.add_listener(self.on_change)
+            self.virtual_configs.append({"interface": "virtual", "channel": "b"})
+            self.assertTrue(self.changed.wait(5))
+        self.assertEqual(
+            self.changes, [({"interface": "virtual", "channel": "b"}, True)]
+        )
+
+    def test_link_notifications(self):
+        with can.ConfigMonitor(
+            ["virtual", "socketcan"], refresh_interval=60
+        ) as monitor:
+            monitor.add_listener(self.on_change)
+            self.socketcan_configs.append({"interface": "socketcan", "channel": "can0"})
+            # the other interfaces are not detected again
+            self.virtual_configs.clear()
+            self.link_monitor.notify()
+            self.assertTrue(self.changed.wait(5))
+            self.assertEqual(
+                monitor.configs,
+                [
+                    {"interface": "virtual", "channel": "a"},
+                    {"interface": "socketcan", "channel": "can0"},
+                ],
+            )
+        self.assertEqual(
+            self.changes, [({"interface": "socketcan", "channel": "can0"}, True)]
+        )
+
+    def test_failing_listener(self):
+        with can.ConfigMonitor("virtual", refresh_interval=60) as monitor:
+            monitor.add_listener(mock.Mock(side_effect=RuntimeError))
+            monitor.add_listener(self.on_change)
+            self.virtual_configs.clear()
+            with self.assertLogs("can.discovery", "ERROR"):
+                monitor.refresh()
+        self.assertEqual(
+            self.changes, [({"interface": "virtual", "channel": "a"}, False)]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
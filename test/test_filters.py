@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+
+"""
+Tests the compiled filters of :mod:`can.filters`.
+"""
+
+import random
+import unittest
+
+import can
+from can.filters import compile_predicate, filter_messages, matches_only_ids
+
+from .data.example_data import TEST_ALL_MESSAGES
+
+
+def reference_match(can_filters, msg):
+    """Check the filters one by one, like the documentation describes them."""
+    if not can_filters:
+        return True
+    for can_filter in can_filters:
+        if (can_filter["can_id"] ^ msg.arbitration_id) & can_filter["can_mask"]:
+            continue
+        flags = {
+            "extended": msg.is_extended_id,
+            "fd": msg.is_fd,
+            "remote": msg.is_remote_frame,
+            "error": msg.is_error_frame,
+        }
+        if any(key in can_filter and can_filter[key] != flags[key] for key in flags):
+            continue
+        if (
+            not can_filter.get("min_id", 0)
+            <= msg.arbitration_id
+            <= can_filter.get("max_id", 0x1FFFFFFF)
+        ):
+            continue
+        if not can_filter.get("min_dlc", 0) <= msg.dlc <= can_filter.get("max_dlc", 64):
+            continue
+        if all(
+            term["offset"] < len(msg.data)
+            and msg.data[term["offset"]] & term.get("mask", 0xFF)
+            == term["value"] & term.get("mask", 0xFF)
+            for term in can_filter.get("data", ())
+        ):
+            return True
+    return False
+
+
+def random_filter(rng):
+    can_filter = {
+        "can_id": rng.choice((0x123, 0x7FF, 0x1ABCDEF, rng.getrandbits(11))),
+        "can_mask": rng.choice((0, 0x7FF, 0x1FFFFFFF, 0x700, 0x1F)),
+    }
+    for key in ("extended", "fd", "remote", "error"):
+        if rng.random() < 0.2:
+            can_filter[key] = rng.random() < 0.5
+    if rng.random() < 0.3:
+        can_filter["min_id"] = rng.getrandbits(10)
+    if rng.random() < 0.3:
+        can_filter["max_id"] = rng.getrandbits(12)
+    if rng.random() < 0.3:
+        can_filter["min_dlc"] = rng.randrange(9)
+    if rng.random() < 0.3:
+        can_filter["max_dlc"] = rng.randrange(9)
+    if rng.random() < 0.3:
+        can_filter["data"] = [
+            {"offset": rng.randrange(8), "value": rng.getrandbits(8)}
+            | ({"mask": rng.choice((0x0F, 0xF0))} if rng.random() < 0.5 else {})
+            for _ in range(rng.randrange(1, 3))
+        ]
+    return can_filter
+
+
+def random_message(rng):
+    is_extended_id = rng.random() < 0.3
+    return can.Message(
+        arbitration_id=rng.choice(
+            (0x123, 0x7FF, 0x1ABCDEF, rng.getrandbits(29 if is_extended_id else 11))
+        ),
+        is_extended_id=is_extended_id,
+        is_fd=rng.random() < 0.3,
+        is_remote_frame=rng.random() < 0.1,
+        is_error_frame=rng.random() < 0.1,
+        data=bytes(rng.getrandbits(8) for _ in range(rng.randrange(9))),
+    )
+
+
+class TestCompilePredicate(unittest.TestCase):
+    def test_same_as_reference(self):
+        rng = random.Random(0)
+        messages = [random_message(rng) for _ in range(200)] + TEST_ALL_MESSAGES
+        for _ in range(200):
+            can_filters = [random_filter(rng) for _ in range(rng.randrange(1, 6))]
+            predicate = compile_predicate(can_filters)
+            for msg in messages:
+                if predicate(msg) != reference_match(can_filters, msg):
+                    self.fail(f"{can_filters} disagree on {msg}")
+
+    def test_match_all(self):
+        for can_filters in (None, [], [{"can_id": 0x1, "can_mask": 0}]):
+            predicate = compile_predicate(can_filters)
+            self.assertTrue(all(predicate(msg) for msg in TEST_ALL_MESSAGES))
+
+    def test_exact_ids(self):
+        can_filters = [
+            {"can_id": can_id, "can_mask": 0x7FF, "extended": False}
+            for can_id in range(0, 0x7FF, 3)
+        ]
+        predicate = compile_predicate(can_filters)
+        for can_id in range(0x7FF):
+            msg = can.Message(arbitration_id=can_id, is_extended_id=False)
+            self.assertEqual(predicate(msg), can_id % 3 == 0)
+        self.assertFalse(predicate(can.Message(arbitration_id=3, is_extended_id=True)))
+
+    def test_invalid_filters(self):
+        for can_filters in (
+            [{"can_id": 0x1}],
+            [{"can_id": "x", "can_mask": 0}],
+            [{"can_id": 0, "can_mask": 0, "data": [{"offset": -1, "value": 0}]}],
+            [{"can_id": 0, "can_mask": 0, "data": [{"value": 0}]}],
+        ):
+            with self.subTest(can_filters=can_filters), self.assertRaises(ValueError):
+                compile_predicate(can_filters)
+
+    def test_filter_messages(self):
+        messages = [
+            can.Message(arbitration_id=0x100, is_fd=True, data=bytes(16)),
+            can.Message(arbitration_id=0x100, is_fd=True, data=bytes(8)),
+            can.Message(arbitration_id=0x200, is_fd=True, data=bytes(16)),
+        ]
+        can_filters = [
+            {"can_id": 0, "can_mask": 0, "max_id": 0x1FF, "min_dlc": 12, "fd": True}
+        ]
+        self.assertEqual(list(filter_messages(messages, can_filters)), messages[:1])
+
+    def test_matches_only_ids(self):
+        self.assertTrue(matches_only_ids(None))
+        self.assertTrue(
+            matches_only_ids([{"can_id": 1, "can_mask": 0x7FF, "extended": False}])
+        )
+        self.assertFalse(
+            matches_only_ids([{"can_id": 1, "can_mask": 0x7FF, "fd": True}])
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python
+
+"""
+This module tests :class:`can.Gateway`.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from copy import copy
+from typing import Optional
+from unittest import mock
+
+import can
+from can.gateway import load_routes
+
+
+class FailingBus(can.BusABC):
+    def __init__(self, channel=None, **kwargs):
+        super().__init__(channel, **kwargs)
+
+    def _recv_internal(self, timeout: Optional[float]):
+        time.sleep(timeout or 0)
+        return None, False
+
+    def send(self, msg: can.Message, timeout: Optional[float] = None) -> None:
+        raise can.CanOperationError("bus off")
+
+
+def double_data(msg: can.Message) -> Optional[can.Message]:
+    if not msg.data:
+        return None
+    msg.data = bytearray(2 * byte for byte in msg.data)
+    return msg
+
+
+class TestGateway(unittest.TestCase):
+    def setUp(self):
+        self.buses = {}
+        self.peers = {}
+        for name in ("a", "b", "c"):
+            self.buses[name] = can.Bus(interface="virtual", channel=f"gateway_{name}")
+            self.peers[name] = can.Bus(interface="virtual", channel=f"gateway_{name}")
+
+    def tearDown(self):
+        for bus in (*self.buses.values(), *self.peers.values()):
+            bus.shutdown()
+
+    def assert_received(self, name, arbitration_ids):
+        received = []
+        for _ in arbitration_ids:
+            msg = self.peers[name].recv(5)
+            self.assertIsNotNone(msg)
+            received.append(msg.arbitration_id)
+        self.assertEqual(received, arbitration_ids)
+        self.assertIsNone(self.peers[name].recv(0.05))
+
+    def test_routes(self):
+        routes = [
+            can.Route(
+                "a", ("b", "c"), can_filters=[{"can_id": 0x100, "can_mask": 0x700}]
+            ),
+            can.Route("b", ("a",), arbitration_id=0x321),
+            can.Route("c", ("a",), transform=double_data),
+        ]
+        with can.Gateway(self.buses, routes) as gateway:
+            self.assertEqual(gateway.routes, routes)
+            self.peers["a"].send(can.Message(arbitration_id=0x101))
+            self.peers["a"].send(can.Message(arbitration_id=0x201))
+            self.assert_received("b", [0x101])
+            self.assert_received("c", [0x101])
+
+            self.peers["b"].send(can.Message(arbitration_id=0x1, data=[1]))
+            msg = self.peers["a"].recv(5)
+            self.assertEqual(msg.arbitration_id, 0x321)
+            self.assertEqual(msg.data, bytearray([1]))
+
+            self.peers["c"].send(can.Message(arbitration_id=0x2))
+            self.peers["c"].send(can.Message(arbitration_id=0x3, data=[1, 2]))
+            msg = self.peers["a"].recv(5)
+            self.assertEqual(msg.arbitration_id, 0x3)
+            self.assertEqual(msg.data, bytearray([2, 4]))
+            self.assertIsNone(self.peers["a"].recv(0.05))
+
+        statistics = [statistics for _, statistics in gateway.statistics()]
+        self.assertEqual([s.forwarded for s in statistics], [2, 1, 1])
+        self.assertEqual([s.dropped for s in statistics], [0, 0, 0])
+        self.assertGreater(statistics[0].latency_mean, 0)
+        self.assertGreaterEqual(statistics[0].latency_max, statistics[0].latency_mean)
+        self.assertEqual(sum(statistics[0].latency_histogram), 2)
+
+    def test_stop_during_transform_keeps_recv_working(self):
+        entered = threading.Event()
+        release = threading.Event()
+
+        def slow_transform(msg):
+            entered.set()
+            release.wait(5)
+            return msg
+
+        gateway = can.Gateway(
+            self.buses, [can.Route("a", ("b",), transform=slow_transform)]
+        )
+        self.peers["a"].send(can.Message(arbitration_id=1))
+        self.assertTrue(entered.wait(5))
+
+        # the receiver is in the transform and not waiting in recv()
+        stopper = threading.Thread(target=gateway.stop)
+        stopper.start()
+        time.sleep(0.05)
+        release.set()
+        stopper.join(5)
+
+        self.peers["a"].send(can.Message(arbitration_id=2))
+        msg = self.buses["a"].recv(1)
+        self.assertIsNotNone(msg)
+        self.assertEqual(msg.arbitration_id, 2)
+
+    def test_rewrite_to_extended_id(self):
+        with can.Gateway(self.buses, [can.Route("a", ("b",), arbitration_id=0x1234)]):
+            self.peers["a"].send(can.Message(arbitration_id=0x1, is_extended_id=False))
+            msg = self.peers["b"].recv(5)
+        self.assertEqual(msg.arbitration_id, 0x1234)
+        self.assertTrue(msg.is_extended_id)
+
+    def test_payload_filters(self):
+        route = can.Route(
+            "a",
+            ("b",),
+            can_filters=[
+                {"can_id": 0x1, "can_mask": 0x7FF, "data": [{"offset": 0, "value": 2}]}
+            ],
+        )
+        with can.Gateway(self.buses, [route]):
+            for first_byte in (1, 2, 3, 2):
+                self.peers["a"].send(can.Message(arbitration_id=0x1, data=[first_byte]))
+            self.assert_received("b", [0x1, 0x1])
+
+    def test_filters_are_evaluated_once_per_id(self):
+        route = can.Route("a", ("b",), can_filters=[{"can_id": 0x1, "can_mask": 0x7FF}])
+        with (
+            mock.patch.object(
+                can.gateway._CompiledRoute, "matches", autospec=True, return_value=True
+            ) as matches,
+            can.Gateway(self.buses, [route]),
+        ):
+            for _ in range(3):
+                self.peers["a"].send(
+                    can.Message(arbitration_id=0x1, is_extended_id=False)
+                )
+            self.peers["a"].send(can.Message(arbitration_id=0x1, is_extended_id=True))
+            self.assert_received("b", [0x1] * 4)
+        self.assertEqual(matches.call_count, 2)
+
+    def test_loop_prevention(self):
+        with self.assertRaises(ValueError):
+            can.Gateway(self.buses, [can.Route("a", ("a", "b"))])
+
+        self.buses["a"].shutdown()
+        self.buses["a"] = can.Bus(
+            interface="virtual", channel="gateway_a", receive_own_messages=True
+        )
+        with can.Gateway(
+            self.buses, [can.Route("a", ("b",)), can.Route("b", ("a",))]
+        ) as gateway:
+            self.peers["b"].send(can.Message(arbitration_id=0x42))
+            self.assert_received("a", [0x42])
+            # the echo of the forwarded message on bus a is not sent back
+            self.assertIsNone(self.peers["b"].recv(0.1))
+        self.assertEqual(
+            [statistics.forwarded for _, statistics in gateway.statistics()], [0, 1]
+        )
+
+    def test_unknown_bus(self):
+        with self.assertRaises(ValueError):
+            can.Gateway(self.buses, [can.Route("a", ("x",))])
+
+    def test_dropped(self):
+        self.buses["x"] = FailingBus()
+
+        def failing_transform(msg):
+            raise ValueError("invalid data")
+
+        routes = [
+            can.Route("a", ("x",)),
+            can.Route("a", ("b",), transform=failing_transform),
+        ]
+        with can.Gateway(self.buses, routes) as gateway:
+            self.peers["a"].send(can.Message(arbitration_id=0x1))
+            self.peers["a"].send(can.Message(arbitration_id=0x2))
+            deadline = time.time() + 5
+            while (
+                sum(statistics.dropped for _, statistics in gateway.statistics()) < 4
+                and time.time() < deadline
+            ):
+                time.sleep(0.01)
+        self.assertEqual(
+            [statistics.dropped for _, statistics in gateway.statistics()], [2, 2]
+        )
+        self.assertIsNone(self.peers["b"].recv(0))
+
+    def test_full_queue(self):
+        with can.Gateway(self.buses, [can.Route("a", ("b",))], queue_size=0) as gateway:
+            self.peers["a"].send(can.Message(arbitration_id=0x1))
+            deadline = time.time() + 5
+            while not gateway.statistics()[0][1].dropped and time.time() < deadline:
+                time.sleep(0.01)
+        self.assertEqual(gateway.statistics()[0][1].dropped, 1)
+
+
+class TestLoadRoutes(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "routes.json")
+
+    def write(self, config):
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump(config, file)
+
+    def test_load(self):
+        self.write(
+            {
+                "buses": {
+                    "a": {"interface": "virtual", "channel": "a"},
+                    "b": {"interface": "virtual", "channel": "b"},
+                },
+                "routes": [
+                    {
+                        "source": "a",
+                        "targets": "b",
+                        "can_filters": [
+                            {"can_id": "0x100", "can_mask": 1792, "extended": False},
+                            {
+                                "can_id": 0,
+                                "can_mask": 0,
+                                "max_dlc": "8",
+                                "fd": 1,
+                                "data": [{"offset": 1, "value": "0x22"}],
+                            },
+                        ],
+                        "arbitration_id": "0x7FF",
+                        "transform": "copy:copy",
+                    },
+                    {"source": "b", "targets": ["a"]},
+                ],
+            }
+        )
+        buses, routes = load_routes(self.path)
+        self.assertEqual(buses["a"], {"interface": "virtual", "channel": "a"})
+        self.assertEqual(
+            routes,
+            [
+                can.Route(
+                    "a",
+                    ("b",),
+                    [
+                        {"can_id": 0x100, "can_mask": 0x700, "extended": False},
+                        {
+                            "can_id": 0,
+                            "can_mask": 0,
+                            "max_dlc": 8,
+                            "fd": True,
+                            "data": [{"offset": 1, "value": 0x22}],
+                        },
+                    ],
+                    0x7FF,
+                    copy,
+                ),
+                can.Route("b", ("a",)),
+            ],
+        )
+
+    def test_invalid(self):
+        for config in (
+            {"buses": {}},
+            {"buses": {}, "routes": [{"source": "a"}]},
+            {
+                "buses": {},
+                "routes": [
+                    {"source": "a", "targets": ["b"], "transform": "nothing:here"}
+                ],
+            },
+        ):
+            with self.subTest(config=config):
+                self.write(config)
+                with self.assertRaises(ValueError):
+                    load_routes(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+
+"""
+This module tests the hub interface.
+"""
+
+import os
+import select
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from typing import Optional
+
+import can
+from can.interfaces.hub import HubBus, HubServer, protocol
+from can.interfaces.virtual import VirtualBus
+
+from .config import IS_UNIX
+
+
+class FailingBus(can.BusABC):
+    def __init__(self, channel=None, **kwargs):
+        super().__init__(channel, **kwargs)
+
+    def _recv_internal(self, timeout: Optional[float]):
+        raise can.CanOperationError("device disconnected")
+
+    def send(self, msg: can.Message, timeout: Optional[float] = None) -> None:
+        pass
+
+
+class BlockingBus(VirtualBus):
+    """Blocks sending frames with the ID 0x666 until released."""
+
+    def __init__(self, channel=None, **kwargs):
+        super().__init__(channel, **kwargs)
+        self.release = threading.Event()
+
+    def send(self, msg: can.Message, timeout: Optional[float] = None) -> None:
+        if msg.arbitration_id == 0x666:
+            self.release.wait(5)
+        super().send(msg, timeout)
+
+
+class TestProtocol(unittest.TestCase):
+    def test_frames(self):
+        messages = [
+            can.Message(timestamp=1.5, arbitration_id=0x123, data=[1, 2, 3]),
+            can.Message(
+                arbitration_id=0x12345678,
+                is_extended_id=True,
+                is_fd=True,
+                bitrate_switch=True,
+                data=range(64),
+            ),
+            can.Message(arbitration_id=0x7FF, is_remote_frame=True, dlc=8),
+            can.Message(is_error_frame=True, is_rx=False),
+        ]
+        decoded = protocol.unpack_frames(protocol.pack_frames(messages))
+        self.assertEqual(len(decoded), len(messages))
+        for original, copy in zip(messages, decoded):
+            self.assertTrue(original.equals(copy))
+            self.assertEqual(original.is_rx, copy.is_rx)
+
+    def test_filters(self):
+        filters = [
+            {"can_id": 0x100, "can_mask": 0x7F0},
+            {"can_id": 0x200, "can_mask": 0x7FF, "extended": False},
+            {"can_id": 0x1000, "can_mask": 0x1FFFFFFF, "extended": True},
+        ]
+        self.assertEqual(
+            protocol.unpack_filters(protocol.pack_filters(filters)), filters
+        )
+        self.assertIsNone(protocol.unpack_filters(protocol.pack_filters(None)))
+
+    def test_send(self):
+        msg = can.Message(arbitration_id=0x1)
+        for timeout in (None, 0.5):
+            messages, decoded_timeout = protocol.unpack_send(
+                protocol.pack_send([msg], timeout)
+            )
+            self.assertTrue(messages[0].equals(msg))
+            self.assertEqual(decoded_timeout, timeout)
+
+    def test_partial_packets(self):
+        data = protocol.pack(protocol.PacketType.ACK, b"") + protocol.pack(
+            protocol.PacketType.FRAMES, b"12345"
+        )
+        buffer = bytearray(data[:-2])
+        self.assertEqual(protocol.unpack(buffer), [(protocol.PacketType.ACK, b"")])
+        self.assertEqual(protocol.unpack(buffer), [])
+        buffer += data[-2:]
+        self.assertEqual(
+            protocol.unpack(buffer), [(protocol.PacketType.FRAMES, b"12345")]
+        )
+        self.assertEqual(buffer, b"")
+
+
+@unittest.skipUnless(IS_UNIX, "requires Unix domain sockets")
+class TestHub(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "hub.sock")
+        self.peer = can.Bus(interface="virtual", channel="hub")
+        self.hub = self.start_hub(can.Bus(interface="virtual", channel="hub"))
+
+    def tearDown(self):
+        self.hub.shutdown()
+        self.peer.shutdown()
+        self.directory.cleanup()
+
+    def start_hub(self, bus):
+        hub = HubServer(bus, self.path)
+        threading.Thread(target=hub.serve_forever, daemon=True).start()
+        return hub
+
+    def connect(self, **kwargs) -> HubBus:
+        bus = can.Bus(interface="hub", channel=self.path, **kwargs)
+        self.addCleanup(bus.shutdown)
+        return bus
+
+    def test_info(self):
+        bus = self.connect()
+        self.assertIsInstance(bus, HubBus)
+        self.assertEqual(bus.protocol, self.hub.bus.protocol)
+        self.assertIn(self.hub.bus.channel_info, bus.channel_info)
+
+    def test_receive(self):
+        bus = self.connect()
+        msg = can.Message(arbitration_id=0x123, data=[1, 2, 3])
+        self.peer.send(msg)
+        received = bus.recv(5)
+        self.assertTrue(msg.equals(received, timestamp_delta=None, check_channel=False))
+        self.assertEqual(received.channel, self.path)
+        self.assertIsNone(bus.recv(0))
+
+    def test_filters_are_applied_by_hub(self):
+        filters = [{"can_id": 0x100, "can_mask": 0x700}]
+        bus = self.connect(can_filters=filters)
+        self.assertEqual(self.hub.bus.filters, filters)
+
+        self.peer.send(can.Message(arbitration_id=0x201))
+        self.peer.send(can.Message(arbitration_id=0x101))
+        self.assertEqual(bus.recv(5).arbitration_id, 0x101)
+        self.assertIsNone(bus.recv(0.05))
+        # the hub did not pass the other message at all
+        self.assertEqual(bus.statistics.messages_filtered, 0)
+
+        bus.set_filters(None)
+        self.assertIsNone(self.hub.bus.filters)
+        self.peer.send(can.Message(arbitration_id=0x201))
+        self.assertEqual(bus.recv(5).arbitration_id, 0x201)
+
+    def test_send(self):
+        bus = self.connect()
+        msg = can.Message(arbitration_id=0x12345678, is_extended_id=True, data=[4])
+        bus.send(msg)
+        self.assertTrue(
+            msg.equals(self.peer.recv(5), timestamp_delta=None, check_channel=False)
+        )
+        self.assertEqual(bus.statistics.messages_sent, 1)
+
+    def test_blocked_send_does_not_delay_other_clients(self):
+        self.hub.shutdown()
+        hub_bus = BlockingBus(channel="hub")
+        self.hub = self.start_hub(hub_bus)
+        blocked = self.connect()
+        other = self.connect()
+
+        sender = threading.Thread(
+            target=blocked.send, args=(can.Message(arbitration_id=0x666),)
+        )
+        sender.start()
+        try:
+            time.sleep(0.05)
+            start = time.perf_counter()
+            other.set_filters([{"can_id": 0x123, "can_mask": 0x7FF}])
+            self.peer.send(can.Message(arbitration_id=0x123))
+            self.assertEqual(other.recv(5).arbitration_id, 0x123)
+            self.assertLess(time.perf_counter() - start, 1)
+            self.assertTrue(sender.is_alive())
+        finally:
+            hub_bus.release.set()
+            sender.join(5)
+        self.assertEqual(self.peer.recv(5).arbitration_id, 0x666)
+
+    def test_loopback_between_clients(self):
+        sender = self.connect()
+        receiver = self.connect(can_filters=[{"can_id": 0x42, "can_mask": 0x7FF}])
+        sender.send(can.Message(arbitration_id=0x42))
+        sender.send(can.Message(arbitration_id=0x43))
+        self.assertEqual(receiver.recv(5).arbitration_id, 0x42)
+        self.assertIsNone(receiver.recv(0.05))
+        self.assertIsNone(sender.recv(0.05))
+
+    def test_connections(self):
+        bus = self.connect()
+        self.assertEqual(self.hub.connections, 1)
+        bus.shutdown()
+        deadline = time.time() + 5
+        while self.hub.connections and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.hub.connections, 0)
+
+    def test_fileno(self):
+        bus = self.connect()
+        self.assertEqual(select.select([bus], [], [], 0)[0], [])
+        self.peer.send(can.Message(arbitration_id=0x1))
+        self.assertEqual(select.select([bus], [], [], 5)[0], [bus])
+        self.assertIsNotNone(bus.recv(0))
+        self.assertEqual(select.select([bus], [], [], 0)[0], [])
+
+    def test_interrupt(self):
+        bus = self.connect()
+        threading.Timer(0.1, bus.interrupt).start()
+        start = time.perf_counter()
+        self.assertIsNone(bus.recv(5))
+        self.assertLess(time.perf_counter() - start, 4)
+
+    def test_second_hub(self):
+        with self.assertRaises(can.CanInitializationError):
+            HubServer(can.Bus(interface="virtual"), self.path)
+
+    def test_stale_socket(self):
+        path = os.path.join(self.directory.name, "stale.sock")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(path)
+        with HubServer(can.Bus(interface="virtual"), path):
+            self.assertTrue(os.path.exists(path))
+        self.assertFalse(os.path.exists(path))
+
+    def test_missing_hub(self):
+        with self.assertRaises(can.CanInitializationError):
+            can.Bus(
+                interface="hub", channel=os.path.join(self.directory.name, "missing")
+            )
+
+    def test_hub_shutdown(self):
+        bus = self.connect()
+        self.hub.shutdown()
+        with self.assertRaises(can.CanOperationError):
+            bus.recv(5)
+        with self.assertRaises(can.CanOperationError):
+            bus.send(can.Message())
+
+    def test_receive_error(self):
+        self.hub.shutdown()
+        self.hub = self.start_hub(FailingBus())
+        bus = self.connect()
+        with self.assertRaisesRegex(can.CanOperationError, "device disconnected"):
+            bus.recv(5)
+        with self.assertRaises(can.CanOperationError):
+            bus.send(can.Message())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,8 @@
 This module tests :meth:`can.interface.virtual`.
 """
 
+import threading
+import time
 import unittest
 
 from can import Bus, Message
@@ -35,5 +37,32 @@ class TestMessageFiltering(unittest.TestCase):
         assert r.data == EXAMPLE_MSG1.data
 
 
+class TestInterrupt(unittest.TestCase):
+    def setUp(self):
+        self.bus = Bus("test", interface="virtual")
+
+    def tearDown(self):
+        self.bus.shutdown()
+
+    def test_interrupt_waiting_recv(self):
+        results = []
+        thread = threading.Thread(target=lambda: results.append(self.bus.recv()))
+        thread.start()
+        time.sleep(0.05)
+        self.bus.interrupt()
+        thread.join(1.0)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(results, [None])
+
+    def test_interrupt_next_recv(self):
+        with Bus("test", interface="virtual") as peer:
+            peer.send(EXAMPLE_MSG1)
+            self.bus.interrupt()
+            # queued messages are still returned first
+            self.assertEqual(self.bus.recv().arbitration_id, 0x481)
+            self.assertIsNone(self.bus.recv())
+            self.assertIsNone(self.bus.recv(0.01))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -17,6 +17,17 @@ MATCH_EXAMPLE = [{"can_id": 0x123, "can_mask": 0x1FFFFFFF, "extended": True}]
 
 MATCH_ONLY_HIGHEST = [{"can_id": 0xFFFFFFFF, "can_mask": 0x1FFFFFFF, "extended": True}]
 
+MATCH_PAYLOAD = [
+    {
+        "can_id": 0x123,
+        "can_mask": 0x7FF,
+        "data": [
+            {"offset": 0, "value": 0x02},
+            {"offset": 2, "mask": 0xF0, "value": 0x30},
+        ],
+    }
+]
+
 
 class TestMessageFiltering(unittest.TestCase):
     def setUp(self):
@@ -46,6 +57,47 @@ class TestMessageFiltering(unittest.TestCase):
         self.assertFalse(self.bus._matches_filters(EXAMPLE_MSG))
         self.assertTrue(self.bus._matches_filters(HIGHEST_MSG))
 
+    def test_match_payload(self):
+        self.bus.set_filters(MATCH_PAYLOAD)
+        self.assertTrue(
+            self.bus._matches_filters(Message(arbitration_id=0x123, data=[2, 0, 0x3F]))
+        )
+        self.assertTrue(
+            self.bus._matches_filters(
+                Message(arbitration_id=0x123, data=[2, 0xFF, 0x30, 4])
+            )
+        )
+        self.assertFalse(
+            self.bus._matches_filters(Message(arbitration_id=0x123, data=[3, 0, 0x30]))
+        )
+        self.assertFalse(
+            self.bus._matches_filters(Message(arbitration_id=0x123, data=[2, 0, 0x40]))
+        )
+        # the payload is too short
+        self.assertFalse(
+            self.bus._matches_filters(Message(arbitration_id=0x123, data=[2, 0]))
+        )
+        self.assertFalse(
+            self.bus._matches_filters(Message(arbitration_id=0x124, data=[2, 0, 0x30]))
+        )
+
+    def test_match_flags_and_ranges(self):
+        self.bus.set_filters(
+            [{"can_id": 0, "can_mask": 0, "min_id": 0x100, "max_dlc": 2, "fd": False}]
+        )
+        self.assertTrue(self.bus._matches_filters(Message(arbitration_id=0x100)))
+        self.assertFalse(self.bus._matches_filters(Message(arbitration_id=0xFF)))
+        self.assertFalse(
+            self.bus._matches_filters(Message(arbitration_id=0x100, data=[1, 2, 3]))
+        )
+        self.assertFalse(
+            self.bus._matches_filters(Message(arbitration_id=0x100, is_fd=True))
+        )
+
+    def test_invalid_filters(self):
+        with self.assertRaises(ValueError):
+            self.bus.set_filters([{"can_id": 0x1}])
+
 
 if __name__ == "__main__":
     unittest.main()
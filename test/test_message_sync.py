@@ -90,6 +90,64 @@ class TestMessageSync(unittest.TestCase, ComparingMessagesTestCase):
 
         self.assertMessagesEqual(messages, collected)
 
+    def test_scheduled(self):
+        messages = [
+            Message(timestamp=50.0),
+            Message(timestamp=50.0 + 0.05),
+            Message(timestamp=50.0 + 0.13),
+        ]
+        sync = MessageSync(messages, gap=0.0, skip=0.0)
+
+        t_start = time.perf_counter()
+        collected = []
+        send_times = []
+        timings = []
+        for send_time, message in sync.scheduled(lead=0.1):
+            timings.append(time.perf_counter() - t_start)
+            send_times.append(send_time - t_start)
+            collected.append(message)
+
+        self.assertMessagesEqual(messages, collected)
+
+        # the send times follow the recorded timestamps ...
+        self.assertTrue(0.0 <= send_times[0] < 0.0 + inc(0.02), str(send_times[0]))
+        self.assertTrue(0.045 <= send_times[1] < 0.05 + inc(0.02), str(send_times[1]))
+        self.assertTrue(0.125 <= send_times[2] < 0.13 + inc(0.02), str(send_times[2]))
+
+        # ... but the messages are yielded up to `lead` seconds earlier
+        self.assertTrue(0.0 <= timings[1] < 0.0 + inc(0.02), str(timings[1]))
+        self.assertTrue(0.025 <= timings[2] < 0.03 + inc(0.02), str(timings[2]))
+
+    def test_scheduled_clock(self):
+        messages = [Message(timestamp=1.0), Message(timestamp=1.5)]
+        sync = MessageSync(messages, gap=0.0, skip=0.0)
+
+        # a clock far away from time.perf_counter()
+        def clock():
+            return time.perf_counter() + 1000.0
+
+        scheduled = list(sync.scheduled(lead=1.0, clock=clock))
+        self.assertAlmostEqual(scheduled[1][0] - scheduled[0][0], 0.5, delta=0.02)
+        self.assertTrue(abs(scheduled[0][0] - clock()) < 0.02)
+
+
+@skip_on_unreliable_platforms
+def test_speed():
+    messages = [Message(timestamp=10.0), Message(timestamp=10.2)]
+    sync = MessageSync(messages, gap=0.0, skip=0.0, speed=2.0)
+
+    before = time.perf_counter()
+    collected = list(sync)
+    took = time.perf_counter() - before
+
+    assert 0.095 <= took < 0.1 + inc(0.02)
+    assert messages == collected
+
+
+def test_speed_invalid():
+    with pytest.raises(ValueError):
+        MessageSync([], speed=0.0)
+
 
 @skip_on_unreliable_platforms
 @pytest.mark.parametrize(
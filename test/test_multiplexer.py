@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+
+"""
+This module tests :class:`can.BusMultiplexer`.
+"""
+
+import select
+import threading
+import time
+import unittest
+from typing import Optional
+
+import can
+
+
+class FailingBus(can.BusABC):
+    def __init__(self, channel=None, **kwargs):
+        super().__init__(channel, **kwargs)
+
+    def _recv_internal(self, timeout: Optional[float]):
+        raise can.CanOperationError("device disconnected")
+
+    def send(self, msg: can.Message, timeout: Optional[float] = None) -> None:
+        pass
+
+
+class TestBusMultiplexer(unittest.TestCase):
+    def setUp(self):
+        self.peer = can.Bus(interface="virtual", channel="multiplexer")
+        self.multiplexer = can.BusMultiplexer(
+            can.Bus(interface="virtual", channel="multiplexer")
+        )
+
+    def tearDown(self):
+        self.multiplexer.shutdown()
+        self.peer.shutdown()
+
+    def test_independent_filters(self):
+        view_1 = self.multiplexer.open_view(
+            can_filters=[{"can_id": 0x100, "can_mask": 0x700}]
+        )
+        view_2 = self.multiplexer.open_view(
+            can_filters=[{"can_id": 0x200, "can_mask": 0x700}]
+        )
+        view_all = self.multiplexer.open_view()
+        self.assertIsInstance(view_1, can.BusABC)
+
+        for arbitration_id in (0x101, 0x201, 0x301):
+            self.peer.send(can.Message(arbitration_id=arbitration_id))
+
+        self.assertEqual(view_1.recv(1).arbitration_id, 0x101)
+        self.assertEqual(view_2.recv(1).arbitration_id, 0x201)
+        self.assertEqual(
+            [view_all.recv(1).arbitration_id for _ in range(3)], [0x101, 0x201, 0x301]
+        )
+        for view in (view_1, view_2, view_all):
+            self.assertIsNone(view.recv(0.05))
+
+    def test_merged_filters(self):
+        bus = self.multiplexer.bus
+        view_1 = self.multiplexer.open_view(
+            can_filters=[{"can_id": 0x100, "can_mask": 0x700}]
+        )
+        self.assertEqual(bus.filters, [{"can_id": 0x100, "can_mask": 0x700}])
+
+        view_2 = self.multiplexer.open_view()
+        self.assertIsNone(bus.filters)
+
+        view_2.set_filters([{"can_id": 0x200, "can_mask": 0x700}])
+        self.assertEqual(
+            bus.filters,
+            [
+                {"can_id": 0x100, "can_mask": 0x700},
+                {"can_id": 0x200, "can_mask": 0x700},
+            ],
+        )
+
+        view_1.shutdown()
+        self.assertEqual(bus.filters, [{"can_id": 0x200, "can_mask": 0x700}])
+        self.assertEqual(self.multiplexer.views, [view_2])
+
+    def test_send(self):
+        view = self.multiplexer.open_view()
+        view.send(can.Message(arbitration_id=0x123))
+        self.assertEqual(self.peer.recv(1).arbitration_id, 0x123)
+        self.assertEqual(view.statistics.messages_sent, 1)
+
+    def test_local_loopback(self):
+        view_1 = self.multiplexer.open_view()
+        view_2 = self.multiplexer.open_view(
+            can_filters=[{"can_id": 0x200, "can_mask": 0x700}]
+        )
+        view_3 = self.multiplexer.open_view()
+
+        view_1.send(can.Message(arbitration_id=0x123))
+        view_1.send(can.Message(arbitration_id=0x234))
+
+        msg = view_3.recv(1)
+        self.assertEqual(msg.arbitration_id, 0x123)
+        self.assertFalse(msg.is_rx)
+        self.assertEqual(view_3.recv(1).arbitration_id, 0x234)
+        self.assertEqual(view_2.recv(1).arbitration_id, 0x234)
+        self.assertIsNone(view_1.recv(0.05))
+        self.assertIsNone(view_2.recv(0))
+
+    def test_rx_queue_size(self):
+        view = self.multiplexer.open_view(rx_queue_size=2)
+        for arbitration_id in range(3):
+            self.peer.send(can.Message(arbitration_id=arbitration_id))
+        time.sleep(0.1)
+        self.assertEqual(view.queue_depth, 2)
+        self.assertEqual(view.recv(0).arbitration_id, 1)
+
+    def test_fileno(self):
+        view = self.multiplexer.open_view()
+        self.assertEqual(select.select([view], [], [], 0)[0], [])
+        self.peer.send(can.Message(arbitration_id=1))
+        self.assertEqual(select.select([view], [], [], 1)[0], [view])
+        self.assertIsNotNone(view.recv(0))
+        self.assertEqual(select.select([view], [], [], 0)[0], [])
+
+    def test_interrupt(self):
+        view = self.multiplexer.open_view()
+        results = []
+        thread = threading.Thread(target=lambda: results.append(view.recv()))
+        thread.start()
+        time.sleep(0.05)
+        view.interrupt()
+        thread.join(1)
+        self.assertEqual(results, [None])
+
+    def test_shutdown_view(self):
+        view = self.multiplexer.open_view()
+        other = self.multiplexer.open_view()
+        view.shutdown()
+        with self.assertRaises(can.CanOperationError):
+            view.recv(0)
+        with self.assertRaises(can.CanOperationError):
+            view.send(can.Message())
+
+        self.peer.send(can.Message(arbitration_id=1))
+        self.assertEqual(other.recv(1).arbitration_id, 1)
+
+    def test_shutdown(self):
+        view = self.multiplexer.open_view()
+        bus = self.multiplexer.bus
+        self.multiplexer.shutdown()
+        self.assertTrue(view._is_shutdown)
+        self.assertTrue(bus._is_shutdown)
+        with self.assertRaises(RuntimeError):
+            self.multiplexer.open_view()
+
+
+class TestBusMultiplexerErrors(unittest.TestCase):
+    def test_receive_error(self):
+        with can.BusMultiplexer(FailingBus()) as multiplexer:
+            view = multiplexer.open_view()
+            with self.assertRaises(can.CanOperationError):
+                view.recv(1)
+            self.assertIsInstance(multiplexer.exception, can.CanOperationError)
+
+            # views opened later fail, too
+            with self.assertRaises(can.CanOperationError):
+                multiplexer.open_view().recv(1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -99,6 +99,63 @@ class TestPlayerScriptModule(unittest.TestCase):
         self.assertEqual(self.mock_virtual_bus.send.call_count, 12)
         self.assertSuccessfulCleanup()
 
+    def test_play_txtime_unsupported(self):
+        sys.argv = self.baseargs + ["--txtime-lead", "0.01", self.logfile]
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+            can.player.main()
+        self.assertIn("ignoring --txtime-lead", mock_stdout.getvalue())
+        self.assertEqual(self.mock_virtual_bus.send.call_count, 2)
+        self.assertSuccessfulCleanup()
+
+    def test_play_txtime(self):
+        self.mock_virtual_bus.send_at = Mock()
+        self.mock_virtual_bus.txtime_now = Mock(return_value=100.0)
+        sys.argv = self.baseargs + ["--txtime-lead", "0.01", self.logfile]
+        can.player.main()
+        self.assertEqual(self.mock_virtual_bus.send.call_count, 0)
+        self.assertEqual(self.mock_virtual_bus.send_at.call_count, 2)
+        launch_times = [c.args[1] for c in self.mock_virtual_bus.send_at.mock_calls]
+        self.assertAlmostEqual(launch_times[1] - launch_times[0], 17.876708 - 2.501)
+        self.assertEqual(self.MockVirtualBus.call_args.kwargs["txtime"], True)
+        self.assertSuccessfulCleanup()
+
+    def test_play_speed(self):
+        sys.argv = self.baseargs + ["--speed", "2", self.logfile]
+        can.player.main()
+        self.assertAlmostEqual(
+            self.MockSleep.call_args.args[0], (17.876708 - 2.501) / 2, places=2
+        )
+        self.assertEqual(self.mock_virtual_bus.send.call_count, 2)
+        self.assertSuccessfulCleanup()
+
+    def test_play_max_throughput(self):
+        sys.argv = self.baseargs + ["--max-throughput", self.logfile]
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+            can.player.main()
+        self.assertIn("Sent 2 frames", mock_stdout.getvalue())
+        self.MockSleep.assert_not_called()
+        self.assertEqual(self.mock_virtual_bus.send.call_count, 2)
+        self.assertSuccessfulCleanup()
+
+    def test_play_channel_map(self):
+        sys.argv = self.baseargs + ["--channel-map", "0=a,1=b", self.logfile]
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+            can.player.main()
+        channels = [c.args[0] for c in self.MockVirtualBus.call_args_list]
+        self.assertEqual(channels, ["a", "b"])
+        # the ASC channel 1 is read as channel 0 and is mapped to "a"
+        self.assertEqual(self.mock_virtual_bus.send.call_count, 2)
+        self.assertIn("1 sent", mock_stdout.getvalue())
+        self.assertEqual(self.mock_virtual_bus.__exit__.call_count, 2)
+
+    def test_play_channel_map_unmapped(self):
+        sys.argv = self.baseargs + ["--channel-map", "0=a", self.logfile]
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+            can.player.main()
+        self.assertEqual(self.mock_virtual_bus.send.call_count, 1)
+        self.assertIn("1 frames of unmapped channels skipped", mock_stdout.getvalue())
+        self.assertSuccessfulCleanup()
+
 
 class TestPlayerCompressedFile(TestPlayerScriptModule):
     """
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+
+"""
+This module tests :class:`can.BusPoller`.
+"""
+
+import asyncio
+import select
+import threading
+import time
+import unittest
+from typing import Optional
+
+import can
+
+
+class FailingBus(can.BusABC):
+    def __init__(self, channel=None, **kwargs):
+        super().__init__(channel, **kwargs)
+
+    def _recv_internal(self, timeout: Optional[float]):
+        raise can.CanOperationError("device disconnected")
+
+    def send(self, msg: can.Message, timeout: Optional[float] = None) -> None:
+        pass
+
+
+class TestBusPoller(unittest.TestCase):
+    def setUp(self):
+        self.poller = can.BusPoller(max_interval=0.005)
+        self.peers = [
+            can.Bus(interface="virtual", channel=f"poller{index}") for index in range(3)
+        ]
+        self.buses = [
+            self.poller.add_bus(can.Bus(interface="virtual", channel=f"poller{index}"))
+            for index in range(3)
+        ]
+
+    def tearDown(self):
+        self.poller.stop()
+        for bus in self.buses + self.peers:
+            bus.shutdown()
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            can.BusPoller(threads=0)
+        with self.assertRaises(ValueError):
+            can.BusPoller(min_interval=0.1, max_interval=0.01)
+
+    def test_recv(self):
+        for index, peer in enumerate(self.peers):
+            peer.send(can.Message(arbitration_id=index))
+
+        for index, bus in enumerate(self.buses):
+            msg = bus.recv(1)
+            self.assertEqual(msg.arbitration_id, index)
+            self.assertIsNone(bus.recv(0))
+
+    def test_interrupt(self):
+        bus = self.buses[0]
+        bus.interrupt()
+        started = time.perf_counter()
+        self.assertIsNone(bus.recv())
+        self.assertLess(time.perf_counter() - started, 1.0)
+
+        self.peers[0].send(can.Message(arbitration_id=1))
+        self.assertEqual(bus.recv(1).arbitration_id, 1)
+
+    def test_notifier_stop_during_callback(self):
+        bus = self.buses[0]
+        entered = threading.Event()
+        release = threading.Event()
+
+        def on_message(msg):
+            entered.set()
+            release.wait(5)
+
+        notifier = can.Notifier(bus, [on_message], timeout=10.0)
+        self.peers[0].send(can.Message(arbitration_id=1))
+        self.assertTrue(entered.wait(5))
+
+        # the reader is in the callback and not waiting in recv()
+        stopper = threading.Thread(target=notifier.stop)
+        stopper.start()
+        time.sleep(0.05)
+        release.set()
+        stopper.join(5)
+
+        sender = threading.Timer(
+            0.2, self.peers[0].send, (can.Message(arbitration_id=2),)
+        )
+        sender.start()
+        msg = bus.recv(2)
+        sender.join()
+        self.assertIsNotNone(msg)
+        self.assertEqual(msg.arbitration_id, 2)
+
+    def test_fileno(self):
+        bus = self.buses[0]
+        self.assertEqual(select.select([bus], [], [], 0)[0], [])
+
+        self.peers[0].send(can.Message(arbitration_id=1))
+        self.peers[0].send(can.Message(arbitration_id=2))
+        self.assertEqual(select.select([bus], [], [], 1)[0], [bus])
+        time.sleep(0.05)
+        self.assertEqual(bus.queue_depth, 2)
+
+        bus.recv(0)
+        self.assertEqual(select.select([bus], [], [], 0)[0], [bus])
+        bus.recv(0)
+        self.assertEqual(select.select([bus], [], [], 0)[0], [])
+
+    def test_filters_and_send(self):
+        self.buses[0].set_filters([{"can_id": 2, "can_mask": 0x7FF}])
+        for arbitration_id in (1, 2):
+            self.peers[0].send(can.Message(arbitration_id=arbitration_id))
+        self.assertEqual(self.buses[0].recv(1).arbitration_id, 2)
+
+        self.buses[1].send(can.Message(arbitration_id=3))
+        self.assertEqual(self.peers[1].recv(1).arbitration_id, 3)
+
+    def test_notifier_in_event_loop(self):
+        async def receive():
+            reader = can.AsyncBufferedReader()
+            notifier = can.Notifier(
+                self.buses, [reader], loop=asyncio.get_running_loop()
+            )
+            for index, peer in enumerate(self.peers):
+                peer.send(can.Message(arbitration_id=index))
+            try:
+                return [
+                    (await asyncio.wait_for(reader.get_message(), 1)).arbitration_id
+                    for _ in self.peers
+                ]
+            finally:
+                notifier.stop()
+
+        self.assertEqual(sorted(asyncio.run(receive())), [0, 1, 2])
+
+    def test_recv_async(self):
+        async def receive():
+            self.assertIsNone(await self.buses[0].recv_async(0.01))
+            self.peers[0].send(can.Message(arbitration_id=5))
+            msg = await self.buses[0].recv_async(1)
+            await self.buses[0].send_async(can.Message(arbitration_id=6))
+            return msg
+
+        self.assertEqual(asyncio.run(receive()).arbitration_id, 5)
+        self.assertEqual(self.peers[0].recv(1).arbitration_id, 6)
+
+    def test_idle_latency(self):
+        # let the poller back off completely
+        time.sleep(0.1)
+        start = time.perf_counter()
+        self.peers[0].send(can.Message())
+        self.assertIsNotNone(self.buses[0].recv(1))
+        self.assertLess(time.perf_counter() - start, 0.1)
+
+    def test_error_stops_polling(self):
+        bus = self.poller.add_bus(FailingBus())
+        with self.assertRaises(can.CanOperationError):
+            bus.recv(1)
+        self.assertIsInstance(bus.exception, can.CanOperationError)
+        self.assertNotIn(bus, self.poller.buses)
+        bus.shutdown()
+
+    def test_remove_bus(self):
+        bus = self.buses.pop()
+        self.assertIn(bus, self.poller.buses)
+        bus.shutdown()
+        self.assertEqual(len(self.poller.buses), 2)
+        with self.assertRaises(can.CanOperationError):
+            bus.recv(0)
+
+    def test_several_threads(self):
+        with can.BusPoller(threads=2) as poller:
+            peer = can.Bus(interface="virtual", channel="poller_threads")
+            buses = [
+                poller.add_bus(can.Bus(interface="virtual", channel="poller_threads"))
+                for _ in range(4)
+            ]
+            peer.send(can.Message(arbitration_id=7))
+            for bus in buses:
+                self.assertEqual(bus.recv(1).arbitration_id, 7)
+            for bus in [*buses, peer]:
+                bus.shutdown()
+
+        with can.Bus(interface="virtual") as bus, self.assertRaises(RuntimeError):
+            poller.add_bus(bus)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+
+"""
+This module tests :class:`can.PriorityQueueBus`.
+"""
+
+import errno
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+
+import can
+from can.priority_queue_bus import arbitration_key
+
+
+class TestArbitrationKey(unittest.TestCase):
+    def test_lower_id_wins(self):
+        self.assertLess(
+            arbitration_key(can.Message(arbitration_id=0x100, is_extended_id=False)),
+            arbitration_key(can.Message(arbitration_id=0x101, is_extended_id=False)),
+        )
+
+    def test_data_frame_wins_over_remote_frame(self):
+        self.assertLess(
+            arbitration_key(can.Message(arbitration_id=0x100, is_extended_id=False)),
+            arbitration_key(
+                can.Message(
+                    arbitration_id=0x100, is_extended_id=False, is_remote_frame=True
+                )
+            ),
+        )
+
+    def test_base_frame_wins_over_extended_frame(self):
+        base = can.Message(arbitration_id=0x100, is_extended_id=False)
+        extended = can.Message(arbitration_id=0x100 << 18, is_extended_id=True)
+        self.assertLess(arbitration_key(base), arbitration_key(extended))
+
+        # the base identifier is compared first
+        extended = can.Message(
+            arbitration_id=0x0FF << 18 | 0x3FFFF, is_extended_id=True
+        )
+        self.assertLess(arbitration_key(extended), arbitration_key(base))
+
+
+class TestPriorityQueueBus(unittest.TestCase):
+    def setUp(self):
+        self.wrapped = Mock(spec=can.BusABC)
+        self.wrapped.channel_info = "mock"
+        self.sent = []
+        self.release = threading.Event()
+
+        def send(msg, timeout=None):
+            self.release.wait(5)
+            self.sent.append(msg.arbitration_id)
+
+        self.wrapped.send.side_effect = send
+
+    def wait_until_sent(self, bus, count):
+        t_end = time.perf_counter() + 5
+        while len(self.sent) < count and time.perf_counter() < t_end:
+            time.sleep(0.001)
+
+    def test_arbitration_order(self):
+        bus = can.PriorityQueueBus(self.wrapped)
+        try:
+            # the first message blocks the worker
+            bus.send(can.Message(arbitration_id=0x7FF, is_extended_id=False))
+            while bus.queue_depth:
+                time.sleep(0.001)
+            for arbitration_id in (0x300, 0x100, 0x200, 0x100):
+                bus.send(
+                    can.Message(arbitration_id=arbitration_id, is_extended_id=False)
+                )
+            self.assertEqual(bus.queue_depth, 4)
+            self.assertEqual(bus.peak_queue_depth, 4)
+
+            self.release.set()
+            self.wait_until_sent(bus, 5)
+            self.assertEqual(self.sent, [0x7FF, 0x100, 0x100, 0x200, 0x300])
+
+            stats = bus.wait_time_statistics()
+            self.assertEqual(stats[0x100].sent, 2)
+            self.assertEqual(stats[0x300].sent, 1)
+            self.assertGreaterEqual(stats[0x300].max, stats[0x300].mean)
+
+            bus.reset_statistics()
+            self.assertEqual(bus.wait_time_statistics(), {})
+            self.assertEqual(bus.peak_queue_depth, 0)
+        finally:
+            self.release.set()
+            bus.shutdown()
+        self.wrapped.shutdown.assert_called_once()
+
+    def test_max_wait(self):
+        bus = can.PriorityQueueBus(self.wrapped, max_wait=0.01)
+        try:
+            bus.send(can.Message(arbitration_id=0x7FF, is_extended_id=False))
+            while bus.queue_depth:
+                time.sleep(0.001)
+            bus.send(can.Message(arbitration_id=0x300, is_extended_id=False))
+            time.sleep(0.02)
+            bus.send(can.Message(arbitration_id=0x100, is_extended_id=False))
+
+            self.release.set()
+            self.wait_until_sent(bus, 3)
+            self.assertEqual(self.sent, [0x7FF, 0x300, 0x100])
+        finally:
+            self.release.set()
+            bus.shutdown()
+
+    def test_queue_full(self):
+        bus = can.PriorityQueueBus(self.wrapped, max_size=1)
+        try:
+            bus.send(can.Message(arbitration_id=1))
+            while bus.queue_depth:
+                time.sleep(0.001)
+            bus.send(can.Message(arbitration_id=2))
+            with self.assertRaises(can.CanOperationError) as context:
+                bus.send(can.Message(arbitration_id=3), timeout=0.01)
+            self.assertEqual(context.exception.error_code, errno.ENOBUFS)
+        finally:
+            self.release.set()
+            bus.shutdown()
+
+    def test_send_errors(self):
+        self.wrapped.send.side_effect = can.CanOperationError("failed")
+        bus = can.PriorityQueueBus(self.wrapped)
+        try:
+            bus.send(can.Message())
+            t_end = time.perf_counter() + 5
+            while not bus.send_errors and time.perf_counter() < t_end:
+                time.sleep(0.001)
+            self.assertEqual(bus.send_errors, 1)
+            self.assertIsInstance(bus.exception, can.CanOperationError)
+        finally:
+            bus.shutdown()
+
+    def test_send_after_shutdown(self):
+        bus = can.PriorityQueueBus(self.wrapped)
+        bus.shutdown()
+        with self.assertRaises(can.CanOperationError):
+            bus.send(can.Message())
+
+    def test_flush_tx_buffer(self):
+        bus = can.PriorityQueueBus(self.wrapped)
+        try:
+            bus.send(can.Message(arbitration_id=1))
+            while bus.queue_depth:
+                time.sleep(0.001)
+            bus.send(can.Message(arbitration_id=2))
+            bus.flush_tx_buffer()
+            self.assertEqual(bus.queue_depth, 0)
+            self.wrapped.flush_tx_buffer.assert_called_once()
+            self.release.set()
+            self.wait_until_sent(bus, 1)
+            time.sleep(0.01)
+            self.assertEqual(self.sent, [1])
+        finally:
+            self.release.set()
+            bus.shutdown()
+
+    def test_virtual_bus(self):
+        with (
+            can.PriorityQueueBus(can.Bus(interface="virtual", channel="pq")) as bus,
+            can.Bus(interface="virtual", channel="pq") as receiver,
+        ):
+            self.assertIsInstance(bus, can.PriorityQueueBus)
+            bus.send(can.Message(arbitration_id=0x123))
+            msg = receiver.recv(1.0)
+            self.assertIsNotNone(msg)
+            self.assertEqual(msg.arbitration_id, 0x123)
+            self.assertEqual(bus.channel_info, receiver.channel_info)
+
+
+if __name__ == "__main__":
+    unittest.main()
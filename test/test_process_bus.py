@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+
+"""
+This module tests :class:`can.ProcessBus`.
+"""
+
+import asyncio
+import os
+import select
+import threading
+import time
+import unittest
+
+import can
+
+
+class TestProcessBus(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # the virtual bus in the child process returns the sent messages
+        cls.bus = can.ProcessBus(
+            interface="virtual", channel="process_bus", receive_own_messages=True
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.bus.shutdown()
+
+    def tearDown(self):
+        self.bus.set_filters(None)
+        while self.bus.recv(0.05) is not None:
+            pass
+
+    def test_runs_in_child_process(self):
+        self.assertTrue(self.bus._process.is_alive())
+        self.assertNotEqual(self.bus._process.pid, os.getpid())
+        self.assertIn("process_bus", self.bus.channel_info)
+
+    def test_send_and_recv(self):
+        self.bus.statistics.reset()
+        for arbitration_id in range(200):
+            self.bus.send(can.Message(arbitration_id=arbitration_id, data=[1, 2]))
+        received = [self.bus.recv(1.0) for _ in range(200)]
+        self.assertEqual([msg.arbitration_id for msg in received], list(range(200)))
+        self.assertEqual(received[0].data, bytearray([1, 2]))
+        self.assertIsNone(self.bus.recv(0))
+        self.assertEqual(self.bus.statistics.messages_received, 200)
+
+    def test_concurrent_send(self):
+        def send(offset):
+            for index in range(50):
+                self.bus.send(can.Message(arbitration_id=offset + index))
+
+        threads = [threading.Thread(target=send, args=(i * 100,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        received = [self.bus.recv(1.0).arbitration_id for _ in range(200)]
+        for offset in range(0, 400, 100):
+            self.assertEqual(
+                [i for i in received if offset <= i < offset + 100],
+                list(range(offset, offset + 50)),
+            )
+
+    def test_filters(self):
+        self.bus.set_filters([{"can_id": 0x123, "can_mask": 0x7FF}])
+        self.bus.send(can.Message(arbitration_id=0x100))
+        self.bus.send(can.Message(arbitration_id=0x123))
+        self.assertEqual(self.bus.recv(1.0).arbitration_id, 0x123)
+        self.assertIsNone(self.bus.recv(0.1))
+
+    def test_filters_recheck_earlier_messages(self):
+        self.bus.send(can.Message(arbitration_id=0x100))
+        # the message waits in the current process when the filters change
+        self.assertEqual(select.select([self.bus], [], [], 1.0)[0], [self.bus])
+        self.bus.set_filters([{"can_id": 0x123, "can_mask": 0x7FF}])
+        self.assertIsNone(self.bus.recv(0.1))
+
+    def test_fileno(self):
+        self.assertEqual(select.select([self.bus], [], [], 0)[0], [])
+        self.bus.send(can.Message(arbitration_id=1))
+        self.bus.send(can.Message(arbitration_id=2))
+        self.assertEqual(select.select([self.bus], [], [], 1.0)[0], [self.bus])
+        self.assertIsNotNone(self.bus.recv(0))
+        self.assertIsNotNone(self.bus.recv(0.1))
+        self.assertEqual(select.select([self.bus], [], [], 0)[0], [])
+
+    def test_notifier_in_event_loop(self):
+        async def receive():
+            reader = can.AsyncBufferedReader()
+            notifier = can.Notifier(self.bus, [reader], loop=asyncio.get_running_loop())
+            try:
+                self.bus.send(can.Message(arbitration_id=7))
+                return await asyncio.wait_for(reader.get_message(), 1.0)
+            finally:
+                notifier.stop()
+
+        self.assertEqual(asyncio.run(receive()).arbitration_id, 7)
+
+    def test_interrupt(self):
+        self.bus.interrupt()
+        started = time.perf_counter()
+        self.assertIsNone(self.bus.recv())
+        self.assertLess(time.perf_counter() - started, 1.0)
+
+    def test_state(self):
+        self.assertEqual(self.bus.state, can.BusState.ACTIVE)
+        with self.assertRaises(NotImplementedError):
+            self.bus.state = can.BusState.PASSIVE
+
+
+class TestProcessBusLifecycle(unittest.TestCase):
+    def test_initialization_error(self):
+        with self.assertRaises(can.CanInterfaceNotImplementedError):
+            can.ProcessBus(interface="does_not_exist")
+
+    def test_shutdown(self):
+        bus = can.ProcessBus(interface="virtual")
+        process = bus._process
+        bus.shutdown()
+        self.assertFalse(process.is_alive())
+        self.assertEqual(process.exitcode, 0)
+        with self.assertRaises(can.CanOperationError):
+            bus.send(can.Message())
+        # shutting down twice is allowed
+        bus.shutdown()
+
+    def test_child_process_exited(self):
+        bus = can.ProcessBus(interface="virtual")
+        try:
+            bus._process.kill()
+            with self.assertRaises(can.CanOperationError):
+                bus.recv(5.0)
+            with self.assertRaises(can.CanOperationError):
+                bus.send(can.Message())
+        finally:
+            bus.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+
+"""
+This module tests :class:`can.RateLimitedBus`.
+"""
+
+import time
+import unittest
+from unittest.mock import Mock
+
+import can
+
+TIMING = can.BitTiming.from_sample_point(
+    f_clock=8_000_000, bitrate=500_000, sample_point=87.5
+)
+
+# 135 bits or 270 µs at 500 kbit/s
+MESSAGE = can.Message(arbitration_id=0x100, is_extended_id=False, data=bytes(8))
+
+
+class TestRateLimitedBus(unittest.TestCase):
+    def setUp(self):
+        self.wrapped = Mock(spec=can.BusABC)
+
+    def test_invalid_arguments(self):
+        for kwargs in ({"max_load": 0.0}, {"max_load": 1.5}, {"max_burst": -1.0}):
+            with self.subTest(**kwargs), self.assertRaises(ValueError):
+                can.RateLimitedBus(self.wrapped, TIMING, **kwargs)
+
+    def test_frame_duration(self):
+        bus = can.RateLimitedBus(self.wrapped, TIMING)
+        self.assertAlmostEqual(bus.frame_duration(MESSAGE), 270e-6)
+
+    def test_burst_is_not_delayed(self):
+        bus = can.RateLimitedBus(self.wrapped, TIMING, max_burst=0.01)
+        bus.send_many([MESSAGE] * 30)
+        self.assertEqual(self.wrapped.send.call_count, 30)
+        self.assertEqual(bus.total_delay, 0.0)
+
+    def test_load_is_limited(self):
+        bus = can.RateLimitedBus(self.wrapped, TIMING, max_load=0.5, max_burst=0.0)
+        start = time.perf_counter()
+        bus.send_many([MESSAGE] * 20)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(self.wrapped.send.call_count, 20)
+        self.assertGreaterEqual(elapsed, 20 * 540e-6 * 0.9)
+        self.assertAlmostEqual(bus.total_delay, 20 * 540e-6, delta=20 * 540e-6 * 0.1)
+
+    def test_timeout(self):
+        bus = can.RateLimitedBus(self.wrapped, TIMING, max_load=0.01, max_burst=0.0)
+        with self.assertRaises(can.CanTimeoutError):
+            bus.send(MESSAGE, timeout=0.001)
+        self.wrapped.send.assert_not_called()
+
+        bus.send(MESSAGE, timeout=0.1)
+        self.wrapped.send.assert_called_once()
+
+    def test_forwards_to_wrapped_bus(self):
+        with can.RateLimitedBus(self.wrapped, TIMING) as bus:
+            bus.recv(0)
+        self.wrapped.recv.assert_called_once_with(0)
+        self.wrapped.shutdown.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+
+"""
+This module tests :func:`can.io.replay_max_throughput` and
+:class:`can.io.ChannelRouter`.
+"""
+
+import errno
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+import can
+from can.io import ChannelRouter, ReplayStatistics, replay_max_throughput
+
+
+class TestReplayMaxThroughput(unittest.TestCase):
+    def test_all_messages_sent_in_order(self):
+        messages = [can.Message(arbitration_id=i) for i in range(200)]
+        received = []
+
+        with (
+            can.Bus(interface="virtual", channel="replay", rx_queue_size=8) as receiver,
+            can.Bus(interface="virtual", channel="replay") as sender,
+        ):
+
+            def consume():
+                while len(received) < len(messages):
+                    if msg := receiver.recv(timeout=1.0):
+                        received.append(msg.arbitration_id)
+                    else:
+                        break
+
+            consumer = threading.Thread(target=consume)
+            consumer.start()
+            stats = replay_max_throughput(sender, messages, batch_size=16)
+            consumer.join()
+
+        self.assertEqual(received, list(range(200)))
+        self.assertEqual(stats.frames_sent, 200)
+        self.assertGreater(stats.frames_per_second, 0)
+
+    def test_backoff_on_full_queue(self):
+        bus = Mock()
+        full = can.CanOperationError("buffer full", errno.ENOBUFS)
+        bus.send.side_effect = [None, full, full, can.CanTimeoutError(), None]
+
+        with patch("can.io.player.time.sleep") as mock_sleep:
+            stats = replay_max_throughput(
+                bus,
+                [can.Message(), can.Message()],
+                min_backoff=0.001,
+                max_backoff=0.003,
+            )
+
+        self.assertEqual(stats.frames_sent, 2)
+        self.assertEqual(stats.backoffs, 3)
+        self.assertEqual(
+            [c.args[0] for c in mock_sleep.call_args_list], [0.001, 0.002, 0.003]
+        )
+
+    def test_other_errors_are_raised(self):
+        bus = Mock()
+        bus.send.side_effect = can.CanOperationError("bus off", errno.ENETDOWN)
+        with self.assertRaises(can.CanOperationError):
+            replay_max_throughput(bus, [can.Message()])
+
+    def test_give_up_after_timeout(self):
+        bus = Mock()
+        bus.send.side_effect = can.CanOperationError("buffer full", errno.ENOBUFS)
+        with self.assertRaises(can.CanOperationError):
+            replay_max_throughput(bus, [can.Message()], max_backoff=0.001, timeout=0.01)
+
+    def test_statistics(self):
+        stats = ReplayStatistics(frames_sent=100, duration=0.5, backoffs=0)
+        self.assertEqual(stats.frames_per_second, 200.0)
+        self.assertEqual(ReplayStatistics(0, 0.0, 0).frames_per_second, 0.0)
+
+
+class TestChannelRouter(unittest.TestCase):
+    def test_routing(self):
+        with (
+            can.Bus(interface="virtual", channel="router_a") as bus_a,
+            can.Bus(interface="virtual", channel="router_b") as bus_b,
+            can.Bus(interface="virtual", channel="router_a") as receiver_a,
+            can.Bus(interface="virtual", channel="router_b") as receiver_b,
+        ):
+            with ChannelRouter({0: bus_a, 1: bus_b, "x": bus_b}) as router:
+                for i in range(10):
+                    router.send(can.Message(arbitration_id=i, channel=i % 2))
+                router.send(can.Message(arbitration_id=10, channel="x"))
+                router.send(can.Message(arbitration_id=11, channel=2))
+
+            received_a = [receiver_a.recv(0).arbitration_id for _ in range(5)]
+            received_b = [receiver_b.recv(0).arbitration_id for _ in range(6)]
+
+        self.assertEqual(received_a, [0, 2, 4, 6, 8])
+        self.assertEqual(received_b, [1, 3, 5, 7, 9, 10])
+        self.assertEqual(router.sent, {0: 5, 1: 5, "x": 1})
+        self.assertEqual(router.unrouted, 1)
+        self.assertIsNone(router.exception)
+        with self.assertRaises(RuntimeError):
+            router.send(can.Message(channel=0))
+
+    def test_slow_bus_does_not_block(self):
+        slow_bus = Mock()
+        release = threading.Event()
+        slow_bus.send.side_effect = lambda *args: release.wait(5)
+        fast_bus = Mock()
+
+        router = ChannelRouter({0: slow_bus, 1: fast_bus})
+        router.send(can.Message(channel=0))
+        for _ in range(100):
+            router.send(can.Message(channel=1))
+        release.set()
+        router.stop(timeout=5)
+
+        self.assertEqual(fast_bus.send.call_count, 100)
+        self.assertEqual(router.sent, {0: 1, 1: 100})
+
+    def test_errors(self):
+        bus = Mock()
+        bus.send.side_effect = can.CanOperationError("failed")
+        with ChannelRouter({0: bus}) as router:
+            router.send(can.Message(channel=0))
+        self.assertEqual(router.errors, {0: 1})
+        self.assertIsInstance(router.exception, can.CanOperationError)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -112,6 +112,20 @@ class TestBridgeScript(CanScriptTest):
         return module
 
 
+class TestHubScript(CanScriptTest):
+    def _commands(self):
+        commands = [
+            "python -m can.hub --help",
+            "can_hub --help",
+        ]
+        return commands
+
+    def _import(self):
+        import can.hub as module
+
+        return module
+
+
 class TestLogconvertScript(CanScriptTest):
     def _commands(self):
         commands = [
@@ -3,28 +3,40 @@
 """
 Test functions in `can.interfaces.socketcan.socketcan`.
 """
+
 import ctypes
+import socket
 import struct
 import sys
+import time
 import unittest
 import warnings
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import can
+from can.bus import _WakeupSocket
+from can.interfaces.socketcan import SocketcanBus
 from can.interfaces.socketcan.constants import (
     CAN_BCM_TX_DELETE,
     CAN_BCM_TX_SETUP,
     SETTIMER,
+    SO_RCVBUFFORCE,
+    SO_RXQ_OVFL,
+    SO_TIMESTAMPNS,
     STARTTIMER,
     TX_COUNTEVT,
 )
 from can.interfaces.socketcan.socketcan import (
     BcmMsgHead,
+    _DropCounter,
+    _set_receive_buffer_size,
     bcm_header_factory,
     build_bcm_header,
     build_bcm_transmit_header,
     build_bcm_tx_delete_header,
     build_bcm_update_header,
+    build_can_frame,
+    capture_message,
 )
 
 from .config import IS_LINUX, IS_PYPY, TEST_INTERFACE_SOCKETCAN
@@ -371,6 +383,32 @@ class SocketCANTest(unittest.TestCase):
         bus = can.Bus(interface="socketcan", channel="vcan0", fd=True)
         self.assertEqual(bus.protocol, can.CanProtocol.CAN_FD)
 
+    @unittest.skipUnless(TEST_INTERFACE_SOCKETCAN, "Only run when vcan0 is available")
+    def test_send_at(self):
+        msg = can.Message(arbitration_id=0x123, data=[1, 2, 3], is_extended_id=False)
+        with (
+            can.Bus(interface="socketcan", channel="vcan0", txtime=True) as sender,
+            can.Bus(interface="socketcan", channel="vcan0") as receiver,
+        ):
+            sender.send_at(msg, sender.txtime_now() + 0.01)
+            received = receiver.recv(1.0)
+        self.assertIsNotNone(received)
+        self.assertEqual(received.arbitration_id, 0x123)
+        self.assertEqual(received.data, msg.data)
+
+    @unittest.skipUnless(TEST_INTERFACE_SOCKETCAN, "Only run when vcan0 is available")
+    def test_send_at_without_txtime(self):
+        msg = can.Message(arbitration_id=0x123, data=[1, 2, 3], is_extended_id=False)
+        with (
+            can.Bus(interface="socketcan", channel="vcan0") as sender,
+            can.Bus(interface="socketcan", channel="vcan0") as receiver,
+        ):
+            self.assertFalse(sender.txtime_supported)
+            launch_time = sender.txtime_now() + 0.05
+            sender.send_at(msg, launch_time)
+            self.assertGreaterEqual(sender.txtime_now(), launch_time)
+            self.assertIsNotNone(receiver.recv(1.0))
+
     @unittest.skipUnless(IS_LINUX and IS_PYPY, "Only test when run on Linux with PyPy")
     def test_pypy_socketcan_support(self):
         """Wait for PyPy raw CAN socket support
@@ -390,5 +428,121 @@ class SocketCANTest(unittest.TestCase):
                 )
 
 
+class FakeCanSocket:
+    """Returns received frames with the given numbers of dropped frames."""
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+
+    def recvmsg(self, bufsize, ancbufsize, flags=0):
+        if not self.frames:
+            # only non-blocking receives are expected without frames
+            assert flags & socket.MSG_DONTWAIT
+            raise BlockingIOError(11, "Resource temporarily unavailable")
+        msg, dropped = self.frames.pop(0)
+        ancillary_data = [
+            (socket.SOL_SOCKET, SO_TIMESTAMPNS, struct.pack("@ll", 12, 500_000_000))
+        ]
+        if dropped is not None:
+            ancillary_data.append(
+                (socket.SOL_SOCKET, SO_RXQ_OVFL, struct.pack("@I", dropped))
+            )
+        return build_can_frame(msg), ancillary_data, 0, ("vcan0",)
+
+    def close(self):
+        pass
+
+
+class SocketCANReceiveQueueTest(unittest.TestCase):
+    def create_bus(self, sock, **kwargs):
+        # a bus without a CAN socket, which is not available everywhere
+        bus = SocketcanBus.__new__(SocketcanBus)
+        bus.socket = sock
+        bus.channel = "vcan0"
+        bus._is_filtered = False
+        bus._report_rx_drops = kwargs.get("report_rx_drops", False)
+        bus._rx_spin_time = kwargs.get("rx_spin_time", 0.0)
+        bus._rx_drops = _DropCounter()
+        bus._wakeup = _WakeupSocket()
+        self.addCleanup(bus._wakeup.close)
+        return bus
+
+    def test_capture_message_with_drops(self):
+        msg = can.Message(arbitration_id=0x123, data=[1, 2], is_extended_id=False)
+        sock = FakeCanSocket([(msg, None), (msg, 3)])
+        for _ in range(2):
+            received = capture_message(sock)
+            self.assertEqual(received.arbitration_id, 0x123)
+            self.assertAlmostEqual(received.timestamp, 12.5)
+
+    def test_rx_queue_dropped(self):
+        msg = can.Message(arbitration_id=0x1, is_extended_id=False)
+        sock = FakeCanSocket([(msg, None), (msg, 2), (msg, 2), (msg, 5), (msg, 1)])
+        bus = self.create_bus(sock, report_rx_drops=True)
+        with patch(
+            "can.interfaces.socketcan.socketcan.select.select",
+            return_value=([sock], [], []),
+        ):
+            dropped = []
+            for _ in range(3):
+                bus._recv_internal(0)
+                dropped.append(bus.rx_queue_dropped)
+            with self.assertLogs(
+                "can.interfaces.socketcan.socketcan.rx", "WARNING"
+            ) as logs:
+                bus._recv_internal(0)
+            dropped.append(bus.rx_queue_dropped)
+            # the counter of the kernel wrapped around
+            bus._recv_internal(0)
+            dropped.append(bus.rx_queue_dropped)
+        self.assertEqual(dropped, [0, 2, 2, 5, 2**32 + 1])
+        self.assertIn("3 frames were dropped", logs.output[0])
+        self.assertIn("12.5", logs.output[0])
+
+    def test_spin(self):
+        msg = can.Message(arbitration_id=0x1, is_extended_id=False)
+        sock = FakeCanSocket([(msg, None)])
+        bus = self.create_bus(sock, rx_spin_time=0.01)
+        with patch(
+            "can.interfaces.socketcan.socketcan.select.select",
+            return_value=([], [], []),
+        ) as select:
+            received, _ = bus._recv_internal(None)
+            self.assertEqual(received.arbitration_id, 0x1)
+            select.assert_not_called()
+
+            # waits for the remaining timeout after spinning
+            started = time.perf_counter()
+            self.assertEqual(bus._recv_internal(0.5), (None, False))
+            self.assertGreaterEqual(time.perf_counter() - started, 0.01)
+            timeout = select.call_args.args[3]
+            self.assertGreater(timeout, 0.4)
+            self.assertLessEqual(timeout, 0.49)
+
+            # interrupt() stops spinning
+            bus._interrupt_pending = True
+            started = time.perf_counter()
+            bus._recv_internal(None)
+            self.assertLess(time.perf_counter() - started, 0.01)
+            self.assertIsNone(select.call_args.args[3])
+
+    @unittest.skipUnless(IS_LINUX, "SO_RCVBUF is only checked on Linux")
+    def test_receive_buffer_size(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            bus = self.create_bus(sock)
+            _set_receive_buffer_size(sock, 4096)
+            self.assertEqual(bus.receive_buffer_size, 2 * 4096)
+
+    def test_forced_receive_buffer_size(self):
+        sock = Mock()
+        sock.getsockopt.return_value = 2 * 1000
+        _set_receive_buffer_size(sock, 1_000_000)
+        sock.setsockopt.assert_called_with(socket.SOL_SOCKET, SO_RCVBUFFORCE, 1_000_000)
+
+        sock.setsockopt.side_effect = [None, PermissionError(1, "Not permitted")]
+        with self.assertLogs("can.interfaces.socketcan.socketcan", "WARNING"):
+            _set_receive_buffer_size(sock, 1_000_000)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+
+"""
+Tests the BPF programs of :mod:`can.interfaces.socketcan.bpf`.
+
+The programs are attached to a datagram socket of a Unix socket pair, since
+the kernel runs them on any socket and this does not need a CAN interface.
+"""
+
+import socket
+import sys
+import unittest
+from unittest import mock
+
+import can
+from can.interfaces.socketcan import SocketcanBus
+from can.interfaces.socketcan.bpf import (
+    attach_program,
+    compile_filters,
+    detach_program,
+    has_payload_terms,
+)
+from can.interfaces.socketcan.constants import (
+    CAN_RAW_FILTER,
+    SO_ATTACH_FILTER,
+    SO_DETACH_FILTER,
+    SOL_CAN_RAW,
+)
+from can.interfaces.socketcan.socketcan import _set_socket_filters, build_can_frame
+
+FILTERS = [
+    [{"can_id": 0x123, "can_mask": 0x7FF}],
+    [{"can_id": 0x123, "can_mask": 0x7FF, "data": [{"offset": 0, "value": 0x10}]}],
+    [
+        {
+            "can_id": 0x100,
+            "can_mask": 0x700,
+            "extended": False,
+            "data": [
+                {"offset": 1, "mask": 0x0F, "value": 0x02},
+                {"offset": 3, "value": 0xFF},
+            ],
+        },
+        {"can_id": 0x1ABCDEF, "can_mask": 0x1FFFFFFF, "extended": True},
+    ],
+    [{"can_id": 0, "can_mask": 0, "data": [{"offset": 10, "value": 0xAA}]}],
+]
+
+MESSAGES = [
+    can.Message(arbitration_id=0x123, is_extended_id=False, data=[0x10]),
+    can.Message(arbitration_id=0x123, is_extended_id=False, data=[0x11, 0x10]),
+    can.Message(arbitration_id=0x123, is_extended_id=True, data=[0x10]),
+    can.Message(arbitration_id=0x123, is_extended_id=False),
+    can.Message(arbitration_id=0x1ABCDEF, data=[1, 2, 3]),
+    can.Message(arbitration_id=0x1ABCDEE, data=[1, 2, 3]),
+    can.Message(arbitration_id=0x145, is_extended_id=False, data=[0, 0xF2, 0, 0xFF]),
+    can.Message(arbitration_id=0x145, is_extended_id=True, data=[0, 0xF2, 0, 0xFF]),
+    can.Message(arbitration_id=0x245, is_extended_id=False, data=[0, 0xF2, 0, 0xFF]),
+    can.Message(arbitration_id=0x145, is_extended_id=False, data=[0, 0xF3, 0, 0xFF]),
+    can.Message(arbitration_id=0x145, is_extended_id=False, data=[0, 0xF2, 0]),
+    can.Message(arbitration_id=0x145, is_extended_id=False, is_remote_frame=True),
+    can.Message(
+        arbitration_id=0x7FF, is_extended_id=False, is_fd=True, data=[0xAA] * 12
+    ),
+    can.Message(arbitration_id=0x7FF, is_extended_id=False, data=[0xAA] * 8),
+]
+
+
+@unittest.skipUnless(sys.platform == "linux", "SO_ATTACH_FILTER is Linux only")
+class TestCompileFilters(unittest.TestCase):
+    def setUp(self):
+        self.sender, self.receiver = socket.socketpair(
+            socket.AF_UNIX, socket.SOCK_DGRAM
+        )
+        self.receiver.setblocking(False)
+        self.addCleanup(self.sender.close)
+        self.addCleanup(self.receiver.close)
+
+    def passes(self, frame):
+        self.sender.send(frame)
+        try:
+            return self.receiver.recv(100) == frame
+        except BlockingIOError:
+            return False
+
+    def test_same_as_software_filters(self):
+        with can.Bus(interface="virtual", channel="test_socketcan_bpf") as bus:
+            for can_filters in FILTERS:
+                attach_program(self.receiver, compile_filters(can_filters))
+                bus.set_filters(can_filters)
+                for msg in MESSAGES:
+                    with self.subTest(can_filters=can_filters, msg=msg):
+                        self.assertEqual(
+                            self.passes(build_can_frame(msg)),
+                            bus._matches_filters(msg),
+                        )
+
+    def test_error_frames_pass(self):
+        attach_program(self.receiver, compile_filters(FILTERS[1]))
+        msg = can.Message(arbitration_id=0x4, is_error_frame=True, data=bytes(8))
+        self.assertTrue(self.passes(build_can_frame(msg)))
+
+    def test_no_filters(self):
+        attach_program(self.receiver, compile_filters(None))
+        for msg in MESSAGES:
+            self.assertTrue(self.passes(build_can_frame(msg)))
+        attach_program(self.receiver, compile_filters([]))
+        for msg in MESSAGES:
+            self.assertFalse(self.passes(build_can_frame(msg)))
+
+    def test_detach(self):
+        attach_program(self.receiver, compile_filters([]))
+        detach_program(self.receiver)
+        self.assertTrue(self.passes(build_can_frame(MESSAGES[0])))
+        # detaching without a program is fine
+        detach_program(self.receiver)
+
+    def test_invalid_terms(self):
+        for term in (
+            {"offset": 64, "value": 0},
+            {"offset": -1, "value": 0},
+            {"offset": 0, "value": 0x100},
+            {"offset": 0, "mask": 0x100, "value": 0},
+        ):
+            with self.subTest(term=term), self.assertRaises(ValueError):
+                compile_filters([{"can_id": 0, "can_mask": 0, "data": [term]}])
+        with self.assertRaises(ValueError):
+            compile_filters(
+                [
+                    {
+                        "can_id": 0,
+                        "can_mask": 0,
+                        "data": [{"offset": i % 64, "value": 0} for i in range(200)],
+                    }
+                ]
+            )
+
+    def test_has_payload_terms(self):
+        self.assertFalse(has_payload_terms(None))
+        self.assertFalse(has_payload_terms(FILTERS[0]))
+        self.assertFalse(has_payload_terms([{"can_id": 0, "can_mask": 0, "data": []}]))
+        self.assertTrue(has_payload_terms(FILTERS[2]))
+
+
+class TestSetSocketFilters(unittest.TestCase):
+    def test_payload_terms(self):
+        sock = mock.Mock()
+        _set_socket_filters(sock, FILTERS[1])
+        self.assertEqual(
+            [call.args[:2] for call in sock.setsockopt.call_args_list],
+            [(socket.SOL_SOCKET, SO_ATTACH_FILTER), (SOL_CAN_RAW, CAN_RAW_FILTER)],
+        )
+
+    def test_id_filters(self):
+        sock = mock.Mock()
+        sock.setsockopt.side_effect = [None, FileNotFoundError(2, "No such file")]
+        _set_socket_filters(sock, FILTERS[0])
+        self.assertEqual(
+            [call.args[:2] for call in sock.setsockopt.call_args_list],
+            [(SOL_CAN_RAW, CAN_RAW_FILTER), (socket.SOL_SOCKET, SO_DETACH_FILTER)],
+        )
+
+    def test_software_filtering(self):
+        # a bus without a CAN socket, which is not available everywhere
+        bus = SocketcanBus.__new__(SocketcanBus)
+        bus.socket = mock.Mock()
+        bus.set_filters(FILTERS[1])
+        self.assertTrue(bus._is_filtered)
+        # the kernel only checks the ID of these filters
+        bus.set_filters([{"can_id": 0x123, "can_mask": 0x7FF, "max_dlc": 4}])
+        self.assertFalse(bus._is_filtered)
+        bus.socket.setsockopt.side_effect = OSError(22, "Invalid argument")
+        bus.set_filters(FILTERS[1])
+        self.assertFalse(bus._is_filtered)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+
+"""
+Tests the netlink helpers and the CAN gateway of the SocketCAN interface.
+"""
+
+import errno
+import unittest
+from unittest import mock
+
+import can
+from can.interfaces.socketcan import gateway, netlink
+from can.interfaces.socketcan.gateway import (
+    GatewayCounters,
+    GatewayModification,
+    GatewayRule,
+    KernelGateway,
+)
+
+from .config import IS_LINUX
+
+INTERFACES = {"vcan0": 3, "vcan1": 4}
+
+
+def if_nametoindex(name):
+    try:
+        return INTERFACES[name]
+    except KeyError:
+        raise OSError(errno.ENODEV, "No such device") from None
+
+
+class FakeNetlinkSocket:
+    """Records the requests and keeps the rules like the kernel."""
+
+    def __init__(self):
+        self.requests = []
+        self.rules = []
+        self.error = None
+
+    def __call__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def request(self, msg_type, payload, flags=0):
+        self.requests.append((msg_type, payload, flags))
+        if self.error is not None:
+            raise OSError(self.error, "error")
+        if msg_type == gateway.RTM_NEWROUTE:
+            self.rules.append(payload)
+        elif msg_type == gateway.RTM_DELROUTE:
+            if payload not in self.rules:
+                raise OSError(errno.EINVAL, "Invalid argument")
+            self.rules.remove(payload)
+        elif msg_type == gateway.RTM_GETROUTE:
+            replies = [(msg_type, b"\x02\x00\x00\x00")]  # an IPv4 route
+            for payload in self.rules:
+                counters = netlink.pack_attr(
+                    gateway.CGW_HANDLED, (42).to_bytes(4, "little")
+                )
+                replies.append((gateway.RTM_NEWROUTE, payload + counters))
+            return replies
+        return []
+
+
+class GatewayTestCase(unittest.TestCase):
+    def setUp(self):
+        self.netlink = FakeNetlinkSocket()
+        for target, replacement in (
+            ("can.interfaces.socketcan.gateway.NetlinkSocket", self.netlink),
+            ("socket.if_nametoindex", if_nametoindex),
+            (
+                "socket.if_indextoname",
+                {index: name for name, index in INTERFACES.items()}.__getitem__,
+            ),
+        ):
+            patcher = mock.patch(target, replacement, create=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class TestNetlink(unittest.TestCase):
+    def test_attributes(self):
+        data = netlink.pack_attr(1, b"\x01\x02\x03") + netlink.pack_attr(
+            2 | netlink.NLA_F_NESTED, b""
+        )
+        self.assertEqual(len(data), 12)
+        self.assertEqual(
+            list(netlink.iter_attrs(data)), [(1, b"\x01\x02\x03"), (2, b"")]
+        )
+        self.assertEqual(netlink.unpack_attrs(data)[1], b"\x01\x02\x03")
+
+    @unittest.skipUnless(IS_LINUX, "netlink is only available on Linux")
+    def test_request(self):
+        ifinfomsg = bytes(16)
+        with netlink.NetlinkSocket() as sock:
+            # RTM_GETLINK: the loopback interface exists everywhere
+            self.assertTrue(sock.request(18, ifinfomsg, netlink.NLM_F_DUMP))
+            with self.assertRaises(OSError) as context:
+                sock.request(18, ifinfomsg[:4] + b"\xff\xff\xff\x7f" + bytes(8))
+            self.assertEqual(context.exception.errno, errno.ENODEV)
+
+
+class TestGatewayRules(GatewayTestCase):
+    def test_add_and_remove(self):
+        rule = GatewayRule("vcan0", "vcan1", echo=True, hop_limit=2)
+        gateway.add_gateway_rule(rule)
+        msg_type, payload, flags = self.netlink.requests[-1]
+        self.assertEqual(msg_type, gateway.RTM_NEWROUTE)
+        self.assertTrue(flags & netlink.NLM_F_CREATE)
+        self.assertEqual(
+            payload[:4], bytes([can.interfaces.socketcan.constants.AF_CAN, 1, 1, 0])
+        )
+        attrs = netlink.unpack_attrs(payload[4:])
+        self.assertEqual(attrs[gateway.CGW_SRC_IF], (3).to_bytes(4, "little"))
+        self.assertEqual(attrs[gateway.CGW_DST_IF], (4).to_bytes(4, "little"))
+        self.assertEqual(attrs[gateway.CGW_LIM_HOPS], b"\x02")
+        self.assertNotIn(gateway.CGW_FILTER, attrs)
+
+        self.assertEqual(gateway.list_gateway_rules(), [(rule, GatewayCounters(42))])
+
+        gateway.remove_gateway_rule(rule)
+        self.assertEqual(self.netlink.requests[-1][0], gateway.RTM_DELROUTE)
+        self.assertEqual(gateway.list_gateway_rules(), [])
+
+    def test_normalize(self):
+        rule = GatewayRule(
+            "vcan0",
+            "vcan1",
+            can_filter={"can_id": 0x123, "can_mask": 0x7FF, "extended": False},
+            modifications=(
+                GatewayModification("and", arbitration_id=0x7F0),
+                GatewayModification("set", dlc=2, data=b"\x01\x02"),
+            ),
+        )
+        normalized = gateway.normalize_gateway_rule(rule)
+        self.assertEqual(
+            normalized.can_filter, {"can_id": 0x123, "can_mask": 0x800007FF}
+        )
+        self.assertEqual(
+            normalized.modifications,
+            (
+                GatewayModification("and", arbitration_id=0x7F0),
+                GatewayModification("set", dlc=2, data=b"\x01\x02" + bytes(6)),
+            ),
+        )
+        self.assertEqual(gateway.normalize_gateway_rule(normalized), normalized)
+
+    def test_fd_modifications(self):
+        rule = GatewayRule(
+            "vcan0",
+            "vcan1",
+            fd=True,
+            modifications=(GatewayModification("xor", data=b"\xff"),),
+        )
+        gateway.add_gateway_rule(rule)
+        attrs = netlink.unpack_attrs(self.netlink.requests[-1][1][4:])
+        self.assertEqual(len(attrs[gateway.CGW_FDMOD_XOR]), 73)
+        self.assertNotIn(gateway.CGW_MOD_XOR, attrs)
+        ((listed, _),) = gateway.list_gateway_rules()
+        self.assertEqual(listed.modifications[0].data, b"\xff" + bytes(63))
+
+    def test_invalid_modifications(self):
+        for modifications in (
+            (GatewayModification("nand", dlc=1),),
+            (GatewayModification("or"),),
+            (GatewayModification("or", dlc=1), GatewayModification("or", dlc=2)),
+        ):
+            with self.subTest(modifications=modifications):
+                with self.assertRaises(ValueError):
+                    gateway.add_gateway_rule(
+                        GatewayRule("vcan0", "vcan1", modifications=modifications)
+                    )
+        self.assertEqual(self.netlink.requests, [])
+
+    def test_kernel_error(self):
+        self.netlink.error = errno.EPERM
+        with self.assertRaises(can.CanOperationError) as context:
+            gateway.add_gateway_rule(GatewayRule("vcan0", "vcan1"))
+        self.assertEqual(context.exception.error_code, errno.EPERM)
+
+
+class TestKernelGateway(GatewayTestCase):
+    def test_rules_are_removed(self):
+        rules = [
+            GatewayRule("vcan0", "vcan1", {"can_id": 0x100, "can_mask": 0x700}),
+            GatewayRule("vcan1", "vcan0"),
+        ]
+        with KernelGateway(rules) as kernel_gateway:
+            self.assertEqual(len(self.netlink.rules), 2)
+            self.assertEqual(
+                kernel_gateway.counters(),
+                [(rule, GatewayCounters(42)) for rule in rules],
+            )
+        self.assertEqual(self.netlink.rules, [])
+
+    def test_failed_rule(self):
+        kernel_gateway = KernelGateway([GatewayRule("vcan0", "vcan1")])
+        self.netlink.rules.clear()
+        # the rules before a rejected one are removed again
+        with self.assertRaises(can.CanOperationError):
+            KernelGateway([GatewayRule("vcan0", "vcan1"), GatewayRule("vcan0", "can9")])
+        self.assertEqual(self.netlink.rules, [])
+        # rules that were removed by the kernel are ignored
+        kernel_gateway.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,14 +4,39 @@
 Tests helpers in `can.interfaces.socketcan.socketcan_common`.
 """
 
+import errno
+import struct
 import unittest
-from pathlib import Path
 from unittest import mock
 
-from can.interfaces.socketcan.utils import error_code_to_str, find_available_interfaces
+from can.interfaces.socketcan.netlink import NLM_F_DUMP, pack_attr
+from can.interfaces.socketcan.utils import (
+    ARPHRD_CAN,
+    IFF_UP,
+    RTM_DELLINK,
+    RTM_GETLINK,
+    RTM_NEWLINK,
+    RTMGRP_LINK,
+    CanInterfaceInfo,
+    LinkMonitor,
+    error_code_to_str,
+    find_available_interfaces,
+    list_can_interfaces,
+)
 
 from .config import IS_LINUX, TEST_INTERFACE_SOCKETCAN
 
+# the numbers of the netlink attributes in the kernel headers, written out
+# to check the constants of the module
+IFLA_IFNAME = 3  # linux/if_link.h
+IFLA_LINKINFO = 18
+IFLA_INFO_KIND = 1
+IFLA_INFO_DATA = 2
+IFLA_CAN_BITTIMING = 1  # linux/can/netlink.h
+IFLA_CAN_STATE = 4
+IFLA_CAN_BERR_COUNTER = 8
+IFLA_CAN_DATA_BITTIMING = 9
+
 
 class TestSocketCanHelpers(unittest.TestCase):
     @unittest.skipUnless(IS_LINUX, "socketcan is only available on Linux")
@@ -40,26 +65,155 @@ class TestSocketCanHelpers(unittest.TestCase):
         self.assertIn("slcan0", result)
 
     def test_find_available_interfaces_w_patch(self):
-        # Contains lo, eth0, wlan0, vcan0, mycustomCan123
-        ip_output = (Path(__file__).parent / "data" / "ip_link_list.json").read_text()
-
-        with mock.patch("subprocess.check_output") as check_output:
-            check_output.return_value = ip_output
-
-            with mock.patch("sys.platform", "linux"):
-                ifs = find_available_interfaces()
-
-        self.assertEqual(["vcan0", "mycustomCan123"], ifs)
+        links = [
+            _link(1, "lo", link_type=772),
+            _link(2, "vcan0", kind="vcan"),
+            _link(3, "can0", kind="can", state=3, bitrate=500_000),
+            _link(4, "can1", kind="can", up=False, bitrate=500_000),
+            _link(5, "mycustomCan123"),
+        ]
+        with (
+            mock.patch(
+                "can.interfaces.socketcan.utils.NetlinkSocket",
+                return_value=FakeNetlinkSocket(links),
+            ),
+            mock.patch("sys.platform", "linux"),
+        ):
+            ifs = find_available_interfaces()
+
+        self.assertEqual(["vcan0", "can0", "mycustomCan123"], ifs)
+
+    def test_list_can_interfaces(self):
+        links = [
+            _link(2, "vcan0", kind="vcan"),
+            _link(3, "can0", kind="can", state=3, bitrate=500_000),
+            _link(
+                4, "can1", kind="can", up=False, bitrate=500_000, data_bitrate=2_000_000
+            ),
+        ]
+        with mock.patch(
+            "can.interfaces.socketcan.utils.NetlinkSocket",
+            return_value=FakeNetlinkSocket(links),
+        ):
+            result = list_can_interfaces()
+
+        self.assertEqual(
+            [
+                CanInterfaceInfo("vcan0", 2, "vcan", True, None, None, None),
+                CanInterfaceInfo("can0", 3, "can", True, "BUS-OFF", 500_000, None),
+                CanInterfaceInfo(
+                    "can1", 4, "can", False, "ERROR-ACTIVE", 500_000, 2_000_000
+                ),
+            ],
+            result,
+        )
+
+    @unittest.skipUnless(IS_LINUX, "netlink is only available on Linux")
+    def test_list_can_interfaces_of_kernel(self):
+        for interface in list_can_interfaces():
+            self.assertIsInstance(interface, CanInterfaceInfo)
 
     def test_find_available_interfaces_exception(self):
-        with mock.patch("subprocess.check_output") as check_output:
-            check_output.return_value = "<h1>Not JSON</h1>"
+        with mock.patch(
+            "can.interfaces.socketcan.utils.NetlinkSocket",
+            side_effect=OSError(errno.EPROTONOSUPPORT, "Protocol not supported"),
+        ):
             result = find_available_interfaces()
             self.assertEqual([], result)
 
-            check_output.side_effect = Exception("Something went wrong :-/")
-            result = find_available_interfaces()
-            self.assertEqual([], result)
+    def test_link_monitor(self):
+        sock = FakeNetlinkSocket([])
+        sock.notifications = [
+            (RTM_NEWLINK, _link(2, "vcan0", kind="vcan")),
+            (RTM_NEWLINK, _link(4, "eth0", link_type=1)),
+            (RTM_DELLINK, _link(3, "can0", kind="can", up=False, bitrate=500_000)),
+        ]
+        with (
+            mock.patch(
+                "can.interfaces.socketcan.utils.NetlinkSocket", return_value=sock
+            ) as netlink_socket,
+            LinkMonitor() as monitor,
+        ):
+            self.assertEqual(
+                [
+                    (
+                        True,
+                        CanInterfaceInfo("vcan0", 2, "vcan", True, None, None, None),
+                    ),
+                    (
+                        False,
+                        CanInterfaceInfo(
+                            "can0", 3, "can", False, "ERROR-ACTIVE", 500_000, None
+                        ),
+                    ),
+                ],
+                monitor.read(),
+            )
+            self.assertEqual([], monitor.read())
+        netlink_socket.assert_called_once_with(groups=RTMGRP_LINK)
+
+    @unittest.skipUnless(IS_LINUX, "netlink is only available on Linux")
+    def test_link_monitor_of_kernel(self):
+        with LinkMonitor() as monitor:
+            self.assertEqual([], monitor.read())
+
+
+class FakeNetlinkSocket:
+    def __init__(self, links):
+        self.links = links
+        self.notifications = []
+
+    def request(self, msg_type, payload, flags=0):
+        assert msg_type == RTM_GETLINK
+        assert flags & NLM_F_DUMP == NLM_F_DUMP
+        return [(RTM_NEWLINK, link) for link in self.links]
+
+    def receive(self):
+        notifications, self.notifications = self.notifications, []
+        return notifications
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+def _link(
+    index,
+    name,
+    link_type=ARPHRD_CAN,
+    up=True,
+    kind=None,
+    state=None,
+    bitrate=None,
+    data_bitrate=None,
+):
+    """Encode the RTM_NEWLINK message of a network interface."""
+    can_attrs = b""
+    if kind == "can":
+        can_attrs += pack_attr(IFLA_CAN_STATE, struct.pack("=I", state or 0))
+        can_attrs += pack_attr(
+            IFLA_CAN_BITTIMING, struct.pack("=8I", bitrate, *[0] * 7)
+        )
+        # must not be mistaken for the data bit timing
+        can_attrs += pack_attr(IFLA_CAN_BERR_COUNTER, struct.pack("=HH", 5, 7))
+        if data_bitrate:
+            can_attrs += pack_attr(
+                IFLA_CAN_DATA_BITTIMING, struct.pack("=8I", data_bitrate, *[0] * 7)
+            )
+    link_info = b""
+    if kind:
+        link_info += pack_attr(IFLA_INFO_KIND, kind.encode() + b"\0")
+        link_info += pack_attr(IFLA_INFO_DATA, can_attrs)
+    return (
+        struct.pack("=BxHiII", 0, link_type, index, IFF_UP if up else 0, 0)
+        + pack_attr(IFLA_IFNAME, name.encode() + b"\0")
+        + (pack_attr(IFLA_LINKINFO, link_info) if link_info else b"")
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+
+"""
+Tests the ISO-TP channels of :mod:`can.interfaces.socketcan.isotp`.
+
+Without ISO-TP support in the kernel, a Unix datagram socket stands in for
+the ISO-TP socket, since both transfer whole PDUs.
+"""
+
+import asyncio
+import errno
+import socket
+import unittest
+from unittest import mock
+
+import can
+from can.interfaces.socketcan import constants
+from can.interfaces.socketcan.isotp import (
+    IsoTpChannel,
+    IsoTpFlowControl,
+    IsoTpLinkLayer,
+    IsoTpOptions,
+    setup_isotp_socket,
+)
+
+from .config import TEST_INTERFACE_SOCKETCAN
+
+
+class TestSetupIsoTpSocket(unittest.TestCase):
+    def test_options(self):
+        sock = mock.Mock()
+        setup_isotp_socket(
+            sock,
+            "vcan0",
+            0x7E8,
+            0x7E0,
+            IsoTpOptions(flags=constants.CAN_ISOTP_TX_PADDING, txpad_content=0xAA),
+            IsoTpFlowControl(bs=8, stmin=5),
+            IsoTpLinkLayer(mtu=constants.CANFD_MTU, tx_dl=64),
+            tx_stmin=0.001,
+        )
+        options = {
+            call.args[1]: call.args[2]
+            for call in sock.setsockopt.call_args_list
+            if call.args[0] == constants.SOL_CAN_ISOTP
+        }
+        self.assertEqual(
+            options,
+            {
+                constants.CAN_ISOTP_TX_STMIN: (1_000_000).to_bytes(4, "little"),
+                constants.CAN_ISOTP_OPTS: bytes(
+                    [0x84, 0, 0, 0, 0, 0, 0, 0, 0, 0xAA, 0xCC, 0]
+                ),
+                constants.CAN_ISOTP_RECV_FC: bytes([8, 5, 0]),
+                constants.CAN_ISOTP_LL_OPTS: bytes([72, 64, 0]),
+            },
+        )
+        sock.bind.assert_called_once_with(("vcan0", 0x7E8, 0x7E0))
+
+
+class TestIsoTpChannel(unittest.TestCase):
+    def setUp(self):
+        self.peer, isotp_socket = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.addCleanup(self.peer.close)
+        self.addCleanup(isotp_socket.close)
+        for name, kwargs in (
+            ("create_isotp_socket", {"return_value": isotp_socket}),
+            ("setup_isotp_socket", {}),
+        ):
+            patcher = mock.patch(f"can.interfaces.socketcan.isotp.{name}", **kwargs)
+            setattr(self, name, patcher.start())
+            self.addCleanup(patcher.stop)
+
+    def test_send_and_recv(self):
+        with IsoTpChannel(
+            "vcan0", 0x1ABCDEF, 0x1ABCDEE, is_extended_id=True
+        ) as channel:
+            args = self.setup_isotp_socket.call_args.args
+            self.assertEqual(args[2:4], (0x81ABCDEF, 0x81ABCDEE))
+            self.assertEqual(channel.rx_id, 0x1ABCDEF)
+
+            pdu = bytes(range(256)) * 16
+            channel.send(pdu)
+            self.assertEqual(self.peer.recv(10000), pdu)
+            self.peer.send(pdu)
+            self.assertEqual(channel.recv(1), pdu)
+            self.assertIsNone(channel.recv(0))
+            self.assertIsNone(channel.recv(0.01))
+
+    def test_send_timeout(self):
+        with IsoTpChannel("vcan0", 1, 2) as channel:
+            with self.assertRaises(can.CanTimeoutError):
+                # until the queue of the peer is full
+                for _ in range(10000):
+                    channel.send(bytes(1000), timeout=0.01)
+
+    def test_async(self):
+        async def transfer(channel):
+            self.assertIsNone(await channel.recv_async(0.01))
+            self.peer.send(b"\x62\xf1\x90")
+            received = await channel.recv_async(1)
+            await channel.send_async(b"\x22\xf1\x90")
+            return received
+
+        with IsoTpChannel("vcan0", 1, 2) as channel:
+            self.assertEqual(asyncio.run(transfer(channel)), b"\x62\xf1\x90")
+        self.assertEqual(self.peer.recv(100), b"\x22\xf1\x90")
+
+    def test_errors(self):
+        self.create_isotp_socket.side_effect = OSError(errno.EPROTONOSUPPORT, "No")
+        with self.assertRaises(can.CanInterfaceNotImplementedError):
+            IsoTpChannel("vcan0", 1, 2)
+
+        sock = mock.Mock()
+        self.create_isotp_socket.side_effect = None
+        self.create_isotp_socket.return_value = sock
+        self.setup_isotp_socket.side_effect = OSError(errno.ENODEV, "No such device")
+        with self.assertRaises(can.CanInitializationError) as context:
+            IsoTpChannel("vcan9", 1, 2)
+        self.assertEqual(context.exception.error_code, errno.ENODEV)
+        sock.close.assert_called_once_with()
+
+        self.setup_isotp_socket.side_effect = None
+        sock.recv_into.side_effect = OSError(errno.ECOMM, "Communication error")
+        with self.assertRaises(can.CanOperationError):
+            IsoTpChannel("vcan0", 1, 2).recv(0)
+
+
+@unittest.skipUnless(TEST_INTERFACE_SOCKETCAN, "Only run when vcan0 is available")
+class TestIsoTpChannelOnVcan(unittest.TestCase):
+    def test_transfer(self):
+        try:
+            client = IsoTpChannel("vcan0", 0x7E8, 0x7E0)
+        except can.CanInterfaceNotImplementedError as error:
+            self.skipTest(str(error))
+        with client, IsoTpChannel("vcan0", 0x7E0, 0x7E8) as server:
+            pdu = bytes(range(256)) * 16
+            client.send(pdu)
+            self.assertEqual(server.recv(5), pdu)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+
+"""
+Tests the sharded receive of :class:`can.interfaces.socketcan.SocketcanBus`.
+"""
+
+import socket
+import time
+import unittest
+from unittest import mock
+
+import can
+from can.interfaces.socketcan import SocketcanBus
+from can.interfaces.socketcan.sharding import ShardedReceiver, partition_filters
+from can.interfaces.socketcan.socketcan import _DropCounter
+
+from .config import TEST_INTERFACE_SOCKETCAN
+
+
+class FakeSocket:
+    """Becomes readable when a message is pushed."""
+
+    def __init__(self):
+        self._reader, self._writer = socket.socketpair()
+        self.messages = []
+        self.options = {}
+
+    def push(self, msg):
+        self.messages.append(msg)
+        self._writer.send(b"\0")
+
+    def setsockopt(self, level, option, value):
+        self.options[level, option] = value
+
+    def fileno(self):
+        return self._reader.fileno()
+
+    def close(self):
+        self._reader.close()
+        self._writer.close()
+
+
+class FakeBus:
+    def __init__(self):
+        self.socket = FakeSocket()
+        self.channel = "vcan0"
+        self._rx_drops = _DropCounter()
+        self.error = None
+
+    def _receive_from(self, sock, drops):
+        if self.error is not None:
+            raise self.error
+        sock._reader.recv(1)
+        return sock.messages.pop(0)
+
+
+class TestPartitionFilters(unittest.TestCase):
+    def test_all_frames(self):
+        self.assertEqual(
+            partition_filters(None, 2),
+            [[{"can_id": 0, "can_mask": 1}], [{"can_id": 1, "can_mask": 1}]],
+        )
+        self.assertEqual(partition_filters(None, 1), [[{"can_id": 0, "can_mask": 0}]])
+
+    def test_filters(self):
+        can_filters = [
+            {"can_id": 0x100, "can_mask": 0x700, "extended": False},
+            {"can_id": 0x123, "can_mask": 0x7FF},
+        ]
+        self.assertEqual(
+            partition_filters(can_filters, 4),
+            [
+                [{"can_id": 0x100, "can_mask": 0x703, "extended": False}],
+                [{"can_id": 0x101, "can_mask": 0x703, "extended": False}],
+                [{"can_id": 0x102, "can_mask": 0x703, "extended": False}],
+                [
+                    {"can_id": 0x103, "can_mask": 0x703, "extended": False},
+                    {"can_id": 0x123, "can_mask": 0x7FF},
+                ],
+            ],
+        )
+
+    def test_payload_terms(self):
+        data = [{"offset": 0, "value": 0x22}]
+        self.assertEqual(
+            partition_filters([{"can_id": 0x7E8, "can_mask": 0x7FF, "data": data}], 2),
+            [[{"can_id": 0x7E8, "can_mask": 0x7FF, "data": data}], []],
+        )
+
+    def test_disjoint(self):
+        for can_id in range(64):
+            for shard, partition in enumerate(partition_filters(None, 8)):
+                matches = any(
+                    (can_id ^ f["can_id"]) & f["can_mask"] == 0 for f in partition
+                )
+                self.assertEqual(matches, can_id % 8 == shard)
+
+
+class TestShardedReceiver(unittest.TestCase):
+    def setUp(self):
+        self.bus = FakeBus()
+        self.sockets = [self.bus.socket]
+
+        def create_socket():
+            self.sockets.append(FakeSocket())
+            return self.sockets[-1]
+
+        for name, kwargs in (
+            ("create_socket", {"side_effect": create_socket}),
+            ("_setup_socket", {}),
+            ("bind_socket", {}),
+        ):
+            patcher = mock.patch(f"can.interfaces.socketcan.sharding.{name}", **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def create_receiver(self, merge_delay=0.0):
+        receiver = ShardedReceiver(self.bus, 4, merge_delay, fd=False)
+        receiver.apply_filters(None)
+        receiver.start()
+        self.addCleanup(self.sockets[0].close)
+        self.addCleanup(receiver.stop)
+        return receiver
+
+    def test_merge_by_timestamp(self):
+        receiver = self.create_receiver(merge_delay=0.2)
+        self.sockets[1].push(can.Message(timestamp=2.0, arbitration_id=1))
+        self.sockets[1].push(can.Message(timestamp=3.0, arbitration_id=5))
+        time.sleep(0.05)
+        self.sockets[2].push(can.Message(timestamp=1.0, arbitration_id=2))
+        self.assertEqual([receiver.get(5).timestamp for _ in range(3)], [1.0, 2.0, 3.0])
+        self.assertIsNone(receiver.get(0.01))
+
+        statistics = receiver.statistics()
+        self.assertEqual([s.messages_received for s in statistics], [0, 2, 1, 0])
+        self.assertEqual(statistics[3].can_filters, [{"can_id": 3, "can_mask": 3}])
+        self.assertEqual(statistics[0].rx_queue_dropped, 0)
+
+    def test_socket_for(self):
+        receiver = self.create_receiver()
+        for can_id in (0x4, 0x5, 0x1FFFFFFE | 0x80000000, 0x7):
+            frame = (can_id).to_bytes(4, "little") + bytes(12)
+            self.assertIs(receiver.socket_for(frame), self.sockets[can_id & 3])
+
+    def test_wake(self):
+        receiver = self.create_receiver()
+        receiver.wake()
+        started = time.monotonic()
+        self.assertIsNone(receiver.get(None))
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_error(self):
+        receiver = self.create_receiver()
+        self.bus.error = can.CanOperationError("Network is down")
+        self.sockets[3].push(can.Message())
+        with self.assertRaises(can.CanOperationError):
+            receiver.get(5)
+
+    def test_shards_must_be_power_of_two(self):
+        with self.assertRaises(ValueError):
+            SocketcanBus("vcan0", rx_shards=3)
+
+
+@unittest.skipUnless(TEST_INTERFACE_SOCKETCAN, "Only run when vcan0 is available")
+class TestShardedSocketcanBus(unittest.TestCase):
+    def test_receive(self):
+        with (
+            can.Bus(interface="socketcan", channel="vcan0", rx_shards=4) as receiver,
+            can.Bus(interface="socketcan", channel="vcan0") as sender,
+        ):
+            for can_id in range(16):
+                sender.send(can.Message(arbitration_id=can_id, is_extended_id=False))
+            received = [receiver.recv(1) for _ in range(16)]
+            self.assertEqual([msg.arbitration_id for msg in received], list(range(16)))
+            self.assertEqual(
+                [s.messages_received for s in receiver.shard_statistics()], [4] * 4
+            )
+
+    def test_send(self):
+        with (
+            can.Bus(
+                interface="socketcan",
+                channel="vcan0",
+                rx_shards=2,
+                receive_own_messages=True,
+            ) as bus,
+            can.Bus(interface="socketcan", channel="vcan0") as other,
+        ):
+            for can_id in range(4):
+                bus.send(can.Message(arbitration_id=can_id, is_extended_id=False))
+            # every frame is received once by the bus
+            received = [bus.recv(1).arbitration_id for _ in range(4)]
+            self.assertEqual(sorted(received), list(range(4)))
+            self.assertIsNone(bus.recv(0.1))
+            self.assertEqual(other.recv(1).arbitration_id, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
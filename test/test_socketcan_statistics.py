@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+
+"""
+Tests the statistics of SocketCAN devices in
+:mod:`can.interfaces.socketcan.statistics`.
+"""
+
+import errno
+import struct
+import threading
+import unittest
+from unittest import mock
+
+import can
+from can.interfaces.socketcan import SocketcanBus
+from can.interfaces.socketcan.netlink import pack_attr
+from can.interfaces.socketcan.statistics import (
+    DeviceStatistics,
+    DeviceStatisticsSampler,
+    get_device_statistics,
+)
+from can.interfaces.socketcan.utils import RTM_GETLINK, RTM_NEWLINK
+
+from .config import IS_LINUX
+
+# the numbers of the netlink attributes in the kernel headers, written out
+# to check the constants of the module
+IFLA_IFNAME = 3  # linux/if_link.h
+IFLA_LINKINFO = 18
+IFLA_STATS64 = 23
+IFLA_INFO_KIND = 1
+IFLA_INFO_DATA = 2
+IFLA_INFO_XSTATS = 3
+IFLA_CAN_STATE = 4  # linux/can/netlink.h
+IFLA_CAN_BERR_COUNTER = 8
+
+
+def _link(name, can_counters=True):
+    """Encode the RTM_NEWLINK message of a CAN device with statistics."""
+    stats64 = struct.pack("=24Q", *range(1, 25))
+    link_info = pack_attr(IFLA_INFO_KIND, b"can\0")
+    if can_counters:
+        link_info += pack_attr(
+            IFLA_INFO_DATA,
+            pack_attr(IFLA_CAN_STATE, struct.pack("=I", 2))
+            + pack_attr(IFLA_CAN_BERR_COUNTER, struct.pack("=HH", 128, 7)),
+        )
+        link_info += pack_attr(IFLA_INFO_XSTATS, struct.pack("=6I", 10, 3, 2, 1, 5, 1))
+    return (
+        struct.pack("=BxHiII", 0, 280, 3, 1, 0)
+        + pack_attr(IFLA_IFNAME, name.encode() + b"\0")
+        + pack_attr(IFLA_STATS64, stats64)
+        + pack_attr(IFLA_LINKINFO, link_info)
+    )
+
+
+class FakeNetlinkSocket:
+    def __init__(self, links):
+        self.links = links
+        self.requests = []
+
+    def request(self, msg_type, payload, flags=0):
+        assert msg_type == RTM_GETLINK
+        self.requests.append(payload)
+        for name, link in self.links.items():
+            if pack_attr(IFLA_IFNAME, name.encode() + b"\0") in payload:
+                return [(RTM_NEWLINK, link)]
+        raise OSError(errno.ENODEV, "No such device")
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class TestDeviceStatistics(unittest.TestCase):
+    def setUp(self):
+        self.sock = FakeNetlinkSocket(
+            {"can0": _link("can0"), "vcan0": _link("vcan0", False)}
+        )
+        patcher = mock.patch(
+            "can.interfaces.socketcan.statistics.NetlinkSocket", return_value=self.sock
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_can_device(self):
+        statistics = get_device_statistics("can0")
+        self.assertEqual(
+            statistics._replace(timestamp=0),
+            DeviceStatistics(
+                timestamp=0,
+                channel="can0",
+                rx_packets=1,
+                tx_packets=2,
+                rx_bytes=3,
+                tx_bytes=4,
+                rx_errors=5,
+                tx_errors=6,
+                rx_dropped=7,
+                tx_dropped=8,
+                rx_over_errors=12,
+                state="ERROR-PASSIVE",
+                tx_error_counter=128,
+                rx_error_counter=7,
+                bus_error=10,
+                error_warning=3,
+                error_passive=2,
+                bus_off=1,
+                arbitration_lost=5,
+                restarts=1,
+            ),
+        )
+        self.assertGreater(statistics.timestamp, 0)
+
+    def test_virtual_device(self):
+        statistics = get_device_statistics("vcan0")
+        self.assertEqual(statistics.rx_dropped, 7)
+        self.assertIsNone(statistics.state)
+        self.assertIsNone(statistics.tx_error_counter)
+        self.assertIsNone(statistics.bus_off)
+
+    def test_unknown_device(self):
+        with self.assertRaises(can.CanOperationError) as context:
+            get_device_statistics("can9")
+        self.assertEqual(context.exception.error_code, errno.ENODEV)
+
+    def test_bus(self):
+        bus = SocketcanBus.__new__(SocketcanBus)
+        bus.channel = "can0"
+        self.assertEqual(bus.device_statistics().bus_off, 1)
+
+        bus.channel = ""
+        with self.assertRaises(can.CanOperationError):
+            bus.device_statistics()
+
+    def test_sampler(self):
+        samples = []
+        sampled = threading.Event()
+
+        def callback(statistics):
+            samples.append(statistics)
+            if len(samples) == 2:
+                sampled.set()
+
+        with DeviceStatisticsSampler(
+            "can0", interval=0.01, callback=callback
+        ) as sampler:
+            self.assertEqual(sampler.latest.channel, "can0")
+            self.assertTrue(sampled.wait(5))
+        self.assertEqual(samples[0].rx_over_errors, 12)
+        # the socket is reused for every reading
+        self.assertGreaterEqual(len(self.sock.requests), 3)
+
+        with self.assertRaises(can.CanOperationError):
+            DeviceStatisticsSampler("can9")
+
+    @unittest.skipUnless(IS_LINUX, "netlink is only available on Linux")
+    def test_kernel(self):
+        with mock.patch(
+            "can.interfaces.socketcan.statistics.NetlinkSocket",
+            can.interfaces.socketcan.netlink.NetlinkSocket,
+        ):
+            statistics = get_device_statistics("lo")
+        self.assertEqual(statistics.channel, "lo")
+        self.assertIsNone(statistics.state)
+
+
+if __name__ == "__main__":
+    unittest.main()
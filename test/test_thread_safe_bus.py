@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+
+"""
+This module tests the TX worker mode of :class:`can.ThreadSafeBus`.
+"""
+
+import threading
+import time
+import unittest
+from concurrent.futures import wait
+from unittest.mock import Mock
+
+import can
+
+
+class TestThreadSafeBusTxWorker(unittest.TestCase):
+    def setUp(self):
+        self.bus = can.ThreadSafeBus(
+            interface="virtual", channel="tx_worker", tx_worker=True
+        )
+        self.receiver = can.Bus(interface="virtual", channel="tx_worker")
+
+    def tearDown(self):
+        self.bus.shutdown()
+        self.receiver.shutdown()
+
+    def test_send_returns_future(self):
+        future = self.bus.send(can.Message(arbitration_id=1))
+        self.assertIsNone(future.result(timeout=5))
+        self.assertEqual(self.receiver.recv(1).arbitration_id, 1)
+
+    def test_order_per_producer(self):
+        def produce(producer):
+            futures = [
+                self.bus.send(can.Message(arbitration_id=producer, data=[index]))
+                for index in range(100)
+            ]
+            wait(futures, timeout=5)
+
+        threads = [
+            threading.Thread(target=produce, args=(producer,)) for producer in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        received = {producer: [] for producer in range(4)}
+        while (msg := self.receiver.recv(0)) is not None:
+            received[msg.arbitration_id].append(msg.data[0])
+        for producer in range(4):
+            self.assertEqual(received[producer], list(range(100)))
+
+    def test_errors_are_reported(self):
+        errors = []
+        self.bus.tx_callback = lambda msg, error: errors.append((msg, error))
+
+        self.bus.__wrapped__.send = Mock(side_effect=can.CanOperationError("failed"))
+        msg = can.Message(arbitration_id=1)
+        future = self.bus.send(msg)
+        with self.assertRaises(can.CanError):
+            future.result(timeout=5)
+        self.assertIs(errors[0][0], msg)
+        self.assertIsInstance(errors[0][1], can.CanError)
+
+        # the worker continues with the next message
+        del self.bus.__wrapped__.send
+        self.bus.send(can.Message(arbitration_id=2)).result(timeout=5)
+        self.assertEqual(errors[1][1], None)
+
+    def test_shutdown_sends_queued_messages(self):
+        with self.bus._lock_send:
+            futures = [self.bus.send(can.Message(arbitration_id=3)) for _ in range(10)]
+            self.assertGreater(self.bus.tx_queue_size, 0)
+        self.bus.shutdown()
+
+        self.assertTrue(all(future.done() for future in futures))
+        with self.assertRaises(can.CanOperationError):
+            self.bus.send(can.Message())
+
+    def test_flush_tx_buffer_cancels_queued_messages(self):
+        with self.bus._lock_send:
+            futures = [self.bus.send(can.Message(arbitration_id=4)) for _ in range(10)]
+            self.bus.flush_tx_buffer()
+        wait(futures, timeout=5)
+        self.assertTrue(futures[-1].cancelled())
+
+    def test_flush_tx_buffer_cancels_taken_messages(self):
+        with self.bus._lock_send:
+            futures = [self.bus.send(can.Message(arbitration_id=5)) for _ in range(10)]
+            # wait until the TX thread took the batch and waits for the lock
+            t_end = time.perf_counter() + 5
+            while self.bus.tx_queue_size and time.perf_counter() < t_end:
+                time.sleep(0.001)
+            self.bus.flush_tx_buffer()
+        wait(futures, timeout=5)
+        self.assertTrue(all(future.cancelled() for future in futures))
+        self.assertIsNone(self.receiver.recv(0))
+
+    def test_messages_after_stop_request_fail(self):
+        errors = []
+        self.bus.tx_callback = lambda msg, error: errors.append(error)
+        with self.bus._lock_send:
+            sent = self.bus.send(can.Message(arbitration_id=6))
+            self.bus._tx_queue.put(None)
+            # queued in the same batch as the stop request
+            late = self.bus.send(can.Message(arbitration_id=7))
+        self.bus._tx_thread.join(5)
+
+        self.assertIsNone(sent.result(timeout=5))
+        with self.assertRaises(can.CanOperationError):
+            late.result(timeout=5)
+        self.assertIsNone(errors[0])
+        self.assertIsInstance(errors[1], can.CanOperationError)
+
+
+class TestThreadSafeBusDirect(unittest.TestCase):
+    def test_send_returns_none(self):
+        with can.ThreadSafeBus(interface="virtual") as bus:
+            self.assertIsInstance(bus, can.ThreadSafeBus)
+            self.assertIsNone(bus.send(can.Message()))
+            self.assertEqual(bus.tx_queue_size, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()